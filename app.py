@@ -7,6 +7,7 @@ For the legacy monolithic version, see app.py.backup
 """
 import os
 import logging
+import threading
 
 # Suppress gRPC/ALTS warnings for cleaner console output
 os.environ['GRPC_VERBOSITY'] = 'ERROR'
@@ -16,7 +17,19 @@ logging.getLogger('grpc').setLevel(logging.ERROR)
 from flask import Flask
 from config import Config
 from models.database import db, init_db
-from models import init_drafts_table, User
+from models import (
+    init_drafts_table, init_faculty_scores_table, init_cache_versions_table,
+    init_student_program_column, User
+)
+from utils.email_queue import init_email_queue_tables
+from utils.period_scheduler import init_period_scheduler_tables, ensure_period_scheduler
+from utils.expired_evaluations import init_expiry_columns, ensure_expiry_sweeper
+from utils.report_artifacts import init_report_artifact_columns, ensure_report_collector
+from utils.bulk_exports import init_bulk_export_tables
+from utils.ai_insight_cache import init_ai_insight_cache_table
+from utils.ai_client import init_ai_insight_jobs_table
+from utils.comment_moderation import init_comment_moderation_table
+from models.analytics import init_analytics_columns
 from utils import DecimalJSONProvider
 
 # Import route blueprints
@@ -24,6 +37,29 @@ from routes import auth_bp, admin_bp, student_bp, guidance_bp, api_bp
 from routes.analytics import analytics_bp
 
 
+def init_database_tables():
+    """
+    Create the tables and columns the application adds to the base schema
+    
+    Every init_* function is idempotent (CREATE TABLE IF NOT EXISTS and
+    information_schema checks), so this is safe to run in every process.
+    They run outside an app context, each on its own pooled connection.
+    """
+    init_drafts_table()
+    init_faculty_scores_table()
+    init_cache_versions_table()
+    init_email_queue_tables()
+    init_period_scheduler_tables()
+    init_expiry_columns()
+    init_student_program_column()
+    init_report_artifact_columns()
+    init_bulk_export_tables()
+    init_ai_insight_cache_table()
+    init_ai_insight_jobs_table()
+    init_comment_moderation_table()
+    init_analytics_columns()
+
+
 def create_app(config_class=Config):
     """
     Application factory pattern
@@ -45,6 +81,11 @@ def create_app(config_class=Config):
     # Initialize SQLAlchemy
     init_db(app)
     
+    # WSGI servers never run __main__, so the schema setup happens here
+    if app.config.get('INIT_DB_ON_STARTUP', True):
+        print("Initializing database tables...")
+        init_database_tables()
+    
     # Configure custom JSON encoder for Decimal types
     app.json = DecimalJSONProvider(app)
     
@@ -56,6 +97,15 @@ def create_app(config_class=Config):
     app.register_blueprint(api_bp)
     app.register_blueprint(analytics_bp)
     
+    # Evaluation period transitions, expiry sweeps and report retention run
+    # in leader-elected background threads (started by the first request so
+    # CLI tools importing the app don't)
+    @app.before_request
+    def start_background_schedulers():
+        ensure_period_scheduler(app)
+        ensure_expiry_sweeper(app)
+        ensure_report_collector(app)
+    
     # Add compatibility routes for old template references
     # This allows templates with url_for('login') to work
     # TODO: Update templates to use blueprint endpoints (e.g., url_for('auth.login'))
@@ -86,16 +136,33 @@ def create_app(config_class=Config):
     return app
 
 
-# Create application instance
-app = create_app()
+_app_lock = threading.Lock()
+
+
+def __getattr__(name):
+    """
+    Create the module-level ``app`` on first access
+    
+    ``from app import app`` and WSGI servers pointed at ``app:app`` still get
+    one shared instance, but merely importing this module no longer builds
+    the app or connects to the database. Spawned worker processes re-import
+    the script that started the server (as ``__mp_main__``), so with
+    ``python app.py`` every bulk export or analytics child used to run
+    create_app() before doing any work.
+    """
+    if name != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _app_lock:
+        if 'app' not in globals():
+            globals()['app'] = create_app()
+    return globals()['app']
 
 
 if __name__ == '__main__':
-    # Initialize database tables
-    print("Initializing database tables...")
-    init_drafts_table()
+    # Create application instance
+    app = create_app()
     
-    # Initialize admin user
+    # Initialize admin user (tables are created by create_app())
     print("Checking admin user...")
     User.initialize_admin()
     
@@ -0,0 +1,90 @@
+"""
+Benchmark: email message construction (messages/second)
+
+Compares building a period-start notification per recipient the old way
+(read and encode the logo and serialize the whole message every time)
+with a PreparedEmail rendered once per job, where only the recipient's
+name and address are substituted and the encoded logo is reused.
+
+No SMTP server or database is needed; messages are built and serialized
+to bytes, which is the work done before handing them to the socket.
+
+Usage:
+    python benchmarks/bench_email_build.py --messages 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask
+from utils.email_utils import (
+    RECIPIENT_NAME,
+    PreparedEmail,
+    _load_logo_part,
+    build_email_message,
+    prepare_evaluation_start_notification,
+)
+
+PERIOD = ('1st Semester 2025-2026 Faculty Evaluation', '2025-10-01', '2025-10-31')
+
+
+def legacy_build(recipients, template):
+    """Per-recipient body, logo read from disk and full serialization"""
+    for email, name in recipients:
+        _load_logo_part.cache_clear()
+        msg = build_email_message(
+            email,
+            template.subject,
+            template.body_html.replace(RECIPIENT_NAME, name),
+            template.body_text.replace(RECIPIENT_NAME, name)
+        )
+        PreparedEmail._flatten(msg)
+
+
+def prepared_build(recipients, template=None):
+    """Render once per job, substitute name and address per recipient"""
+    prepared = prepare_evaluation_start_notification(*PERIOD)
+    for email, name in recipients:
+        prepared.as_bytes(email, name)
+
+
+def run(build, recipients, template):
+    started = time.perf_counter()
+    build(recipients, template)
+    return len(recipients) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Email construction benchmark')
+    parser.add_argument('--messages', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config.update(
+        MAIL_USERNAME='noreply@example.com',
+        MAIL_REPLY_TO='guidance@example.com',
+        MAIL_LIST_UNSUBSCRIBE='mailto:guidance@example.com',
+        LOGO_PATH=os.path.join(ROOT, 'static', 'images', 'nclogo.png'),
+    )
+    recipients = [(f'student{i}@example.com', f'Student {i}') for i in range(args.messages)]
+
+    with app.app_context():
+        # Warm up imports and the charset/encoder machinery
+        template = prepare_evaluation_start_notification(*PERIOD)
+        prepared_build(recipients[:10])
+
+        legacy = run(legacy_build, recipients, template)
+        prepared = run(prepared_build, recipients, template)
+
+    print(f"Messages:  {args.messages}")
+    print(f"Legacy:    {legacy:,.0f} messages/s")
+    print(f"Prepared:  {prepared:,.0f} messages/s")
+    print(f"Speedup:   {prepared / legacy:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: faculty performance stats query (queries/second)
+
+Compares the legacy stats query, which LEFT JOINs both evaluation_responses
+and comments onto evaluations and de-duplicates with COUNT(DISTINCT ...),
+with FacultyAnalytics.evaluation_stats(), which aggregates evaluations,
+responses and comments in independent single-row subqueries.
+
+One synthetic faculty member is seeded with --evaluations completed
+evaluations, each answering --criteria criteria. Every other evaluation
+carries --comments comments and the rest one, so the legacy join reads
+up to criteria x comments rows per evaluation. Both queries must report
+the same counts; the legacy average is printed next to the true one to
+show how the fan-out skews it.
+
+A scratch database (--scratch-db, dropped afterwards) holds copies of the
+tables involved, created LIKE the originals, so the real data is never
+touched; TEMPORARY tables cannot be used because the new query reads
+evaluations more than once. The source database must already contain the
+IntellEvalPro schema.
+
+Usage:
+    DATABASE_URL=mysql+pymysql://root:@localhost:3306/intellevalpro_db \
+        python benchmarks/bench_faculty_analytics.py --criteria 40 --evaluations 500 --comments 3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector
+from models.analytics import FacultyAnalytics
+from models.database import _get_connect_args
+
+COPIED_TABLES = (
+    'evaluation_categories', 'evaluation_criteria', 'class_sections',
+    'evaluations', 'evaluation_responses', 'comments'
+)
+
+FACULTY_ID = 1
+PERIOD_ID = 1
+SENTIMENTS = ('Positive', 'Negative', 'Neutral')
+
+# Stats query as it was before the subqueries were split out
+LEGACY_STATS_SQL = """
+    SELECT
+        COUNT(DISTINCT e.evaluation_id) as total_evaluations,
+        COUNT(DISTINCT CASE WHEN e.status = 'Completed' THEN e.evaluation_id END) as completed_evaluations,
+        COUNT(DISTINCT er.response_id) as total_responses,
+        AVG(CASE WHEN er.rating IS NOT NULL THEN er.rating END) as average_rating,
+        COUNT(DISTINCT c.comment_id) as total_comments,
+        COUNT(DISTINCT CASE WHEN c.sentiment = 'Positive' THEN c.comment_id END) as positive_comments,
+        COUNT(DISTINCT CASE WHEN c.sentiment = 'Negative' THEN c.comment_id END) as negative_comments,
+        COUNT(DISTINCT CASE WHEN c.sentiment = 'Neutral' THEN c.comment_id END) as neutral_comments
+    FROM evaluations e
+    JOIN class_sections cs ON e.section_id = cs.section_id
+    LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
+    LEFT JOIN comments c ON e.evaluation_id = c.evaluation_id
+    WHERE cs.faculty_id = %s
+    AND e.period_id = %s
+"""
+
+COUNT_FIELDS = (
+    'total_evaluations', 'completed_evaluations', 'total_responses', 'total_comments',
+    'positive_comments', 'negative_comments', 'neutral_comments'
+)
+
+
+def setup(cursor, source_db, scratch_db, criteria, evaluations, comments):
+    """Copy the table definitions into the scratch database and seed one faculty member"""
+    cursor.execute(f"DROP DATABASE IF EXISTS `{scratch_db}`")
+    cursor.execute(f"CREATE DATABASE `{scratch_db}`")
+    for table in COPIED_TABLES:
+        cursor.execute(f"CREATE TABLE `{scratch_db}`.`{table}` LIKE `{source_db}`.`{table}`")
+    cursor.execute(f"USE `{scratch_db}`")
+
+    cursor.execute("INSERT INTO evaluation_categories (category_id, name) VALUES (1, 'Teaching')")
+    cursor.executemany("""
+        INSERT INTO evaluation_criteria (criteria_id, category_id, description, `order`)
+        VALUES (%s, 1, %s, %s)
+    """, [(i, f"Criterion {i}", i) for i in range(1, criteria + 1)])
+    cursor.execute("""
+        INSERT INTO class_sections (section_id, subject_id, faculty_id, acad_term_id, section_name)
+        VALUES (1, 1, %s, 1, 'BENCH')
+    """, (FACULTY_ID,))
+
+    cursor.executemany("""
+        INSERT INTO evaluations (evaluation_id, period_id, section_id, student_id, status)
+        VALUES (%s, %s, 1, %s, 'Completed')
+    """, [(i, PERIOD_ID, i) for i in range(1, evaluations + 1)])
+
+    # Odd evaluations rate higher and carry more comments, so the legacy AVG
+    # (which counts each rating once per comment) is visibly skewed
+    for start in range(1, evaluations + 1, 100):
+        batch = range(start, min(start + 100, evaluations + 1))
+        cursor.executemany("""
+            INSERT INTO evaluation_responses (evaluation_id, criteria_id, rating)
+            VALUES (%s, %s, %s)
+        """, [(e, c, 4 + c % 2 if e % 2 else (e + c) % 5 + 1) for e in batch for c in range(1, criteria + 1)])
+        cursor.executemany("""
+            INSERT INTO comments (evaluation_id, comment_text, sentiment)
+            VALUES (%s, %s, %s)
+        """, [(e, f"Comment {k} on evaluation {e}", SENTIMENTS[(e + k) % 3])
+              for e in batch for k in range(1 + (e % 2) * (comments - 1) if comments else 0)])
+
+
+def run(repeats, query):
+    """Time repeated executions of one stats query"""
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = query()
+    return repeats / (time.perf_counter() - started), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--criteria', type=int, default=40)
+    parser.add_argument('--evaluations', type=int, default=500)
+    parser.add_argument('--comments', type=int, default=3, help='Comments on every other evaluation (others get 1)')
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--scratch-db', default='intellevalpro_bench')
+    args = parser.parse_args()
+
+    connect_args = _get_connect_args()
+    conn = mysql.connector.connect(**connect_args)
+    cursor = conn.cursor(dictionary=True)
+    try:
+        setup(cursor, connect_args['database'], args.scratch_db, args.criteria, args.evaluations, args.comments)
+        conn.commit()
+
+        def legacy():
+            cursor.execute(LEGACY_STATS_SQL, (FACULTY_ID, PERIOD_ID))
+            return cursor.fetchone()
+
+        def current():
+            return FacultyAnalytics.evaluation_stats(cursor, FACULTY_ID, PERIOD_ID)
+
+        legacy_rate, legacy_stats = run(args.repeats, legacy)
+        current_rate, current_stats = run(args.repeats, current)
+
+        for field in COUNT_FIELDS:
+            assert int(legacy_stats[field] or 0) == int(current_stats[field] or 0), field
+
+        cursor.execute("SELECT AVG(rating) as average_rating FROM evaluation_responses")
+        true_average = float(cursor.fetchone()['average_rating'])
+
+        print(f"Criteria: {args.criteria}  Evaluations: {args.evaluations}  "
+              f"Comments: {current_stats['total_comments']}  Responses: {current_stats['total_responses']}")
+        print(f"Legacy  (fan-out join):  {legacy_rate:8.1f} queries/s  "
+              f"average {float(legacy_stats['average_rating']):.4f}")
+        print(f"Current (subqueries):    {current_rate:8.1f} queries/s  "
+              f"average {float(current_stats['average_rating']):.4f}")
+        print(f"True average rating:     {true_average:.4f}")
+        print(f"Speed-up: {current_rate / legacy_rate:.2f}x")
+    finally:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{args.scratch_db}`")
+        cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
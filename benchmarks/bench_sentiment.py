@@ -0,0 +1,65 @@
+"""
+Benchmark: comment sentiment classification (comments/second)
+
+Runs the offline lexicon scorer used at submit time over a synthetic
+corpus of English, Tagalog and mixed (Taglish) comments of realistic
+length, and reports throughput, time per comment and the label mix.
+
+No database or network is needed.
+
+Usage:
+    python benchmarks/bench_sentiment.py --comments 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sentiment import classify_sentiment
+
+SAMPLES = (
+    'Very good teacher, explains the lessons clearly and is always prepared.',
+    'Napakagaling po ni sir magturo, malinaw at mabait pa.',
+    'Magaling siya pero minsan late pumapasok sa klase.',
+    'The class is boring and the instructor is often absent.',
+    'Hindi malinaw magturo at masungit pa, nakakainis.',
+    'Sobrang bait ni maam, salamat po sa lahat!',
+    'Good but needs improvement in time management.',
+    'Walang kwenta ang mga activities, sayang ang oras.',
+    'She is not rude at all, very approachable and patient.',
+    'Okay lang naman po, walang problema.',
+    'The lessons are confusing and the exams are unfair.',
+    'Thank you for being an inspiring and dedicated professor!',
+)
+
+
+def build_corpus(count, seed):
+    """Comments of one to three sample sentences each"""
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(SAMPLES) for _ in range(rng.randint(1, 3))) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--comments', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.comments, args.seed)
+
+    started = time.perf_counter()
+    labels = Counter(classify_sentiment(comment) for comment in corpus)
+    elapsed = time.perf_counter() - started
+
+    print(f"Comments: {args.comments}  Average length: {sum(map(len, corpus)) / len(corpus):.0f} chars")
+    print(f"Throughput: {args.comments / elapsed:10.0f} comments/s")
+    print(f"Per comment: {elapsed / args.comments * 1e6:8.1f} µs")
+    print("Labels: " + ", ".join(f"{label} {labels[label]}" for label in ('Positive', 'Neutral', 'Negative')))
+
+
+if __name__ == '__main__':
+    main()
@@ -45,6 +45,23 @@ class Config:
         'pool_pre_ping': True,  # Verify connections before using
     }
     
+    # mysql-connector pool used by models.database.get_db_connection()
+    DB_POOL_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_POOL_MAX_OVERFLOW', 20)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 3600)),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true',
+    }
+    
+    # Run the idempotent init_* table/column setup when an app is created
+    # (see app.init_database_tables); disable once migrations are applied
+    INIT_DB_ON_STARTUP = os.getenv('INIT_DB_ON_STARTUP', 'True').lower() == 'true'
+    
+    # Seconds a worker reuses the cached current term / active period before
+    # checking whether they changed (see models/academic_calendar.py)
+    ACADEMIC_CALENDAR_CACHE_TTL = int(os.getenv('ACADEMIC_CALENDAR_CACHE_TTL', 30))
+    
     # Server Configuration
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', 5000))
@@ -72,6 +89,69 @@ class Config:
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD', '')
     MAIL_REPLY_TO = os.getenv('MAIL_REPLY_TO', MAIL_USERNAME)
     MAIL_LIST_UNSUBSCRIBE = os.getenv('MAIL_LIST_UNSUBSCRIBE', f'mailto:guidance@norzagaraycollege.edu.ph')
+    
+    # Email Queue Configuration (durable bulk notifications, see utils/email_queue.py)
+    EMAIL_QUEUE_BATCH_SIZE = int(os.getenv('EMAIL_QUEUE_BATCH_SIZE', 100))
+    EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv('EMAIL_QUEUE_MAX_ATTEMPTS', 5))
+    EMAIL_QUEUE_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_QUEUE_RETRY_BASE_SECONDS', 60))
+    EMAIL_QUEUE_CONNECTIONS = int(os.getenv('EMAIL_QUEUE_CONNECTIONS', 5))
+    EMAIL_RATE_LIMIT_PER_SECOND = float(os.getenv('EMAIL_RATE_LIMIT_PER_SECOND', 10))
+    # Set to False when running `python -m utils.email_queue` as a separate worker
+    EMAIL_QUEUE_INPROCESS_WORKER = os.getenv('EMAIL_QUEUE_INPROCESS_WORKER', 'True').lower() == 'true'
+    
+    # Evaluation period lifecycle (status transitions, see utils/period_scheduler.py)
+    PERIOD_SCHEDULER_INTERVAL_SECONDS = int(os.getenv('PERIOD_SCHEDULER_INTERVAL_SECONDS', 3600))
+    # Set to False when running `python -m utils.period_scheduler` from cron or a separate process
+    PERIOD_SCHEDULER_INPROCESS = os.getenv('PERIOD_SCHEDULER_INPROCESS', 'True').lower() == 'true'
+    
+    # Evaluation expiry sweeper (timer deadlines and ended periods, see utils/expired_evaluations.py)
+    EXPIRY_SWEEP_INTERVAL_SECONDS = int(os.getenv('EXPIRY_SWEEP_INTERVAL_SECONDS', 60))
+    EXPIRY_SWEEP_BATCH_SIZE = int(os.getenv('EXPIRY_SWEEP_BATCH_SIZE', 500))
+    # Set to False when running `python -m utils.expired_evaluations` from cron or a separate process
+    EXPIRY_SWEEPER_INPROCESS = os.getenv('EXPIRY_SWEEPER_INPROCESS', 'True').lower() == 'true'
+    
+    # Generated report artifacts (background rendering and retention, see utils/report_artifacts.py)
+    REPORT_ARTIFACT_DIR = os.getenv('REPORT_ARTIFACT_DIR', os.path.join('storage', 'reports'))
+    REPORT_RETENTION_DAYS = int(os.getenv('REPORT_RETENTION_DAYS', 30))
+    REPORT_GC_INTERVAL_SECONDS = int(os.getenv('REPORT_GC_INTERVAL_SECONDS', 3600))
+    # Set to False when running `python -m utils.report_artifacts` as a separate worker
+    REPORT_WORKER_INPROCESS = os.getenv('REPORT_WORKER_INPROCESS', 'True').lower() == 'true'
+    
+    # Cached per-faculty evaluation exports (see utils/export_cache.py)
+    EXPORT_CACHE_DIR = os.getenv('EXPORT_CACHE_DIR', os.path.join('storage', 'exports'))
+    EXPORT_CACHE_MAX_AGE_DAYS = int(os.getenv('EXPORT_CACHE_MAX_AGE_DAYS', 14))
+    
+    # Bulk evaluation exports (ZIP of every faculty's report, see utils/bulk_exports.py)
+    BULK_EXPORT_DIR = os.getenv('BULK_EXPORT_DIR', os.path.join('storage', 'bulk_exports'))
+    BULK_EXPORT_PROCESSES = int(os.getenv('BULK_EXPORT_PROCESSES', 2))
+    # Set to False when running `python -m utils.bulk_exports` as a separate worker
+    BULK_EXPORT_INPROCESS = os.getenv('BULK_EXPORT_INPROCESS', 'True').lower() == 'true'
+    
+    # Cached AI analytics insights (see utils/ai_insight_cache.py); 0 disables the cache
+    AI_INSIGHT_CACHE_TTL_SECONDS = int(os.getenv('AI_INSIGHT_CACHE_TTL_SECONDS', 86400))
+    AI_INSIGHT_CACHE_MAX_ENTRIES = int(os.getenv('AI_INSIGHT_CACHE_MAX_ENTRIES', 5000))
+    
+    # Shared AI client (bounded pool, deadlines, circuit breaker, see utils/ai_client.py)
+    AI_MAX_CONCURRENCY = int(os.getenv('AI_MAX_CONCURRENCY', 4))
+    AI_MAX_PENDING = int(os.getenv('AI_MAX_PENDING', 8))
+    AI_TIMEOUT_SECONDS = float(os.getenv('AI_TIMEOUT_SECONDS', 20))
+    AI_ADVANCED_TIMEOUT_SECONDS = float(os.getenv('AI_ADVANCED_TIMEOUT_SECONDS', 60))
+    AI_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('AI_CIRCUIT_FAILURE_THRESHOLD', 5))
+    AI_CIRCUIT_RESET_SECONDS = float(os.getenv('AI_CIRCUIT_RESET_SECONDS', 60))
+    # Run advanced /ai-analytics insights as background jobs polled by the page
+    AI_ASYNC_ADVANCED = os.getenv('AI_ASYNC_ADVANCED', 'True').lower() == 'true'
+    AI_JOB_WORKERS = int(os.getenv('AI_JOB_WORKERS', 2))
+    # Answer with a local stub model instead of Gemini (offline development and testing)
+    AI_USE_STUB_MODEL = os.getenv('AI_USE_STUB_MODEL', 'False').lower() == 'true'
+    
+    # Comment moderation (results stored per comment, see utils/comment_moderation.py)
+    COMMENT_MODERATION_BATCH_SIZE = int(os.getenv('COMMENT_MODERATION_BATCH_SIZE', 25))
+    COMMENT_MODERATION_CONCURRENCY = int(os.getenv('COMMENT_MODERATION_CONCURRENCY', 4))
+    
+    # Comment theme dictionary for analytics (JSON of theme -> keywords, see utils/theme_matcher.py)
+    ANALYTICS_THEMES_FILE = os.getenv('ANALYTICS_THEMES_FILE')
+    # Worker processes for period-wide analytics recalculation (see AnalyticsScheduler in models/analytics.py)
+    ANALYTICS_PROCESSES = int(os.getenv('ANALYTICS_PROCESSES', 2))
 
 
 class DevelopmentConfig(Config):
@@ -2,18 +2,45 @@
 Models package for IntellEvalPro
 Provides database models and helper functions
 """
-from .database import get_db_connection, init_drafts_table, execute_query
+from .database import (
+    get_db_connection,
+    init_drafts_table,
+    execute_query,
+    request_transaction,
+    db_cursor,
+    RequestTransactionAborted
+)
 from .user import User
-from .student import Student
+from .student import Student, init_student_program_column
 from .faculty import Faculty
 from .evaluation import Evaluation
+from .faculty_scores import FacultyScores, init_faculty_scores_table
+from .rankings import FacultyRankings
+from .cache_versions import CacheVersion, init_cache_versions_table
+from .questionnaire import Questionnaire
+from .academic_calendar import AcademicCalendar
+from .activity_log import ActivityLog
+from .response_matrix import ResponseMatrix
 
 __all__ = [
     'get_db_connection',
     'init_drafts_table',
     'execute_query',
+    'request_transaction',
+    'db_cursor',
+    'RequestTransactionAborted',
     'User',
     'Student',
+    'init_student_program_column',
     'Faculty',
-    'Evaluation'
+    'Evaluation',
+    'FacultyScores',
+    'init_faculty_scores_table',
+    'FacultyRankings',
+    'CacheVersion',
+    'init_cache_versions_table',
+    'Questionnaire',
+    'AcademicCalendar',
+    'ActivityLog',
+    'ResponseMatrix'
 ]
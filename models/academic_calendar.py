@@ -0,0 +1,279 @@
+"""
+Academic calendar resolver for IntellEvalPro
+Current academic year/term and active evaluation period, cached per worker
+
+Almost every dashboard starts by looking up the current term and the
+active evaluation period, often with a fallback query when none is set.
+AcademicCalendar loads all of them in one go and keeps the result for
+ACADEMIC_CALENDAR_CACHE_TTL seconds. After that the 'academic_calendar'
+version in cache_versions is checked and the snapshot is only reloaded if
+it changed or the date rolled over.
+
+Endpoints that write academic_years, academic_terms or evaluation_periods
+call AcademicCalendar.invalidate() in their transaction, which drops this
+worker's snapshot immediately and makes the other workers reload at their
+next check.
+"""
+import time
+from datetime import date, datetime
+
+from config import Config
+from .cache_versions import CacheVersion
+from .database import get_db_connection
+
+CACHE_NAME = 'academic_calendar'
+
+# Replaced as a whole; None until first use or after invalidate()
+_snapshot = None
+
+
+def _as_datetime(value):
+    """Treat a DATE as midnight so it compares with DATETIME columns like MySQL does"""
+    if isinstance(value, datetime) or not isinstance(value, date):
+        return value
+    return datetime.combine(value, datetime.min.time())
+
+
+def _days_remaining(period):
+    """DATEDIFF(end_date, CURDATE()) for a period (negative once it has ended)"""
+    end_date = period.get('end_date')
+    if not isinstance(end_date, date):
+        return None
+    if isinstance(end_date, datetime):
+        end_date = end_date.date()
+    return (end_date - date.today()).days
+
+
+class AcademicCalendar:
+    """Cached lookups of the current academic term and evaluation period"""
+
+    @staticmethod
+    def invalidate(cursor):
+        """
+        Mark the academic calendar as changed (caller commits)
+
+        Args:
+            cursor: Cursor on the connection that changed years, terms or periods
+        """
+        global _snapshot
+        CacheVersion.bump(cursor, CACHE_NAME)
+        _snapshot = None
+
+    @staticmethod
+    def _load(cursor, version):
+        """
+        Query the current year, terms and candidate periods
+
+        Args:
+            cursor: Dictionary cursor
+            version (int): Cache version the snapshot is built from
+
+        Returns:
+            dict: Snapshot of the academic calendar
+        """
+        cursor.execute("""
+            SELECT acad_year_id, year_code, year_name, start_date, end_date
+            FROM academic_years
+            WHERE is_current = 1
+            LIMIT 1
+        """)
+        current_year = cursor.fetchone()
+
+        # Current terms plus the most recent one as a fallback
+        cursor.execute("""
+            SELECT
+                at.acad_term_id,
+                at.term_name,
+                at.term_code,
+                at.start_date,
+                at.end_date,
+                at.is_current,
+                at.acad_year_id,
+                ay.year_code,
+                ay.year_name,
+                CONCAT(ay.year_code, ' - ', at.term_name) as display_term
+            FROM academic_terms at
+            INNER JOIN academic_years ay ON at.acad_year_id = ay.acad_year_id
+            WHERE at.is_current = 1
+            OR at.acad_term_id = (SELECT MAX(acad_term_id) FROM academic_terms)
+            ORDER BY at.acad_term_id DESC
+        """)
+        terms = cursor.fetchall()
+
+        # Active or running periods plus the most recent one as a fallback
+        cursor.execute("""
+            SELECT
+                ep.period_id,
+                ep.title,
+                ep.start_date,
+                ep.end_date,
+                ep.status,
+                ep.acad_term_id,
+                COALESCE(ep.is_archived, 0) as is_archived,
+                CONCAT(ay.year_code, ' - ', at.term_name) as display_term
+            FROM evaluation_periods ep
+            LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
+            LEFT JOIN academic_years ay ON at.acad_year_id = ay.acad_year_id
+            WHERE ep.status = 'Active'
+            OR CURDATE() BETWEEN ep.start_date AND ep.end_date
+            OR ep.period_id = (
+                SELECT latest.period_id FROM (
+                    SELECT period_id FROM evaluation_periods
+                    ORDER BY start_date DESC
+                    LIMIT 1
+                ) latest
+            )
+            ORDER BY ep.start_date DESC
+        """)
+        periods = cursor.fetchall()
+
+        return {
+            'version': version,
+            'loaded_on': date.today(),
+            'expires_at': time.monotonic() + Config.ACADEMIC_CALENDAR_CACHE_TTL,
+            'current_year': current_year,
+            'terms': terms,
+            'periods': periods
+        }
+
+    @staticmethod
+    def _get_snapshot():
+        """
+        Get this worker's snapshot, revalidating it once its TTL has passed
+
+        Returns:
+            dict: Snapshot of the academic calendar
+        """
+        global _snapshot
+
+        snapshot = _snapshot
+        if (snapshot and snapshot['expires_at'] > time.monotonic()
+                and snapshot['loaded_on'] == date.today()):
+            return snapshot
+
+        conn = get_db_connection()
+        if not conn:
+            raise RuntimeError("Database connection failed")
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                version = CacheVersion.get(cursor, CACHE_NAME)
+            except Exception as e:
+                print(f"Error reading academic calendar version: {e}")
+                version = None
+
+            if (snapshot and version is not None and snapshot['version'] == version
+                    and snapshot['loaded_on'] == date.today()):
+                # Unchanged: keep the data for another TTL
+                snapshot = dict(snapshot, expires_at=time.monotonic() + Config.ACADEMIC_CALENDAR_CACHE_TTL)
+            else:
+                snapshot = AcademicCalendar._load(cursor, version)
+            cursor.close()
+
+            if version is not None:
+                _snapshot = snapshot
+            return snapshot
+        finally:
+            conn.close()
+
+    @staticmethod
+    def current_year():
+        """
+        Get the academic year marked as current
+
+        Returns:
+            dict: acad_year_id, year_code, year_name, start_date, end_date, or None
+        """
+        current_year = AcademicCalendar._get_snapshot()['current_year']
+        return dict(current_year) if current_year else None
+
+    @staticmethod
+    def current_term(fallback=False):
+        """
+        Get the academic term marked as current
+
+        A current term of the current year is preferred over one left marked
+        current in another year.
+
+        Args:
+            fallback (bool): Return the most recent term when none is current
+
+        Returns:
+            dict: Term columns with acad_year_id, year_code, year_name and
+                  display_term, or None
+        """
+        snapshot = AcademicCalendar._get_snapshot()
+        terms = snapshot['terms']
+        current = [term for term in terms if term['is_current']]
+        current_year = snapshot['current_year']
+
+        term = None
+        if current_year:
+            term = next((t for t in current if t['acad_year_id'] == current_year['acad_year_id']), None)
+        if not term and current:
+            term = current[0]
+        if not term and fallback and terms:
+            term = terms[0]
+        return dict(term) if term else None
+
+    @staticmethod
+    def active_period(fallback=False):
+        """
+        Get the evaluation period with status 'Active' (latest start date first)
+
+        Args:
+            fallback (bool): Return the most recent period when none is active
+
+        Returns:
+            dict: period_id, title, start_date, end_date, status, acad_term_id,
+                  is_archived, display_term (year and term) and days_remaining,
+                  or None
+        """
+        periods = AcademicCalendar._get_snapshot()['periods']
+        period = next((p for p in periods if p['status'] == 'Active'), None)
+        if not period and fallback and periods:
+            period = periods[0]
+        if not period:
+            return None
+        period = dict(period)
+        period['days_remaining'] = _days_remaining(period)
+        return period
+
+    @staticmethod
+    def open_period():
+        """
+        Get the period students can currently evaluate in
+
+        A non-archived period whose dates include today wins over one that is
+        only flagged 'Active'. The returned status is derived from the dates
+        (Upcoming / Active / Completed).
+
+        Returns:
+            dict: Same keys as active_period(), or None
+        """
+        today = _as_datetime(date.today())
+        periods = [
+            p for p in AcademicCalendar._get_snapshot()['periods']
+            if not p['is_archived']
+        ]
+        running = [
+            p for p in periods
+            if p['start_date'] and p['end_date']
+            and _as_datetime(p['start_date']) <= today <= _as_datetime(p['end_date'])
+        ]
+
+        if running:
+            period = dict(running[0])
+            period['status'] = 'Active'
+        else:
+            period = next((p for p in periods if p['status'] == 'Active'), None)
+            if not period:
+                return None
+            period = dict(period)
+            if period['start_date'] and today < _as_datetime(period['start_date']):
+                period['status'] = 'Upcoming'
+            elif period['end_date'] and today > _as_datetime(period['end_date']):
+                period['status'] = 'Completed'
+        period['days_remaining'] = _days_remaining(period)
+        return period
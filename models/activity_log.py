@@ -0,0 +1,260 @@
+"""
+Activity log queries for IntellEvalPro
+Filtered, keyset-paginated reads of activity_logs for the admin log viewer and exports
+
+activity_logs only ever grows, so it is never read whole. Pages are
+walked newest first on (timestamp, log_id): a page ends with a cursor
+naming its last row and the next page starts strictly after it. InnoDB
+stores the primary key in every secondary index, so idx_timestamp already
+orders rows by (timestamp, log_id) and each page is an index range scan,
+no matter how deep into the log it is. Role, activity type, user and
+date filters map onto idx_user_role, idx_activity_type, idx_user_id and
+idx_timestamp.
+"""
+from datetime import datetime, timedelta
+
+# Columns of the list view and exports; user_agent and additional_data
+# are only loaded for a single log (see ActivityLog.get)
+LIST_COLUMNS = (
+    'log_id', 'user_id', 'user_name', 'user_role', 'activity_type',
+    'description', 'reason', 'target_user', 'ip_address', 'timestamp'
+)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+CURSOR_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+class ActivityLog:
+    """Query helpers for the activity_logs table"""
+
+    @staticmethod
+    def parse_filters(args):
+        """
+        Read log filters from request arguments
+
+        Args:
+            args: Mapping such as request.args with any of role, activity_type,
+                  user_id, search, date_from and date_to (YYYY-MM-DD)
+
+        Returns:
+            dict: Normalized filters (missing ones are None)
+
+        Raises:
+            ValueError: If user_id or a date is malformed
+        """
+        user_id = args.get('user_id')
+        date_from = args.get('date_from')
+        date_to = args.get('date_to')
+        return {
+            'role': args.get('role') or None,
+            'activity_type': args.get('activity_type') or None,
+            'user_id': int(user_id) if user_id else None,
+            'search': (args.get('search') or '').strip() or None,
+            'date_from': datetime.strptime(date_from, '%Y-%m-%d') if date_from else None,
+            # Inclusive end date: everything before the next midnight
+            'date_to': datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1) if date_to else None
+        }
+
+    @staticmethod
+    def encode_cursor(log):
+        """
+        Build the cursor that continues after a log row
+
+        Args:
+            log (dict): Row with timestamp and log_id
+
+        Returns:
+            str: Opaque cursor for the next page
+        """
+        return f"{log['timestamp'].strftime(CURSOR_FORMAT)}_{log['log_id']}"
+
+    @staticmethod
+    def decode_cursor(cursor_value):
+        """
+        Parse a cursor made by encode_cursor()
+
+        Args:
+            cursor_value (str): Cursor from a previous page
+
+        Returns:
+            tuple: (timestamp, log_id)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        timestamp, _, log_id = cursor_value.rpartition('_')
+        return datetime.strptime(timestamp, CURSOR_FORMAT), int(log_id)
+
+    @staticmethod
+    def _where(filters, after=None):
+        """
+        Build the WHERE clause for filters and an optional keyset position
+
+        Args:
+            filters (dict): From parse_filters()
+            after (tuple, optional): (timestamp, log_id) to continue after
+
+        Returns:
+            tuple: (sql, params)
+        """
+        conditions = ["timestamp IS NOT NULL"]
+        params = []
+
+        if filters.get('role'):
+            conditions.append("user_role = %s")
+            params.append(filters['role'])
+        if filters.get('activity_type'):
+            conditions.append("activity_type = %s")
+            params.append(filters['activity_type'])
+        if filters.get('user_id'):
+            conditions.append("user_id = %s")
+            params.append(filters['user_id'])
+        if filters.get('date_from'):
+            conditions.append("timestamp >= %s")
+            params.append(filters['date_from'])
+        if filters.get('date_to'):
+            conditions.append("timestamp < %s")
+            params.append(filters['date_to'])
+        if filters.get('search'):
+            conditions.append("(user_name LIKE %s OR description LIKE %s OR activity_type LIKE %s)")
+            pattern = f"%{filters['search']}%"
+            params.extend([pattern, pattern, pattern])
+        if after:
+            # Expanded form of (timestamp, log_id) < (%s, %s) so the
+            # timestamp bound is usable as an index range
+            conditions.append("timestamp <= %s AND (timestamp < %s OR log_id < %s)")
+            params.extend([after[0], after[0], after[1]])
+
+        return " WHERE " + " AND ".join(conditions), params
+
+    @staticmethod
+    def page(cursor, filters, after=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Get one page of logs, newest first
+
+        Args:
+            cursor: Dictionary cursor
+            filters (dict): From parse_filters()
+            after (tuple, optional): Decoded cursor of the previous page
+            limit (int): Page size (capped at MAX_PAGE_SIZE)
+
+        Returns:
+            tuple: (logs, next_cursor); next_cursor is None on the last page
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        where, params = ActivityLog._where(filters, after)
+
+        # One extra row tells whether another page follows
+        cursor.execute(
+            f"SELECT {', '.join(LIST_COLUMNS)} FROM activity_logs{where}"
+            " ORDER BY timestamp DESC, log_id DESC LIMIT %s",
+            tuple(params) + (limit + 1,)
+        )
+        logs = cursor.fetchall()
+
+        next_cursor = None
+        if len(logs) > limit:
+            logs = logs[:limit]
+            next_cursor = ActivityLog.encode_cursor(logs[-1])
+        return logs, next_cursor
+
+    @staticmethod
+    def iter_all(cursor, filters, batch_size=1000):
+        """
+        Yield every matching log, newest first, one page query at a time
+
+        Only one batch is held in memory, so this suits streamed exports of
+        any size.
+
+        Args:
+            cursor: Dictionary cursor (must stay open while iterating)
+            filters (dict): From parse_filters()
+            batch_size (int): Rows fetched per query
+
+        Yields:
+            dict: Log rows with LIST_COLUMNS
+        """
+        after = None
+        while True:
+            where, params = ActivityLog._where(filters, after)
+            cursor.execute(
+                f"SELECT {', '.join(LIST_COLUMNS)} FROM activity_logs{where}"
+                " ORDER BY timestamp DESC, log_id DESC LIMIT %s",
+                tuple(params) + (batch_size,)
+            )
+            logs = cursor.fetchall()
+            yield from logs
+            if len(logs) < batch_size:
+                return
+            after = (logs[-1]['timestamp'], logs[-1]['log_id'])
+
+    @staticmethod
+    def count(cursor, filters):
+        """
+        Count logs matching filters
+
+        Args:
+            cursor: Dictionary cursor
+            filters (dict): From parse_filters()
+
+        Returns:
+            int: Number of matching logs
+        """
+        where, params = ActivityLog._where(filters)
+        cursor.execute(f"SELECT COUNT(*) as total FROM activity_logs{where}", tuple(params))
+        return cursor.fetchone()['total']
+
+    @staticmethod
+    def stats(cursor):
+        """
+        Get the totals shown above the log viewer
+
+        Each count is answered from an index rather than by reading rows.
+
+        Args:
+            cursor: Dictionary cursor
+
+        Returns:
+            dict: total, login, retake and today counts
+        """
+        cursor.execute("SELECT COUNT(*) as total FROM activity_logs")
+        total = cursor.fetchone()['total']
+
+        cursor.execute("""
+            SELECT activity_type, COUNT(*) as total
+            FROM activity_logs
+            WHERE activity_type IN ('login', 'retake')
+            GROUP BY activity_type
+        """)
+        by_type = {row['activity_type']: row['total'] for row in cursor.fetchall()}
+
+        cursor.execute("SELECT COUNT(*) as total FROM activity_logs WHERE timestamp >= CURDATE()")
+        today = cursor.fetchone()['total']
+
+        return {
+            'total': total,
+            'login': by_type.get('login', 0),
+            'retake': by_type.get('retake', 0),
+            'today': today
+        }
+
+    @staticmethod
+    def get(cursor, log_id):
+        """
+        Get a single log including user_agent and additional_data
+
+        Args:
+            cursor: Dictionary cursor
+            log_id (int): Log ID
+
+        Returns:
+            dict: Log row, or None if not found
+        """
+        cursor.execute(f"""
+            SELECT {', '.join(LIST_COLUMNS)}, user_agent, additional_data
+            FROM activity_logs
+            WHERE log_id = %s
+        """, (log_id,))
+        return cursor.fetchone()
@@ -3,13 +3,116 @@ Faculty Performance and Response Analytics Model
 Handles all analytics calculations and data aggregation
 """
 from models.database import get_db_connection
+from utils.theme_matcher import get_theme_matcher, themes_file
+from collections import Counter
 from datetime import datetime, timedelta
+import concurrent.futures
+import heapq
 import json
 import logging
+import multiprocessing
+import os
+import time
 from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Batch analytics (AnalyticsScheduler.calculate_all_faculty_analytics)
+DEFAULT_PROCESSES = 2
+# Building grows with the comment count (each group's longest comments are
+# selected and theme-matched) and a spawned worker takes ~1s to start, so
+# smaller periods are built in-process
+PARALLEL_MIN_COMMENTS = 50000
+SAVE_BATCH_SIZE = 500
+# Comments per sentiment theme-matched for strengths/improvements, longest
+# first, like FacultyAnalytics._analyze_comments
+THEME_COMMENT_LIMIT = 10
+
+
+def _index_exists(cursor, table_name, index_name):
+    """Check information_schema for an index (compatible with older MySQL/MariaDB)"""
+    cursor.execute("""
+        SELECT COUNT(1)
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+        AND table_name = %s
+        AND index_name = %s
+    """, (table_name, index_name))
+    return cursor.fetchone()[0] > 0
+
+
+def _column_exists(cursor, table_name, column_name):
+    """Check information_schema for a column"""
+    cursor.execute("""
+        SELECT COUNT(1)
+        FROM information_schema.columns
+        WHERE table_schema = DATABASE()
+        AND table_name = %s
+        AND column_name = %s
+    """, (table_name, column_name))
+    return cursor.fetchone()[0] > 0
+
+
+def init_analytics_columns():
+    """
+    Add the per-subject and comment columns to faculty_performance_analytics if they don't exist
+    
+    Rows are keyed by (faculty_id, period_id, subject_key), where subject_key
+    is subject_id or 0 for a faculty member's overall row (a NULL subject_id
+    would never collide in a unique key, so overall rows could not be upserted).
+    category_performance_analytics gets a unique (analytics_id, category_id)
+    key so category rows are upserted instead of duplicated.
+    """
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            
+            columns = (
+                ('subject_id', "INT NULL AFTER period_id"),
+                ('strengths_summary', "TEXT NULL AFTER performance_grade"),
+                ('improvement_areas', "TEXT NULL AFTER strengths_summary"),
+                ('total_comments', "INT DEFAULT 0 AFTER improvement_areas"),
+                ('positive_comments', "INT DEFAULT 0 AFTER total_comments"),
+                ('negative_comments', "INT DEFAULT 0 AFTER positive_comments"),
+                ('neutral_comments', "INT DEFAULT 0 AFTER negative_comments"),
+                ('last_calculated', "DATETIME NULL AFTER neutral_comments"),
+                ('subject_key', "INT AS (IFNULL(subject_id, 0)) STORED AFTER subject_id"),
+            )
+            for column, definition in columns:
+                if not _column_exists(cursor, 'faculty_performance_analytics', column):
+                    cursor.execute(f"ALTER TABLE faculty_performance_analytics ADD COLUMN {column} {definition}")
+            
+            if not _index_exists(cursor, 'faculty_performance_analytics', 'unique_faculty_period_subject'):
+                cursor.execute("""
+                    ALTER TABLE faculty_performance_analytics
+                    ADD UNIQUE KEY unique_faculty_period_subject (faculty_id, period_id, subject_key)
+                """)
+            if _index_exists(cursor, 'faculty_performance_analytics', 'unique_faculty_period'):
+                cursor.execute("ALTER TABLE faculty_performance_analytics DROP INDEX unique_faculty_period")
+            
+            if not _index_exists(cursor, 'category_performance_analytics', 'unique_analytics_category'):
+                # Keep the newest row of any duplicates left by earlier recalculations
+                cursor.execute("""
+                    DELETE older FROM category_performance_analytics older
+                    JOIN category_performance_analytics newer
+                        ON older.analytics_id = newer.analytics_id
+                        AND older.category_id = newer.category_id
+                        AND older.category_analytics_id < newer.category_analytics_id
+                """)
+                cursor.execute("""
+                    ALTER TABLE category_performance_analytics
+                    ADD UNIQUE KEY unique_analytics_category (analytics_id, category_id)
+                """)
+            
+            conn.commit()
+            cursor.close()
+            print("✅ Analytics columns initialized successfully")
+        except Exception as e:
+            print(f"Error initializing analytics columns: {e}")
+        finally:
+            conn.close()
+
 class FacultyAnalytics:
     """Faculty Performance Analytics Handler"""
     
@@ -27,26 +130,7 @@ class FacultyAnalytics:
                 params.append(subject_id)
             
             # Get evaluation statistics
-            cursor.execute(f"""
-                SELECT 
-                    COUNT(DISTINCT e.evaluation_id) as total_evaluations,
-                    COUNT(DISTINCT CASE WHEN e.status = 'Completed' THEN e.evaluation_id END) as completed_evaluations,
-                    COUNT(DISTINCT er.response_id) as total_responses,
-                    AVG(CASE WHEN er.rating IS NOT NULL THEN er.rating END) as average_rating,
-                    COUNT(DISTINCT c.comment_id) as total_comments,
-                    COUNT(DISTINCT CASE WHEN c.sentiment = 'Positive' THEN c.comment_id END) as positive_comments,
-                    COUNT(DISTINCT CASE WHEN c.sentiment = 'Negative' THEN c.comment_id END) as negative_comments,
-                    COUNT(DISTINCT CASE WHEN c.sentiment = 'Neutral' THEN c.comment_id END) as neutral_comments
-                FROM evaluations e
-                JOIN class_sections cs ON e.section_id = cs.section_id
-                LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                LEFT JOIN comments c ON e.evaluation_id = c.evaluation_id
-                WHERE cs.faculty_id = %s 
-                AND e.period_id = %s
-                {subject_condition}
-            """, params)
-            
-            stats = cursor.fetchone()
+            stats = FacultyAnalytics.evaluation_stats(cursor, faculty_id, period_id, subject_id)
             
             # Calculate response rate
             total_evaluations = stats['total_evaluations'] or 0
@@ -120,6 +204,76 @@ class FacultyAnalytics:
                 conn.close()
             return {}
     
+    @staticmethod
+    def evaluation_stats(cursor, faculty_id: int, period_id: int, subject_id: Optional[int] = None) -> Dict:
+        """
+        Evaluation, response and comment counts of a faculty member in a period
+        
+        Evaluations, responses and comments are each aggregated in their own
+        single-row subquery. Joining responses and comments onto evaluations
+        directly would multiply every response by every comment of the same
+        evaluation, which COUNT(DISTINCT ...) hides but AVG(rating) does not.
+        
+        Args:
+            cursor: Dictionary cursor
+            faculty_id: Faculty member
+            period_id: Evaluation period
+            subject_id: Only this subject's evaluations
+            
+        Returns:
+            dict: total_evaluations, completed_evaluations, total_responses,
+                  average_rating, total_comments and positive/negative/neutral_comments
+        """
+        subject_condition = "AND cs.subject_id = %s" if subject_id else ""
+        scope_params = [faculty_id, period_id]
+        if subject_id:
+            scope_params.append(subject_id)
+        scope = f"""
+                JOIN class_sections cs ON e.section_id = cs.section_id
+                WHERE cs.faculty_id = %s
+                AND e.period_id = %s
+                {subject_condition}
+        """
+        
+        cursor.execute(f"""
+            SELECT 
+                ev.total_evaluations,
+                ev.completed_evaluations,
+                r.total_responses,
+                r.average_rating,
+                cm.total_comments,
+                cm.positive_comments,
+                cm.negative_comments,
+                cm.neutral_comments
+            FROM (
+                SELECT 
+                    COUNT(*) as total_evaluations,
+                    SUM(e.status = 'Completed') as completed_evaluations
+                FROM evaluations e
+                {scope}
+            ) ev
+            CROSS JOIN (
+                SELECT 
+                    COUNT(*) as total_responses,
+                    AVG(er.rating) as average_rating
+                FROM evaluation_responses er
+                JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                {scope}
+            ) r
+            CROSS JOIN (
+                SELECT 
+                    COUNT(*) as total_comments,
+                    SUM(c.sentiment = 'Positive') as positive_comments,
+                    SUM(c.sentiment = 'Negative') as negative_comments,
+                    SUM(c.sentiment = 'Neutral') as neutral_comments
+                FROM comments c
+                JOIN evaluations e ON c.evaluation_id = e.evaluation_id
+                {scope}
+            ) cm
+        """, scope_params * 3)
+        
+        return cursor.fetchone()
+    
     @staticmethod
     def _calculate_performance_grade(average_rating: float) -> str:
         """Calculate performance grade based on average rating"""
@@ -193,34 +347,63 @@ class FacultyAnalytics:
     
     @staticmethod
     def _extract_themes(comments: List[str]) -> List[str]:
-        """Extract common themes from comments (simplified keyword-based approach)"""
+        """Extract common themes from comments (single-pass keyword matcher, see utils/theme_matcher.py)"""
         if not comments:
             return []
         
-        # Keywords for different aspects
-        theme_keywords = {
-            'Clear Explanation': ['clear', 'explain', 'understand', 'clarity'],
-            'Engaging Teaching': ['engaging', 'interesting', 'interactive', 'participation'],
-            'Well Prepared': ['prepared', 'organized', 'structure', 'plan'],
-            'Helpful': ['helpful', 'support', 'assistance', 'available'],
-            'Knowledgeable': ['knowledge', 'expert', 'experienced', 'skilled'],
-            'Patient': ['patient', 'understanding', 'calm', 'kind'],
-            'Communication': ['communication', 'speak', 'voice', 'presentation'],
-            'Time Management': ['time', 'punctual', 'schedule', 'manage'],
-            'Assessment': ['exam', 'test', 'grade', 'feedback', 'evaluation'],
-            'Technology Use': ['technology', 'online', 'digital', 'computer']
-        }
-        
-        theme_scores = {}
-        text = ' '.join(comments).lower()
+        matcher = get_theme_matcher()
+        return matcher.rank(matcher.count_all(comments))
+    
+    @staticmethod
+    def period_comment_themes(period_id: int) -> Dict[str, Dict[Tuple[int, Optional[int]], Counter]]:
+        """
+        Count comment themes for every faculty member of a period in one pass
         
-        for theme, keywords in theme_keywords.items():
-            score = sum(text.count(keyword) for keyword in keywords)
-            if score > 0:
-                theme_scores[theme] = score
+        Each Positive/Negative comment of the period is matched once and its
+        theme counts are added to its faculty member, both overall and for
+        the subject it was given in.
         
-        # Return top themes sorted by frequency
-        return sorted(theme_scores.keys(), key=lambda x: theme_scores[x], reverse=True)
+        Args:
+            period_id: Evaluation period
+            
+        Returns:
+            dict: 'strengths' (Positive comments) and 'improvements' (Negative
+                  comments), each mapping (faculty_id, None) and
+                  (faculty_id, subject_id) to a Counter of theme matches
+        """
+        themes = {'strengths': {}, 'improvements': {}}
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor(dictionary=True)
+            
+            cursor.execute("""
+                SELECT cs.faculty_id, cs.subject_id, c.sentiment, c.comment_text
+                FROM comments c
+                JOIN evaluations e ON c.evaluation_id = e.evaluation_id
+                JOIN class_sections cs ON e.section_id = cs.section_id
+                WHERE e.period_id = %s
+                AND c.sentiment IN ('Positive', 'Negative')
+            """, (period_id,))
+            
+            def groups(row):
+                kind = 'strengths' if row['sentiment'] == 'Positive' else 'improvements'
+                return ((kind, row['faculty_id'], None), (kind, row['faculty_id'], row['subject_id']))
+            
+            grouped = get_theme_matcher().count_grouped(cursor, groups)
+            for (kind, faculty_id, subject_id), counts in grouped.items():
+                themes[kind][(faculty_id, subject_id)] = counts
+            
+            cursor.close()
+            conn.close()
+            return themes
+            
+        except Exception as e:
+            logger.error(f"Error counting period comment themes: {str(e)}")
+            if 'cursor' in locals():
+                cursor.close()
+            if 'conn' in locals():
+                conn.close()
+            return themes
     
     @staticmethod
     def save_analytics_to_db(analytics_data: Dict) -> bool:
@@ -238,6 +421,7 @@ class FacultyAnalytics:
                  negative_comments, neutral_comments, last_calculated)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
                 ON DUPLICATE KEY UPDATE
+                analytics_id = LAST_INSERT_ID(analytics_id),
                 total_evaluations = VALUES(total_evaluations),
                 completed_evaluations = VALUES(completed_evaluations),
                 response_rate = VALUES(response_rate),
@@ -269,6 +453,7 @@ class FacultyAnalytics:
                 analytics_data['neutral_comments']
             ))
             
+            # Set by LAST_INSERT_ID() on update too
             analytics_id = cursor.lastrowid
             
             # Save category performance data
@@ -443,57 +628,391 @@ class FacultyAnalytics:
             return {'trends': []}
 
 
+def _new_group() -> Dict:
+    return {
+        'total_evaluations': 0,
+        'completed_evaluations': 0,
+        'ratings': Counter(),
+        'categories': {},
+        'sentiments': Counter(),
+        'strengths': [],
+        'improvements': []
+    }
+
+
+def build_faculty_analytics(period_id: int, faculty: Dict, matcher=None) -> List[Dict]:
+    """
+    Build the overall and per-subject analytics of one faculty member from pre-aggregated rows
+    
+    Produces the same dicts as FacultyAnalytics.calculate_faculty_performance,
+    without touching the database: themes come from the THEME_COMMENT_LIMIT
+    longest comments of each sentiment, grades from unrounded averages, and
+    evaluations of sections without a subject only count towards the
+    overall row (the legacy path computed that subject's row as the overall
+    one).
+    
+    Args:
+        period_id: Evaluation period
+        faculty: faculty_id plus the faculty member's rows from the grouped
+            period queries: 'evaluations' (subject_id, total, completed),
+            'ratings' (subject_id, category_id, completed, rating, count),
+            'sentiments' (subject_id, sentiment, count) and
+            'comments' (subject_id, sentiment, comment_text)
+        matcher: ThemeMatcher (default: the configured one)
+        
+    Returns:
+        list: Analytics dicts, the overall one (subject_id None) first
+    """
+    matcher = matcher or get_theme_matcher()
+    faculty_id = faculty['faculty_id']
+    groups = {None: _new_group()}
+    
+    def targets(subject_id):
+        if subject_id is None:
+            return (groups[None],)
+        if subject_id not in groups:
+            groups[subject_id] = _new_group()
+        return (groups[None], groups[subject_id])
+    
+    for subject_id, total, completed in faculty['evaluations']:
+        for group in targets(subject_id):
+            group['total_evaluations'] += int(total or 0)
+            group['completed_evaluations'] += int(completed or 0)
+    
+    for subject_id, category_id, completed, rating, count in faculty['ratings']:
+        for group in targets(subject_id):
+            group['ratings'][rating] += count
+            # Category breakdowns only cover completed evaluations
+            if completed and category_id is not None:
+                group['categories'].setdefault(category_id, Counter())[rating] += count
+    
+    for subject_id, sentiment, count in faculty['sentiments']:
+        for group in targets(subject_id):
+            group['sentiments'][sentiment] += count
+    
+    for subject_id, sentiment, comment_text in faculty['comments']:
+        kind = 'strengths' if sentiment == 'Positive' else 'improvements'
+        for group in targets(subject_id):
+            group[kind].append(comment_text or '')
+    
+    results = []
+    for subject_id, group in groups.items():
+        total_evaluations = group['total_evaluations']
+        completed_evaluations = group['completed_evaluations']
+        response_rate = (completed_evaluations / total_evaluations * 100) if total_evaluations > 0 else 0
+        
+        rated = sum(group['ratings'].values())
+        average_rating = (sum(rating * count for rating, count in group['ratings'].items()) / rated) if rated else 0.0
+        
+        category_performance = []
+        for category_id, ratings in group['categories'].items():
+            total_responses = sum(ratings.values())
+            average_score = sum(rating * count for rating, count in ratings.items()) / total_responses
+            category_performance.append({
+                'category_id': category_id,
+                'average_score': average_score,
+                'total_responses': total_responses,
+                'score_distribution': json.dumps({str(rating): ratings.get(rating, 0) for rating in range(1, 6)})
+            })
+        
+        themes = {
+            kind: matcher.rank(matcher.count_all(heapq.nlargest(THEME_COMMENT_LIMIT, group[kind], key=len)))
+            for kind in ('strengths', 'improvements')
+        }
+        sentiments = group['sentiments']
+        results.append({
+            'faculty_id': faculty_id,
+            'period_id': period_id,
+            'subject_id': subject_id,
+            'total_evaluations': total_evaluations,
+            'completed_evaluations': completed_evaluations,
+            'response_rate': round(response_rate, 2),
+            'average_rating': round(average_rating, 2),
+            'overall_score': round(average_rating * 20, 2),
+            'performance_grade': FacultyAnalytics._calculate_performance_grade(average_rating),
+            'strengths_summary': '; '.join(themes['strengths'][:3]),
+            'improvement_areas': '; '.join(themes['improvements'][:3]),
+            'total_comments': sum(sentiments.values()),
+            'positive_comments': sentiments.get('Positive', 0),
+            'negative_comments': sentiments.get('Negative', 0),
+            'neutral_comments': sentiments.get('Neutral', 0),
+            'category_performance': category_performance
+        })
+    
+    return results
+
+
+def _build_analytics_chunk(period_id: int, chunk: List[Dict], theme_path: Optional[str]) -> List[Dict]:
+    """Worker process entry point: build_faculty_analytics over a chunk of faculty members"""
+    matcher = get_theme_matcher(theme_path)
+    results = []
+    for faculty in chunk:
+        results.extend(build_faculty_analytics(period_id, faculty, matcher))
+    return results
+
+
+def _setting(name: str, default):
+    """Read a setting from the Flask config when running inside the app"""
+    try:
+        from flask import current_app, has_app_context
+        if has_app_context():
+            return current_app.config.get(name, default)
+    except ImportError:
+        pass
+    return default
+
+
 class AnalyticsScheduler:
     """Handle scheduled analytics calculations"""
     
     @staticmethod
-    def calculate_all_faculty_analytics(period_id: int) -> bool:
-        """Calculate analytics for all faculty in a given period"""
+    def load_period_rows(period_id: int) -> Dict[int, Dict]:
+        """
+        Load everything the period's analytics are built from in four grouped queries
+        
+        Args:
+            period_id: Evaluation period
+            
+        Returns:
+            dict: faculty_id -> input of build_faculty_analytics()
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor(dictionary=True)
+            faculty = {}
+            
+            def rows_of(faculty_id):
+                if faculty_id not in faculty:
+                    faculty[faculty_id] = {
+                        'faculty_id': faculty_id,
+                        'evaluations': [],
+                        'ratings': [],
+                        'sentiments': [],
+                        'comments': []
+                    }
+                return faculty[faculty_id]
             
-            # Get all faculty who have evaluations in this period
             cursor.execute("""
-                SELECT DISTINCT cs.faculty_id
-                FROM class_sections cs
-                JOIN evaluations e ON cs.section_id = e.section_id
+                SELECT cs.faculty_id, cs.subject_id,
+                       COUNT(*) as total_evaluations,
+                       SUM(e.status = 'Completed') as completed_evaluations
+                FROM evaluations e
+                JOIN class_sections cs ON e.section_id = cs.section_id
                 WHERE e.period_id = %s
+                GROUP BY cs.faculty_id, cs.subject_id
             """, (period_id,))
+            for faculty_id, subject_id, total, completed in cursor.fetchall():
+                rows_of(faculty_id)['evaluations'].append((subject_id, total, completed))
             
-            faculty_list = cursor.fetchall()
-            
-            success_count = 0
-            for faculty in faculty_list:
-                faculty_id = faculty['faculty_id']
-                
-                # Calculate overall analytics
-                analytics = FacultyAnalytics.calculate_faculty_performance(faculty_id, period_id)
-                if analytics and FacultyAnalytics.save_analytics_to_db(analytics):
-                    success_count += 1
-                
-                # Calculate subject-specific analytics
-                cursor.execute("""
-                    SELECT DISTINCT cs.subject_id
-                    FROM class_sections cs
-                    JOIN evaluations e ON cs.section_id = e.section_id
-                    WHERE cs.faculty_id = %s AND e.period_id = %s
-                """, (faculty_id, period_id))
-                
-                subjects = cursor.fetchall()
-                for subject in subjects:
-                    subject_analytics = FacultyAnalytics.calculate_faculty_performance(
-                        faculty_id, period_id, subject['subject_id']
-                    )
-                    if subject_analytics:
-                        FacultyAnalytics.save_analytics_to_db(subject_analytics)
+            # One row per rating value, so averages and 1-5 distributions are exact sums
+            cursor.execute("""
+                SELECT cs.faculty_id, cs.subject_id, ecr.category_id,
+                       e.status = 'Completed' as completed, er.rating, COUNT(*) as responses
+                FROM evaluation_responses er
+                JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                JOIN class_sections cs ON e.section_id = cs.section_id
+                LEFT JOIN evaluation_criteria ecr ON er.criteria_id = ecr.criteria_id
+                WHERE e.period_id = %s
+                AND er.rating IS NOT NULL
+                GROUP BY cs.faculty_id, cs.subject_id, ecr.category_id, completed, er.rating
+            """, (period_id,))
+            for faculty_id, subject_id, category_id, completed, rating, responses in cursor.fetchall():
+                rows_of(faculty_id)['ratings'].append((subject_id, category_id, completed, int(rating), responses))
+            
+            cursor.execute("""
+                SELECT cs.faculty_id, cs.subject_id, c.sentiment, COUNT(*) as comments
+                FROM comments c
+                JOIN evaluations e ON c.evaluation_id = e.evaluation_id
+                JOIN class_sections cs ON e.section_id = cs.section_id
+                WHERE e.period_id = %s
+                GROUP BY cs.faculty_id, cs.subject_id, c.sentiment
+            """, (period_id,))
+            for faculty_id, subject_id, sentiment, comments in cursor.fetchall():
+                rows_of(faculty_id)['sentiments'].append((subject_id, sentiment, comments))
+            
+            cursor.execute("""
+                SELECT cs.faculty_id, cs.subject_id, c.sentiment, c.comment_text
+                FROM comments c
+                JOIN evaluations e ON c.evaluation_id = e.evaluation_id
+                JOIN class_sections cs ON e.section_id = cs.section_id
+                WHERE e.period_id = %s
+                AND c.sentiment IN ('Positive', 'Negative')
+            """, (period_id,))
+            for faculty_id, subject_id, sentiment, comment_text in cursor:
+                rows_of(faculty_id)['comments'].append((subject_id, sentiment, comment_text))
             
+            return faculty
+        finally:
             cursor.close()
             conn.close()
+    
+    @staticmethod
+    def build_period_analytics(period_id: int, faculty: Dict[int, Dict], processes: int) -> List[Dict]:
+        """
+        Run build_faculty_analytics() for every faculty member, in worker processes for large periods
+        
+        Args:
+            period_id: Evaluation period
+            faculty: From load_period_rows()
+            processes: Worker processes (0 or 1 builds in this process)
+            
+        Returns:
+            list: Analytics dicts of every faculty member and subject
+        """
+        theme_path = themes_file()
+        processes = min(processes, os.cpu_count() or 1)
+        comment_count = sum(len(rows['comments']) for rows in faculty.values())
+        if processes <= 1 or len(faculty) < 2 or comment_count < PARALLEL_MIN_COMMENTS:
+            return _build_analytics_chunk(period_id, list(faculty.values()), theme_path)
+        
+        # Deal faculty members out by comment count so chunks take about as long
+        chunks = [[] for _ in range(min(processes * 4, len(faculty)))]
+        by_comments = sorted(faculty.values(), key=lambda rows: -len(rows['comments']))
+        for index, rows in enumerate(by_comments):
+            chunks[index % len(chunks)].append(rows)
+        
+        results = []
+        # Spawned (not forked) children: the parent is a threaded web process
+        context = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+            futures = [executor.submit(_build_analytics_chunk, period_id, chunk, theme_path) for chunk in chunks]
+            for future in futures:
+                results.extend(future.result())
+        return results
+    
+    @staticmethod
+    def save_period_analytics(period_id: int, results: List[Dict]) -> None:
+        """
+        Bulk-upsert faculty_performance_analytics and category_performance_analytics in one transaction
+        
+        Args:
+            period_id: Evaluation period
+            results: From build_period_analytics()
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            rows = [(
+                analytics['faculty_id'],
+                analytics['period_id'],
+                analytics['subject_id'],
+                analytics['total_evaluations'],
+                analytics['completed_evaluations'],
+                analytics['response_rate'],
+                analytics['average_rating'],
+                analytics['overall_score'],
+                analytics['performance_grade'],
+                analytics['strengths_summary'],
+                analytics['improvement_areas'],
+                analytics['total_comments'],
+                analytics['positive_comments'],
+                analytics['negative_comments'],
+                analytics['neutral_comments']
+            ) for analytics in results]
+            for start in range(0, len(rows), SAVE_BATCH_SIZE):
+                # executemany sends each batch as one multi-row INSERT
+                cursor.executemany("""
+                    INSERT INTO faculty_performance_analytics 
+                    (faculty_id, period_id, subject_id, total_evaluations, completed_evaluations, 
+                     response_rate, average_rating, overall_score, performance_grade, 
+                     strengths_summary, improvement_areas, total_comments, positive_comments, 
+                     negative_comments, neutral_comments, last_calculated)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                    ON DUPLICATE KEY UPDATE
+                    total_evaluations = VALUES(total_evaluations),
+                    completed_evaluations = VALUES(completed_evaluations),
+                    response_rate = VALUES(response_rate),
+                    average_rating = VALUES(average_rating),
+                    overall_score = VALUES(overall_score),
+                    performance_grade = VALUES(performance_grade),
+                    strengths_summary = VALUES(strengths_summary),
+                    improvement_areas = VALUES(improvement_areas),
+                    total_comments = VALUES(total_comments),
+                    positive_comments = VALUES(positive_comments),
+                    negative_comments = VALUES(negative_comments),
+                    neutral_comments = VALUES(neutral_comments),
+                    last_calculated = NOW()
+                """, rows[start:start + SAVE_BATCH_SIZE])
+            
+            # Multi-row upserts don't report each row's id
+            cursor.execute("""
+                SELECT analytics_id, faculty_id, subject_id
+                FROM faculty_performance_analytics
+                WHERE period_id = %s
+            """, (period_id,))
+            analytics_ids = {(faculty_id, subject_id): analytics_id for analytics_id, faculty_id, subject_id in cursor.fetchall()}
+            
+            category_rows = []
+            for analytics in results:
+                analytics_id = analytics_ids.get((analytics['faculty_id'], analytics['subject_id']))
+                if analytics_id is None:
+                    continue
+                for category in analytics['category_performance']:
+                    category_rows.append((
+                        analytics_id,
+                        category['category_id'],
+                        category['average_score'],
+                        category['total_responses'],
+                        category['score_distribution'],
+                        FacultyAnalytics._calculate_performance_grade(category['average_score'])
+                    ))
+            for start in range(0, len(category_rows), SAVE_BATCH_SIZE):
+                cursor.executemany("""
+                    INSERT INTO category_performance_analytics 
+                    (analytics_id, category_id, average_score, total_responses, 
+                     score_distribution, performance_level)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE
+                    average_score = VALUES(average_score),
+                    total_responses = VALUES(total_responses),
+                    score_distribution = VALUES(score_distribution),
+                    performance_level = VALUES(performance_level)
+                """, category_rows[start:start + SAVE_BATCH_SIZE])
             
-            logger.info(f"Successfully calculated analytics for {success_count}/{len(faculty_list)} faculty members")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    @staticmethod
+    def calculate_all_faculty_analytics(period_id: int, processes: Optional[int] = None) -> bool:
+        """
+        Calculate analytics for all faculty in a given period
+        
+        Loads the period with a few grouped queries, builds every faculty
+        member's overall and per-subject analytics (in ANALYTICS_PROCESSES
+        worker processes when the period has many comments) and saves them
+        with bulk upserts. Each stage's duration is logged.
+        
+        Args:
+            period_id: Evaluation period
+            processes: Overrides ANALYTICS_PROCESSES
+            
+        Returns:
+            bool: True if every faculty member's analytics were saved
+        """
+        if processes is None:
+            processes = _setting('ANALYTICS_PROCESSES', DEFAULT_PROCESSES)
+        
+        try:
+            started = time.perf_counter()
+            faculty = AnalyticsScheduler.load_period_rows(period_id)
+            loaded = time.perf_counter()
+            logger.info(f"Analytics period {period_id}: loaded {len(faculty)} faculty members in {loaded - started:.2f}s")
+            
+            results = AnalyticsScheduler.build_period_analytics(period_id, faculty, processes)
+            built = time.perf_counter()
+            logger.info(f"Analytics period {period_id}: built {len(results)} analytics rows in {built - loaded:.2f}s")
+            
+            AnalyticsScheduler.save_period_analytics(period_id, results)
+            saved = time.perf_counter()
+            logger.info(f"Successfully calculated analytics for {len(faculty)} faculty members "
+                        f"(saved in {saved - built:.2f}s, {saved - started:.2f}s total)")
             return True
             
         except Exception as e:
             logger.error(f"Error in scheduled analytics calculation: {str(e)}")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,69 @@
+"""
+Cache version stamps for IntellEvalPro
+Shared counters that let every worker process tell whether its cached copy is stale
+
+Each cached resource has a row in cache_versions. Writers bump the row in
+the same transaction as the data they change; readers compare the stored
+version with the one their in-process copy was built from. Because the
+counter lives in the database, a change made through one worker is seen
+by all the others on their next read.
+"""
+from .database import get_db_connection
+
+
+def init_cache_versions_table():
+    """Initialize cache_versions table if it doesn't exist"""
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cache_versions (
+                    name VARCHAR(64) PRIMARY KEY,
+                    version BIGINT UNSIGNED NOT NULL DEFAULT 1,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                )
+            """)
+            conn.commit()
+            cursor.close()
+            print("✅ Cache versions table initialized successfully")
+        except Exception as e:
+            print(f"Error initializing cache versions table: {e}")
+        finally:
+            conn.close()
+
+
+class CacheVersion:
+    """Read and bump named version stamps"""
+
+    @staticmethod
+    def get(cursor, name):
+        """
+        Get the current version of a cached resource
+
+        Args:
+            cursor: Cursor to read with
+            name (str): Resource name
+
+        Returns:
+            int: Current version (0 if the resource was never bumped)
+        """
+        cursor.execute("SELECT version FROM cache_versions WHERE name = %s", (name,))
+        row = cursor.fetchone()
+        if not row:
+            return 0
+        return int(row['version'] if isinstance(row, dict) else row[0])
+
+    @staticmethod
+    def bump(cursor, name):
+        """
+        Mark a cached resource as changed (caller commits)
+
+        Args:
+            cursor: Cursor on the connection that owns the write transaction
+            name (str): Resource name
+        """
+        cursor.execute("""
+            INSERT INTO cache_versions (name, version) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1
+        """, (name,))
@@ -0,0 +1,288 @@
+"""
+Connection pool for IntellEvalPro
+Provides a process-wide, thread-safe pool of mysql-connector connections
+
+Connections handed out by the pool are wrapped in a PooledConnection proxy.
+Calling close() on the proxy returns the underlying connection to the pool
+instead of tearing down the TCP/auth session, so existing code that does
+``conn = get_db_connection() ... conn.close()`` keeps working unchanged.
+"""
+import os
+import threading
+import time
+import logging
+from collections import deque
+
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no connection becomes available within pool_timeout"""
+
+
+class PooledConnection:
+    """
+    Proxy around a raw mysql-connector connection checked out of a pool
+
+    Every attribute not defined here is delegated to the raw connection,
+    so cursors, commit(), rollback() etc. behave exactly as before.
+    """
+
+    def __init__(self, pool, record):
+        self._pool = pool
+        self._record = record
+        self._closed = False
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the proxy itself
+        if self._closed:
+            raise mysql.connector.errors.OperationalError(
+                'Connection has been returned to the pool'
+            )
+        return getattr(self._record.raw, name)
+
+    def is_connected(self):
+        """Report False once the proxy has been returned to the pool"""
+        if self._closed:
+            return False
+        return self._record.raw.is_connected()
+
+    def close(self):
+        """Return the connection to the pool (idempotent)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._pool._return(self._record)
+
+    def invalidate(self):
+        """Discard the underlying connection instead of reusing it"""
+        if self._closed:
+            return
+        self._closed = True
+        self._pool._return(self._record, discard=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class _ConnectionRecord:
+    """Bookkeeping for one raw connection owned by the pool"""
+
+    __slots__ = ('raw', 'created_at', 'last_used')
+
+    def __init__(self, raw):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    Thread-safe connection pool with overflow, pre-ping and recycling
+
+    Args:
+        connect_args (dict): Keyword arguments for mysql.connector.connect
+        pool_size (int): Number of idle connections kept open
+        max_overflow (int): Extra connections allowed beyond pool_size
+        pool_timeout (float): Seconds to wait for a free connection
+        pool_recycle (int): Reopen connections older than this (seconds, -1 disables)
+        pool_pre_ping (bool): Ping idle connections before handing them out
+    """
+
+    def __init__(self, connect_args, pool_size=10, max_overflow=20, pool_timeout=30,
+                 pool_recycle=3600, pool_pre_ping=True):
+        self.connect_args = dict(connect_args)
+        self.pool_size = max(0, int(pool_size))
+        self.max_overflow = max(0, int(max_overflow))
+        self.pool_timeout = float(pool_timeout)
+        self.pool_recycle = int(pool_recycle)
+        self.pool_pre_ping = bool(pool_pre_ping)
+        self.pid = os.getpid()
+
+        self._idle = deque()
+        self._open_count = 0
+        self._in_use = 0
+        self._cond = threading.Condition(threading.Lock())
+
+        # Metrics
+        self._checkouts = 0
+        self._connects = 0
+        self._recycled = 0
+        self._invalidated = 0
+        self._exhausted = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # ------------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------------
+    def connect(self):
+        """
+        Check a connection out of the pool
+
+        Returns:
+            PooledConnection: Proxy whose close() returns the connection
+
+        Raises:
+            PoolExhaustedError: If no connection frees up within pool_timeout
+            mysql.connector.Error: If a new connection cannot be opened
+        """
+        started = time.monotonic()
+        deadline = started + self.pool_timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    record = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._open_count < self.pool_size + self.max_overflow:
+                    # Reserve the slot now, open the socket outside the lock
+                    record = None
+                    self._open_count += 1
+                    self._in_use += 1
+                    break
+
+                if not waited:
+                    self._exhausted += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolExhaustedError(
+                        f'Connection pool exhausted ({self._open_count} open, '
+                        f'timeout {self.pool_timeout}s)'
+                    )
+                self._cond.wait(remaining)
+
+            wait = time.monotonic() - started
+            self._checkouts += 1
+            self._wait_total += wait
+            if wait > self._wait_max:
+                self._wait_max = wait
+
+        try:
+            if record is None:
+                record = self._open()
+            else:
+                record = self._validate(record)
+        except Exception:
+            with self._cond:
+                self._open_count -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        record.last_used = time.monotonic()
+        return PooledConnection(self, record)
+
+    def _open(self):
+        """Open a brand-new raw connection"""
+        raw = mysql.connector.connect(**self.connect_args)
+        with self._cond:
+            self._connects += 1
+        return _ConnectionRecord(raw)
+
+    def _validate(self, record):
+        """Recycle or ping an idle connection before reuse"""
+        now = time.monotonic()
+        if self.pool_recycle >= 0 and now - record.created_at > self.pool_recycle:
+            self._close_raw(record.raw)
+            with self._cond:
+                self._recycled += 1
+            return self._open()
+
+        if self.pool_pre_ping:
+            try:
+                record.raw.ping(reconnect=False)
+            except Exception:
+                self._close_raw(record.raw)
+                with self._cond:
+                    self._invalidated += 1
+                return self._open()
+        return record
+
+    def _return(self, record, discard=False):
+        """Reset a connection and put it back on the idle stack"""
+        raw = record.raw
+        if not discard:
+            try:
+                # Drop any open transaction so the next borrower starts clean
+                # and does not see a stale REPEATABLE READ snapshot
+                if raw.unread_result:
+                    raw.consume_results()
+                if raw.in_transaction:
+                    raw.rollback()
+            except Exception as e:
+                logger.debug(f'Discarding pooled connection on reset failure: {e}')
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self.pid != os.getpid() or len(self._idle) >= self.pool_size:
+                self._open_count -= 1
+                if discard:
+                    self._invalidated += 1
+                close_it = True
+            else:
+                record.last_used = time.monotonic()
+                self._idle.append(record)
+                close_it = False
+            self._cond.notify()
+
+        if close_it:
+            self._close_raw(raw)
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Maintenance / metrics
+    # ------------------------------------------------------------------
+    def dispose(self):
+        """Close every idle connection (checked-out ones close on return)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open_count -= len(idle)
+        for record in idle:
+            self._close_raw(record.raw)
+
+    def stats(self):
+        """
+        Snapshot of pool metrics
+
+        Returns:
+            dict: Sizes, checkout counts, wait times and exhaustion counters
+        """
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'open': self._open_count,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'overflow': max(0, self._open_count - self.pool_size),
+                'checkouts': checkouts,
+                'connects': self._connects,
+                'recycled': self._recycled,
+                'invalidated': self._invalidated,
+                'exhausted': self._exhausted,
+                'timeouts': self._timeouts,
+                'avg_wait_ms': round(self._wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+                'max_wait_ms': round(self._wait_max * 1000, 3),
+            }
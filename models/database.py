@@ -2,11 +2,16 @@
 Database connection module for IntellEvalPro
 Provides SQLAlchemy database instance and legacy mysql-connector support
 """
+import os
+import threading
+from contextlib import contextmanager
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import text
 import mysql.connector
 from urllib.parse import urlparse
 from config import Config
+from .connection_pool import ConnectionPool
 
 # SQLAlchemy instance (to be initialized with app in app.py)
 db = SQLAlchemy()
@@ -20,38 +25,292 @@ def init_db(app):
         app: Flask application instance
     """
     db.init_app(app)
+    # Hand the request-scoped mysql-connector connection back to the pool
+    app.teardown_appcontext(close_request_connection)
     with app.app_context():
         # Create tables if they don't exist
         db.create_all()
         print("✅ SQLAlchemy database initialized")
 
 
+# Process-wide mysql-connector pool (created lazily, recreated after fork)
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_connect_args():
+    """
+    Build mysql.connector.connect() arguments from DATABASE_URL
+    
+    Returns:
+        dict: Connection parameters
+    """
+    parsed = urlparse(Config.SQLALCHEMY_DATABASE_URI)
+    return {
+        'host': parsed.hostname or 'localhost',
+        'user': parsed.username or 'root',
+        'password': parsed.password or '',
+        'database': parsed.path.lstrip('/') if parsed.path else 'IntellEvalPro_db',
+        'port': parsed.port or 3306
+    }
+
+
+def get_pool():
+    """
+    Get the process-wide connection pool, creating it on first use
+    
+    Returns:
+        ConnectionPool: Shared pool for this process
+    """
+    global _pool
+    pool = _pool
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            # After a fork the parent's sockets must not be shared; start fresh
+            _pool = ConnectionPool(_get_connect_args(), **Config.DB_POOL_OPTIONS)
+        return _pool
+
+
+def get_pool_stats():
+    """
+    Get connection pool metrics (checkout wait time, in-use, exhausted count)
+    
+    Returns:
+        dict: Pool statistics
+    """
+    return get_pool().stats()
+
+
+class RequestTransactionAborted(Exception):
+    """Raised by commit() after a shared request connection was rolled back"""
+
+
+class RequestConnection:
+    """
+    Request-scoped wrapper around a pooled connection
+    
+    Every get_db_connection() call made inside the same Flask app context
+    receives this same object. close() is a no-op; the underlying connection
+    is released by close_request_connection() at teardown. While a
+    request_transaction() block is active, commit() is deferred so the
+    whole block is written with a single COMMIT.
+    
+    Cursors are buffered by default, so one caller's half-read result never
+    blocks (or is drained by) another caller's query. rollback() always
+    rolls back. If other callers still hold the connection, their
+    uncommitted writes may have been discarded with it, so the request
+    transaction is marked aborted and every later commit() raises
+    RequestTransactionAborted instead of saving a partial set of writes.
+    """
+    
+    def __init__(self, conn):
+        self._conn = conn
+        self._defer_depth = 0
+        self._commit_pending = False
+        self._borrowers = 0
+        self._aborted = False
+        self._cursors = []
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def cursor(self, *args, **kwargs):
+        """Open a cursor (buffered unless prepared), closed at release if left open"""
+        if not kwargs.get('prepared'):
+            kwargs.setdefault('buffered', True)
+        cursor = self._conn.cursor(*args, **kwargs)
+        self._cursors.append(cursor)
+        return cursor
+    
+    def borrow(self):
+        """Register one more get_db_connection() caller"""
+        self._borrowers += 1
+        return self
+    
+    def close(self):
+        """End one caller's use; the connection is released at the end of the request"""
+        self._borrowers = max(self._borrowers - 1, 0)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+    
+    def commit(self):
+        """
+        Commit now, or at the end of the enclosing request_transaction()
+        
+        Raises:
+            RequestTransactionAborted: If a rollback may have discarded
+                another caller's writes earlier in this request
+        """
+        if self._aborted:
+            raise RequestTransactionAborted(
+                'Request transaction was rolled back while the connection was shared'
+            )
+        if self._defer_depth:
+            self._commit_pending = True
+        else:
+            self._conn.commit()
+    
+    def rollback(self):
+        """
+        Roll back everything not yet committed on this connection
+        
+        When other callers still hold the connection (or never released
+        it), the request transaction is marked aborted so their later
+        commits fail instead of saving what survived the rollback.
+        """
+        self._commit_pending = False
+        if self._borrowers > 1:
+            self._aborted = True
+        self._conn.rollback()
+    
+    def release(self, exc=None):
+        """Close leftover cursors and return the underlying connection to the pool"""
+        for cursor in self._cursors:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._cursors = []
+        try:
+            if exc is None and self._commit_pending and not self._aborted:
+                self._conn.commit()
+        except Exception as e:
+            print(f"Error committing request connection: {e}")
+        finally:
+            # Pooled close() rolls back anything left uncommitted
+            self._conn.close()
+
+
+def _checkout():
+    """Check a raw pooled connection out, or None if the database is unreachable"""
+    try:
+        return get_pool().connect()
+    except Exception as err:
+        print(f"Error connecting to MySQL: {err}")
+        return None
+
+
 def get_db_connection():
     """
-    Legacy function: Create and return a MySQL database connection using mysql-connector
+    Legacy function: Return a MySQL database connection using mysql-connector
     This is kept for backward compatibility with existing code.
     
+    Connections come from a shared pool. Inside a Flask app context the
+    same connection is reused by every caller (decorators, models, utils
+    and route handlers) and returned to the pool at teardown; calling
+    close() on it is harmless. Outside an app context a fresh pooled
+    connection is returned and close() hands it back to the pool.
+    
     Returns:
         mysql.connector.connection: Database connection object or None if failed
     """
+    if not has_app_context():
+        return _checkout()
+    
+    conn = g.get('_db_conn')
+    if conn is None:
+        raw = _checkout()
+        if raw is None:
+            return None
+        conn = g._db_conn = RequestConnection(raw)
+    return conn.borrow()
+
+
+def close_request_connection(exc=None):
+    """
+    Teardown handler: release the request-scoped connection
+    
+    Args:
+        exc: Exception that ended the app context, if any
+    """
+    conn = g.pop('_db_conn', None)
+    if conn is not None:
+        conn.release(exc)
+
+
+@contextmanager
+def request_transaction():
+    """
+    Group several helpers' writes into one transaction with a single COMMIT
+    
+    Helpers called inside the block still call conn.commit() as usual; the
+    commits are deferred until the block exits cleanly, and everything is
+    rolled back if it raises.
+    
+    Usage:
+        with request_transaction():
+            User.update_last_login(user_id)
+            log_activity(...)
+    
+    Yields:
+        Connection shared by the block (None if the database is unreachable)
+    """
+    conn = get_db_connection()
+    if not isinstance(conn, RequestConnection):
+        # No app context (or no database): nothing to share, commit directly
+        try:
+            yield conn
+            if conn:
+                conn.commit()
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if conn:
+                conn.close()
+        return
+    
+    conn._defer_depth += 1
     try:
-        # Parse DATABASE_URL to extract connection parameters
-        db_url = Config.SQLALCHEMY_DATABASE_URI
-        parsed = urlparse(db_url)
-        
-        db_config = {
-            'host': parsed.hostname or 'localhost',
-            'user': parsed.username or 'root',
-            'password': parsed.password or '',
-            'database': parsed.path.lstrip('/') if parsed.path else 'IntellEvalPro_db',
-            'port': parsed.port or 3306
-        }
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn._defer_depth -= 1
+        conn.close()
+    if conn._defer_depth == 0 and conn._commit_pending:
+        if conn._aborted:
+            raise RequestTransactionAborted('Request transaction was rolled back inside the block')
+        conn._commit_pending = False
+        conn._conn.commit()
+
+
+@contextmanager
+def db_cursor(dictionary=False):
+    """
+    Cursor on the request-scoped connection, closed automatically
+    
+    Usage:
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute("SELECT ...")
+            rows = cursor.fetchall()
+    
+    Args:
+        dictionary (bool): Return rows as dictionaries
         
-        conn = mysql.connector.connect(**db_config)
-        return conn
-    except mysql.connector.Error as err:
-        print(f"Error connecting to MySQL: {err}")
-        return None
+    Yields:
+        Cursor object (None if the database is unreachable)
+    """
+    conn = get_db_connection()
+    if not conn:
+        yield None
+        return
+    cursor = conn.cursor(dictionary=dictionary)
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+        conn.close()
 
 
 def init_drafts_table():
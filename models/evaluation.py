@@ -3,6 +3,8 @@ Evaluation model for IntellEvalPro
 Handles evaluation-specific data and operations
 """
 from .database import get_db_connection
+from .faculty_scores import FacultyScores
+from utils.sentiment import classify_sentiment
 
 
 class Evaluation:
@@ -112,3 +114,137 @@ class Evaluation:
             return []
         finally:
             conn.close()
+    
+    @staticmethod
+    def record_submission(cursor, evaluation_id, responses, comment_text=None):
+        """
+        Write a completed evaluation in one batch (caller commits)
+        
+        The status UPDATE runs first and only matches evaluations that are
+        not yet Completed, so it row-locks the evaluation and turns a
+        concurrent double-submit into a no-op instead of a duplicate-key
+        error. All ratings go in as a single multi-row INSERT that is
+        idempotent against evaluation_criteria_UNIQUE, and are added to
+        faculty_score_aggregates in the same transaction, and an active
+        timer session is closed as 'completed'. The comment is labelled with
+        the offline sentiment scorer (utils/sentiment.py).
+        
+        Args:
+            cursor: Cursor on the connection that owns the transaction
+            evaluation_id (int): Evaluation being submitted
+            responses (list): Dicts with 'criteria_id' and 'rating'
+            comment_text (str, optional): Free-text comment
+            
+        Returns:
+            bool: True if written, False if the evaluation was already completed
+        """
+        cursor.execute("""
+            UPDATE evaluations 
+            SET status = 'Completed',
+                completion_time = NOW(),
+                updated_at = NOW()
+            WHERE evaluation_id = %s AND status <> 'Completed'
+        """, (evaluation_id,))
+        
+        if cursor.rowcount == 0:
+            return False
+        
+        if responses:
+            placeholders = ', '.join(['(%s, %s, %s)'] * len(responses))
+            params = []
+            for response in responses:
+                params.extend((evaluation_id, response['criteria_id'], response['rating']))
+            
+            cursor.execute(f"""
+                INSERT INTO evaluation_responses (evaluation_id, criteria_id, rating)
+                VALUES {placeholders}
+                ON DUPLICATE KEY UPDATE rating = VALUES(rating), updated_at = NOW()
+            """, params)
+        
+        # Keep the per-faculty running totals in the same transaction
+        FacultyScores.apply_evaluation(cursor, evaluation_id)
+        
+        # Delete any existing draft since evaluation is now completed
+        cursor.execute("DELETE FROM evaluation_drafts WHERE evaluation_id = %s", (evaluation_id,))
+        
+        # Close the timer session so the expiry sweep leaves it alone
+        cursor.execute("""
+            UPDATE evaluation_timer_sessions
+            SET status = 'completed', end_time = NOW()
+            WHERE evaluation_id = %s AND status = 'active'
+        """, (evaluation_id,))
+        
+        if comment_text:
+            cursor.execute("""
+                INSERT INTO comments (evaluation_id, comment_text, sentiment, created_at)
+                VALUES (%s, %s, %s, NOW())
+            """, (evaluation_id, comment_text, classify_sentiment(comment_text)))
+        
+        return True
+    
+    @staticmethod
+    def create_for_period(cursor, period_id, student_id=None):
+        """
+        Create missing Pending evaluations for every active enrollment (caller commits)
+        
+        Each student in an active section gets one evaluation per section
+        with an assigned faculty; evaluations that already exist are skipped,
+        so this is safe to run repeatedly.
+        
+        Args:
+            cursor: Cursor on the connection that owns the transaction
+            period_id (int): Evaluation period to populate
+            student_id (int, optional): Only create this student's evaluations
+            
+        Returns:
+            int: Number of evaluations created
+        """
+        query = """
+            INSERT INTO evaluations (period_id, section_id, student_id, status, created_at)
+            SELECT DISTINCT
+                %s as period_id,
+                cs.section_id,
+                ss.student_id,
+                'Pending' as status,
+                NOW() as created_at
+            FROM section_students ss
+            INNER JOIN class_sections cs ON (
+                ss.section_id = cs.section_id 
+                OR ss.section_id = cs.section_ref_id
+            )
+            WHERE ss.status = 'Active'
+            AND cs.faculty_id IS NOT NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM evaluations ev 
+                WHERE ev.period_id = %s 
+                AND ev.section_id = cs.section_id 
+                AND ev.student_id = ss.student_id
+            )
+        """
+        params = [period_id, period_id]
+        if student_id:
+            query += " AND ss.student_id = %s"
+            params.append(student_id)
+        cursor.execute(query, tuple(params))
+        return cursor.rowcount
+    
+    @staticmethod
+    def create_for_active_periods(cursor, student_id=None):
+        """
+        Create missing evaluations in every Active period (caller commits)
+        
+        Covers enrollments made after a period became Active, which the
+        Pending -> Active transition could not see.
+        
+        Args:
+            cursor: Cursor on the connection that owns the transaction
+            student_id (int, optional): Only create this student's evaluations
+            
+        Returns:
+            int: Number of evaluations created
+        """
+        cursor.execute("SELECT period_id FROM evaluation_periods WHERE status = 'Active'")
+        period_ids = [row['period_id'] if isinstance(row, dict) else row[0]
+                      for row in cursor.fetchall()]
+        return sum(Evaluation.create_for_period(cursor, period_id, student_id)
+                   for period_id in period_ids)
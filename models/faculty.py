@@ -4,6 +4,16 @@ Handles faculty-specific data and operations
 """
 from .database import get_db_connection
 
+# Sort keys accepted by the faculty list, mapped to ORDER BY expressions
+SORT_COLUMNS = {
+    'name': 'f.last_name, f.first_name',
+    'faculty_number': 'f.faculty_number',
+    'department': 'p.name',
+    'rank': 'f.rank',
+    'status': 'f.status',
+    'created_at': 'f.created_at'
+}
+
 
 class Faculty:
     """Faculty model for managing faculty information"""
@@ -74,3 +84,191 @@ class Faculty:
             return []
         finally:
             conn.close()
+    
+    @staticmethod
+    def list_filters(args):
+        """
+        Read faculty list filters from request arguments
+        
+        Args:
+            args: Mapping such as request.args
+            
+        Returns:
+            dict: include_archived, search, program_id, status and rank
+            
+        Raises:
+            ValueError: If program_id is not a number
+        """
+        program_id = args.get('program_id')
+        return {
+            'include_archived': args.get('include_archived', 'false').lower() == 'true',
+            'search': (args.get('search') or '').strip() or None,
+            'program_id': int(program_id) if program_id else None,
+            'status': args.get('status') or None,
+            'rank': args.get('rank') or None
+        }
+    
+    @staticmethod
+    def _where(filters):
+        """
+        Build the WHERE clause of the faculty list (faculty aliased as f)
+        
+        Args:
+            filters (dict): From list_filters()
+            
+        Returns:
+            tuple: (sql, params)
+        """
+        conditions = []
+        params = []
+        
+        if not filters.get('include_archived'):
+            conditions.append("f.is_archived = FALSE")
+        if filters.get('program_id'):
+            conditions.append("f.program_id = %s")
+            params.append(filters['program_id'])
+        if filters.get('status'):
+            conditions.append("f.status = %s")
+            params.append(filters['status'])
+        if filters.get('rank'):
+            conditions.append("f.rank = %s")
+            params.append(filters['rank'])
+        if filters.get('search'):
+            conditions.append("""
+                (f.faculty_number LIKE %s
+                 OR f.last_name LIKE %s
+                 OR f.first_name LIKE %s
+                 OR CONCAT(f.first_name, ' ', f.last_name) LIKE %s
+                 OR f.email LIKE %s)
+            """)
+            pattern = f"%{filters['search']}%"
+            params.extend([pattern] * 5)
+        
+        if not conditions:
+            return "", params
+        return "WHERE " + " AND ".join(conditions), params
+    
+    @staticmethod
+    def find(cursor, filters, order_by=None, limit=None, offset=0):
+        """
+        Get faculty with program, workload and rating information
+        
+        Class, evaluation and rating figures are aggregated separately and
+        only for the returned faculty, so a page never joins more than its
+        own sections and responses.
+        
+        Args:
+            cursor: Dictionary cursor
+            filters (dict): From list_filters()
+            order_by (str, optional): ORDER BY expressions built from SORT_COLUMNS
+            limit (int, optional): Page size; all matching faculty if None
+            offset (int): Rows to skip
+            
+        Returns:
+            list: Faculty dictionaries with department_name, program_code,
+                  total_classes, workload_codes, total_evaluations and avg_rating
+        """
+        where, params = Faculty._where(filters)
+        order_by = order_by or SORT_COLUMNS['name']
+        query = f"""
+            SELECT f.*, 
+                   p.name as department_name,
+                   p.program_code
+            FROM faculty f
+            LEFT JOIN programs p ON f.program_id = p.program_id
+            {where}
+            ORDER BY {order_by}, f.faculty_id
+        """
+        if limit is not None:
+            query += " LIMIT %s OFFSET %s"
+            params = params + [limit, offset]
+        cursor.execute(query, tuple(params))
+        faculty_list = cursor.fetchall()
+        if not faculty_list:
+            return faculty_list
+        
+        # A full list aggregates everything; a page only its own faculty
+        faculty_filter = ""
+        faculty_ids = ()
+        if limit is not None:
+            faculty_ids = tuple(f['faculty_id'] for f in faculty_list)
+            faculty_filter = f"WHERE cs.faculty_id IN ({', '.join(['%s'] * len(faculty_ids))})"
+        
+        cursor.execute(f"""
+            SELECT cs.faculty_id,
+                   COUNT(*) as total_classes,
+                   GROUP_CONCAT(DISTINCT s.subject_code ORDER BY s.subject_code SEPARATOR ',') as workload_codes
+            FROM class_sections cs
+            LEFT JOIN subjects s ON cs.subject_id = s.subject_id
+            {faculty_filter}
+            GROUP BY cs.faculty_id
+        """, faculty_ids)
+        workloads = {row['faculty_id']: row for row in cursor.fetchall()}
+        
+        cursor.execute(f"""
+            SELECT cs.faculty_id,
+                   COUNT(DISTINCT e.evaluation_id) as total_evaluations,
+                   ROUND(AVG(er.rating), 2) as avg_rating
+            FROM class_sections cs
+            JOIN evaluations e ON cs.section_id = e.section_id AND e.status = 'Completed'
+            LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
+            {faculty_filter}
+            GROUP BY cs.faculty_id
+        """, faculty_ids)
+        ratings = {row['faculty_id']: row for row in cursor.fetchall()}
+        
+        for faculty in faculty_list:
+            workload = workloads.get(faculty['faculty_id'])
+            rating = ratings.get(faculty['faculty_id'])
+            faculty['total_classes'] = workload['total_classes'] if workload else 0
+            faculty['workload_codes'] = workload['workload_codes'] if workload else None
+            faculty['total_evaluations'] = rating['total_evaluations'] if rating else 0
+            faculty['avg_rating'] = rating['avg_rating'] if rating else None
+        return faculty_list
+    
+    @staticmethod
+    def count(cursor, filters):
+        """
+        Count faculty matching filters
+        
+        Args:
+            cursor: Dictionary cursor
+            filters (dict): From list_filters()
+            
+        Returns:
+            int: Number of matching faculty
+        """
+        where, params = Faculty._where(filters)
+        cursor.execute(f"SELECT COUNT(*) as total FROM faculty f {where}", tuple(params))
+        return cursor.fetchone()['total']
+    
+    @staticmethod
+    def stats(cursor):
+        """
+        Get the totals shown above the faculty list (non-archived faculty)
+        
+        Args:
+            cursor: Dictionary cursor
+            
+        Returns:
+            dict: total_faculty, total_classes, avg_rating and total_evaluations
+        """
+        cursor.execute("""
+            SELECT 
+                COUNT(DISTINCT f.faculty_id) as total_faculty,
+                COUNT(DISTINCT cs.section_id) as total_classes,
+                COUNT(DISTINCT e.evaluation_id) as total_evaluations,
+                ROUND(AVG(er.rating), 2) as avg_rating
+            FROM faculty f
+            LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
+            LEFT JOIN evaluations e ON cs.section_id = e.section_id AND e.status = 'Completed'
+            LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
+            WHERE f.is_archived = FALSE
+        """)
+        stats = cursor.fetchone()
+        return {
+            'total_faculty': stats['total_faculty'] or 0,
+            'total_classes': stats['total_classes'] or 0,
+            'avg_rating': float(stats['avg_rating']) if stats['avg_rating'] else 0,
+            'total_evaluations': stats['total_evaluations'] or 0
+        }
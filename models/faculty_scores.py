@@ -0,0 +1,389 @@
+"""
+Faculty score aggregates for IntellEvalPro
+Running per-(faculty, period, category) rating totals kept in step with submissions
+
+Rankings and dashboards used to re-aggregate every evaluation_responses
+row of a period on each request. faculty_score_aggregates keeps, for each
+faculty / period / category, the number of completed evaluations, the
+number of ratings, their sum and a 1-5 histogram:
+
+    average = rating_sum / response_count
+
+Rows are changed in the same transaction as the evaluation itself:
+    - Evaluation.record_submission() adds a newly completed evaluation
+    - reset / retake paths retract it before its responses are deleted
+
+Both also bump the faculty's results version in cache_versions (per
+period and overall), which keys cached exports of those results, and the
+period's results version, which keys the period's response matrix (see
+models/response_matrix.py).
+
+Anything that changes history outside those paths (reassigning a section
+to another faculty, moving criteria between categories, manual SQL) can
+be reconciled with the rebuild command:
+
+    python -m models.faculty_scores check [--period-id N]
+    python -m models.faculty_scores rebuild [--period-id N]
+"""
+from .cache_versions import CacheVersion
+from .database import get_db_connection
+
+RATING_COLUMNS = ('rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5')
+
+# Signed delta for one evaluation; %(sign)s is 1 to add and -1 to retract.
+# Only Completed evaluations are ever counted, so the status check makes
+# retracting a Pending/Expired evaluation a no-op.
+_EVALUATION_DELTA_SQL = """
+    INSERT INTO faculty_score_aggregates
+        (faculty_id, period_id, category_id, evaluation_count, response_count, rating_sum,
+         rating_1, rating_2, rating_3, rating_4, rating_5)
+    SELECT cs.faculty_id, e.period_id, ec.category_id,
+           %(sign)s,
+           %(sign)s * COUNT(*),
+           %(sign)s * SUM(er.rating),
+           %(sign)s * SUM(er.rating = 1),
+           %(sign)s * SUM(er.rating = 2),
+           %(sign)s * SUM(er.rating = 3),
+           %(sign)s * SUM(er.rating = 4),
+           %(sign)s * SUM(er.rating = 5)
+    FROM evaluations e
+    JOIN class_sections cs ON e.section_id = cs.section_id
+    JOIN evaluation_responses er ON er.evaluation_id = e.evaluation_id
+    JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
+    WHERE e.evaluation_id = %(evaluation_id)s
+    AND e.status = 'Completed'
+    GROUP BY cs.faculty_id, e.period_id, ec.category_id
+    ON DUPLICATE KEY UPDATE
+        evaluation_count = evaluation_count + VALUES(evaluation_count),
+        response_count = response_count + VALUES(response_count),
+        rating_sum = rating_sum + VALUES(rating_sum),
+        rating_1 = rating_1 + VALUES(rating_1),
+        rating_2 = rating_2 + VALUES(rating_2),
+        rating_3 = rating_3 + VALUES(rating_3),
+        rating_4 = rating_4 + VALUES(rating_4),
+        rating_5 = rating_5 + VALUES(rating_5)
+"""
+
+# Full aggregation from the source tables (rebuild and consistency check)
+_AGGREGATE_SELECT_SQL = """
+    SELECT cs.faculty_id, e.period_id, ec.category_id,
+           COUNT(DISTINCT e.evaluation_id) AS evaluation_count,
+           COUNT(*) AS response_count,
+           SUM(er.rating) AS rating_sum,
+           SUM(er.rating = 1) AS rating_1,
+           SUM(er.rating = 2) AS rating_2,
+           SUM(er.rating = 3) AS rating_3,
+           SUM(er.rating = 4) AS rating_4,
+           SUM(er.rating = 5) AS rating_5
+    FROM evaluations e
+    JOIN class_sections cs ON e.section_id = cs.section_id
+    JOIN evaluation_responses er ON er.evaluation_id = e.evaluation_id
+    JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
+    WHERE e.status = 'Completed'
+    {period_filter}
+    GROUP BY cs.faculty_id, e.period_id, ec.category_id
+"""
+
+# Completed evaluations per faculty in a period (%s). evaluation_count is
+# per category, so it cannot give a faculty's total: an evaluation that
+# skips a category is missing from that category's count. Join this instead.
+FACULTY_EVALUATIONS_SQL = """
+    SELECT cs.faculty_id, COUNT(DISTINCT e.evaluation_id) AS evaluations
+    FROM evaluations e
+    JOIN class_sections cs ON e.section_id = cs.section_id
+    WHERE e.period_id = %s AND e.status = 'Completed'
+    GROUP BY cs.faculty_id
+"""
+
+# Bumps 'faculty_results:<faculty>', 'faculty_results:<faculty>:<period>' and
+# 'period_results:<period>' for a Completed evaluation (no-op otherwise, like
+# the delta above)
+_RESULTS_VERSION_SQL = """
+    INSERT INTO cache_versions (name, version)
+    SELECT names.name, 1
+    FROM (
+        SELECT CONCAT('faculty_results:', cs.faculty_id) AS name
+        FROM evaluations e
+        JOIN class_sections cs ON e.section_id = cs.section_id
+        WHERE e.evaluation_id = %(evaluation_id)s AND e.status = 'Completed'
+        UNION ALL
+        SELECT CONCAT('faculty_results:', cs.faculty_id, ':', e.period_id)
+        FROM evaluations e
+        JOIN class_sections cs ON e.section_id = cs.section_id
+        WHERE e.evaluation_id = %(evaluation_id)s AND e.status = 'Completed'
+        UNION ALL
+        SELECT CONCAT('period_results:', e.period_id)
+        FROM evaluations e
+        WHERE e.evaluation_id = %(evaluation_id)s AND e.status = 'Completed'
+    ) AS names
+    ON DUPLICATE KEY UPDATE version = version + 1
+"""
+
+_COMPARED_COLUMNS = ('evaluation_count', 'response_count', 'rating_sum') + RATING_COLUMNS
+
+
+def init_faculty_scores_table(backfill=True):
+    """
+    Initialize faculty_score_aggregates table if it doesn't exist
+    
+    Args:
+        backfill (bool): Rebuild from existing responses when the table is empty
+    """
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS faculty_score_aggregates (
+                    faculty_id INT NOT NULL,
+                    period_id INT NOT NULL,
+                    category_id INT NOT NULL,
+                    evaluation_count INT NOT NULL DEFAULT 0,
+                    response_count INT NOT NULL DEFAULT 0,
+                    rating_sum INT NOT NULL DEFAULT 0,
+                    rating_1 INT NOT NULL DEFAULT 0,
+                    rating_2 INT NOT NULL DEFAULT 0,
+                    rating_3 INT NOT NULL DEFAULT 0,
+                    rating_4 INT NOT NULL DEFAULT 0,
+                    rating_5 INT NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    PRIMARY KEY (faculty_id, period_id, category_id),
+                    INDEX idx_faculty_scores_period (period_id, category_id)
+                )
+            """)
+            conn.commit()
+
+            cursor.execute("SELECT 1 FROM faculty_score_aggregates LIMIT 1")
+            is_empty = cursor.fetchone() is None
+            cursor.close()
+
+            print("✅ Faculty score aggregates table initialized successfully")
+            if backfill and is_empty:
+                FacultyScores.rebuild()
+        except Exception as e:
+            print(f"Error initializing faculty score aggregates table: {e}")
+        finally:
+            conn.close()
+
+
+class FacultyScores:
+    """Maintenance of the faculty_score_aggregates table"""
+
+    @staticmethod
+    def apply_evaluation(cursor, evaluation_id):
+        """
+        Add a just-completed evaluation to the aggregates (caller commits)
+
+        Args:
+            cursor: Cursor on the connection that owns the transaction
+            evaluation_id (int): Evaluation whose responses were just written
+        """
+        cursor.execute(_EVALUATION_DELTA_SQL, {'sign': 1, 'evaluation_id': evaluation_id})
+        cursor.execute(_RESULTS_VERSION_SQL, {'evaluation_id': evaluation_id})
+
+    @staticmethod
+    def retract_evaluation(cursor, evaluation_id):
+        """
+        Remove a completed evaluation from the aggregates (caller commits)
+
+        Must run before the evaluation's responses are deleted or its status
+        changes. Evaluations that are not Completed were never counted, so
+        this is a no-op for them.
+
+        Args:
+            cursor: Cursor on the connection that owns the transaction
+            evaluation_id (int): Evaluation about to be reset
+        """
+        cursor.execute(_EVALUATION_DELTA_SQL, {'sign': -1, 'evaluation_id': evaluation_id})
+        cursor.execute(_RESULTS_VERSION_SQL, {'evaluation_id': evaluation_id})
+
+    @staticmethod
+    def results_version(cursor, faculty_id, period_id=None):
+        """
+        Get the version of a faculty's evaluation results
+
+        Changes whenever one of the faculty's evaluations is completed or
+        retracted, so it can key caches of anything derived from them.
+
+        Args:
+            cursor: Cursor to read with
+            faculty_id (int): Faculty ID
+            period_id (int, optional): Only this period's results
+
+        Returns:
+            int: Current version (0 if nothing was ever recorded)
+        """
+        name = f"faculty_results:{faculty_id}"
+        if period_id:
+            name += f":{period_id}"
+        return CacheVersion.get(cursor, name)
+
+    @staticmethod
+    def period_version(cursor, period_id):
+        """
+        Get the version of a period's evaluation results
+
+        Changes whenever any evaluation of the period is completed or
+        retracted.
+
+        Args:
+            cursor: Cursor to read with
+            period_id (int): Evaluation period
+
+        Returns:
+            int: Current version (0 if nothing was ever recorded)
+        """
+        return CacheVersion.get(cursor, f"period_results:{period_id}")
+
+    @staticmethod
+    def drop_category(cursor, category_id):
+        """
+        Remove all aggregates of a category whose responses are being deleted
+
+        Args:
+            cursor: Cursor on the connection that owns the transaction
+            category_id (int): Category being deleted
+        """
+        cursor.execute("DELETE FROM faculty_score_aggregates WHERE category_id = %s", (category_id,))
+
+    @staticmethod
+    def rebuild(period_id=None):
+        """
+        Recompute aggregates from evaluation_responses
+
+        Args:
+            period_id (int, optional): Limit the rebuild to one period
+
+        Returns:
+            int: Number of aggregate rows written, or None on failure
+        """
+        conn = get_db_connection()
+        if not conn:
+            return None
+
+        try:
+            cursor = conn.cursor()
+            if period_id:
+                cursor.execute("DELETE FROM faculty_score_aggregates WHERE period_id = %s", (period_id,))
+                select_sql = _AGGREGATE_SELECT_SQL.format(period_filter="AND e.period_id = %s")
+                params = (period_id,)
+            else:
+                cursor.execute("DELETE FROM faculty_score_aggregates")
+                select_sql = _AGGREGATE_SELECT_SQL.format(period_filter="")
+                params = ()
+
+            cursor.execute(f"""
+                INSERT INTO faculty_score_aggregates
+                    (faculty_id, period_id, category_id, evaluation_count, response_count, rating_sum,
+                     rating_1, rating_2, rating_3, rating_4, rating_5)
+                {select_sql}
+            """, params)
+            rows = cursor.rowcount
+            conn.commit()
+            cursor.close()
+
+            scope = f"period {period_id}" if period_id else "all periods"
+            print(f"✅ Rebuilt faculty score aggregates for {scope} ({rows} rows)")
+            return rows
+        except Exception as e:
+            print(f"Error rebuilding faculty score aggregates: {e}")
+            conn.rollback()
+            return None
+        finally:
+            conn.close()
+
+    @staticmethod
+    def check(period_id=None):
+        """
+        Compare stored aggregates against a fresh aggregation
+
+        Args:
+            period_id (int, optional): Limit the check to one period
+
+        Returns:
+            list: Mismatches as dicts with the key and stored/expected rows
+                  (empty when consistent), or None on failure
+        """
+        conn = get_db_connection()
+        if not conn:
+            return None
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            columns = ', '.join(_COMPARED_COLUMNS)
+            if period_id:
+                cursor.execute(
+                    _AGGREGATE_SELECT_SQL.format(period_filter="AND e.period_id = %s"), (period_id,)
+                )
+                expected_rows = cursor.fetchall()
+                cursor.execute(f"""
+                    SELECT faculty_id, period_id, category_id, {columns}
+                    FROM faculty_score_aggregates
+                    WHERE period_id = %s
+                """, (period_id,))
+            else:
+                cursor.execute(_AGGREGATE_SELECT_SQL.format(period_filter=""))
+                expected_rows = cursor.fetchall()
+                cursor.execute(f"""
+                    SELECT faculty_id, period_id, category_id, {columns}
+                    FROM faculty_score_aggregates
+                """)
+            stored_rows = cursor.fetchall()
+            cursor.close()
+
+            def keyed(rows):
+                return {
+                    (row['faculty_id'], row['period_id'], row['category_id']):
+                        tuple(int(row[column] or 0) for column in _COMPARED_COLUMNS)
+                    for row in rows
+                }
+
+            expected = keyed(expected_rows)
+            # All-zero rows are left behind by retractions and count as absent
+            stored = {key: values for key, values in keyed(stored_rows).items() if any(values)}
+
+            mismatches = []
+            for key in sorted(set(expected) | set(stored)):
+                if expected.get(key) != stored.get(key):
+                    mismatches.append({
+                        'faculty_id': key[0],
+                        'period_id': key[1],
+                        'category_id': key[2],
+                        'stored': dict(zip(_COMPARED_COLUMNS, stored[key])) if key in stored else None,
+                        'expected': dict(zip(_COMPARED_COLUMNS, expected[key])) if key in expected else None
+                    })
+            return mismatches
+        except Exception as e:
+            print(f"Error checking faculty score aggregates: {e}")
+            return None
+        finally:
+            conn.close()
+
+
+def main():
+    """Command line entry point for backfill and consistency checks"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Faculty score aggregates maintenance')
+    parser.add_argument('command', choices=['rebuild', 'check'])
+    parser.add_argument('--period-id', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        init_faculty_scores_table(backfill=False)
+        rows = FacultyScores.rebuild(args.period_id)
+        raise SystemExit(0 if rows is not None else 1)
+
+    mismatches = FacultyScores.check(args.period_id)
+    if mismatches is None:
+        raise SystemExit(1)
+    for mismatch in mismatches:
+        print(f"❌ faculty {mismatch['faculty_id']} period {mismatch['period_id']} "
+              f"category {mismatch['category_id']}: stored={mismatch['stored']} "
+              f"expected={mismatch['expected']}")
+    print(f"{len(mismatches)} mismatched aggregate row(s)")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
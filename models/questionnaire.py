@@ -0,0 +1,138 @@
+"""
+Evaluation questionnaire for IntellEvalPro
+Active categories and their criteria, grouped the way the evaluation form shows them
+
+Every student opening a form needs the same questionnaire, and it only
+changes when guidance edits categories or criteria. The grouped result is
+kept per process and reused for as long as the 'questionnaire' version in
+cache_versions is unchanged; every endpoint that writes evaluation_categories
+or evaluation_criteria bumps that version via Questionnaire.invalidate().
+"""
+from .cache_versions import CacheVersion
+from .database import get_db_connection
+
+CACHE_NAME = 'questionnaire'
+
+# (version, questionnaire) of this process; replaced as a whole so readers
+# never see a version paired with another version's data
+_cached = (None, None)
+
+
+class Questionnaire:
+    """Cached access to the evaluation questionnaire"""
+
+    @staticmethod
+    def invalidate(cursor):
+        """
+        Mark the questionnaire as changed (caller commits)
+
+        Args:
+            cursor: Cursor on the connection that changed categories or criteria
+        """
+        CacheVersion.bump(cursor, CACHE_NAME)
+
+    @staticmethod
+    def version(cursor):
+        """
+        Get the current questionnaire version (for keying derived caches)
+
+        Args:
+            cursor: Cursor to read with
+
+        Returns:
+            int: Version stamp
+        """
+        return CacheVersion.get(cursor, CACHE_NAME)
+
+    @staticmethod
+    def load(cursor):
+        """
+        Query and group all non-archived categories with their criteria
+
+        Args:
+            cursor: Dictionary cursor
+
+        Returns:
+            dict: 'categories' (each with its ordered 'criteria') and 'total_questions'
+        """
+        cursor.execute("""
+            SELECT
+                c.category_id,
+                c.name as category_name,
+                c.description as category_description,
+                c.weight,
+                cr.criteria_id,
+                cr.description as criteria_description,
+                cr.`order`
+            FROM evaluation_categories c
+            LEFT JOIN evaluation_criteria cr ON c.category_id = cr.category_id
+            WHERE c.is_archived = FALSE
+            ORDER BY c.category_id, cr.`order`, cr.criteria_id
+        """)
+        rows = cursor.fetchall()
+
+        # Group criteria by category
+        categories = {}
+        for row in rows:
+            category_id = row['category_id']
+
+            if category_id not in categories:
+                categories[category_id] = {
+                    'category_id': category_id,
+                    'category_name': row['category_name'],
+                    'category_description': row['category_description'],
+                    'weight': float(row['weight']) if row['weight'] else 1.0,
+                    'criteria': []
+                }
+
+            # Add criteria if exists (skip if no criteria for category)
+            if row['criteria_id']:
+                categories[category_id]['criteria'].append({
+                    'criteria_id': row['criteria_id'],
+                    'description': row['criteria_description'],
+                    'order': row['order']
+                })
+
+        categories_list = list(categories.values())
+        return {
+            'categories': categories_list,
+            'total_questions': sum(len(cat['criteria']) for cat in categories_list)
+        }
+
+    @staticmethod
+    def get():
+        """
+        Get the grouped questionnaire, rebuilding it only when its version changed
+
+        Returns:
+            tuple: (version, questionnaire). version is None when it could not
+                   be read, in which case the questionnaire is loaded fresh and
+                   not cached. The returned dict is shared and must not be modified.
+        """
+        global _cached
+
+        conn = get_db_connection()
+        if not conn:
+            raise RuntimeError("Database connection failed")
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                version = CacheVersion.get(cursor, CACHE_NAME)
+            except Exception as e:
+                print(f"Error reading questionnaire version: {e}")
+                version = None
+
+            cached_version, cached_questionnaire = _cached
+            if version is not None and cached_version == version:
+                cursor.close()
+                return version, cached_questionnaire
+
+            questionnaire = Questionnaire.load(cursor)
+            cursor.close()
+
+            if version is not None:
+                _cached = (version, questionnaire)
+            return version, questionnaire
+        finally:
+            conn.close()
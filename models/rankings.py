@@ -0,0 +1,138 @@
+"""
+Faculty ranking engine for IntellEvalPro
+Computes overall and per-category averages for every faculty in one grouped pass
+
+The set of category columns follows the active (non-archived) rows of
+evaluation_categories, so adding or archiving a category changes the
+rankings without touching any SQL. Scores come from the running totals in
+faculty_score_aggregates (see models/faculty_scores.py); evaluation
+totals are counted from evaluations, as the aggregates are per category.
+"""
+from .database import get_db_connection
+from .faculty_scores import FACULTY_EVALUATIONS_SQL
+
+
+class FacultyRankings:
+    """Faculty rankings shared by the rankings API and its PDF/Excel exports"""
+
+    @staticmethod
+    def get_active_categories(cursor):
+        """
+        Get the categories that become ranking columns
+
+        Args:
+            cursor: Dictionary cursor
+
+        Returns:
+            list: Dicts with category_id and name, in display order
+        """
+        cursor.execute("""
+            SELECT category_id, name
+            FROM evaluation_categories
+            WHERE is_archived = 0
+            ORDER BY display_order, category_id
+        """)
+        return cursor.fetchall()
+
+    @staticmethod
+    def compute(period_id, academic_year_id=None, department_id=None):
+        """
+        Rank faculty for a period
+
+        One conditional-aggregation column is generated per active category,
+        all computed in a single GROUP BY over the period's aggregate rows.
+
+        Args:
+            period_id (int): Evaluation period
+            academic_year_id (int, optional): Only rank if the period belongs to this year
+            department_id (int, optional): Limit to one program
+
+        Returns:
+            dict: 'categories' (column definitions) and 'rankings' (rows sorted
+                  best first, each with a 'category_scores' dict keyed by
+                  category_id), or None on failure
+        """
+        conn = get_db_connection()
+        if not conn:
+            return None
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            categories = FacultyRankings.get_active_categories(cursor)
+
+            category_columns = []
+            params = []
+            for category in categories:
+                category_columns.append(f"""
+                    ROUND(SUM(CASE WHEN fsa.category_id = %s THEN fsa.rating_sum END)
+                          / SUM(CASE WHEN fsa.category_id = %s THEN fsa.response_count END), 2)
+                        AS category_{int(category['category_id'])}""")
+                params.extend([category['category_id'], category['category_id']])
+
+            query = f"""
+                SELECT
+                    f.faculty_id,
+                    f.first_name,
+                    f.last_name,
+                    f.program_id,
+                    p.name AS department_name,
+                    COALESCE(MAX(fe.evaluations), 0) AS total_evaluations,
+                    ROUND(SUM(fsa.rating_sum) / SUM(fsa.response_count), 2) AS average_rating
+                    {''.join(',' + column for column in category_columns)}
+                FROM faculty_score_aggregates fsa
+                JOIN faculty f ON fsa.faculty_id = f.faculty_id
+                JOIN evaluation_periods ep ON fsa.period_id = ep.period_id
+                JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
+                LEFT JOIN programs p ON f.program_id = p.program_id
+                LEFT JOIN ({FACULTY_EVALUATIONS_SQL}) fe ON fe.faculty_id = f.faculty_id
+                WHERE fsa.period_id = %s
+                    AND f.is_archived = 0
+            """
+            params.extend([period_id, period_id])
+
+            if academic_year_id:
+                query += " AND at.acad_year_id = %s"
+                params.append(academic_year_id)
+
+            if department_id:
+                query += " AND f.program_id = %s"
+                params.append(department_id)
+
+            query += """
+                GROUP BY f.faculty_id, f.first_name, f.last_name, f.program_id, p.name
+                HAVING SUM(fsa.response_count) > 0
+                ORDER BY average_rating DESC, total_evaluations DESC
+            """
+
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            cursor.close()
+
+            rankings = []
+            for row in rows:
+                rankings.append({
+                    'faculty_id': row['faculty_id'],
+                    'first_name': row['first_name'],
+                    'last_name': row['last_name'],
+                    'program_id': row['program_id'],
+                    'department_name': row['department_name'],
+                    'total_evaluations': row['total_evaluations'],
+                    'average_rating': float(row['average_rating']) if row['average_rating'] else 0.0,
+                    'category_scores': {
+                        category['category_id']: float(row[f"category_{int(category['category_id'])}"] or 0)
+                        for category in categories
+                    }
+                })
+
+            return {
+                'categories': [
+                    {'category_id': category['category_id'], 'name': category['name']}
+                    for category in categories
+                ],
+                'rankings': rankings
+            }
+        except Exception as e:
+            print(f"Error computing faculty rankings: {e}")
+            return None
+        finally:
+            conn.close()
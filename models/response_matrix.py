@@ -0,0 +1,354 @@
+"""
+Per-period response matrix for IntellEvalPro
+A period's ratings loaded once into compact NumPy arrays and aggregated with vectorized group-bys
+
+Analytics endpoints each re-ran their own GROUP BY over evaluation_responses
+for averages, 1-5 distributions and category breakdowns. ResponseMatrix
+loads every rating of a period's completed evaluations once, as parallel
+arrays of small integer codes (evaluation, faculty, section, subject,
+criteria, category) plus an int8 rating, so a million ratings take about
+ten megabytes. Any of those columns can then be grouped on with a single
+np.bincount, which also makes standard deviations, quartiles and
+per-criterion histograms cheap - statistics that are awkward in MySQL.
+
+Because ratings are whole numbers from 1 to 5, every statistic is derived
+from a per-group histogram: quartiles are exact (they match np.percentile)
+without sorting anything.
+
+Matrices are kept per process for the CACHE_PERIODS most recently used
+periods. Each is stamped with the period's results version (bumped by
+FacultyScores whenever an evaluation is completed or retracted), the
+questionnaire version, and the period's evaluation counts; a matrix is
+reloaded as soon as any of them changes.
+
+NumPy is optional. Without it ResponseMatrix.for_period() returns None and
+endpoints keep using their SQL aggregates.
+"""
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .database import get_db_connection
+from .faculty_scores import FacultyScores
+from .questionnaire import Questionnaire
+
+CACHE_PERIODS = 8
+
+RESPONSE_KEYS = ('evaluation', 'faculty', 'section', 'subject', 'criteria', 'category')
+EVALUATION_KEYS = ('faculty', 'section', 'subject')
+
+# period_id -> ResponseMatrix, least recently used first
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _encode(values):
+    """Dense codes for a column of ids: (sorted unique ids, code of each value)"""
+    ids, codes = np.unique(np.asarray(values, dtype=np.int64), return_inverse=True)
+    return ids, codes.astype(np.min_scalar_type(max(len(ids) - 1, 0)))
+
+
+def _histogram_stats(histograms):
+    """
+    Count, mean, population std dev and quartiles of rows of 1-5 histograms
+
+    Args:
+        histograms: (groups, 5) array of rating counts
+
+    Returns:
+        dict: Arrays of one value per group
+    """
+    values = np.arange(1, 6, dtype=np.float64)
+    counts = histograms.sum(axis=1)
+    safe = np.maximum(counts, 1)
+    means = histograms @ values / safe
+    variances = np.maximum(histograms @ (values ** 2) / safe - means ** 2, 0.0)
+
+    # Linear interpolation between order statistics, like np.percentile
+    cumulative = np.cumsum(histograms, axis=1)
+    quartiles = {}
+    for name, fraction in (('p25', 0.25), ('median', 0.5), ('p75', 0.75)):
+        position = fraction * np.maximum(counts - 1, 0)
+        lower = np.floor(position)
+        low = 1 + (cumulative <= lower[:, None]).sum(axis=1)
+        high = 1 + (cumulative <= np.ceil(position)[:, None]).sum(axis=1)
+        quartiles[name] = np.where(counts > 0, low + (high - low) * (position - lower), 0.0)
+
+    return {'count': counts, 'mean': means, 'std_dev': np.sqrt(variances), **quartiles}
+
+
+class ResponseMatrix:
+    """A period's ratings as NumPy arrays, with vectorized statistics"""
+
+    def __init__(self, period_id, version, responses, evaluations, criteria):
+        """
+        Args:
+            period_id (int): Evaluation period
+            version (tuple): Cache stamp the data was loaded at
+            responses (list): (evaluation_id, faculty_id, section_id, subject_id,
+                criteria_id, category_id, rating) of every rating
+            evaluations (list): (evaluation_id, faculty_id, section_id, subject_id,
+                completed) of every evaluation of the period
+            criteria (dict): criteria_id -> dict with description, order,
+                category_id and category_name
+        """
+        self.period_id = period_id
+        self.version = version
+        self.criteria = criteria
+
+        columns = list(zip(*responses)) if responses else [()] * (len(RESPONSE_KEYS) + 1)
+        self.ids = {}
+        self.codes = {}
+        for key, column in zip(RESPONSE_KEYS, columns):
+            self.ids[key], self.codes[key] = _encode(column)
+        self.ratings = np.asarray(columns[-1], dtype=np.int8)
+
+        columns = list(zip(*evaluations)) if evaluations else [()] * (len(EVALUATION_KEYS) + 2)
+        self.evaluation_columns = {
+            key: np.asarray(column, dtype=np.int64) for key, column in zip(EVALUATION_KEYS, columns[1:-1])
+        }
+        self.evaluation_completed = np.asarray(columns[-1], dtype=bool)
+
+    def __len__(self):
+        return len(self.ratings)
+
+    @property
+    def nbytes(self):
+        """Memory held by the arrays"""
+        arrays = list(self.ids.values()) + list(self.codes.values()) + list(self.evaluation_columns.values())
+        return sum(array.nbytes for array in arrays) + self.ratings.nbytes + self.evaluation_completed.nbytes
+
+    def select(self, **filters):
+        """
+        Mask of the ratings matching some ids
+
+        Args:
+            **filters: Any of RESPONSE_KEYS set to an id or a list of ids
+                (None is ignored), e.g. select(faculty_id=3, subject_id=12)
+
+        Returns:
+            ndarray: Boolean mask over the ratings
+        """
+        mask = np.ones(len(self.ratings), dtype=bool)
+        for name, value in filters.items():
+            if value is None:
+                continue
+            key = name[:-3] if name.endswith('_id') else name
+            ids = self.ids[key]
+            if isinstance(value, (list, tuple, set)):
+                mask &= np.isin(ids, list(value))[self.codes[key]]
+                continue
+            code = np.searchsorted(ids, value)
+            if code >= len(ids) or ids[code] != value:
+                return np.zeros(len(self.ratings), dtype=bool)
+            mask &= self.codes[key] == code
+        return mask
+
+    def histograms(self, by, mask=None):
+        """
+        1-5 rating histogram of every group
+
+        Args:
+            by (str): One of RESPONSE_KEYS
+            mask (ndarray): From select(), to only count some ratings
+
+        Returns:
+            tuple: (ids, (groups, 5) array of counts), one row per id
+        """
+        codes, ratings = self.codes[by], self.ratings
+        if mask is not None:
+            codes, ratings = codes[mask], ratings[mask]
+        groups = len(self.ids[by])
+        flat = codes.astype(np.int64) * 5 + (ratings.astype(np.int64) - 1)
+        return self.ids[by], np.bincount(flat, minlength=groups * 5).reshape(groups, 5)
+
+    def group_stats(self, by, mask=None):
+        """
+        Statistics per group, for groups with at least one rating
+
+        Args:
+            by (str): One of RESPONSE_KEYS
+            mask (ndarray): From select()
+
+        Returns:
+            dict: id -> dict with count, mean, std_dev, p25, median, p75 and
+                  votes ('1'..'5' -> count)
+        """
+        ids, histograms = self.histograms(by, mask)
+        stats = _histogram_stats(histograms)
+        results = {}
+        for index in np.flatnonzero(stats['count']):
+            results[int(ids[index])] = {
+                'count': int(stats['count'][index]),
+                'mean': float(stats['mean'][index]),
+                'std_dev': float(stats['std_dev'][index]),
+                'p25': float(stats['p25'][index]),
+                'median': float(stats['median'][index]),
+                'p75': float(stats['p75'][index]),
+                'votes': {str(rating): int(histograms[index, rating - 1]) for rating in range(1, 6)}
+            }
+        return results
+
+    def summary(self, mask=None):
+        """
+        Statistics over all (or the selected) ratings
+
+        Args:
+            mask (ndarray): From select()
+
+        Returns:
+            dict: Same fields as a group_stats() entry (count 0 and mean 0.0 if nothing matched)
+        """
+        ratings = self.ratings if mask is None else self.ratings[mask]
+        histogram = np.bincount(ratings.astype(np.int64) - 1, minlength=5)[None, :]
+        stats = _histogram_stats(histogram)
+        summary = {name: float(values[0]) for name, values in stats.items()}
+        summary['count'] = int(summary['count'])
+        summary['votes'] = {str(rating): int(histogram[0, rating - 1]) for rating in range(1, 6)}
+        return summary
+
+    def evaluation_counts(self, **filters):
+        """
+        Assigned and completed evaluations matching some ids
+
+        Args:
+            **filters: Any of EVALUATION_KEYS set to an id or a list of ids
+                (None is ignored), e.g. evaluation_counts(faculty_id=3)
+
+        Returns:
+            dict: total, completed and response_rate (percent)
+        """
+        keep = np.ones(len(self.evaluation_completed), dtype=bool)
+        for name, value in filters.items():
+            if value is None:
+                continue
+            key = name[:-3] if name.endswith('_id') else name
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            keep &= np.isin(self.evaluation_columns[key], values)
+        total = int(keep.sum())
+        completed = int(self.evaluation_completed[keep].sum())
+        return {
+            'total': total,
+            'completed': completed,
+            'response_rate': round(completed / total * 100, 2) if total else 0.0
+        }
+
+    @staticmethod
+    def current_version(cursor, period_id):
+        """
+        Cache stamp of a period's ratings
+
+        Args:
+            cursor: Cursor to read with
+            period_id (int): Evaluation period
+
+        Returns:
+            tuple: (period results version, questionnaire version,
+                    evaluations, completed evaluations)
+        """
+        cursor.execute("""
+            SELECT COUNT(*), COALESCE(SUM(status = 'Completed'), 0)
+            FROM evaluations
+            WHERE period_id = %s
+        """, (period_id,))
+        row = cursor.fetchone()
+        counts = tuple(int(value) for value in (row.values() if isinstance(row, dict) else row))
+        return (FacultyScores.period_version(cursor, period_id), Questionnaire.version(cursor)) + counts
+
+    @staticmethod
+    def load(cursor, period_id, version):
+        """
+        Query a period's ratings, evaluations and criteria
+
+        Args:
+            cursor: Plain (tuple) cursor
+            period_id (int): Evaluation period
+            version (tuple): From current_version()
+
+        Returns:
+            ResponseMatrix: Loaded matrix
+        """
+        cursor.execute("""
+            SELECT er.evaluation_id, cs.faculty_id, cs.section_id, COALESCE(cs.subject_id, 0),
+                   er.criteria_id, ecr.category_id, er.rating
+            FROM evaluation_responses er
+            JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+            JOIN class_sections cs ON e.section_id = cs.section_id
+            JOIN evaluation_criteria ecr ON er.criteria_id = ecr.criteria_id
+            WHERE e.period_id = %s
+            AND e.status = 'Completed'
+            AND er.rating BETWEEN 1 AND 5
+        """, (period_id,))
+        responses = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT e.evaluation_id, cs.faculty_id, cs.section_id, COALESCE(cs.subject_id, 0),
+                   e.status = 'Completed'
+            FROM evaluations e
+            JOIN class_sections cs ON e.section_id = cs.section_id
+            WHERE e.period_id = %s
+        """, (period_id,))
+        evaluations = cursor.fetchall()
+
+        cursor.execute("""
+            SELECT ecr.criteria_id, ecr.description, ecr.`order`, ec.category_id, ec.name
+            FROM evaluation_criteria ecr
+            JOIN evaluation_categories ec ON ecr.category_id = ec.category_id
+        """)
+        criteria = {
+            criteria_id: {
+                'description': description,
+                'order': order,
+                'category_id': category_id,
+                'category_name': category_name
+            }
+            for criteria_id, description, order, category_id, category_name in cursor.fetchall()
+        }
+
+        return ResponseMatrix(period_id, version, responses, evaluations, criteria)
+
+    @staticmethod
+    def for_period(period_id):
+        """
+        Get the cached matrix of a period, reloading it if the period changed
+
+        Args:
+            period_id (int): Evaluation period
+
+        Returns:
+            ResponseMatrix: Up-to-date matrix, or None if NumPy is not
+                            installed or the database could not be read
+        """
+        if np is None or not period_id:
+            return None
+
+        conn = get_db_connection()
+        if not conn:
+            return None
+        try:
+            cursor = conn.cursor()
+            version = ResponseMatrix.current_version(cursor, period_id)
+            with _cache_lock:
+                matrix = _cache.get(period_id)
+                if matrix is not None and matrix.version == version:
+                    _cache.move_to_end(period_id)
+                    cursor.close()
+                    return matrix
+
+            matrix = ResponseMatrix.load(cursor, period_id, version)
+            cursor.close()
+            with _cache_lock:
+                _cache[period_id] = matrix
+                _cache.move_to_end(period_id)
+                while len(_cache) > CACHE_PERIODS:
+                    _cache.popitem(last=False)
+            return matrix
+        except Exception as e:
+            print(f"Error loading response matrix for period {period_id}: {e}")
+            return None
+        finally:
+            conn.close()
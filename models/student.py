@@ -4,6 +4,92 @@ Handles student-specific data and operations
 """
 from .database import get_db_connection
 
+# Sort keys accepted by the student list, mapped to ORDER BY expressions
+SORT_COLUMNS = {
+    'name': 's.std_Surname, s.std_Firstname',
+    'student_number': 's.std_Number',
+    'program': 'p.name',
+    'year_level': 's.std_Level',
+    'status': 's.std_Status',
+    'enrollment_date': 's.created_at'
+}
+
+# Columns of the admin student list
+_LIST_COLUMNS = """
+    s.id,
+    s.std_Number as student_number,
+    s.std_Firstname as first_name,
+    s.std_Surname as last_name,
+    s.std_Middlename as middle_name,
+    s.std_Birthdate as birthdate,
+    s.std_Age as age,
+    s.std_Address as address,
+    s.std_Gender as gender,
+    s.std_EmailAdd as email,
+    s.std_ContactNum as contact_number,
+    s.std_Course as program,
+    s.program_id,
+    s.std_Level as year_level,
+    s.std_Status as status,
+    s.is_archived,
+    s.created_at as enrollment_date,
+    u.username,
+    u.is_active as user_active,
+    sec.section_id as current_section_id,
+    sec.section_code as current_section_code,
+    sec.section_name as current_section_name
+"""
+
+
+def _column_exists(cursor, table_name, column_name):
+    """Check information_schema for a column"""
+    cursor.execute("""
+        SELECT COUNT(1)
+        FROM information_schema.columns
+        WHERE table_schema = DATABASE()
+        AND table_name = %s
+        AND column_name = %s
+    """, (table_name, column_name))
+    return cursor.fetchone()[0] > 0
+
+
+def init_student_program_column():
+    """
+    Add std_info.program_id (indexed) if it doesn't exist and backfill it
+    
+    std_Course holds the program name as text, and joining it to programs
+    needs a collation conversion no index can serve. program_id is kept
+    next to it by the student create/update endpoints. Existing rows are
+    matched to programs by name, falling back to the program description
+    or code.
+    """
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            if not _column_exists(cursor, 'std_info', 'program_id'):
+                cursor.execute("""
+                    ALTER TABLE std_info
+                    ADD COLUMN program_id INT NULL AFTER std_Course,
+                    ADD INDEX idx_std_program (program_id)
+                """)
+            
+            for program_column in ('name', 'description', 'program_code'):
+                cursor.execute(f"""
+                    UPDATE std_info s
+                    JOIN programs p
+                        ON s.std_Course COLLATE utf8mb4_unicode_ci = p.{program_column} COLLATE utf8mb4_unicode_ci
+                    SET s.program_id = p.program_id
+                    WHERE s.program_id IS NULL
+                """)
+            conn.commit()
+            cursor.close()
+            print("✅ Student program column initialized successfully")
+        except Exception as e:
+            print(f"Error initializing student program column: {e}")
+        finally:
+            conn.close()
+
 
 class Student:
     """Student model for managing student information"""
@@ -134,3 +220,290 @@ class Student:
             return 0
         finally:
             conn.close()
+    
+    @staticmethod
+    def list_filters(args):
+        """
+        Read student list filters from request arguments
+        
+        Args:
+            args: Mapping such as request.args
+            
+        Returns:
+            dict: include_archived, exclude_assigned, search, program_id,
+                  year_level, status, section_id and evaluation_status
+                  
+        Raises:
+            ValueError: If program_id or section_id is not a number
+        """
+        program_id = args.get('program_id')
+        section_id = args.get('section_id')
+        return {
+            'include_archived': args.get('include_archived', 'false').lower() == 'true',
+            'exclude_assigned': args.get('exclude_assigned', 'false').lower() == 'true',
+            'search': (args.get('search') or '').strip() or None,
+            'program_id': int(program_id) if program_id else None,
+            'year_level': args.get('year_level') or None,
+            'status': args.get('status') or None,
+            'section_id': int(section_id) if section_id else None,
+            'evaluation_status': args.get('evaluation_status') or None
+        }
+    
+    @staticmethod
+    def _where(filters):
+        """
+        Build the WHERE clause of the student list (std_info aliased as s)
+        
+        Args:
+            filters (dict): From list_filters()
+            
+        Returns:
+            tuple: (sql, params)
+        """
+        conditions = []
+        params = []
+        
+        if not filters.get('include_archived'):
+            conditions.append("s.is_archived = FALSE")
+        if filters.get('exclude_assigned'):
+            conditions.append("""
+                s.id NOT IN (
+                    SELECT student_id 
+                    FROM section_students 
+                    WHERE status = 'Active'
+                )
+            """)
+        if filters.get('section_id'):
+            conditions.append("""
+                EXISTS (
+                    SELECT 1 FROM section_students
+                    WHERE student_id = s.id AND section_id = %s AND status = 'Active'
+                )
+            """)
+            params.append(filters['section_id'])
+        if filters.get('program_id'):
+            conditions.append("s.program_id = %s")
+            params.append(filters['program_id'])
+        if filters.get('year_level'):
+            conditions.append("s.std_Level = %s")
+            params.append(filters['year_level'])
+        if filters.get('status'):
+            conditions.append("s.std_Status = %s")
+            params.append(filters['status'])
+        if filters.get('search'):
+            conditions.append("""
+                (s.std_Number LIKE %s
+                 OR s.std_Surname LIKE %s
+                 OR s.std_Firstname LIKE %s
+                 OR CONCAT(s.std_Firstname, ' ', s.std_Surname) LIKE %s
+                 OR s.std_EmailAdd LIKE %s)
+            """)
+            pattern = f"%{filters['search']}%"
+            params.extend([pattern] * 5)
+        
+        if not conditions:
+            return "", params
+        return "WHERE " + " AND ".join(conditions), params
+    
+    @staticmethod
+    def find(cursor, filters, order_by=None, limit=None, offset=0):
+        """
+        Get students with account, program and current section information
+        
+        Args:
+            cursor: Dictionary cursor
+            filters (dict): From list_filters()
+            order_by (str, optional): ORDER BY expressions built from SORT_COLUMNS
+            limit (int, optional): Page size; all matching students if None
+            offset (int): Rows to skip
+            
+        Returns:
+            list: Student dictionaries
+        """
+        where, params = Student._where(filters)
+        order_by = order_by or SORT_COLUMNS['name']
+        query = f"""
+            SELECT {_LIST_COLUMNS}
+            FROM std_info s
+            LEFT JOIN users u ON s.user_id = u.user_id
+            LEFT JOIN programs p ON s.program_id = p.program_id
+            LEFT JOIN section_students ss ON s.id = ss.student_id AND ss.status = 'Active'
+            LEFT JOIN sections sec ON ss.section_id = sec.section_id
+            {where}
+            ORDER BY {order_by}, s.id
+        """
+        if limit is not None:
+            query += " LIMIT %s OFFSET %s"
+            params = params + [limit, offset]
+        cursor.execute(query, tuple(params))
+        return cursor.fetchall()
+    
+    @staticmethod
+    def count(cursor, filters):
+        """
+        Count students matching filters
+        
+        Args:
+            cursor: Dictionary cursor
+            filters (dict): From list_filters()
+            
+        Returns:
+            int: Number of matching students
+        """
+        where, params = Student._where(filters)
+        cursor.execute(f"SELECT COUNT(*) as total FROM std_info s {where}", tuple(params))
+        return cursor.fetchone()['total']
+    
+    @staticmethod
+    def stats(cursor):
+        """
+        Get the totals shown above the student list (non-archived students)
+        
+        Args:
+            cursor: Dictionary cursor
+            
+        Returns:
+            dict: total_students, active_students, total_programs and
+                  students_with_accounts
+        """
+        cursor.execute("""
+            SELECT 
+                COUNT(*) as total_students,
+                COALESCE(SUM(s.std_Status = 'Enrolled'), 0) as active_students,
+                COUNT(DISTINCT s.std_Course) as total_programs,
+                COUNT(s.user_id) as students_with_accounts
+            FROM std_info s
+            WHERE s.is_archived = FALSE
+        """)
+        stats = cursor.fetchone()
+        return {
+            'total_students': stats['total_students'] or 0,
+            'active_students': int(stats['active_students'] or 0),
+            'total_programs': stats['total_programs'] or 0,
+            'students_with_accounts': stats['students_with_accounts'] or 0
+        }
+    
+    @staticmethod
+    def find_with_evaluation_status(cursor, filters, order_by=None, limit=None, offset=0, count=False):
+        """
+        Get students with their evaluation counts and overall evaluation status
+        
+        The status is 'No Evaluations', 'Completed' (all completed),
+        'In Progress' (any in progress) or 'Pending'. Without an
+        evaluation_status filter only the returned students' evaluations
+        are aggregated.
+        
+        Args:
+            cursor: Dictionary cursor
+            filters (dict): From list_filters()
+            order_by (str, optional): ORDER BY expressions built from SORT_COLUMNS
+            limit (int, optional): Page size; all matching students if None
+            offset (int): Rows to skip
+            count (bool): Also count all matching students when paging
+            
+        Returns:
+            tuple: (students, total); total is None when paging without count
+        """
+        where, params = Student._where(filters)
+        order_by = order_by or SORT_COLUMNS['name']
+        columns = """
+            s.id,
+            s.std_Number as student_number,
+            s.std_Firstname as first_name,
+            s.std_Surname as last_name,
+            s.std_EmailAdd as email,
+            s.std_Course as department,
+            s.program_id,
+            s.std_Status as enrollment_status,
+            s.created_at
+        """
+        status_case = """
+            CASE 
+                WHEN COALESCE(ev.total_evaluations, 0) = 0 THEN 'No Evaluations'
+                WHEN ev.completed_evaluations = ev.total_evaluations THEN 'Completed'
+                WHEN ev.in_progress_evaluations > 0 THEN 'In Progress'
+                ELSE 'Pending'
+            END
+        """
+        paging = ""
+        paging_params = []
+        if limit is not None:
+            paging = " LIMIT %s OFFSET %s"
+            paging_params = [limit, offset]
+        
+        if filters.get('evaluation_status'):
+            # Filtering on the derived status needs every student's counts
+            from_clause = f"""
+                FROM std_info s
+                LEFT JOIN programs p ON s.program_id = p.program_id
+                LEFT JOIN (
+                    SELECT student_id,
+                           COUNT(*) as total_evaluations,
+                           SUM(status = 'Completed') as completed_evaluations,
+                           SUM(status = 'In Progress') as in_progress_evaluations
+                    FROM evaluations
+                    GROUP BY student_id
+                ) ev ON ev.student_id = s.id
+                {where}
+                {"AND" if where else "WHERE"} {status_case} = %s
+            """
+            status_params = params + [filters['evaluation_status']]
+            cursor.execute(f"""
+                SELECT {columns},
+                       COALESCE(ev.total_evaluations, 0) as total_evaluations,
+                       COALESCE(ev.completed_evaluations, 0) as completed_evaluations,
+                       {status_case} as status
+                {from_clause}
+                ORDER BY {order_by}, s.id{paging}
+            """, tuple(status_params + paging_params))
+            students = cursor.fetchall()
+            
+            if limit is None:
+                return students, len(students)
+            if not count:
+                return students, None
+            cursor.execute(f"SELECT COUNT(*) as total {from_clause}", tuple(status_params))
+            return students, cursor.fetchone()['total']
+        
+        cursor.execute(f"""
+            SELECT {columns}
+            FROM std_info s
+            LEFT JOIN programs p ON s.program_id = p.program_id
+            {where}
+            ORDER BY {order_by}, s.id{paging}
+        """, tuple(params + paging_params))
+        students = cursor.fetchall()
+        
+        counts = {}
+        if students:
+            placeholders = ', '.join(['%s'] * len(students))
+            cursor.execute(f"""
+                SELECT student_id,
+                       COUNT(*) as total_evaluations,
+                       SUM(status = 'Completed') as completed_evaluations,
+                       SUM(status = 'In Progress') as in_progress_evaluations
+                FROM evaluations
+                WHERE student_id IN ({placeholders})
+                GROUP BY student_id
+            """, tuple(student['id'] for student in students))
+            counts = {row['student_id']: row for row in cursor.fetchall()}
+        
+        for student in students:
+            row = counts.get(student['id'])
+            total = row['total_evaluations'] if row else 0
+            completed = int(row['completed_evaluations'] or 0) if row else 0
+            in_progress = int(row['in_progress_evaluations'] or 0) if row else 0
+            student['total_evaluations'] = total
+            student['completed_evaluations'] = completed
+            if total == 0:
+                student['status'] = 'No Evaluations'
+            elif completed == total:
+                student['status'] = 'Completed'
+            elif in_progress > 0:
+                student['status'] = 'In Progress'
+            else:
+                student['status'] = 'Pending'
+        
+        if limit is None:
+            return students, len(students)
+        return students, Student.count(cursor, filters) if count else None
@@ -4,7 +4,7 @@ Handles all admin-related routes and functionality
 """
 from flask import Blueprint, render_template, session, redirect, url_for
 from utils import admin_required
-from models import Faculty, Student, get_db_connection
+from models import Faculty, Student, AcademicCalendar, get_db_connection
 from utils.json_encoder import jsonify
 
 # Create blueprint
@@ -103,36 +103,16 @@ def header():
     # Get current academic year and term from database
     current_term_display = 'No Active Term'
     try:
-        conn = get_db_connection()
-        if conn:
-            cursor = conn.cursor(dictionary=True)
-            
-            # Get current academic year
-            cursor.execute("""
-                SELECT acad_year_id, year_code, year_name
-                FROM academic_years
-                WHERE is_current = 1
-                LIMIT 1
-            """)
-            current_year = cursor.fetchone()
-            
-            if current_year:
-                # Get current semester/term for this year
-                cursor.execute("""
-                    SELECT term_name, term_code
-                    FROM academic_terms
-                    WHERE acad_year_id = %s AND is_current = 1
-                    LIMIT 1
-                """, (current_year['acad_year_id'],))
-                current_term = cursor.fetchone()
-                
-                if current_term:
-                    current_term_display = f"{current_year['year_code']} - {current_term['term_name']}"
-                else:
-                    current_term_display = current_year['year_code']
+        current_year = AcademicCalendar.current_year()
+        
+        if current_year:
+            # Get current semester/term for this year
+            current_term = AcademicCalendar.current_term()
             
-            cursor.close()
-            conn.close()
+            if current_term and current_term['acad_year_id'] == current_year['acad_year_id']:
+                current_term_display = f"{current_year['year_code']} - {current_term['term_name']}"
+            else:
+                current_term_display = current_year['year_code']
     except Exception as e:
         print(f"Error getting current term: {e}")
     
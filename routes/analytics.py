@@ -5,7 +5,10 @@ Handles faculty performance and response analytics endpoints
 from flask import Blueprint, render_template, request, session, redirect, url_for, make_response
 from utils import admin_required, guidance_required
 from models.analytics import FacultyAnalytics, AnalyticsScheduler
+from models.rankings import FacultyRankings
+from models.academic_calendar import AcademicCalendar
 from models.database import get_db_connection
+from models.faculty_scores import FACULTY_EVALUATIONS_SQL
 from utils.json_encoder import jsonify
 import logging
 
@@ -23,14 +26,7 @@ def faculty_performance():
         cursor = conn.cursor(dictionary=True)
         
         # Get current active period
-        cursor.execute("""
-            SELECT period_id, title, start_date, end_date 
-            FROM evaluation_periods 
-            WHERE status = 'Active' 
-            ORDER BY start_date DESC 
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
+        current_period = AcademicCalendar.active_period()
         
         # Get all periods for dropdown
         cursor.execute("""
@@ -165,14 +161,7 @@ def response_analytics():
         cursor = conn.cursor(dictionary=True)
         
         # Get current active period
-        cursor.execute("""
-            SELECT period_id, title, start_date, end_date 
-            FROM evaluation_periods 
-            WHERE status = 'Active' 
-            ORDER BY start_date DESC 
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
+        current_period = AcademicCalendar.active_period()
         
         # Get all periods for dropdown
         cursor.execute("""
@@ -234,14 +223,7 @@ def faculty_details(faculty_id):
         
         # Get current active period if none specified
         if not period_id:
-            cursor.execute("""
-                SELECT period_id 
-                FROM evaluation_periods 
-                WHERE status = 'Active' 
-                ORDER BY start_date DESC 
-                LIMIT 1
-            """)
-            period_result = cursor.fetchone()
+            period_result = AcademicCalendar.active_period()
             if period_result:
                 period_id = period_result['period_id']
         
@@ -495,14 +477,7 @@ def rankings():
         cursor = conn.cursor(dictionary=True)
         
         # Get current active period
-        cursor.execute("""
-            SELECT period_id, title, start_date, end_date 
-            FROM evaluation_periods 
-            WHERE status = 'Active' 
-            ORDER BY start_date DESC 
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
+        current_period = AcademicCalendar.active_period()
         
         # Get all periods for dropdown
         cursor.execute("""
@@ -586,9 +561,13 @@ def export_rankings():
         # Create CSV content
         csv_data = []
         if ranking_type == 'faculty':
-            csv_data.append('Rank,Faculty Name,Department,Overall Score,Teaching,Communication,Professionalism,Total Evaluations')
+            category_names = [category['name'] for category in data[0]['category_scores']] if data else []
+            csv_data.append(','.join(['Rank', 'Faculty Name', 'Department', 'Overall Score'] + category_names + ['Total Evaluations']))
             for i, faculty in enumerate(data, 1):
-                csv_data.append(f"{i},{faculty['name']},{faculty['department']},{faculty['overall_score']:.2f},{faculty['teaching_score']:.2f},{faculty['communication_score']:.2f},{faculty['professionalism_score']:.2f},{faculty['total_evaluations']}")
+                category_scores = ','.join(f"{category['score']:.2f}" for category in faculty['category_scores'])
+                csv_data.append(f"{i},{faculty['name']},{faculty['department']},{faculty['overall_score']:.2f},"
+                                + (f"{category_scores}," if category_scores else '')
+                                + f"{faculty['total_evaluations']}")
         else:
             csv_data.append('Rank,Department,Average Score,Total Faculty,Total Evaluations,Performance Level')
             for i, dept in enumerate(data, 1):
@@ -611,56 +590,34 @@ def export_rankings():
 
 def get_faculty_rankings(period_id):
     """Get faculty rankings with detailed metrics"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        query = """
-        SELECT 
-            f.faculty_id,
-            CONCAT(f.first_name, ' ', f.last_name) as name,
-            f.program_id,
-            p.name as department,
-            COUNT(DISTINCT e.evaluation_id) as total_evaluations,
-            AVG(er.rating) as overall_score,
-            AVG(er.rating) as teaching_score,
-            AVG(er.rating) as communication_score,
-            AVG(er.rating) as professionalism_score
-        FROM faculty f
-        LEFT JOIN programs p ON f.program_id = p.program_id
-        LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-        LEFT JOIN evaluations e ON cs.section_id = e.section_id 
-            AND e.period_id = %s
-            AND e.status = 'Completed'
-        LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-        GROUP BY f.faculty_id, f.first_name, f.last_name, f.program_id, p.name
-        HAVING total_evaluations > 0
-        ORDER BY overall_score DESC, total_evaluations DESC
-        """
-        
-        cursor.execute(query, (period_id,))
-        results = cursor.fetchall()
-        
-        # Add ranking and performance level
-        for i, faculty in enumerate(results):
-            faculty['rank'] = i + 1
-            faculty['medal_type'] = get_medal_type(i + 1)
-            faculty['performance_level'] = get_performance_level(faculty['overall_score'])
-            
-            # Round scores to 2 decimal places and convert to float
-            faculty['overall_score'] = round(float(faculty['overall_score']) if faculty['overall_score'] else 0, 2)
-            faculty['teaching_score'] = round(float(faculty['teaching_score']) if faculty['teaching_score'] else 0, 2)
-            faculty['communication_score'] = round(float(faculty['communication_score']) if faculty['communication_score'] else 0, 2)
-            faculty['professionalism_score'] = round(float(faculty['professionalism_score']) if faculty['professionalism_score'] else 0, 2)
-        
-        cursor.close()
-        conn.close()
-        
-        return results
-        
-    except Exception as e:
-        logger.error(f"Error getting faculty rankings: {str(e)}")
+    ranking = FacultyRankings.compute(period_id)
+    if ranking is None:
         return []
+    
+    results = []
+    for i, faculty in enumerate(ranking['rankings']):
+        results.append({
+            'faculty_id': faculty['faculty_id'],
+            'name': f"{faculty['first_name']} {faculty['last_name']}",
+            'program_id': faculty['program_id'],
+            'department': faculty['department_name'],
+            'total_evaluations': faculty['total_evaluations'],
+            'overall_score': round(faculty['average_rating'], 2),
+            # One entry per active evaluation category, in display order
+            'category_scores': [
+                {
+                    'category_id': category['category_id'],
+                    'name': category['name'],
+                    'score': round(faculty['category_scores'][category['category_id']], 2)
+                }
+                for category in ranking['categories']
+            ],
+            'rank': i + 1,
+            'medal_type': get_medal_type(i + 1),
+            'performance_level': get_performance_level(faculty['average_rating'])
+        })
+    
+    return results
 
 def get_department_rankings(period_id):
     """Get department rankings with aggregated metrics"""
@@ -668,25 +625,29 @@ def get_department_rankings(period_id):
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
-        query = """
+        query = f"""
         SELECT 
             p.name as department,
             COUNT(DISTINCT f.faculty_id) as total_faculty,
-            COUNT(DISTINCT e.evaluation_id) as total_evaluations,
-            AVG(er.rating) as average_score
+            COALESCE(SUM(fe.evaluations), 0) as total_evaluations,
+            SUM(fs.rating_sum) / SUM(fs.response_count) as average_score
         FROM programs p
         LEFT JOIN faculty f ON p.program_id = f.program_id
-        LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-        LEFT JOIN evaluations e ON cs.section_id = e.section_id 
-            AND e.period_id = %s
-            AND e.status = 'Completed'
-        LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
+        LEFT JOIN (
+            SELECT faculty_id,
+                   SUM(rating_sum) as rating_sum,
+                   SUM(response_count) as response_count
+            FROM faculty_score_aggregates
+            WHERE period_id = %s
+            GROUP BY faculty_id
+        ) fs ON f.faculty_id = fs.faculty_id
+        LEFT JOIN ({FACULTY_EVALUATIONS_SQL}) fe ON f.faculty_id = fe.faculty_id
         GROUP BY p.program_id, p.name
         HAVING total_evaluations > 0
         ORDER BY average_score DESC, total_evaluations DESC
         """
         
-        cursor.execute(query, (period_id,))
+        cursor.execute(query, (period_id, period_id))
         results = cursor.fetchall()
         
         # Add ranking and performance level
@@ -3,10 +3,26 @@ API routes blueprint for IntellEvalPro
 Handles all API endpoints that return JSON data
 """
 from flask import Blueprint, request, session, current_app
-from models import Faculty, Student, Evaluation, get_db_connection
+from models import (
+    Faculty, Student, Evaluation, FacultyScores, FacultyRankings, Questionnaire, AcademicCalendar,
+    ActivityLog, ResponseMatrix, get_db_connection
+)
+from models.activity_log import DEFAULT_PAGE_SIZE
+from models.student import SORT_COLUMNS as STUDENT_SORT_COLUMNS
+from models.faculty import SORT_COLUMNS as FACULTY_SORT_COLUMNS
 from utils.json_encoder import jsonify
 from utils import login_required
-from datetime import datetime
+from utils.period_scheduler import apply_period_transitions
+from utils.expired_evaluations import set_timer_deadline
+from utils.pagination import is_paginated, parse_page_args, page_info
+from utils.report_artifacts import (
+    queue_report_render, remove_unreferenced_artifact, ensure_report_renderer
+)
+from utils.report_renderers import EXTENSIONS as REPORT_EXTENSIONS
+from utils.export_cache import export_cache_key, cached_export, export_temp_path, store_export
+from utils.evaluation_reports import group_faculty_results, render_evaluation_pdf, render_evaluation_excel
+from utils.ai_client import get_ai_client, AIUnavailableError, start_insight_job, get_insight_job
+from datetime import datetime, timedelta
 
 # Create blueprint
 api_bp = Blueprint('api', __name__, url_prefix='/api')
@@ -93,6 +109,44 @@ def refresh_session():
         }), 500
 
 
+@api_bp.route('/admin/db-pool-stats')
+@login_required
+def db_pool_stats():
+    """Get database connection pool metrics (admin only)"""
+    from models.database import get_pool_stats
+
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
+    try:
+        return jsonify({'success': True, 'pool': get_pool_stats()})
+    except Exception as e:
+        print(f"Error getting pool stats: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@api_bp.route('/admin/ai-insight-cache-stats')
+@login_required
+def ai_insight_cache_stats():
+    """Get AI analytics insight cache hit/miss counters of this worker (admin only)"""
+    from utils.ai_insight_cache import insight_cache
+
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
+    return jsonify({'success': True, 'cache': insight_cache.stats()})
+
+
+@api_bp.route('/admin/ai-client-stats')
+@login_required
+def ai_client_stats():
+    """Get AI client pool, circuit breaker and call counters of this worker (admin only)"""
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
+    return jsonify({'success': True, 'client': get_ai_client().stats()})
+
+
 @api_bp.route('/evaluation/start', methods=['POST'])
 @login_required
 def start_evaluation_timer():
@@ -196,10 +250,12 @@ def start_evaluation_timer():
             })
         
         if existing_session:
-            # Check if session has expired
+            # Check if session has expired (against its stored deadline)
             start_time = existing_session['start_time']
-            elapsed = (datetime.now() - start_time).total_seconds()
-            remaining = (time_limit * 60) - elapsed
+            expires_at = existing_session.get('expires_at') or (
+                start_time + timedelta(minutes=existing_session['time_limit_minutes'])
+            )
+            remaining = (expires_at - datetime.now()).total_seconds()
             
             if remaining <= 0:
                 # Session expired
@@ -223,14 +279,15 @@ def start_evaluation_timer():
                 'remaining_seconds': int(remaining)
             })
         
-        # Create new timer session
+        # Create new timer session with its deadline
         cursor.execute("""
             INSERT INTO evaluation_timer_sessions
-            (evaluation_id, user_id, start_time, time_limit_minutes)
-            VALUES (%s, %s, NOW(), %s)
-        """, (evaluation_id, user_id, time_limit))
+            (evaluation_id, user_id, start_time, time_limit_minutes, expires_at)
+            VALUES (%s, %s, NOW(), %s, NOW() + INTERVAL %s MINUTE)
+        """, (evaluation_id, user_id, time_limit, time_limit))
         
         session_id = cursor.lastrowid
+        set_timer_deadline(cursor, session_id)
         conn.commit()
         
         # Get the start time
@@ -299,12 +356,15 @@ def check_evaluation_time(session_id):
                 'error': 'Session not found'
             }), 404
         
-        # Calculate remaining time
+        # Calculate remaining time from the stored deadline
         start_time = timer_session['start_time']
-        time_limit = timer_session['time_limit_minutes']
+        expires_at = timer_session.get('expires_at') or (
+            start_time + timedelta(minutes=timer_session['time_limit_minutes'])
+        )
         
-        elapsed = (datetime.now() - start_time).total_seconds()
-        remaining = (time_limit * 60) - elapsed
+        now = datetime.now()
+        elapsed = (now - start_time).total_seconds()
+        remaining = (expires_at - now).total_seconds()
         
         if remaining <= 0:
             return jsonify({
@@ -376,10 +436,10 @@ def mark_evaluation_expired():
         
         evaluation_id = session_info['evaluation_id']
         
-        # Mark timer session as completed (expired)
+        # Mark timer session as expired
         cursor.execute("""
             UPDATE evaluation_timer_sessions
-            SET completed_at = NOW()
+            SET status = 'expired', end_time = NOW()
             WHERE session_id = %s
         """, (session_id,))
         
@@ -388,6 +448,7 @@ def mark_evaluation_expired():
             UPDATE evaluations
             SET status = 'Expired'
             WHERE evaluation_id = %s
+            AND status IN ('Pending', 'In Progress')
         """, (evaluation_id,))
         
         conn.commit()
@@ -522,7 +583,29 @@ def get_next_faculty_number():
 @api_bp.route('/faculty')
 @login_required
 def get_faculty():
-    """Get all faculty members with program information"""
+    """
+    Get faculty members with program information
+    
+    Without page/limit the whole list is returned. With them, one page
+    is returned along with a pagination block.
+    
+    Query params:
+        page, limit: Page to return
+        sort, order: Sort key (name, faculty_number, department, rank,
+                     status, created_at) and direction (asc/desc)
+        search: Name, faculty number or email
+        program_id, status, rank, include_archived: Filters
+    
+    Counts and stats are computed for the first page of a filter (or
+    with count=true) and reused by the client while it pages.
+    """
+    try:
+        filters = Faculty.list_filters(request.args)
+        paginated = is_paginated(request.args)
+        paging = parse_page_args(request.args, FACULTY_SORT_COLUMNS, 'name')
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid page or filter'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'success': False, 'error': 'Database connection failed'}), 500
@@ -530,61 +613,25 @@ def get_faculty():
     try:
         cursor = conn.cursor(dictionary=True)
         
-        # Check if we should include archived faculty (default: exclude)
-        include_archived = request.args.get('include_archived', 'false').lower() == 'true'
-        
-        # Get all faculty with program info, class counts, and average ratings
-        archive_filter = "" if include_archived else "WHERE f.is_archived = FALSE"
+        with_counts = not paginated or paging['page'] == 1 or request.args.get('count') == 'true'
         
-        query = f"""
-            SELECT f.*, 
-                   p.name as department_name,
-                   p.program_code,
-                   COUNT(DISTINCT cs.section_id) as total_classes,
-                   ROUND(AVG(er.rating), 2) as avg_rating,
-                   COUNT(DISTINCT e.evaluation_id) as total_evaluations,
-                   GROUP_CONCAT(DISTINCT s.subject_code ORDER BY s.subject_code SEPARATOR ',') as workload_codes
-            FROM faculty f
-            LEFT JOIN programs p ON f.program_id = p.program_id
-            LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-            LEFT JOIN subjects s ON cs.subject_id = s.subject_id
-            LEFT JOIN evaluations e ON cs.section_id = e.section_id AND e.status = 'Completed'
-            LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-            {archive_filter}
-            GROUP BY f.faculty_id
-            ORDER BY f.last_name, f.first_name
-        """
-        cursor.execute(query)
-        faculty_list = cursor.fetchall()
+        if paginated:
+            faculty_list = Faculty.find(cursor, filters, paging['order_by'], paging['limit'], paging['offset'])
+        else:
+            faculty_list = Faculty.find(cursor, filters, paging['order_by'])
         
-        # Get statistics (only for non-archived faculty)
-        stats_query = """
-            SELECT 
-                COUNT(DISTINCT f.faculty_id) as total_faculty,
-                COUNT(DISTINCT cs.section_id) as total_classes,
-                COUNT(DISTINCT e.evaluation_id) as total_evaluations,
-                ROUND(AVG(er.rating), 2) as avg_rating
-            FROM faculty f
-            LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-            LEFT JOIN evaluations e ON cs.section_id = e.section_id AND e.status = 'Completed'
-            LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-            WHERE f.is_archived = FALSE
-        """
-        cursor.execute(stats_query)
-        stats = cursor.fetchone()
+        result = {
+            'success': True,
+            'data': faculty_list
+        }
+        if paginated:
+            result['pagination'] = page_info(paging, Faculty.count(cursor, filters) if with_counts else None)
+        if with_counts:
+            result['stats'] = Faculty.stats(cursor)
         
         cursor.close()
         
-        return jsonify({
-            'success': True,
-            'data': faculty_list,
-            'stats': {
-                'total_faculty': stats['total_faculty'] or 0,
-                'total_classes': stats['total_classes'] or 0,
-                'avg_rating': float(stats['avg_rating']) if stats['avg_rating'] else 0,
-                'total_evaluations': stats['total_evaluations'] or 0
-            }
-        })
+        return jsonify(result)
         
     except Exception as e:
         print(f"Error getting faculty: {e}")
@@ -818,7 +865,31 @@ def unarchive_faculty(faculty_id):
 @api_bp.route('/students')
 @login_required
 def get_students():
-    """Get all students with user information"""
+    """
+    Get students with user information
+    
+    Without page/limit the whole list is returned. With them, one page
+    is returned along with a pagination block.
+    
+    Query params:
+        page, limit: Page to return
+        sort, order: Sort key (name, student_number, program, year_level,
+                     status, enrollment_date) and direction (asc/desc)
+        search: Name, student number or email
+        program_id, year_level, status, section_id: Filters
+        include_archived, exclude_assigned: Include archived students /
+                     leave out students already in an active section
+    
+    Counts and stats are computed for the first page of a filter (or
+    with count=true) and reused by the client while it pages.
+    """
+    try:
+        filters = Student.list_filters(request.args)
+        paginated = is_paginated(request.args)
+        paging = parse_page_args(request.args, STUDENT_SORT_COLUMNS, 'name')
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid page or filter'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'success': False, 'error': 'Database connection failed'}), 500
@@ -826,87 +897,25 @@ def get_students():
     try:
         cursor = conn.cursor(dictionary=True)
         
-        # Check if we should include archived students (default: exclude)
-        include_archived = request.args.get('include_archived', 'false').lower() == 'true'
-        
-        # Check if we should exclude students already assigned to sections
-        exclude_assigned = request.args.get('exclude_assigned', 'false').lower() == 'true'
-        
-        # Build archive filter
-        archive_filter = "" if include_archived else "WHERE s.is_archived = FALSE"
+        with_counts = not paginated or paging['page'] == 1 or request.args.get('count') == 'true'
         
-        # Build section assignment filter
-        section_filter = ""
-        if exclude_assigned:
-            section_filter = """
-                AND s.id NOT IN (
-                    SELECT student_id 
-                    FROM section_students 
-                    WHERE status = 'Active'
-                )
-            """
-        
-        # Get all students with user information and current section
-        query = f"""
-            SELECT s.id,
-                   s.std_Number as student_number,
-                   s.std_Firstname as first_name,
-                   s.std_Surname as last_name,
-                   s.std_Middlename as middle_name,
-                   s.std_Birthdate as birthdate,
-                   s.std_Age as age,
-                   s.std_Address as address,
-                   s.std_Gender as gender,
-                   s.std_EmailAdd as email,
-                   s.std_ContactNum as contact_number,
-                   s.std_Course as program,
-                   p.program_id,
-                   s.std_Level as year_level,
-                   s.std_Status as status,
-                   s.is_archived,
-                   s.created_at as enrollment_date,
-                   u.username,
-                   u.is_active as user_active,
-                   sec.section_id as current_section_id,
-                   sec.section_code as current_section_code,
-                   sec.section_name as current_section_name
-            FROM std_info s
-            LEFT JOIN users u ON s.user_id = u.user_id
-            LEFT JOIN programs p ON s.std_Course COLLATE utf8mb4_unicode_ci = p.name COLLATE utf8mb4_unicode_ci
-            LEFT JOIN section_students ss ON s.id = ss.student_id AND ss.status = 'Active'
-            LEFT JOIN sections sec ON ss.section_id = sec.section_id
-            {archive_filter}
-            {section_filter}
-            ORDER BY s.std_Surname, s.std_Firstname
-        """
-        cursor.execute(query)
-        student_list = cursor.fetchall()
+        if paginated:
+            student_list = Student.find(cursor, filters, paging['order_by'], paging['limit'], paging['offset'])
+        else:
+            student_list = Student.find(cursor, filters, paging['order_by'])
         
-        # Get statistics (only for non-archived students)
-        stats_query = """
-            SELECT 
-                COUNT(DISTINCT s.id) as total_students,
-                COUNT(DISTINCT CASE WHEN s.std_Status = 'Enrolled' THEN s.id END) as active_students,
-                COUNT(DISTINCT s.std_Course) as total_programs,
-                COUNT(DISTINCT CASE WHEN s.user_id IS NOT NULL THEN s.id END) as students_with_accounts
-            FROM std_info s
-            WHERE s.is_archived = FALSE
-        """
-        cursor.execute(stats_query)
-        stats = cursor.fetchone()
+        result = {
+            'success': True,
+            'data': student_list
+        }
+        if paginated:
+            result['pagination'] = page_info(paging, Student.count(cursor, filters) if with_counts else None)
+        if with_counts:
+            result['stats'] = Student.stats(cursor)
         
         cursor.close()
         
-        return jsonify({
-            'success': True,
-            'data': student_list,
-            'stats': {
-                'total_students': stats['total_students'] or 0,
-                'active_students': stats['active_students'] or 0,
-                'total_programs': stats['total_programs'] or 0,
-                'students_with_accounts': stats['students_with_accounts'] or 0
-            }
-        })
+        return jsonify(result)
         
     except Exception as e:
         print(f"Error getting students: {e}")
@@ -969,8 +978,8 @@ def create_student():
             INSERT INTO std_info (
                 std_Number, std_Surname, std_Firstname, std_Middlename,
                 std_Birthdate, std_Age, std_Address, std_Gender,
-                std_EmailAdd, std_ContactNum, std_Level, std_Course, std_Status
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                std_EmailAdd, std_ContactNum, std_Level, std_Course, program_id, std_Status
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
         
         values = (
@@ -986,6 +995,7 @@ def create_student():
             data.get('contact_number', ''),
             data['year_level'],
             program['name'],
+            data['program_id'],
             data.get('status', 'Enrolled')
         )
         
@@ -1052,6 +1062,9 @@ def create_student():
                 INSERT INTO section_students (section_id, student_id, status, assigned_date)
                 VALUES (%s, %s, 'Active', NOW())
             """, (section_id, student_id))
+            
+            # Periods that are already Active would otherwise never include them
+            Evaluation.create_for_active_periods(cursor, student_id)
         
         conn.commit()
         cursor.close()
@@ -1156,6 +1169,8 @@ def update_student(student_id):
         if program_name:
             update_fields.append("std_Course = %s")
             values.append(program_name)
+            update_fields.append("program_id = %s")
+            values.append(data['program_id'])
         
         if not update_fields:
             return jsonify({'success': False, 'error': 'No fields to update'}), 400
@@ -1240,6 +1255,9 @@ def update_student(student_id):
                     INSERT INTO section_students (section_id, student_id, status, assigned_date)
                     VALUES (%s, %s, 'Active', NOW())
                 """, (section_id, student_id))
+            
+            # Periods that are already Active would otherwise never include them
+            Evaluation.create_for_active_periods(cursor, student_id)
         
         conn.commit()
         cursor.close()
@@ -1412,6 +1430,9 @@ def reset_evaluation(evaluation_id):
         if not evaluation:
             return jsonify({'success': False, 'error': 'Evaluation not found'}), 404
         
+        # Take a completed evaluation out of the faculty score totals first
+        FacultyScores.retract_evaluation(cursor, evaluation_id)
+        
         # Delete all evaluation responses for this evaluation
         cursor.execute("DELETE FROM evaluation_responses WHERE evaluation_id = %s", (evaluation_id,))
         
@@ -1420,6 +1441,7 @@ def reset_evaluation(evaluation_id):
             UPDATE evaluations 
             SET status = 'Pending',
                 start_time = NULL,
+                expires_at = NULL,
                 completion_time = NULL,
                 updated_at = NOW()
             WHERE evaluation_id = %s
@@ -2397,24 +2419,8 @@ def get_evaluation_periods():
 @api_bp.route('/academic-year', methods=['GET'])
 def get_academic_year():
     """Get current academic year information"""
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({
-            'success': True,
-            'year': '2025-2026',
-            'semester': '1st Semester',
-            'status': 'Active'
-        })
-    
     try:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT * FROM evaluation_periods 
-            WHERE status = 'Active' 
-            LIMIT 1
-        """)
-        period = cursor.fetchone()
-        cursor.close()
+        period = AcademicCalendar.active_period()
         
         if period:
             title = period.get('title', '')
@@ -2438,8 +2444,6 @@ def get_academic_year():
             })
     except Exception as e:
         print(f"Error getting academic year: {e}")
-    finally:
-        conn.close()
     
     # Return fallback data
     return jsonify({
@@ -2685,41 +2689,38 @@ def student_activity_stats():
 @api_bp.route('/guidance/students')
 @login_required
 def guidance_students():
-    """Get all students with evaluation status for guidance counselor"""
+    """
+    Get students with evaluation status for guidance counselor
+    
+    Accepts the same page, sort and filter arguments as /students, plus
+    evaluation_status (Completed, In Progress, Pending, No Evaluations).
+    Archived students are included unless include_archived=false.
+    """
     if session.get('role') != 'guidance':
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
+    try:
+        filters = Student.list_filters(request.args)
+        if 'include_archived' not in request.args:
+            filters['include_archived'] = True
+        paginated = is_paginated(request.args)
+        paging = parse_page_args(request.args, STUDENT_SORT_COLUMNS, 'name')
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid page or filter'}), 400
+    
     try:
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
-        # Get all students with their evaluation status
-        cursor.execute("""
-            SELECT 
-                s.id,
-                s.std_Number as student_number,
-                s.std_Firstname as first_name,
-                s.std_Surname as last_name,
-                s.std_EmailAdd as email,
-                s.std_Course as department,
-                s.std_Status as enrollment_status,
-                s.created_at,
-                COUNT(DISTINCT e.evaluation_id) as total_evaluations,
-                SUM(CASE WHEN e.status = 'Completed' THEN 1 ELSE 0 END) as completed_evaluations,
-                CASE 
-                    WHEN COUNT(DISTINCT e.evaluation_id) = 0 THEN 'No Evaluations'
-                    WHEN SUM(CASE WHEN e.status = 'Completed' THEN 1 ELSE 0 END) = COUNT(DISTINCT e.evaluation_id) THEN 'Completed'
-                    WHEN SUM(CASE WHEN e.status = 'In Progress' THEN 1 ELSE 0 END) > 0 THEN 'In Progress'
-                    ELSE 'Pending'
-                END as status
-            FROM std_info s
-            LEFT JOIN evaluations e ON s.id = e.student_id
-            GROUP BY s.id, s.std_Number, s.std_Firstname, s.std_Surname, 
-                     s.std_EmailAdd, s.std_Course, s.std_Status, s.created_at
-            ORDER BY s.std_Surname, s.std_Firstname
-        """)
+        with_counts = paging['page'] == 1 or request.args.get('count') == 'true'
+        
+        if paginated:
+            students, total = Student.find_with_evaluation_status(
+                cursor, filters, paging['order_by'], paging['limit'], paging['offset'], count=with_counts
+            )
+        else:
+            students, total = Student.find_with_evaluation_status(cursor, filters, paging['order_by'])
         
-        students = cursor.fetchall()
         cursor.close()
         conn.close()
         
@@ -2728,10 +2729,14 @@ def guidance_students():
             if student.get('created_at'):
                 student['created_at'] = student['created_at'].isoformat() if hasattr(student['created_at'], 'isoformat') else str(student['created_at'])
         
-        return jsonify({
+        result = {
             'success': True,
             'students': students
-        })
+        }
+        if paginated:
+            result['pagination'] = page_info(paging, total)
+        
+        return jsonify(result)
         
     except Exception as e:
         print(f"Error getting students for guidance: {str(e)}")
@@ -2980,6 +2985,9 @@ def guidance_allow_retake():
                 evaluation = cursor.fetchone()
                 
                 if evaluation:
+                    # Take a completed evaluation out of the faculty score totals first
+                    FacultyScores.retract_evaluation(cursor, eval_id)
+                    
                     # Delete existing evaluation responses (ratings) to clear previous answers
                     cursor.execute("""
                         DELETE FROM evaluation_responses 
@@ -3004,6 +3012,7 @@ def guidance_allow_retake():
                         SET status = 'Pending', 
                             completion_time = NULL,
                             start_time = NULL,
+                            expires_at = NULL,
                             updated_at = NOW()
                         WHERE evaluation_id = %s
                     """, (eval_id,))
@@ -3041,6 +3050,9 @@ def guidance_allow_retake():
             evaluation = cursor.fetchone()
             
             if evaluation:
+                # Take a completed evaluation out of the faculty score totals first
+                FacultyScores.retract_evaluation(cursor, evaluation['evaluation_id'])
+                
                 # Delete existing evaluation responses (ratings) to clear previous answers
                 cursor.execute("""
                     DELETE FROM evaluation_responses 
@@ -3065,6 +3077,7 @@ def guidance_allow_retake():
                     SET status = 'Pending', 
                         completion_time = NULL,
                         start_time = NULL,
+                        expires_at = NULL,
                         updated_at = NOW()
                     WHERE evaluation_id = %s
                 """, (evaluation['evaluation_id'],))
@@ -3165,6 +3178,9 @@ def admin_allow_retake():
             evaluation = cursor.fetchone()
             
             if evaluation:
+                # Take a completed evaluation out of the faculty score totals first
+                FacultyScores.retract_evaluation(cursor, eval_id)
+                
                 # Delete existing evaluation responses (ratings)
                 cursor.execute("""
                     DELETE FROM evaluation_responses 
@@ -3189,6 +3205,7 @@ def admin_allow_retake():
                     SET status = 'Pending', 
                         completion_time = NULL,
                         start_time = NULL,
+                        expires_at = NULL,
                         updated_at = NOW()
                     WHERE evaluation_id = %s
                 """, (eval_id,))
@@ -3288,21 +3305,14 @@ def guidance_faculty_evaluations():
         statistics = cursor.fetchone()
         
         # Get current evaluation period with academic term info
-        cursor.execute("""
-            SELECT 
-                ep.title as period_name, 
-                CONCAT(ay.year_code, ' - ', at.term_name) as academic_year,
-                ep.start_date, 
-                ep.end_date
-            FROM evaluation_periods ep
-            LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
-            LEFT JOIN academic_years ay ON at.acad_year_id = ay.acad_year_id
-            WHERE ep.status = 'Active'
-            ORDER BY ep.start_date DESC
-            LIMIT 1
-        """)
-        
-        current_period = cursor.fetchone()
+        current_period = AcademicCalendar.active_period()
+        if current_period:
+            current_period = {
+                'period_name': current_period['title'],
+                'academic_year': current_period['display_term'],
+                'start_date': current_period['start_date'],
+                'end_date': current_period['end_date']
+            }
         
         cursor.close()
         conn.close()
@@ -3669,34 +3679,14 @@ def guidance_performance_trends():
 @login_required
 def get_current_term():
     """Get current academic term information"""
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'success': False, 'error': 'Database connection failed'}), 500
-    
     try:
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get current academic year
-        cursor.execute("""
-            SELECT acad_year_id, year_code, year_name, start_date, end_date, is_current
-            FROM academic_years
-            WHERE is_current = 1
-            LIMIT 1
-        """)
-        
-        current_year = cursor.fetchone()
+        current_year = AcademicCalendar.current_year()
         
         if current_year:
-            # Get current term/semester for this year
-            cursor.execute("""
-                SELECT acad_term_id, term_name, term_code, start_date, end_date, is_current
-                FROM academic_terms
-                WHERE acad_year_id = %s AND is_current = 1
-                LIMIT 1
-            """, (current_year['acad_year_id'],))
-            current_term = cursor.fetchone()
-            
-            cursor.close()
+            # Current term/semester for this year
+            current_term = AcademicCalendar.current_term()
+            if current_term and current_term['acad_year_id'] != current_year['acad_year_id']:
+                current_term = None
             
             return jsonify({
                 'success': True,
@@ -3711,7 +3701,6 @@ def get_current_term():
                 }
             })
         else:
-            cursor.close()
             # No current year set, return default
             return jsonify({
                 'success': True,
@@ -3729,8 +3718,6 @@ def get_current_term():
     except Exception as e:
         print(f"Error getting current term: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
-    finally:
-        conn.close()
 
 
 @api_bp.route('/academic-years')
@@ -3891,6 +3878,7 @@ def create_academic_year():
               (mid_date + timedelta(days=1)).strftime('%Y-%m-%d'), 
               data['end_date'], 0))
         
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -3968,6 +3956,7 @@ def update_academic_year(acad_year_id):
         """
         
         cursor.execute(update_query, values)
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -4021,6 +4010,7 @@ def delete_academic_year(acad_year_id):
         # Foreign keys will cascade delete academic_terms and their evaluation_periods
         cursor.execute("DELETE FROM academic_years WHERE acad_year_id = %s", (acad_year_id,))
         
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -4250,6 +4240,7 @@ def create_academic_term():
         ))
         
         acad_term_id = cursor.lastrowid
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -4304,6 +4295,7 @@ def update_academic_term(acad_term_id):
             WHERE acad_term_id = %s
         """, update_values)
         
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -4347,6 +4339,7 @@ def delete_academic_term(acad_term_id):
         
         # Delete the term
         cursor.execute("DELETE FROM academic_terms WHERE acad_term_id = %s", (acad_term_id,))
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -4367,99 +4360,6 @@ def delete_academic_term(acad_term_id):
 # EVALUATION PERIODS MANAGEMENT ENDPOINTS
 # ============================================================
 
-def update_period_status_auto():
-    """Automatically update evaluation period status based on dates"""
-    conn = get_db_connection()
-    if not conn:
-        return
-    
-    try:
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get periods that will transition to 'Active' (for email notifications)
-        cursor.execute("""
-            SELECT period_id, title, start_date, end_date
-            FROM evaluation_periods 
-            WHERE CURDATE() >= start_date 
-            AND CURDATE() <= end_date 
-            AND status != 'Active'
-        """)
-        periods_to_activate = cursor.fetchall()
-        
-        # Update status to 'Active' for periods that have started but not ended
-        cursor.execute("""
-            UPDATE evaluation_periods 
-            SET status = 'Active'
-            WHERE CURDATE() >= start_date 
-            AND CURDATE() <= end_date 
-            AND status != 'Active'
-        """)
-        
-        # Update status to 'Closed' for periods that have ended
-        # Database schema uses: 'Pending', 'Active', 'Closed', 'Canceled'
-        cursor.execute("""
-            UPDATE evaluation_periods 
-            SET status = 'Closed'
-            WHERE CURDATE() > end_date 
-            AND status != 'Closed'
-            AND status != 'Canceled'
-        """)
-        
-        # Update status to 'Pending' for periods that haven't started
-        cursor.execute("""
-            UPDATE evaluation_periods 
-            SET status = 'Pending'
-            WHERE CURDATE() < start_date 
-            AND status NOT IN ('Pending', 'Canceled')
-        """)
-        
-        conn.commit()
-        
-        # Automatic email notifications removed - use manual "Send Email Notifications" button
-        if periods_to_activate:
-            print(f"✅ {len(periods_to_activate)} period(s) automatically activated.")
-            print(f"📧 Use the 'Send Email Notifications' button to notify users.")
-            
-            # Still sync evaluations for newly activated periods
-            for period in periods_to_activate:
-                try:
-                    cursor.execute("""
-                        INSERT INTO evaluations (period_id, section_id, student_id, status, created_at)
-                        SELECT DISTINCT
-                            %s as period_id,
-                            cs.section_id,
-                            ss.student_id,
-                            'Pending' as status,
-                            NOW() as created_at
-                        FROM section_students ss
-                        INNER JOIN class_sections cs ON (
-                            ss.section_id = cs.section_id 
-                            OR ss.section_id = cs.section_ref_id
-                        )
-                        WHERE ss.status = 'Active'
-                        AND cs.faculty_id IS NOT NULL
-                        AND NOT EXISTS (
-                            SELECT 1 FROM evaluations ev 
-                            WHERE ev.period_id = %s 
-                            AND ev.section_id = cs.section_id 
-                            AND ev.student_id = ss.student_id
-                        )
-                    """, (period['period_id'], period['period_id']))
-                    
-                    evaluations_created = cursor.rowcount
-                    conn.commit()
-                    print(f"Synced evaluations for period {period['period_id']}: {evaluations_created} evaluation(s) created")
-                except Exception as sync_error:
-                    print(f"Error syncing evaluations for period {period['period_id']}: {sync_error}")
-        
-        cursor.close()
-    except Exception as e:
-        print(f"Error updating period status: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
-
-
 @api_bp.route('/evaluation-periods-admin')
 @login_required
 def get_evaluation_periods_admin():
@@ -4467,9 +4367,6 @@ def get_evaluation_periods_admin():
     if session.get('role') != 'admin':
         return jsonify({'success': False, 'error': 'Unauthorized'}), 403
     
-    # Auto-update statuses based on dates
-    update_period_status_auto()
-    
     # Get filter parameter
     academic_year_id = request.args.get('academic_year_id', type=int)
     
@@ -4593,15 +4490,6 @@ def create_evaluation_period_admin():
         if end_date <= start_date:
             return jsonify({'success': False, 'error': 'End date must be after start date'}), 400
         
-        # Determine initial status based on dates
-        today = datetime.now().date()
-        if start_date.date() > today:
-            status = 'Upcoming'
-        elif start_date.date() <= today <= end_date.date():
-            status = 'Active'
-        else:
-            status = 'Completed'
-        
         # Check for overlapping periods
         cursor.execute("""
             SELECT period_id, title 
@@ -4633,42 +4521,18 @@ def create_evaluation_period_admin():
             data['title'],
             data['start_date'],
             data['end_date'],
-            status
+            'Pending'
         ))
         
         period_id = cursor.lastrowid
         
-        # Auto-sync evaluations for all assigned students
-        # This handles both direct section_id matches and section_ref_id relationships
-        try:
-            cursor.execute("""
-                INSERT INTO evaluations (period_id, section_id, student_id, status, created_at)
-                SELECT DISTINCT
-                    %s as period_id,
-                    cs.section_id,
-                    ss.student_id,
-                    'Pending' as status,
-                    NOW() as created_at
-                FROM section_students ss
-                INNER JOIN class_sections cs ON (
-                    ss.section_id = cs.section_id 
-                    OR ss.section_id = cs.section_ref_id
-                )
-                WHERE ss.status = 'Active'
-                AND cs.faculty_id IS NOT NULL
-                AND NOT EXISTS (
-                    SELECT 1 FROM evaluations ev 
-                    WHERE ev.period_id = %s 
-                    AND ev.section_id = cs.section_id 
-                    AND ev.student_id = ss.student_id
-                )
-            """, (period_id, period_id))
-            
-            evaluations_created = cursor.rowcount
-            conn.commit()
-        except Exception as sync_error:
-            print(f"Error syncing evaluations: {sync_error}")
-            evaluations_created = 0
+        # Move the period to the status its dates call for; becoming Active
+        # creates its evaluations in the same transaction
+        transitions = apply_period_transitions(cursor, f"user:{session.get('user_id')}", period_id)
+        status = transitions[-1]['to_status'] if transitions else 'Pending'
+        evaluations_created = sum(t['evaluations_created'] for t in transitions)
+        AcademicCalendar.invalidate(cursor)
+        conn.commit()
         
         # Email notifications removed - use manual "Send Email Notifications" button instead
         print(f"✅ Evaluation period created with status: {status}")
@@ -4755,10 +4619,11 @@ def update_evaluation_period_admin(period_id):
         """
         
         cursor.execute(update_query, update_values)
-        conn.commit()
         
-        # Auto-update status if dates changed
-        update_period_status_auto()
+        # Move the period to the status its (possibly new) dates call for
+        apply_period_transitions(cursor, f"user:{session.get('user_id')}", period_id)
+        AcademicCalendar.invalidate(cursor)
+        conn.commit()
         
         cursor.close()
         
@@ -4812,6 +4677,7 @@ def archive_evaluation_period_admin(period_id):
         
         # Archive the period (mark as archived)
         cursor.execute("UPDATE evaluation_periods SET is_archived = 1 WHERE period_id = %s", (period_id,))
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -4902,6 +4768,7 @@ def unarchive_evaluation_period_admin(period_id):
         
         # Unarchive the period
         cursor.execute("UPDATE evaluation_periods SET is_archived = 0 WHERE period_id = %s", (period_id,))
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -4954,6 +4821,7 @@ def delete_evaluation_period_admin(period_id):
         
         # Delete the period
         cursor.execute("DELETE FROM evaluation_periods WHERE period_id = %s", (period_id,))
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -4992,30 +4860,7 @@ def sync_evaluations_for_period(period_id):
             return jsonify({'success': False, 'error': 'Evaluation period not found'}), 404
         
         # Create evaluations for all assigned students who don't have one yet
-        cursor.execute("""
-            INSERT INTO evaluations (period_id, section_id, student_id, status, created_at)
-            SELECT DISTINCT
-                %s as period_id,
-                cs.section_id,
-                ss.student_id,
-                'Pending' as status,
-                NOW() as created_at
-            FROM section_students ss
-            INNER JOIN class_sections cs ON (
-                ss.section_id = cs.section_id 
-                OR ss.section_id = cs.section_ref_id
-            )
-            WHERE ss.status = 'Active'
-            AND cs.faculty_id IS NOT NULL
-            AND NOT EXISTS (
-                SELECT 1 FROM evaluations ev 
-                WHERE ev.period_id = %s 
-                AND ev.section_id = cs.section_id 
-                AND ev.student_id = ss.student_id
-            )
-        """, (period_id, period_id))
-        
-        evaluations_created = cursor.rowcount
+        evaluations_created = Evaluation.create_for_period(cursor, period_id)
         conn.commit()
         cursor.close()
         
@@ -5050,7 +4895,7 @@ def sync_all_evaluations():
         # Get all active or upcoming periods
         cursor.execute("""
             SELECT period_id FROM evaluation_periods 
-            WHERE status IN ('Active', 'Upcoming')
+            WHERE status IN ('Active', 'Pending', 'Upcoming')
         """)
         periods = cursor.fetchall()
         
@@ -5060,30 +4905,7 @@ def sync_all_evaluations():
             period_id = period['period_id']
             
             # Create evaluations for all assigned students who don't have one yet
-            cursor.execute("""
-                INSERT INTO evaluations (period_id, section_id, student_id, status, created_at)
-                SELECT DISTINCT
-                    %s as period_id,
-                    cs.section_id,
-                    ss.student_id,
-                    'Pending' as status,
-                    NOW() as created_at
-                FROM section_students ss
-                INNER JOIN class_sections cs ON (
-                    ss.section_id = cs.section_id 
-                    OR ss.section_id = cs.section_ref_id
-                )
-                WHERE ss.status = 'Active'
-                AND cs.faculty_id IS NOT NULL
-                AND NOT EXISTS (
-                    SELECT 1 FROM evaluations ev 
-                    WHERE ev.period_id = %s 
-                    AND ev.section_id = cs.section_id 
-                    AND ev.student_id = ss.student_id
-                )
-            """, (period_id, period_id))
-            
-            total_created += cursor.rowcount
+            total_created += Evaluation.create_for_period(cursor, period_id)
         
         conn.commit()
         cursor.close()
@@ -5190,12 +5012,6 @@ def get_evaluation_periods_guidance():
     if session.get('role') not in ['admin', 'guidance']:
         return jsonify({'success': False, 'error': 'Unauthorized'}), 403
     
-    # Auto-update statuses based on dates
-    try:
-        update_period_status_auto()
-    except Exception as update_error:
-        pass  # Non-fatal error, continue
-    
     # Get filter parameter
     academic_year_id = request.args.get('academic_year_id', type=int)
     
@@ -5332,15 +5148,6 @@ def create_evaluation_period_guidance():
         if end_date <= start_date:
             return jsonify({'success': False, 'error': 'End date must be after start date'}), 400
         
-        # Determine initial status based on dates
-        today = datetime.now().date()
-        if start_date.date() > today:
-            status = 'Upcoming'
-        elif start_date.date() <= today <= end_date.date():
-            status = 'Active'
-        else:
-            status = 'Completed'
-        
         # Check for overlapping periods
         cursor.execute("""
             SELECT period_id, title 
@@ -5372,41 +5179,18 @@ def create_evaluation_period_guidance():
             data['title'],
             data['start_date'],
             data['end_date'],
-            status
+            'Pending'
         ))
         
         period_id = cursor.lastrowid
         
-        # Auto-sync evaluations for all assigned students
-        try:
-            cursor.execute("""
-                INSERT INTO evaluations (period_id, section_id, student_id, status, created_at)
-                SELECT DISTINCT
-                    %s as period_id,
-                    cs.section_id,
-                    ss.student_id,
-                    'Pending' as status,
-                    NOW() as created_at
-                FROM section_students ss
-                INNER JOIN class_sections cs ON (
-                    ss.section_id = cs.section_id 
-                    OR ss.section_id = cs.section_ref_id
-                )
-                WHERE ss.status = 'Active'
-                AND cs.faculty_id IS NOT NULL
-                AND NOT EXISTS (
-                    SELECT 1 FROM evaluations ev 
-                    WHERE ev.period_id = %s 
-                    AND ev.section_id = cs.section_id 
-                    AND ev.student_id = ss.student_id
-                )
-            """, (period_id, period_id))
-            
-            evaluations_created = cursor.rowcount
-            conn.commit()
-        except Exception as sync_error:
-            print(f"Error syncing evaluations: {sync_error}")
-            evaluations_created = 0
+        # Move the period to the status its dates call for; becoming Active
+        # creates its evaluations in the same transaction
+        transitions = apply_period_transitions(cursor, f"user:{session.get('user_id')}", period_id)
+        status = transitions[-1]['to_status'] if transitions else 'Pending'
+        evaluations_created = sum(t['evaluations_created'] for t in transitions)
+        AcademicCalendar.invalidate(cursor)
+        conn.commit()
         
         # Email notifications removed - use manual "Send Email Notifications" button instead
         print(f"✅ Evaluation period created with status: {status}")
@@ -5445,10 +5229,16 @@ def get_email_job_status(job_id):
     if session.get('role') not in ['admin', 'guidance']:
         return jsonify({'success': False, 'error': 'Unauthorized'}), 403
     
-    if not hasattr(current_app, 'email_jobs') or job_id not in current_app.email_jobs:
+    from utils.email_queue import get_email_job_progress, ensure_background_worker
+    
+    job_info = get_email_job_progress(job_id)
+    if not job_info:
         return jsonify({'success': False, 'error': 'Job not found'}), 404
     
-    job_info = current_app.email_jobs[job_id]
+    # Resume delivery if the process that enqueued the job has since restarted
+    if job_info['status'] == 'processing':
+        ensure_background_worker(current_app._get_current_object())
+    
     return jsonify({
         'success': True,
         'job_id': job_id,
@@ -5456,7 +5246,9 @@ def get_email_job_status(job_id):
         'total': job_info['total'],
         'sent': job_info['sent'],
         'failed': job_info['failed'],
-        'progress_percentage': round((job_info['sent'] + job_info['failed']) / job_info['total'] * 100) if job_info['total'] > 0 else 0
+        'pending': job_info['pending'],
+        'progress_percentage': round((job_info['sent'] + job_info['failed']) / job_info['total'] * 100) if job_info['total'] > 0 else 0,
+        'throughput': job_info['throughput']
     })
 
 
@@ -5511,79 +5303,35 @@ def send_evaluation_notifications(period_id):
                 'error': 'No users with valid email addresses found'
             }), 400
         
-        # Import email utility
-        from utils.email_utils import send_evaluation_start_notification
-        from threading import Thread
-        import uuid
-        import time
-        
-        # Generate unique job ID for tracking
-        email_job_id = str(uuid.uuid4())
-        
-        # Initialize email jobs tracking if not exists
-        if not hasattr(current_app, 'email_jobs'):
-            current_app.email_jobs = {}
-        
-        current_app.email_jobs[email_job_id] = {
-            'status': 'processing',
-            'total': len(all_users),
-            'sent': 0,
-            'failed': 0,
-            'started_at': time.time()
-        }
+        # Queue one outbox row per recipient; delivery state lives in the DB
+        # so progress survives restarts and is visible to every worker
+        from utils.email_queue import enqueue_email_job, ensure_background_worker
+        
+        recipients = [{
+            'user_id': user['user_id'],
+            'email': user['email'],
+            'name': f"{user['first_name']} {user['last_name']}"
+        } for user in all_users]
+        
+        email_job_id = enqueue_email_job(
+            'evaluation_start',
+            recipients,
+            payload={
+                'period_title': period['title'],
+                'start_date': period['start_date'].strftime('%Y-%m-%d'),
+                'end_date': period['end_date'].strftime('%Y-%m-%d')
+            },
+            period_id=period_id,
+            created_by=session.get('user_id')
+        )
+        
+        if not email_job_id:
+            conn.close()
+            return jsonify({'success': False, 'error': 'Failed to queue email notifications'}), 500
         
-        # Get the current app context for background thread
-        app = current_app._get_current_object()
+        ensure_background_worker(current_app._get_current_object())
         
-        # Function to send emails in background with app context
-        def send_notification_emails():
-            import concurrent.futures
-            from threading import Lock
-            
-            stats_lock = Lock()
-            
-            def send_to_user(user):
-                # Each thread needs its own app context
-                with app.app_context():
-                    try:
-                        user_name = f"{user['first_name']} {user['last_name']}"
-                        result = send_evaluation_start_notification(
-                            user['email'],
-                            user_name,
-                            period['title'],
-                            period['start_date'].strftime('%Y-%m-%d'),
-                            period['end_date'].strftime('%Y-%m-%d')
-                        )
-                        with stats_lock:
-                            if result:
-                                app.email_jobs[email_job_id]['sent'] += 1
-                                print(f"   ✅ Email sent: {user['email']}")
-                            else:
-                                app.email_jobs[email_job_id]['failed'] += 1
-                                print(f"   ❌ Email failed: {user['email']}")
-                        return result
-                    except Exception as email_error:
-                        with stats_lock:
-                            app.email_jobs[email_job_id]['failed'] += 1
-                        print(f"   ❌ Exception: {user['email']}: {str(email_error)}")
-                        return False
-            
-            # Use ThreadPoolExecutor for parallel email sending (5 concurrent)
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                list(executor.map(send_to_user, all_users))
-            
-            # Mark job as complete
-            with app.app_context():
-                app.email_jobs[email_job_id]['status'] = 'completed'
-                app.email_jobs[email_job_id]['completed_at'] = time.time()
-                print(f"\n📧 Email Summary: {app.email_jobs[email_job_id]['sent']} sent, {app.email_jobs[email_job_id]['failed']} failed")
-        
-        # Start email sending in background thread
-        thread = Thread(target=send_notification_emails)
-        thread.daemon = True
-        thread.start()
-        
-        print(f"🚀 Started email notification job for period '{period['title']}' (Job ID: {email_job_id})")
+        print(f"🚀 Queued email notification job for period '{period['title']}' (Job ID: {email_job_id})")
         print(f"📊 Sending to {len(all_users)} users")
         
         conn.close()
@@ -5656,10 +5404,11 @@ def update_evaluation_period_guidance(period_id):
         """
         
         cursor.execute(update_query, update_values)
-        conn.commit()
         
-        # Auto-update status if dates changed
-        update_period_status_auto()
+        # Move the period to the status its (possibly new) dates call for
+        apply_period_transitions(cursor, f"user:{session.get('user_id')}", period_id)
+        AcademicCalendar.invalidate(cursor)
+        conn.commit()
         
         cursor.close()
         
@@ -5713,6 +5462,7 @@ def archive_evaluation_period_guidance(period_id):
         
         # Archive the period (mark as archived)
         cursor.execute("UPDATE evaluation_periods SET is_archived = 1 WHERE period_id = %s", (period_id,))
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -5803,6 +5553,7 @@ def unarchive_evaluation_period_guidance(period_id):
         
         # Unarchive the period
         cursor.execute("UPDATE evaluation_periods SET is_archived = 0 WHERE period_id = %s", (period_id,))
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -5855,6 +5606,7 @@ def delete_evaluation_period_guidance(period_id):
         
         # Delete the period
         cursor.execute("DELETE FROM evaluation_periods WHERE period_id = %s", (period_id,))
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         cursor.close()
         
@@ -5888,7 +5640,7 @@ def sync_all_evaluations_guidance():
         # Get all active or upcoming periods
         cursor.execute("""
             SELECT period_id FROM evaluation_periods 
-            WHERE status IN ('Active', 'Upcoming')
+            WHERE status IN ('Active', 'Pending', 'Upcoming')
         """)
         periods = cursor.fetchall()
         
@@ -5898,30 +5650,7 @@ def sync_all_evaluations_guidance():
             period_id = period['period_id']
             
             # Create evaluations for all assigned students who don't have one yet
-            cursor.execute("""
-                INSERT INTO evaluations (period_id, section_id, student_id, status, created_at)
-                SELECT DISTINCT
-                    %s as period_id,
-                    cs.section_id,
-                    ss.student_id,
-                    'Pending' as status,
-                    NOW() as created_at
-                FROM section_students ss
-                INNER JOIN class_sections cs ON (
-                    ss.section_id = cs.section_id 
-                    OR ss.section_id = cs.section_ref_id
-                )
-                WHERE ss.status = 'Active'
-                AND cs.faculty_id IS NOT NULL
-                AND NOT EXISTS (
-                    SELECT 1 FROM evaluations ev 
-                    WHERE ev.period_id = %s 
-                    AND ev.section_id = cs.section_id 
-                    AND ev.student_id = ss.student_id
-                )
-            """, (period_id, period_id))
-            
-            total_created += cursor.rowcount
+            total_created += Evaluation.create_for_period(cursor, period_id)
         
         conn.commit()
         cursor.close()
@@ -6458,6 +6187,9 @@ def add_student_to_section(section_id):
             VALUES (%s, %s, 'Active', NOW())
         """, (section_id, student_id))
         
+        # Periods that are already Active would otherwise never include them
+        Evaluation.create_for_active_periods(cursor, student_id)
+        
         conn.commit()
         cursor.close()
         
@@ -6982,11 +6714,9 @@ def get_dashboard_stats():
             FROM (
                 SELECT 
                     f.faculty_id,
-                    ROUND(AVG(er.rating), 2) as avg_rating
+                    ROUND(SUM(fsa.rating_sum) / SUM(fsa.response_count), 2) as avg_rating
                 FROM faculty f
-                LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-                LEFT JOIN evaluations e ON cs.section_id = e.section_id AND e.status = 'Completed'
-                LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
+                JOIN faculty_score_aggregates fsa ON f.faculty_id = fsa.faculty_id
                 WHERE f.is_archived = FALSE
                 GROUP BY f.faculty_id
                 HAVING avg_rating IS NOT NULL
@@ -7006,8 +6736,8 @@ def get_dashboard_stats():
                 COUNT(DISTINCT CASE WHEN e.status = 'Completed' THEN e.evaluation_id END) as completed_evals,
                 -- Count all student evaluations (completed + pending)
                 COUNT(DISTINCT e.evaluation_id) as total_evals,
-                -- Average rating from completed evaluations only
-                ROUND(AVG(CASE WHEN e.status = 'Completed' THEN er.rating END), 2) as avg_rating,
+                -- Average rating from completed evaluations only (faculty score aggregates)
+                ROUND(MAX(program_scores.avg_rating), 2) as avg_rating,
                 -- Calculate completion percentage: completed student evaluations / total student evaluations
                 CASE 
                     WHEN COUNT(DISTINCT e.evaluation_id) > 0 THEN
@@ -7028,7 +6758,14 @@ def get_dashboard_stats():
             LEFT JOIN faculty f ON p.program_id = f.program_id AND f.is_archived = FALSE
             LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
             LEFT JOIN evaluations e ON cs.section_id = e.section_id
-            LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
+            LEFT JOIN (
+                SELECT 
+                    sf.program_id,
+                    SUM(fsa.rating_sum) / SUM(fsa.response_count) as avg_rating
+                FROM faculty_score_aggregates fsa
+                JOIN faculty sf ON fsa.faculty_id = sf.faculty_id AND sf.is_archived = FALSE
+                GROUP BY sf.program_id
+            ) program_scores ON p.program_id = program_scores.program_id
             GROUP BY p.program_id, p.name, p.program_code
             HAVING faculty_count > 0
             ORDER BY completion_percentage DESC, avg_rating DESC
@@ -7136,11 +6873,9 @@ def get_dashboard_rating_distribution():
                 FROM (
                     SELECT 
                         f.faculty_id,
-                        ROUND(AVG(er.rating), 2) as avg_rating
+                        ROUND(SUM(fsa.rating_sum) / SUM(fsa.response_count), 2) as avg_rating
                     FROM faculty f
-                    LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-                    LEFT JOIN evaluations e ON cs.section_id = e.section_id AND e.status = 'Completed'
-                    LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
+                    JOIN faculty_score_aggregates fsa ON f.faculty_id = fsa.faculty_id
                     WHERE f.is_archived = FALSE AND f.program_id = %s
                     GROUP BY f.faculty_id
                     HAVING avg_rating IS NOT NULL
@@ -7163,11 +6898,9 @@ def get_dashboard_rating_distribution():
                 FROM (
                     SELECT 
                         f.faculty_id,
-                        ROUND(AVG(er.rating), 2) as avg_rating
+                        ROUND(SUM(fsa.rating_sum) / SUM(fsa.response_count), 2) as avg_rating
                     FROM faculty f
-                    LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-                    LEFT JOIN evaluations e ON cs.section_id = e.section_id AND e.status = 'Completed'
-                    LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
+                    JOIN faculty_score_aggregates fsa ON f.faculty_id = fsa.faculty_id
                     WHERE f.is_archived = FALSE
                     GROUP BY f.faculty_id
                     HAVING avg_rating IS NOT NULL
@@ -7503,48 +7236,73 @@ def faculty_evaluation_details(faculty_id):
             period_filter = "AND e.period_id = %s"
             period_params.append(period_id)
         
-        # Get faculty basic information
-        query = f"""
-            SELECT 
-                f.faculty_id,
-                f.first_name,
-                f.last_name,
-                f.faculty_number,
-                p.name as department_name,
-                COUNT(DISTINCT e.evaluation_id) as total_evaluations,
-                COUNT(DISTINCT CASE WHEN e.status = 'Completed' THEN e.evaluation_id END) as completed_evaluations
-            FROM faculty f
-            LEFT JOIN programs p ON f.program_id = p.program_id
-            LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-            LEFT JOIN evaluations e ON cs.section_id = e.section_id
-            WHERE f.faculty_id = %s {period_filter}
-            GROUP BY f.faculty_id, f.first_name, f.last_name, f.faculty_number, p.name
-        """
+        # A single period's counts and ratings come from the cached response matrix
+        matrix = ResponseMatrix.for_period(period_id) if period_id else None
         
-        cursor.execute(query, tuple(period_params))
+        # Get faculty basic information
+        if matrix is not None:
+            cursor.execute("""
+                SELECT 
+                    f.faculty_id,
+                    f.first_name,
+                    f.last_name,
+                    f.faculty_number,
+                    p.name as department_name
+                FROM faculty f
+                LEFT JOIN programs p ON f.program_id = p.program_id
+                WHERE f.faculty_id = %s
+            """, (faculty_id,))
+            faculty = cursor.fetchone()
+            if faculty:
+                counts = matrix.evaluation_counts(faculty_id=faculty_id)
+                faculty['total_evaluations'] = counts['total']
+                faculty['completed_evaluations'] = counts['completed']
+        else:
+            query = f"""
+                SELECT 
+                    f.faculty_id,
+                    f.first_name,
+                    f.last_name,
+                    f.faculty_number,
+                    p.name as department_name,
+                    COUNT(DISTINCT e.evaluation_id) as total_evaluations,
+                    COUNT(DISTINCT CASE WHEN e.status = 'Completed' THEN e.evaluation_id END) as completed_evaluations
+                FROM faculty f
+                LEFT JOIN programs p ON f.program_id = p.program_id
+                LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
+                LEFT JOIN evaluations e ON cs.section_id = e.section_id
+                WHERE f.faculty_id = %s {period_filter}
+                GROUP BY f.faculty_id, f.first_name, f.last_name, f.faculty_number, p.name
+            """
         
-        faculty = cursor.fetchone()
+            cursor.execute(query, tuple(period_params))
+            faculty = cursor.fetchone()
         
         if not faculty:
             return jsonify({'success': False, 'message': 'Faculty not found'}), 404
         
         # Calculate overall rating with period filter
-        rating_params = [faculty_id]
-        if period_id:
-            rating_params.append(period_id)
+        if matrix is not None:
+            selection = matrix.select(faculty_id=faculty_id)
+            overall = matrix.summary(selection)
+            faculty['overall_rating'] = round(overall['mean'], 1) if overall['count'] else 0
+        else:
+            rating_params = [faculty_id]
+            if period_id:
+                rating_params.append(period_id)
+                
+            rating_query = f"""
+                SELECT AVG(er.rating) as overall_rating
+                FROM evaluation_responses er
+                JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                JOIN class_sections cs ON e.section_id = cs.section_id
+                WHERE cs.faculty_id = %s AND e.status = 'Completed' {period_filter}
+            """
             
-        rating_query = f"""
-            SELECT AVG(er.rating) as overall_rating
-            FROM evaluation_responses er
-            JOIN evaluations e ON er.evaluation_id = e.evaluation_id
-            JOIN class_sections cs ON e.section_id = cs.section_id
-            WHERE cs.faculty_id = %s AND e.status = 'Completed' {period_filter}
-        """
-        
-        cursor.execute(rating_query, tuple(rating_params))
-        
-        rating_result = cursor.fetchone()
-        faculty['overall_rating'] = round(rating_result['overall_rating'], 1) if rating_result['overall_rating'] else 0
+            cursor.execute(rating_query, tuple(rating_params))
+            
+            rating_result = cursor.fetchone()
+            faculty['overall_rating'] = round(rating_result['overall_rating'], 1) if rating_result['overall_rating'] else 0
         
         # Calculate response rate
         if faculty['total_evaluations'] > 0:
@@ -7560,6 +7318,7 @@ def faculty_evaluation_details(faculty_id):
             
         comments_query = f"""
             SELECT 
+                c.comment_id,
                 AVG(er.rating) as rating,
                 c.comment_text as comment,
                 c.sentiment,
@@ -7582,30 +7341,42 @@ def faculty_evaluation_details(faculty_id):
         comments = cursor.fetchall()
         
         # Get rating breakdown by category with period filter
-        breakdown_params = [faculty_id]
-        if period_id:
-            breakdown_params.append(period_id)
+        if matrix is not None:
+            category_names = {c['category_id']: c['category_name'] for c in matrix.criteria.values()}
+            rating_breakdown_list = [
+                {
+                    'category': category_names.get(category_id),
+                    'average': stats['mean'],
+                    'percentage': stats['mean'] / 5.0 * 100
+                }
+                for category_id, stats in matrix.group_stats('category', selection).items()
+            ]
+            rating_breakdown_list.sort(key=lambda item: item['average'], reverse=True)
+        else:
+            breakdown_params = [faculty_id]
+            if period_id:
+                breakdown_params.append(period_id)
+                
+            breakdown_query = f"""
+                SELECT 
+                    ec.name as category,
+                    AVG(er.rating) as average,
+                    (AVG(er.rating) / 5.0 * 100) as percentage
+                FROM evaluation_responses er
+                JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                JOIN class_sections cs ON e.section_id = cs.section_id
+                JOIN evaluation_criteria ecr ON er.criteria_id = ecr.criteria_id
+                JOIN evaluation_categories ec ON ecr.category_id = ec.category_id
+                WHERE cs.faculty_id = %s 
+                AND e.status = 'Completed'
+                {period_filter}
+                GROUP BY ec.category_id, ec.name
+                ORDER BY average DESC
+            """
             
-        breakdown_query = f"""
-            SELECT 
-                ec.name as category,
-                AVG(er.rating) as average,
-                (AVG(er.rating) / 5.0 * 100) as percentage
-            FROM evaluation_responses er
-            JOIN evaluations e ON er.evaluation_id = e.evaluation_id
-            JOIN class_sections cs ON e.section_id = cs.section_id
-            JOIN evaluation_criteria ecr ON er.criteria_id = ecr.criteria_id
-            JOIN evaluation_categories ec ON ecr.category_id = ec.category_id
-            WHERE cs.faculty_id = %s 
-            AND e.status = 'Completed'
-            {period_filter}
-            GROUP BY ec.category_id, ec.name
-            ORDER BY average DESC
-        """
-        
-        cursor.execute(breakdown_query, tuple(breakdown_params))
-        
-        rating_breakdown_list = cursor.fetchall()
+            cursor.execute(breakdown_query, tuple(breakdown_params))
+            
+            rating_breakdown_list = cursor.fetchall()
         
         # Convert rating breakdown to dictionary
         rating_breakdown = {}
@@ -7623,15 +7394,10 @@ def faculty_evaluation_details(faculty_id):
                 WHERE ep.period_id = %s
                 LIMIT 1
             """, (period_id,))
+            period = cursor.fetchone()
         else:
-            cursor.execute("""
-                SELECT ep.title
-                FROM evaluation_periods ep
-                WHERE ep.status = 'Active'
-                LIMIT 1
-            """)
+            period = AcademicCalendar.active_period()
         
-        period = cursor.fetchone()
         evaluation_period = period['title'] if period else 'Current Evaluation Period'
         
         # Get existing recommendation for this faculty (most recent)
@@ -7858,50 +7624,78 @@ def evaluation_criteria_results(faculty_id):
             if period_result:
                 period_status = period_result['status']
         
-        # Get overall rating
-        cursor.execute(f"""
-            SELECT AVG(er.rating) as overall_rating
-            FROM evaluation_responses er
-            JOIN evaluations e ON er.evaluation_id = e.evaluation_id
-            JOIN class_sections cs ON e.section_id = cs.section_id
-            LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
-            WHERE cs.faculty_id = %s AND e.status = 'Completed' {period_filter}
-        """, tuple(period_params))
+        # A single period's ratings come from the cached response matrix
+        matrix = ResponseMatrix.for_period(period_id) if period_id and not academic_year_id else None
+        if matrix is not None:
+            selection = matrix.select(faculty_id=faculty_id, subject_id=subject_id, section_id=section_id)
+            overall = matrix.summary(selection)
+            faculty['overall_rating'] = round(overall['mean'], 2) if overall['count'] else 0
+            
+            criteria_results = []
+            for criteria_id, stats in matrix.group_stats('criteria', selection).items():
+                criterion = matrix.criteria[criteria_id]
+                criteria_results.append({
+                    'category_id': criterion['category_id'],
+                    'category_name': criterion['category_name'],
+                    'criteria_id': criteria_id,
+                    'criteria_description': criterion['description'],
+                    'order': criterion['order'],
+                    'total_responses': stats['count'],
+                    'votes_5': stats['votes']['5'],
+                    'votes_4': stats['votes']['4'],
+                    'votes_3': stats['votes']['3'],
+                    'votes_2': stats['votes']['2'],
+                    'votes_1': stats['votes']['1'],
+                    'mean_rating': stats['mean'],
+                    'std_dev': round(stats['std_dev'], 2),
+                    'median': stats['median']
+                })
+            criteria_results.sort(key=lambda row: (row['category_id'], row['order'] or 0, row['criteria_id']))
+        else:
+            # Get overall rating
+            cursor.execute(f"""
+                SELECT AVG(er.rating) as overall_rating
+                FROM evaluation_responses er
+                JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                JOIN class_sections cs ON e.section_id = cs.section_id
+                LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
+                LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
+                WHERE cs.faculty_id = %s AND e.status = 'Completed' {period_filter}
+            """, tuple(period_params))
         
-        rating_result = cursor.fetchone()
-        faculty['overall_rating'] = round(rating_result['overall_rating'], 2) if rating_result['overall_rating'] else 0
+            rating_result = cursor.fetchone()
+            faculty['overall_rating'] = round(rating_result['overall_rating'], 2) if rating_result['overall_rating'] else 0
         
-        # Get vote distribution per criterion grouped by category
-        cursor.execute(f"""
-            SELECT 
-                ec.category_id,
-                ec.name as category_name,
-                ecr.criteria_id,
-                ecr.description as criteria_description,
-                ecr.`order`,
-                COUNT(er.response_id) as total_responses,
-                SUM(CASE WHEN er.rating = 5 THEN 1 ELSE 0 END) as votes_5,
-                SUM(CASE WHEN er.rating = 4 THEN 1 ELSE 0 END) as votes_4,
-                SUM(CASE WHEN er.rating = 3 THEN 1 ELSE 0 END) as votes_3,
-                SUM(CASE WHEN er.rating = 2 THEN 1 ELSE 0 END) as votes_2,
-                SUM(CASE WHEN er.rating = 1 THEN 1 ELSE 0 END) as votes_1,
-                AVG(er.rating) as mean_rating
-            FROM evaluation_criteria ecr
-            JOIN evaluation_categories ec ON ecr.category_id = ec.category_id
-            LEFT JOIN evaluation_responses er ON ecr.criteria_id = er.criteria_id
-            LEFT JOIN evaluations e ON er.evaluation_id = e.evaluation_id
-            LEFT JOIN class_sections cs ON e.section_id = cs.section_id
-            LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
-            WHERE (cs.faculty_id = %s OR cs.faculty_id IS NULL) 
-              AND e.status = 'Completed'
-              {period_filter}
-            GROUP BY ec.category_id, ec.name, ecr.criteria_id, ecr.description, ecr.`order`
-            ORDER BY ec.category_id, ecr.`order`, ecr.criteria_id
-        """, tuple(period_params))
+            # Get vote distribution per criterion grouped by category
+            cursor.execute(f"""
+                SELECT 
+                    ec.category_id,
+                    ec.name as category_name,
+                    ecr.criteria_id,
+                    ecr.description as criteria_description,
+                    ecr.`order`,
+                    COUNT(er.response_id) as total_responses,
+                    SUM(CASE WHEN er.rating = 5 THEN 1 ELSE 0 END) as votes_5,
+                    SUM(CASE WHEN er.rating = 4 THEN 1 ELSE 0 END) as votes_4,
+                    SUM(CASE WHEN er.rating = 3 THEN 1 ELSE 0 END) as votes_3,
+                    SUM(CASE WHEN er.rating = 2 THEN 1 ELSE 0 END) as votes_2,
+                    SUM(CASE WHEN er.rating = 1 THEN 1 ELSE 0 END) as votes_1,
+                    AVG(er.rating) as mean_rating
+                FROM evaluation_criteria ecr
+                JOIN evaluation_categories ec ON ecr.category_id = ec.category_id
+                LEFT JOIN evaluation_responses er ON ecr.criteria_id = er.criteria_id
+                LEFT JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                LEFT JOIN class_sections cs ON e.section_id = cs.section_id
+                LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
+                LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
+                WHERE (cs.faculty_id = %s OR cs.faculty_id IS NULL) 
+                  AND e.status = 'Completed'
+                  {period_filter}
+                GROUP BY ec.category_id, ec.name, ecr.criteria_id, ecr.description, ecr.`order`
+                ORDER BY ec.category_id, ecr.`order`, ecr.criteria_id
+            """, tuple(period_params))
         
-        criteria_results = cursor.fetchall()
+            criteria_results = cursor.fetchall()
         
         # Helper function to determine remarks from mean
         def get_remarks(mean):
@@ -7945,6 +7739,9 @@ def evaluation_criteria_results(faculty_id):
                 'mean': mean,
                 'remarks': get_remarks(mean) if mean > 0 else 'No Data'
             }
+            if 'std_dev' in row:
+                criterion_data['std_dev'] = row['std_dev']
+                criterion_data['median'] = row['median']
             
             categories[category_id]['criteria'].append(criterion_data)
         
@@ -7994,6 +7791,28 @@ def evaluation_criteria_results(faculty_id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+def send_export_file(file_path, download_name, mimetype, cache_key, immutable=False):
+    """
+    Send a cached export with its cache key as ETag
+    
+    Exports of closed periods cannot change any more, so browsers may keep
+    them for a day; others are revalidated against the ETag on every request.
+    """
+    from flask import send_file
+    
+    response = send_file(
+        file_path,
+        as_attachment=True,
+        download_name=download_name,
+        mimetype=mimetype,
+        etag=cache_key,
+        max_age=86400 if immutable else None
+    )
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+
 @api_bp.route('/guidance/export-evaluation-pdf/<int:faculty_id>')
 @login_required
 def export_evaluation_pdf(faculty_id):
@@ -8002,13 +7821,6 @@ def export_evaluation_pdf(faculty_id):
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     try:
-        from reportlab.lib import colors
-        from reportlab.lib.pagesizes import letter, landscape
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT
-        from flask import send_file
         import os
         from datetime import datetime
         
@@ -8053,7 +7865,7 @@ def export_evaluation_pdf(faculty_id):
         
         # Get period and year info
         cursor.execute("""
-            SELECT ep.title as period_name, ay.year_name
+            SELECT ep.title as period_name, ep.status as period_status, ay.year_name
             FROM evaluation_periods ep
             JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
             JOIN academic_years ay ON at.acad_year_id = ay.acad_year_id
@@ -8061,6 +7873,27 @@ def export_evaluation_pdf(faculty_id):
         """, (period_id,))
         period_info = cursor.fetchone()
         
+        # Reuse the rendered file while the faculty's results are unchanged
+        cache_dir = os.path.abspath(current_app.config.get('EXPORT_CACHE_DIR', os.path.join('storage', 'exports')))
+        cache_key = export_cache_key(
+            'evaluation_pdf',
+            faculty_id=faculty_id, period_id=period_id, subject_id=subject_id,
+            section_id=section_id, academic_year_id=academic_year_id,
+            signatures=[sig_faculty_x, sig_faculty_y, sig_dean_x, sig_dean_y,
+                        sig_president_x, sig_president_y],
+            labels=[faculty, subject, section, period_info],
+            results_version=FacultyScores.results_version(cursor, faculty_id, period_id),
+            questionnaire_version=Questionnaire.version(cursor)
+        )
+        period_closed = bool(period_info) and period_info['period_status'] == 'Closed'
+        filename = f"Evaluation_Report_{faculty['last_name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        
+        cached_path = cached_export(cache_dir, cache_key, 'pdf')
+        if cached_path:
+            cursor.close()
+            conn.close()
+            return send_export_file(cached_path, filename, 'application/pdf', cache_key, period_closed)
+        
         # Build filters
         filters = []
         params = [faculty_id]
@@ -8082,7 +7915,7 @@ def export_evaluation_pdf(faculty_id):
         if filters:
             period_filter = "AND " + " AND ".join(filters)
         
-        # Get evaluation data (same query as the main results)
+        # Rating counts per criterion (same filters as the main results)
         cursor.execute(f"""
             SELECT 
                 c.category_id,
@@ -8092,7 +7925,7 @@ def export_evaluation_pdf(faculty_id):
                 cr.description,
                 cr.order as criterion_order,
                 er.rating,
-                e.evaluation_id
+                COUNT(*) as count
             FROM evaluation_categories c
             LEFT JOIN evaluation_criteria cr ON c.category_id = cr.category_id
             LEFT JOIN evaluation_responses er ON cr.criteria_id = er.criteria_id
@@ -8103,86 +7936,11 @@ def export_evaluation_pdf(faculty_id):
             WHERE cs.faculty_id = %s 
               AND e.status = 'Completed'
               {period_filter}
+            GROUP BY c.category_id, cr.criteria_id, er.rating
             ORDER BY c.display_order, cr.order
         """, tuple(params))
         
-        results = cursor.fetchall()
-        
-        # Process data into categories
-        categories = {}
-        for row in results:
-            category_id = row['category_id']
-            if category_id not in categories:
-                categories[category_id] = {
-                    'category_id': category_id,
-                    'category_name': row['category_name'],
-                    'category_order': row['category_order'],
-                    'criteria': []
-                }
-            
-            if row['criterion_id']:
-                criterion_id = row['criterion_id']
-                existing_criterion = next((c for c in categories[category_id]['criteria'] if c['criterion_id'] == criterion_id), None)
-                
-                if not existing_criterion:
-                    criterion_data = {
-                        'criterion_id': criterion_id,
-                        'description': row['description'],
-                        'criterion_order': row['criterion_order'],
-                        'votes': {'5': 0, '4': 0, '3': 0, '2': 0, '1': 0},
-                        'total_responses': 0,
-                        'mean': 0,
-                        'remarks': 'No Data'
-                    }
-                    categories[category_id]['criteria'].append(criterion_data)
-                    existing_criterion = criterion_data
-                
-                if row['rating']:
-                    rating_str = str(int(row['rating']))
-                    existing_criterion['votes'][rating_str] = existing_criterion['votes'].get(rating_str, 0) + 1
-                    existing_criterion['total_responses'] += 1
-        
-        # Calculate means
-        for category in categories.values():
-            for criterion in category['criteria']:
-                if criterion['total_responses'] > 0:
-                    total_score = sum(int(rating) * count for rating, count in criterion['votes'].items())
-                    criterion['mean'] = total_score / criterion['total_responses']
-                    
-                    if criterion['mean'] >= 4.50:
-                        criterion['remarks'] = 'OUTSTANDING'
-                    elif criterion['mean'] >= 3.50:
-                        criterion['remarks'] = 'HIGHLY SATISFACTORY'
-                    elif criterion['mean'] >= 2.50:
-                        criterion['remarks'] = 'SATISFACTORY'
-                    elif criterion['mean'] >= 1.50:
-                        criterion['remarks'] = 'NEEDS IMPROVEMENT'
-                    else:
-                        criterion['remarks'] = 'POOR'
-        
-        categories_list = list(categories.values())
-        
-        # Calculate overall rating
-        total_mean = 0
-        total_criteria = 0
-        for category in categories_list:
-            for criterion in category['criteria']:
-                if criterion['total_responses'] > 0:
-                    total_mean += criterion['mean']
-                    total_criteria += 1
-        
-        overall_mean = total_mean / total_criteria if total_criteria > 0 else 0
-        
-        if overall_mean >= 4.50:
-            overall_remarks = 'OUTSTANDING'
-        elif overall_mean >= 3.50:
-            overall_remarks = 'HIGHLY SATISFACTORY'
-        elif overall_mean >= 2.50:
-            overall_remarks = 'SATISFACTORY'
-        elif overall_mean >= 1.50:
-            overall_remarks = 'NEEDS IMPROVEMENT'
-        else:
-            overall_remarks = 'POOR'
+        results = group_faculty_results(cursor.fetchall())
         
         # Get comments
         cursor.execute(f"""
@@ -8207,189 +7965,21 @@ def export_evaluation_pdf(faculty_id):
         conn.close()
         
         # Generate PDF
-        filename = f"Evaluation_Report_{faculty['last_name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        filepath = os.path.join('static', 'reports', filename)
+        filepath = export_temp_path(cache_dir, 'pdf')
+        
+        render_evaluation_pdf(
+            {'faculty': faculty, 'subject': subject, 'section': section, 'period_info': period_info,
+             'comments': unique_comments, **results},
+            filepath,
+            signatures={
+                'faculty_x': sig_faculty_x, 'faculty_y': sig_faculty_y,
+                'dean_x': sig_dean_x, 'dean_y': sig_dean_y,
+                'president_x': sig_president_x, 'president_y': sig_president_y
+            }
+        )
+        filepath = store_export(cache_dir, cache_key, 'pdf', filepath)
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        
-        doc = SimpleDocTemplate(filepath, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Add logo and header
-        logo_path = os.path.join('static', 'images', 'nclogo.png')
-        if os.path.exists(logo_path):
-            logo = Image(logo_path, width=0.8*inch, height=0.8*inch)
-            elements.append(logo)
-        
-        # Title
-        title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=12, textColor=colors.black, spaceAfter=6, alignment=TA_CENTER, fontName='Times-Bold')
-        elements.append(Paragraph('NORZAGARAY COLLEGE', title_style))
-        elements.append(Paragraph('Municipal Compound, Norzagaray, Bulacan', ParagraphStyle('Subtitle', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER)))
-        elements.append(Paragraph('GUIDANCE AND COUNSELING CENTER', ParagraphStyle('Subtitle2', parent=styles['Normal'], fontSize=10, fontName='Times-Bold', alignment=TA_CENTER, spaceAfter=6)))
-        elements.append(Paragraph('FACULTY TEACHING PERFORMANCE EVALUATION SUMMARY REPORT', ParagraphStyle('Subtitle3', parent=styles['Normal'], fontSize=9, alignment=TA_CENTER, spaceAfter=3)))
-        
-        if period_info:
-            # Remove any status text (Active), (Closed), etc. from period name using regex
-            import re
-            period_name = re.sub(r'\s*\([^)]*\)\s*$', '', period_info['period_name']).strip()
-            elements.append(Paragraph(f"{period_name}, A.Y. {period_info['year_name']}", ParagraphStyle('Period', parent=styles['Normal'], fontSize=9, alignment=TA_CENTER, spaceAfter=6)))
-        
-        # Add section info to print header if section is selected
-        if section:
-            elements.append(Paragraph(f"Section: {section['section_name']}", ParagraphStyle('Section', parent=styles['Normal'], fontSize=9, alignment=TA_CENTER, spaceAfter=12)))
-        else:
-            elements.append(Spacer(1, 0.1*inch))
-        
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Faculty info
-        elements.append(Paragraph(f"<b>Faculty Name:</b> {faculty['first_name']} {faculty['last_name']}", styles['Normal']))
-        if subject:
-            elements.append(Paragraph(f"<b>Subject:</b> {subject['subject_code']} - {subject['title']}", styles['Normal']))
-        if section:
-            elements.append(Paragraph(f"<b>Section:</b> {section['section_name']}", styles['Normal']))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Build results tables
-        for category in categories_list:
-            # Category header
-            elements.append(Paragraph(f"<b>{category['category_name']}</b>", ParagraphStyle('CategoryHeader', parent=styles['Heading2'], fontSize=11, fontName='Times-Bold', spaceAfter=6)))
-            
-            # Criteria table
-            table_data = [['No.', 'Performance Indicators', '5', '4', '3', '2', '1', 'Mean', 'Remarks']]
-            
-            # Create paragraph styles for table cells
-            cell_style = ParagraphStyle('CellStyle', parent=styles['Normal'], fontSize=8, leading=10)
-            remarks_style = ParagraphStyle('RemarksStyle', parent=styles['Normal'], fontSize=7, leading=9, alignment=TA_CENTER)
-            
-            for idx, criterion in enumerate(category['criteria'], 1):
-                # Wrap remarks text in Paragraph for text wrapping
-                remarks_text = criterion['remarks'] if criterion['total_responses'] > 0 else 'NO DATA'
-                
-                table_data.append([
-                    str(idx),
-                    Paragraph(criterion['description'], cell_style),
-                    str(criterion['votes']['5']),
-                    str(criterion['votes']['4']),
-                    str(criterion['votes']['3']),
-                    str(criterion['votes']['2']),
-                    str(criterion['votes']['1']),
-                    f"{criterion['mean']:.2f}" if criterion['total_responses'] > 0 else 'N/A',
-                    Paragraph(remarks_text, remarks_style)
-                ])
-            
-            # Adjusted column widths to give more space to remarks while keeping everything on one page
-            table = Table(table_data, colWidths=[0.3*inch, 2.8*inch, 0.35*inch, 0.35*inch, 0.35*inch, 0.35*inch, 0.35*inch, 0.5*inch, 1.0*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('ALIGN', (1, 1), (1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Times-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('FONTSIZE', (0, 1), (-1, -1), 7),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                ('TOPPADDING', (0, 1), (-1, -1), 4),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-                ('LEFTPADDING', (0, 0), (-1, -1), 3),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ]))
-            
-            elements.append(table)
-            elements.append(Spacer(1, 0.15*inch))
-        
-        # Comments section
-        if unique_comments:
-            elements.append(Paragraph('<b>COMMENTS:</b>', ParagraphStyle('CommentsHeader', parent=styles['Heading3'], fontSize=10, fontName='Times-Bold', spaceAfter=6)))
-            for idx, comment in enumerate(unique_comments, 1):
-                elements.append(Paragraph(f"{idx}. {comment}", ParagraphStyle('Comment', parent=styles['Normal'], fontSize=9, leftIndent=20, spaceAfter=4)))
-            elements.append(Spacer(1, 0.2*inch))
-        
-        # Rating scale
-        elements.append(Paragraph('<b>RATING SCALE:</b>', ParagraphStyle('RatingHeader', parent=styles['Heading3'], fontSize=10, fontName='Times-Bold', spaceAfter=6)))
-        rating_data = [
-            ['Rating', 'Equivalent', 'Total:', f"{total_mean:.2f}"],
-            ['4.50 - 5.00', 'OUTSTANDING', 'Rating:', f"{overall_mean:.2f}"],
-            ['3.50 - 4.49', 'HIGHLY SATISFACTORY', 'Remarks:', overall_remarks],
-            ['2.50 - 3.49', 'SATISFACTORY', '', ''],
-            ['1.50 - 2.49', 'NEEDS IMPROVEMENT', '', ''],
-            ['1.00 - 1.49', 'POOR', '', '']
-        ]
-        
-        rating_table = Table(rating_data, colWidths=[1.5*inch, 2*inch, 1.2*inch, 1.5*inch])
-        rating_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Times-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('SPAN', (2, 3), (3, 5)),
-        ]))
-        
-        elements.append(rating_table)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Signatures with custom positioning
-        # Convert percentage to actual spacing (max available space ~4 inches after rating table)
-        max_signature_space = 4.0  # inches available for signature positioning
-        
-        # Calculate vertical spacing based on Y percentages
-        faculty_spacing = (sig_faculty_y / 100.0) * max_signature_space
-        dean_spacing = ((sig_dean_y - sig_faculty_y) / 100.0) * max_signature_space
-        president_spacing = ((sig_president_y - sig_dean_y) / 100.0) * max_signature_space
-        
-        # Determine horizontal alignment based on X percentage
-        # 0-33% = LEFT, 33-66% = CENTER, 66-100% = RIGHT
-        def get_alignment(x_percent):
-            print(f"X Percent: {x_percent}")
-            if x_percent < 33:
-                print("  -> LEFT alignment")
-                return TA_LEFT
-            elif x_percent < 66:
-                print("  -> CENTER alignment")
-                return TA_CENTER
-            else:
-                print("  -> RIGHT alignment")
-                return 2  # TA_RIGHT value
-        
-        print(f"\n=== Signature Positioning Debug ===")
-        print(f"Faculty X: {sig_faculty_x}%, Y: {sig_faculty_y}%")
-        print(f"Dean X: {sig_dean_x}%, Y: {sig_dean_y}%")
-        print(f"President X: {sig_president_x}%, Y: {sig_president_y}%")
-        
-        faculty_align = get_alignment(sig_faculty_x)
-        dean_align = get_alignment(sig_dean_x)
-        president_align = get_alignment(sig_president_x)
-        
-        print(f"Final alignments - Faculty: {faculty_align}, Dean: {dean_align}, President: {president_align}")
-        print(f"=== End Debug ===\n")
-        
-        # Faculty Signature
-        elements.append(Spacer(1, faculty_spacing * inch))
-        elements.append(Paragraph('_' * 50, ParagraphStyle('SigLine1', parent=styles['Normal'], alignment=faculty_align)))
-        elements.append(Paragraph('<b>SIGNATURE OF FACULTY</b>', ParagraphStyle('Sig', parent=styles['Normal'], fontSize=9, spaceAfter=12, alignment=faculty_align)))
-        
-        # Dean Signature
-        elements.append(Spacer(1, dean_spacing * inch))
-        elements.append(Paragraph('_' * 50, ParagraphStyle('SigLine2', parent=styles['Normal'], alignment=dean_align)))
-        elements.append(Paragraph('<b>SIGNATURE OF COLLEGE DEAN</b>', ParagraphStyle('Sig2', parent=styles['Normal'], fontSize=9, spaceAfter=12, alignment=dean_align)))
-        
-        # President Signature
-        elements.append(Spacer(1, president_spacing * inch))
-        elements.append(Paragraph('<b>NOTED BY:</b>', ParagraphStyle('Noted', parent=styles['Normal'], fontSize=9, fontName='Times-Bold', spaceAfter=6, alignment=president_align)))
-        elements.append(Paragraph('<b>MA. LIBERTY DG. PASCUAL, Ph.D.</b>', ParagraphStyle('Name', parent=styles['Normal'], fontSize=10, fontName='Times-Bold', alignment=president_align)))
-        elements.append(Paragraph('College President', ParagraphStyle('Title', parent=styles['Normal'], alignment=president_align)))
-        
-        # Build PDF
-        doc.build(elements)
-        
-        return send_file(filepath, as_attachment=True, download_name=filename, mimetype='application/pdf')
+        return send_export_file(filepath, filename, 'application/pdf', cache_key, period_closed)
         
     except Exception as e:
         print(f"Error exporting to PDF: {str(e)}")
@@ -8406,10 +7996,6 @@ def export_evaluation_excel(faculty_id):
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     try:
-        import openpyxl
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-        from openpyxl.utils import get_column_letter
-        from flask import send_file
         import os
         from datetime import datetime
         
@@ -8444,7 +8030,7 @@ def export_evaluation_excel(faculty_id):
         
         # Get period and year info
         cursor.execute("""
-            SELECT ep.title as period_name, ay.year_name
+            SELECT ep.title as period_name, ep.status as period_status, ay.year_name
             FROM evaluation_periods ep
             JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
             JOIN academic_years ay ON at.acad_year_id = ay.acad_year_id
@@ -8452,6 +8038,25 @@ def export_evaluation_excel(faculty_id):
         """, (period_id,))
         period_info = cursor.fetchone()
         
+        # Reuse the rendered file while the faculty's results are unchanged
+        cache_dir = os.path.abspath(current_app.config.get('EXPORT_CACHE_DIR', os.path.join('storage', 'exports')))
+        cache_key = export_cache_key(
+            'evaluation_excel',
+            faculty_id=faculty_id, period_id=period_id, subject_id=subject_id,
+            section_id=section_id, academic_year_id=academic_year_id,
+            labels=[faculty, subject, section, period_info],
+            results_version=FacultyScores.results_version(cursor, faculty_id, period_id),
+            questionnaire_version=Questionnaire.version(cursor)
+        )
+        period_closed = bool(period_info) and period_info['period_status'] == 'Closed'
+        filename = f"Evaluation_Report_{faculty['last_name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        
+        cached_path = cached_export(cache_dir, cache_key, 'xlsx')
+        if cached_path:
+            cursor.close()
+            conn.close()
+            return send_export_file(cached_path, filename, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', cache_key, period_closed)
+        
         # Build filters (same as PDF)
         filters = []
         params = [faculty_id]
@@ -8473,7 +8078,7 @@ def export_evaluation_excel(faculty_id):
         if filters:
             period_filter = "AND " + " AND ".join(filters)
         
-        # Get evaluation data
+        # Rating counts per criterion (same filters as the main results)
         cursor.execute(f"""
             SELECT 
                 c.category_id,
@@ -8483,7 +8088,7 @@ def export_evaluation_excel(faculty_id):
                 cr.description,
                 cr.order as criterion_order,
                 er.rating,
-                e.evaluation_id
+                COUNT(*) as count
             FROM evaluation_categories c
             LEFT JOIN evaluation_criteria cr ON c.category_id = cr.category_id
             LEFT JOIN evaluation_responses er ON cr.criteria_id = er.criteria_id
@@ -8494,82 +8099,11 @@ def export_evaluation_excel(faculty_id):
             WHERE cs.faculty_id = %s 
               AND e.status = 'Completed'
               {period_filter}
+            GROUP BY c.category_id, cr.criteria_id, er.rating
             ORDER BY c.display_order, cr.order
         """, tuple(params))
         
-        results = cursor.fetchall()
-        
-        # Process data
-        categories = {}
-        for row in results:
-            category_id = row['category_id']
-            if category_id not in categories:
-                categories[category_id] = {
-                    'category_id': category_id,
-                    'category_name': row['category_name'],
-                    'category_order': row['category_order'],
-                    'criteria': []
-                }
-            
-            if row['criterion_id']:
-                criterion_id = row['criterion_id']
-                existing_criterion = next((c for c in categories[category_id]['criteria'] if c['criterion_id'] == criterion_id), None)
-                
-                if not existing_criterion:
-                    criterion_data = {
-                        'criterion_id': criterion_id,
-                        'description': row['description'],
-                        'criterion_order': row['criterion_order'],
-                        'votes': {'5': 0, '4': 0, '3': 0, '2': 0, '1': 0},
-                        'total_responses': 0,
-                        'mean': 0,
-                        'remarks': 'No Data'
-                    }
-                    categories[category_id]['criteria'].append(criterion_data)
-                    existing_criterion = criterion_data
-                
-                if row['rating']:
-                    rating_str = str(int(row['rating']))
-                    existing_criterion['votes'][rating_str] = existing_criterion['votes'].get(rating_str, 0) + 1
-                    existing_criterion['total_responses'] += 1
-        
-        # Calculate means
-        total_mean = 0
-        total_criteria = 0
-        
-        for category in categories.values():
-            for criterion in category['criteria']:
-                if criterion['total_responses'] > 0:
-                    total_score = sum(int(rating) * count for rating, count in criterion['votes'].items())
-                    criterion['mean'] = total_score / criterion['total_responses']
-                    total_mean += criterion['mean']
-                    total_criteria += 1
-                    
-                    if criterion['mean'] >= 4.50:
-                        criterion['remarks'] = 'OUTSTANDING'
-                    elif criterion['mean'] >= 3.50:
-                        criterion['remarks'] = 'HIGHLY SATISFACTORY'
-                    elif criterion['mean'] >= 2.50:
-                        criterion['remarks'] = 'SATISFACTORY'
-                    elif criterion['mean'] >= 1.50:
-                        criterion['remarks'] = 'NEEDS IMPROVEMENT'
-                    else:
-                        criterion['remarks'] = 'POOR'
-        
-        categories_list = list(categories.values())
-        
-        overall_mean = total_mean / total_criteria if total_criteria > 0 else 0
-        
-        if overall_mean >= 4.50:
-            overall_remarks = 'OUTSTANDING'
-        elif overall_mean >= 3.50:
-            overall_remarks = 'HIGHLY SATISFACTORY'
-        elif overall_mean >= 2.50:
-            overall_remarks = 'SATISFACTORY'
-        elif overall_mean >= 1.50:
-            overall_remarks = 'NEEDS IMPROVEMENT'
-        else:
-            overall_remarks = 'POOR'
+        results = group_faculty_results(cursor.fetchall())
         
         # Get comments
         cursor.execute(f"""
@@ -8593,322 +8127,16 @@ def export_evaluation_excel(faculty_id):
         cursor.close()
         conn.close()
         
-        # Create Excel file
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Evaluation Report"
-        
-        # Styles
-        header_font = Font(name='Times New Roman', size=14, bold=True)
-        subheader_font = Font(name='Times New Roman', size=11, bold=True)
-        normal_font = Font(name='Times New Roman', size=10)
-        bold_font = Font(name='Times New Roman', size=10, bold=True)
-        
-        center_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        left_alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
-        
-        gray_fill = PatternFill(start_color='E5E7EB', end_color='E5E7EB', fill_type='solid')
-        
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
+        # Create Excel file in the export cache
+        filepath = export_temp_path(cache_dir, 'xlsx')
+        render_evaluation_excel(
+            {'faculty': faculty, 'subject': subject, 'section': section, 'period_info': period_info,
+             'comments': unique_comments, **results},
+            filepath
         )
+        filepath = store_export(cache_dir, cache_key, 'xlsx', filepath)
         
-        # Add logo at the top
-        row = 1
-        try:
-            from openpyxl.drawing.image import Image as XLImage
-            logo_path = os.path.join('static', 'images', 'nclogo.png')
-            if os.path.exists(logo_path):
-                img = XLImage(logo_path)
-                # Make logo bigger (100x100 pixels)
-                img.width = 100
-                img.height = 100
-                # Position the logo in column C-D area (left side, as shown in the format)
-                ws.add_image(img, f'C{row}')
-                # Set row heights to accommodate larger logo - reduced spacing to lower the logo
-                ws.row_dimensions[row].height = 75
-                ws.row_dimensions[row + 1].height = 3
-                ws.row_dimensions[row + 2].height = 3
-                # Add less space for the image to position it lower
-                row += 3
-        except Exception as e:
-            print(f"Could not add logo: {e}")
-            pass
-        
-        # Header section
-        ws.merge_cells(f'A{row}:I{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'NORZAGARAY COLLEGE'
-        cell.font = Font(name='Times New Roman', size=12, bold=True)
-        cell.alignment = center_alignment
-        row += 1
-        
-        ws.merge_cells(f'A{row}:I{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'Municipal Compound, Norzagaray, Bulacan'
-        cell.font = normal_font
-        cell.alignment = center_alignment
-        row += 1
-        
-        ws.merge_cells(f'A{row}:I{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'GUIDANCE AND COUNSELING CENTER'
-        cell.font = Font(name='Times New Roman', size=10, bold=True)
-        cell.alignment = center_alignment
-        row += 1
-        
-        ws.merge_cells(f'A{row}:I{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'FACULTY TEACHING PERFORMANCE EVALUATION SUMMARY REPORT'
-        cell.font = Font(name='Times New Roman', size=9)
-        cell.alignment = center_alignment
-        row += 1
-        
-        if period_info:
-            # Remove any status text (Active), (Closed), etc. from period name using regex
-            import re
-            period_name = re.sub(r'\s*\([^)]*\)\s*$', '', period_info['period_name']).strip()
-            ws.merge_cells(f'A{row}:I{row}')
-            cell = ws[f'A{row}']
-            cell.value = f"{period_name}, A.Y. {period_info['year_name']}"
-            cell.font = Font(name='Times New Roman', size=9)
-            cell.alignment = center_alignment
-            row += 1
-        
-        # Add section info to print header if section is selected
-        if section:
-            ws.merge_cells(f'A{row}:I{row}')
-            cell = ws[f'A{row}']
-            cell.value = f"Section: {section['section_name']}"
-            cell.font = Font(name='Times New Roman', size=9)
-            cell.alignment = center_alignment
-            row += 1
-        
-        row += 1  # Empty row
-        
-        # Faculty info
-        ws[f'A{row}'] = f"Faculty Name: {faculty['first_name']} {faculty['last_name']}"
-        ws[f'A{row}'].font = bold_font
-        row += 1
-        
-        if subject:
-            ws[f'A{row}'] = f"Subject: {subject['subject_code']} - {subject['title']}"
-            ws[f'A{row}'].font = bold_font
-            row += 1
-        
-        if section:
-            ws[f'A{row}'] = f"Section: {section['section_name']}"
-            ws[f'A{row}'].font = bold_font
-            row += 1
-        
-        row += 1  # Empty row
-        
-        # Categories and criteria
-        for category in categories_list:
-            # Category header
-            ws.merge_cells(f'A{row}:I{row}')
-            cell = ws[f'A{row}']
-            cell.value = category['category_name']
-            cell.font = subheader_font
-            cell.fill = gray_fill
-            cell.alignment = left_alignment
-            cell.border = thin_border
-            row += 1
-            
-            # Table headers
-            headers = ['No.', 'Performance Indicators', '5', '4', '3', '2', '1', 'Mean', 'Remarks']
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=row, column=col)
-                cell.value = header
-                cell.font = bold_font
-                cell.fill = gray_fill
-                cell.alignment = center_alignment
-                cell.border = thin_border
-            row += 1
-            
-            # Criteria data
-            for idx, criterion in enumerate(category['criteria'], 1):
-                ws.cell(row=row, column=1).value = idx
-                ws.cell(row=row, column=2).value = criterion['description']
-                ws.cell(row=row, column=3).value = criterion['votes']['5']
-                ws.cell(row=row, column=4).value = criterion['votes']['4']
-                ws.cell(row=row, column=5).value = criterion['votes']['3']
-                ws.cell(row=row, column=6).value = criterion['votes']['2']
-                ws.cell(row=row, column=7).value = criterion['votes']['1']
-                ws.cell(row=row, column=8).value = f"{criterion['mean']:.2f}" if criterion['total_responses'] > 0 else 'N/A'
-                ws.cell(row=row, column=9).value = criterion['remarks']
-                
-                for col in range(1, 10):
-                    cell = ws.cell(row=row, column=col)
-                    cell.font = normal_font
-                    cell.border = thin_border
-                    if col == 2:
-                        cell.alignment = left_alignment
-                    else:
-                        cell.alignment = center_alignment
-                
-                row += 1
-            
-            row += 1  # Empty row between categories
-        
-        # Comments
-        if unique_comments:
-            ws.merge_cells(f'A{row}:I{row}')
-            cell = ws[f'A{row}']
-            cell.value = 'COMMENTS:'
-            cell.font = subheader_font
-            cell.alignment = left_alignment
-            row += 1
-            
-            for idx, comment in enumerate(unique_comments, 1):
-                ws.merge_cells(f'A{row}:I{row}')
-                cell = ws[f'A{row}']
-                cell.value = f"{idx}. {comment}"
-                cell.font = normal_font
-                cell.alignment = left_alignment
-                row += 1
-            
-            row += 1
-        
-        # Rating scale
-        ws.merge_cells(f'A{row}:I{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'RATING SCALE:'
-        cell.font = subheader_font
-        cell.alignment = left_alignment
-        row += 1
-        
-        # Rating table
-        rating_headers = [['Rating', 'Equivalent', 'Total:', f"{total_mean:.2f}"]]
-        rating_data = [
-            ['4.50 - 5.00', 'OUTSTANDING', 'Rating:', f"{overall_mean:.2f}"],
-            ['3.50 - 4.49', 'HIGHLY SATISFACTORY', 'Remarks:', overall_remarks],
-            ['2.50 - 3.49', 'SATISFACTORY', '', ''],
-            ['1.50 - 2.49', 'NEEDS IMPROVEMENT', '', ''],
-            ['1.00 - 1.49', 'POOR', '', '']
-        ]
-        
-        for data_row in rating_headers + rating_data:
-            for col, value in enumerate(data_row, 1):
-                cell = ws.cell(row=row, column=col)
-                cell.value = value
-                cell.font = bold_font if row == (row - len(rating_data) - len(rating_headers) + 1) else normal_font
-                cell.fill = gray_fill if row == (row - len(rating_data) - len(rating_headers) + 1) else PatternFill()
-                cell.alignment = center_alignment
-                cell.border = thin_border
-            row += 1
-        
-        row += 2  # Empty rows before signatures
-        
-        # Signature section
-        # Signature of Faculty
-        ws.merge_cells(f'A{row}:C{row}')
-        cell = ws[f'A{row}']
-        cell.value = '________________________________'
-        cell.alignment = left_alignment
-        row += 1
-        
-        ws.merge_cells(f'A{row}:C{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'SIGNATURE OF FACULTY'
-        cell.font = bold_font
-        cell.alignment = left_alignment
-        row += 2
-        
-        # Signature of College Dean
-        ws.merge_cells(f'A{row}:C{row}')
-        cell = ws[f'A{row}']
-        cell.value = '________________________________'
-        cell.alignment = left_alignment
-        row += 1
-        
-        ws.merge_cells(f'A{row}:C{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'SIGNATURE OF COLLEGE DEAN'
-        cell.font = bold_font
-        cell.alignment = left_alignment
-        row += 2
-        
-        # Noted by section
-        ws.merge_cells(f'A{row}:C{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'NOTED BY:'
-        cell.font = bold_font
-        cell.alignment = left_alignment
-        row += 2
-        
-        ws.merge_cells(f'A{row}:C{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'MA. LIBERTY DG. PASCUAL, Ph.D.'
-        cell.font = bold_font
-        cell.alignment = left_alignment
-        row += 1
-        
-        ws.merge_cells(f'A{row}:C{row}')
-        cell = ws[f'A{row}']
-        cell.value = 'College President'
-        cell.font = normal_font
-        cell.alignment = left_alignment
-        row += 1
-        
-        # Column widths
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 50
-        ws.column_dimensions['C'].width = 8
-        ws.column_dimensions['D'].width = 8
-        ws.column_dimensions['E'].width = 8
-        ws.column_dimensions['F'].width = 8
-        ws.column_dimensions['G'].width = 8
-        ws.column_dimensions['H'].width = 12
-        ws.column_dimensions['I'].width = 20
-        
-        # Configure page setup for printing
-        ws.page_setup.orientation = ws.ORIENTATION_PORTRAIT
-        ws.page_setup.paperSize = ws.PAPERSIZE_LETTER
-        ws.page_setup.fitToPage = True
-        ws.page_setup.fitToHeight = 0  # Fit all rows on pages
-        ws.page_setup.fitToWidth = 1   # Fit to one page wide
-        
-        # Set print margins (in inches)
-        ws.page_margins.left = 0.5
-        ws.page_margins.right = 0.5
-        ws.page_margins.top = 0.75
-        ws.page_margins.bottom = 0.75
-        ws.page_margins.header = 0.3
-        ws.page_margins.footer = 0.3
-        
-        # Set print area (from A1 to last used cell)
-        ws.print_area = f'A1:I{row}'
-        
-        # Center on page when printing
-        ws.page_setup.horizontalCentered = True
-        
-        # Print gridlines for better readability
-        ws.print_options.gridLines = False
-        ws.print_options.headings = False
-        
-        # Scale to fit (80% scale for better readability)
-        ws.page_setup.scale = 85
-        ws.sheet_properties.pageSetUpPr.fitToPage = True
-        
-        # Print title rows (repeat header on each page if document spans multiple pages)
-        # This will repeat the first 6 rows (logo and headers) on each printed page
-        ws.print_title_rows = '1:6'
-        
-        # Set print quality
-        ws.page_setup.printQuality = 600
-        
-        # Save file
-        filename = f"Evaluation_Report_{faculty['last_name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        filepath = os.path.join('static', 'reports', filename)
-        
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        wb.save(filepath)
-        
-        return send_file(filepath, as_attachment=True, download_name=filename, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        return send_export_file(filepath, filename, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', cache_key, period_closed)
         
     except Exception as e:
         print(f"Error exporting to Excel: {str(e)}")
@@ -8917,6 +8145,90 @@ def export_evaluation_excel(faculty_id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+@api_bp.route('/guidance/bulk-exports', methods=['POST'])
+@login_required
+def create_bulk_export():
+    """Queue a ZIP of every faculty's evaluation report for a period (optionally one department)"""
+    if session.get('role') != 'guidance':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    
+    from utils.bulk_exports import enqueue_bulk_export, ensure_bulk_export_worker
+    
+    data = request.get_json() or {}
+    period_id = data.get('period_id')
+    program_id = data.get('program_id') or data.get('department_id')
+    file_format = data.get('file_format', 'pdf')
+    
+    if not period_id:
+        return jsonify({'success': False, 'message': 'Evaluation period is required'}), 400
+    if file_format not in ('pdf', 'excel'):
+        return jsonify({'success': False, 'message': 'File format must be pdf or excel'}), 400
+    
+    job_id = enqueue_bulk_export(period_id, program_id, file_format, session.get('user_id'))
+    if not job_id:
+        return jsonify({'success': False, 'message': 'Failed to queue bulk export'}), 500
+    
+    ensure_bulk_export_worker(current_app._get_current_object())
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f"/api/guidance/bulk-exports/{job_id}"
+    }), 202
+
+
+@api_bp.route('/guidance/bulk-exports/<job_id>', methods=['GET'])
+@login_required
+def get_bulk_export_status(job_id):
+    """Get the progress of a bulk export job"""
+    if session.get('role') != 'guidance':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    
+    from utils.bulk_exports import get_bulk_export, ensure_bulk_export_worker
+    
+    job = get_bulk_export(job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Bulk export not found'}), 404
+    
+    # Resume the queue if the process that accepted the job has since restarted
+    if job['status'] in ('queued', 'running'):
+        ensure_bulk_export_worker(current_app._get_current_object())
+    
+    job.pop('file_path', None)
+    if job['status'] == 'completed':
+        job['download_url'] = f"/api/guidance/bulk-exports/{job_id}/download"
+        job['file_size_formatted'] = format_file_size(job['file_size'])
+    
+    return jsonify({'success': True, 'job': job})
+
+
+@api_bp.route('/guidance/bulk-exports/<job_id>/download', methods=['GET'])
+@login_required
+def download_bulk_export(job_id):
+    """Download the ZIP of a completed bulk export"""
+    from flask import send_file
+    import os
+    from utils.bulk_exports import get_bulk_export
+    
+    if session.get('role') != 'guidance':
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    
+    job = get_bulk_export(job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Bulk export not found'}), 404
+    if job['status'] != 'completed' or not job['file_path'] or not os.path.exists(job['file_path']):
+        return jsonify({'success': False, 'status': job['status'],
+                        'message': 'Bulk export is not ready'}), 409
+    
+    return send_file(
+        job['file_path'],
+        as_attachment=True,
+        download_name=f"Evaluation_Reports_{job['created_at'].strftime('%Y%m%d_%H%M%S')}.zip",
+        mimetype='application/zip'
+    )
+
+
 @api_bp.route('/guidance/department-analysis/<int:department_id>')
 @login_required
 def department_analysis(department_id):
@@ -8958,38 +8270,76 @@ def department_analysis(department_id):
             if period_result:
                 period_status = period_result['status']
             
-            # Get vote distribution per criterion for ALL faculty in this department
-            cursor.execute("""
-                SELECT 
-                    ec.category_id,
-                    ec.name as category_name,
-                    ecr.criteria_id,
-                    ecr.description as criteria_description,
-                    ecr.`order`,
-                    COUNT(er.response_id) as total_responses,
-                    SUM(CASE WHEN er.rating = 5 THEN 1 ELSE 0 END) as votes_5,
-                    SUM(CASE WHEN er.rating = 4 THEN 1 ELSE 0 END) as votes_4,
-                    SUM(CASE WHEN er.rating = 3 THEN 1 ELSE 0 END) as votes_3,
-                    SUM(CASE WHEN er.rating = 2 THEN 1 ELSE 0 END) as votes_2,
-                    SUM(CASE WHEN er.rating = 1 THEN 1 ELSE 0 END) as votes_1,
-                    AVG(er.rating) as mean_rating
-                FROM evaluation_criteria ecr
-                JOIN evaluation_categories ec ON ecr.category_id = ec.category_id
-                LEFT JOIN evaluation_responses er ON ecr.criteria_id = er.criteria_id
-                LEFT JOIN evaluations e ON er.evaluation_id = e.evaluation_id
-                LEFT JOIN class_sections cs ON e.section_id = cs.section_id
-                LEFT JOIN faculty f ON cs.faculty_id = f.faculty_id
-                LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
-                LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
-                WHERE f.program_id = %s
-                  AND at.acad_year_id = %s
-                  AND e.period_id = %s
-                  AND e.status = 'Completed'
-                GROUP BY ec.category_id, ec.name, ecr.criteria_id, ecr.description, ecr.`order`
-                ORDER BY ec.category_id, ecr.`order`, ecr.criteria_id
-            """, (department_id, academic_year_id, period_id))
+            # The period's ratings come from the cached response matrix; it is
+            # empty for this department if the period is not in the academic year
+            matrix = ResponseMatrix.for_period(period_id)
+            if matrix is not None:
+                cursor.execute("""
+                    SELECT 1
+                    FROM evaluation_periods ep
+                    JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
+                    WHERE ep.period_id = %s AND at.acad_year_id = %s
+                """, (period_id, academic_year_id))
+                in_year = cursor.fetchone() is not None
+                cursor.execute("""
+                    SELECT faculty_id FROM faculty WHERE program_id = %s
+                """, (department_id,))
+                department_faculty = [row['faculty_id'] for row in cursor.fetchall()] if in_year else []
+                
+                selection = matrix.select(faculty_id=department_faculty)
+                criteria_results = []
+                for criteria_id, stats in matrix.group_stats('criteria', selection).items():
+                    criterion = matrix.criteria[criteria_id]
+                    criteria_results.append({
+                        'category_id': criterion['category_id'],
+                        'category_name': criterion['category_name'],
+                        'criteria_id': criteria_id,
+                        'criteria_description': criterion['description'],
+                        'order': criterion['order'],
+                        'total_responses': stats['count'],
+                        'votes_5': stats['votes']['5'],
+                        'votes_4': stats['votes']['4'],
+                        'votes_3': stats['votes']['3'],
+                        'votes_2': stats['votes']['2'],
+                        'votes_1': stats['votes']['1'],
+                        'mean_rating': stats['mean'],
+                        'std_dev': round(stats['std_dev'], 2),
+                        'median': stats['median']
+                    })
+                criteria_results.sort(key=lambda row: (row['category_id'], row['order'] or 0, row['criteria_id']))
+            else:
+                # Get vote distribution per criterion for ALL faculty in this department
+                cursor.execute("""
+                    SELECT 
+                        ec.category_id,
+                        ec.name as category_name,
+                        ecr.criteria_id,
+                        ecr.description as criteria_description,
+                        ecr.`order`,
+                        COUNT(er.response_id) as total_responses,
+                        SUM(CASE WHEN er.rating = 5 THEN 1 ELSE 0 END) as votes_5,
+                        SUM(CASE WHEN er.rating = 4 THEN 1 ELSE 0 END) as votes_4,
+                        SUM(CASE WHEN er.rating = 3 THEN 1 ELSE 0 END) as votes_3,
+                        SUM(CASE WHEN er.rating = 2 THEN 1 ELSE 0 END) as votes_2,
+                        SUM(CASE WHEN er.rating = 1 THEN 1 ELSE 0 END) as votes_1,
+                        AVG(er.rating) as mean_rating
+                    FROM evaluation_criteria ecr
+                    JOIN evaluation_categories ec ON ecr.category_id = ec.category_id
+                    LEFT JOIN evaluation_responses er ON ecr.criteria_id = er.criteria_id
+                    LEFT JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                    LEFT JOIN class_sections cs ON e.section_id = cs.section_id
+                    LEFT JOIN faculty f ON cs.faculty_id = f.faculty_id
+                    LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
+                    LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
+                    WHERE f.program_id = %s
+                      AND at.acad_year_id = %s
+                      AND e.period_id = %s
+                      AND e.status = 'Completed'
+                    GROUP BY ec.category_id, ec.name, ecr.criteria_id, ecr.description, ecr.`order`
+                    ORDER BY ec.category_id, ecr.`order`, ecr.criteria_id
+                """, (department_id, academic_year_id, period_id))
             
-            criteria_results = cursor.fetchall()
+                criteria_results = cursor.fetchall()
             
             # Helper function to determine remarks from mean
             def get_remarks(mean):
@@ -9036,6 +8386,9 @@ def department_analysis(department_id):
                     'mean': mean,
                     'remarks': get_remarks(mean) if mean > 0 else 'No Data'
                 }
+                if 'std_dev' in row:
+                    criterion_data['std_dev'] = row['std_dev']
+                    criterion_data['median'] = row['median']
                 
                 categories[category_id]['criteria'].append(criterion_data)
                 
@@ -9050,21 +8403,24 @@ def department_analysis(department_id):
             overall_mean = round(total_mean / total_criteria, 2) if total_criteria > 0 else 0
             
             # Get total evaluations count
-            cursor.execute("""
-                SELECT COUNT(DISTINCT e.evaluation_id) as total_evaluations
-                FROM evaluations e
-                JOIN class_sections cs ON e.section_id = cs.section_id
-                JOIN faculty f ON cs.faculty_id = f.faculty_id
-                LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
-                LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
-                WHERE f.program_id = %s
-                  AND at.acad_year_id = %s
-                  AND e.period_id = %s
-                  AND e.status = 'Completed'
-            """, (department_id, academic_year_id, period_id))
+            if matrix is not None:
+                total_evaluations = matrix.evaluation_counts(faculty_id=department_faculty)['completed']
+            else:
+                cursor.execute("""
+                    SELECT COUNT(DISTINCT e.evaluation_id) as total_evaluations
+                    FROM evaluations e
+                    JOIN class_sections cs ON e.section_id = cs.section_id
+                    JOIN faculty f ON cs.faculty_id = f.faculty_id
+                    LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
+                    LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
+                    WHERE f.program_id = %s
+                      AND at.acad_year_id = %s
+                      AND e.period_id = %s
+                      AND e.status = 'Completed'
+                """, (department_id, academic_year_id, period_id))
             
-            eval_count = cursor.fetchone()
-            total_evaluations = eval_count['total_evaluations'] if eval_count else 0
+                eval_count = cursor.fetchone()
+                total_evaluations = eval_count['total_evaluations'] if eval_count else 0
             
             cursor.close()
             conn.close()
@@ -9872,109 +9228,25 @@ def faculty_rankings():
     try:
         # Get query parameters
         academic_year_id = request.args.get('academic_year_id', type=int)
-        period_id = request.args.get('period_id', type=int)
-        department_id = request.args.get('department_id', type=int)  # Optional
-        
-        if not academic_year_id or not period_id:
-            return jsonify({
-                'success': False,
-                'message': 'Academic year and period are required'
-            }), 400
-        
-        conn = get_db_connection()
-        if not conn:
-            return jsonify({'success': False, 'message': 'Database connection failed'}), 500
-        
-        try:
-            cursor = conn.cursor(dictionary=True)
-            
-            # Build the query with optional department filter
-            query = """
-                SELECT 
-                    f.faculty_id,
-                    f.first_name,
-                    f.last_name,
-                    f.program_id,
-                    p.name AS department_name,
-                    COUNT(DISTINCT e.evaluation_id) AS total_evaluations,
-                    -- Overall average rating
-                    ROUND(AVG(overall_avg.avg_rating), 2) AS average_rating,
-                    -- Learning Delivery (Category ID 2) 
-                    ROUND(AVG(cat2.avg_rating), 2) AS learning_delivery,
-                    -- Assessment of Student Learning (Category ID 4)
-                    ROUND(AVG(cat4.avg_rating), 2) AS assessment_learning,
-                    -- Student-Teacher Engagement (Category ID 5)
-                    ROUND(AVG(cat5.avg_rating), 2) AS student_engagement
-                FROM faculty f
-                LEFT JOIN programs p ON f.program_id = p.program_id
-                LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-                LEFT JOIN evaluations e ON cs.section_id = e.section_id
-                    AND e.period_id = %s
-                    AND e.status = 'completed'
-                LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
-                LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
-                -- Overall average subquery
-                LEFT JOIN (
-                    SELECT 
-                        e.evaluation_id,
-                        AVG(er.rating) as avg_rating
-                    FROM evaluations e
-                    JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                    WHERE e.period_id = %s AND e.status = 'completed'
-                    GROUP BY e.evaluation_id
-                ) overall_avg ON e.evaluation_id = overall_avg.evaluation_id
-                -- Learning Delivery (Category 2) average
-                LEFT JOIN (
-                    SELECT 
-                        e.evaluation_id,
-                        AVG(er.rating) as avg_rating
-                    FROM evaluations e
-                    JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                    JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-                    WHERE e.period_id = %s AND e.status = 'completed' AND ec.category_id = 2
-                    GROUP BY e.evaluation_id
-                ) cat2 ON e.evaluation_id = cat2.evaluation_id
-                -- Assessment of Student Learning (Category 4) average  
-                LEFT JOIN (
-                    SELECT 
-                        e.evaluation_id,
-                        AVG(er.rating) as avg_rating
-                    FROM evaluations e
-                    JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                    JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-                    WHERE e.period_id = %s AND e.status = 'completed' AND ec.category_id = 4
-                    GROUP BY e.evaluation_id
-                ) cat4 ON e.evaluation_id = cat4.evaluation_id
-                -- Student-Teacher Engagement (Category 5) average
-                LEFT JOIN (
-                    SELECT 
-                        e.evaluation_id,
-                        AVG(er.rating) as avg_rating
-                    FROM evaluations e
-                    JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                    JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-                    WHERE e.period_id = %s AND e.status = 'completed' AND ec.category_id = 5
-                    GROUP BY e.evaluation_id
-                ) cat5 ON e.evaluation_id = cat5.evaluation_id
-                WHERE f.is_archived = 0
-                    AND at.acad_year_id = %s
-            """
-            
-            params = [period_id, period_id, period_id, period_id, period_id, academic_year_id]
-            
-            # Add department filter if provided
-            if department_id:
-                query += " AND f.program_id = %s"
-                params.append(department_id)
-            
-            query += """
-                GROUP BY f.faculty_id, f.first_name, f.last_name, f.program_id, p.name
-                HAVING COUNT(DISTINCT e.evaluation_id) > 0
-                ORDER BY average_rating DESC, total_evaluations DESC
-            """
-            
-            cursor.execute(query, tuple(params))
-            rankings = cursor.fetchall()
+        period_id = request.args.get('period_id', type=int)
+        department_id = request.args.get('department_id', type=int)  # Optional
+        
+        if not academic_year_id or not period_id:
+            return jsonify({
+                'success': False,
+                'message': 'Academic year and period are required'
+            }), 400
+        
+        ranking = FacultyRankings.compute(period_id, academic_year_id, department_id)
+        if ranking is None:
+            return jsonify({'success': False, 'message': 'Failed to compute faculty rankings'}), 500
+        
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({'success': False, 'message': 'Database connection failed'}), 500
+        
+        try:
+            cursor = conn.cursor(dictionary=True)
             
             # Get period status
             period_status = 'Active'  # Default status
@@ -9985,27 +9257,12 @@ def faculty_rankings():
             if period_result:
                 period_status = period_result['status']
             
-            # Format the results
-            result_data = []
-            for faculty in rankings:
-                result_data.append({
-                    'faculty_id': faculty['faculty_id'],
-                    'first_name': faculty['first_name'],
-                    'last_name': faculty['last_name'],
-                    'program_id': faculty['program_id'],
-                    'department_name': faculty['department_name'],
-                    'total_evaluations': faculty['total_evaluations'],
-                    'average_rating': float(faculty['average_rating']) if faculty['average_rating'] else 0.0,
-                    'learning_delivery': float(faculty['learning_delivery']) if faculty['learning_delivery'] else 0.0,
-                    'assessment_learning': float(faculty['assessment_learning']) if faculty['assessment_learning'] else 0.0,
-                    'student_engagement': float(faculty['student_engagement']) if faculty['student_engagement'] else 0.0
-                })
-            
             return jsonify({
                 'success': True,
                 'data': {
-                    'rankings': result_data,
-                    'total_faculty': len(result_data),
+                    'categories': ranking['categories'],
+                    'rankings': ranking['rankings'],
+                    'total_faculty': len(ranking['rankings']),
                     'period_status': period_status
                 }
             })
@@ -10096,7 +9353,6 @@ def generate_ai_recommendation():
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     try:
-        import google.generativeai as genai
         import os
         
         data = request.get_json()
@@ -10120,9 +9376,6 @@ def generate_ai_recommendation():
                 'message': 'Gemini API key not configured. Please contact administrator.'
             }), 500
         
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
         # Create comprehensive prompt for AI
         prompt = f"""
 As a professional educational consultant, write a detailed and professional recommendation for a faculty member based on their evaluation results.
@@ -10149,20 +9402,24 @@ Write in a professional, constructive, and supportive tone. The recommendation s
 Format the recommendation as a cohesive paragraph without bullet points or numbered lists.
 """
         
-        # Generate AI response
-        response = model.generate_content(prompt)
+        # Generate AI response (shared client: bounded pool, deadline, circuit breaker)
+        ai_recommendation = get_ai_client().generate(prompt)
         
-        if not response or not response.text:
+        if not ai_recommendation:
             raise Exception('AI generated empty response')
         
-        ai_recommendation = response.text.strip()
-        
         return jsonify({
             'success': True,
             'recommendation': ai_recommendation,
             'message': 'AI recommendation generated successfully'
         })
         
+    except AIUnavailableError as e:
+        print(f"AI service unavailable: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'The AI service is temporarily unavailable. Please try again in a few moments.'
+        }), 503
     except ImportError:
         return jsonify({
             'success': False,
@@ -10186,7 +9443,6 @@ def generate_strengths_weaknesses():
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     try:
-        import google.generativeai as genai
         import os
         import json
         
@@ -10211,9 +9467,6 @@ def generate_strengths_weaknesses():
                 'message': 'Gemini API key not configured. Please contact administrator.'
             }), 500
         
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
         # Prepare comments summary
         comments_text = ""
         if comments:
@@ -10272,14 +9525,13 @@ Guidelines:
 Return ONLY the JSON object, no additional text or formatting.
 """
         
-        # Generate AI response
-        response = model.generate_content(prompt)
+        # Generate AI response (shared client: bounded pool, deadline, circuit breaker)
+        ai_text = get_ai_client().generate(prompt)
         
-        if not response or not response.text:
+        if not ai_text:
             raise Exception('AI generated empty response')
         
         # Parse the JSON response
-        ai_text = response.text.strip()
         
         # Remove markdown code blocks if present
         if ai_text.startswith('```json'):
@@ -10304,6 +9556,12 @@ Return ONLY the JSON object, no additional text or formatting.
             'message': 'AI analysis generated successfully'
         })
         
+    except AIUnavailableError as e:
+        print(f"AI service unavailable: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'The AI service is temporarily unavailable. Please try again in a few moments.'
+        }), 503
     except ImportError:
         return jsonify({
             'success': False,
@@ -10311,7 +9569,7 @@ Return ONLY the JSON object, no additional text or formatting.
         }), 500
     except json.JSONDecodeError as e:
         print(f"JSON parsing error: {str(e)}")
-        print(f"AI Response: {response.text if 'response' in locals() else 'No response'}")
+        print(f"AI Response: {ai_text if 'ai_text' in locals() else 'No response'}")
         return jsonify({
             'success': False, 
             'message': 'Failed to parse AI response. Please try again.'
@@ -10334,7 +9592,6 @@ def generate_comments_summary():
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     try:
-        import google.generativeai as genai
         import os
         import json
         
@@ -10363,9 +9620,6 @@ def generate_comments_summary():
                 'message': 'Gemini API key not configured. Please contact administrator.'
             }), 500
         
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
         # Organize comments by rating
         positive_comments = [c['comment'] for c in comments if c.get('rating', 0) >= 4 and c.get('comment', '').strip()]
         neutral_comments = [c['comment'] for c in comments if c.get('rating', 0) == 3 and c.get('comment', '').strip()]
@@ -10433,14 +9687,13 @@ Guidelines:
 Return ONLY the JSON object, no additional text or formatting.
 """
         
-        # Generate AI response
-        response = model.generate_content(prompt)
+        # Generate AI response (shared client: bounded pool, deadline, circuit breaker)
+        ai_text = get_ai_client().generate(prompt)
         
-        if not response or not response.text:
+        if not ai_text:
             raise Exception('AI generated empty response')
         
         # Parse the JSON response
-        ai_text = response.text.strip()
         
         # Remove markdown code blocks if present
         if ai_text.startswith('```json'):
@@ -10463,6 +9716,12 @@ Return ONLY the JSON object, no additional text or formatting.
             'message': 'Comments summary generated successfully'
         })
         
+    except AIUnavailableError as e:
+        print(f"AI service unavailable: {e}")
+        return jsonify({
+            'success': False,
+            'message': 'The AI service is temporarily unavailable. Please try again in a few moments.'
+        }), 503
     except ImportError:
         return jsonify({
             'success': False,
@@ -10470,7 +9729,7 @@ Return ONLY the JSON object, no additional text or formatting.
         }), 500
     except json.JSONDecodeError as e:
         print(f"JSON parsing error: {str(e)}")
-        print(f"AI Response: {response.text if 'response' in locals() else 'No response'}")
+        print(f"AI Response: {ai_text if 'ai_text' in locals() else 'No response'}")
         return jsonify({
             'success': False, 
             'message': 'Failed to parse AI response. Please try again.'
@@ -10491,96 +9750,63 @@ def filter_offensive_comments():
     """
     Use Gemini AI to detect offensive language in student comments (any language)
     Returns list of comments with offensive flag
+    
+    Comments are identified by ``comment_ids`` (comments.comment_id, as
+    returned by the comment listings); their text is read from the
+    database. Results are stored per comment, so only comments never
+    moderated before are sent to the model (see utils/comment_moderation.py).
     """
     if session.get('role') not in ['guidance', 'admin']:
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
     
     try:
-        import google.generativeai as genai
+        from utils.comment_moderation import moderate_comments
         import os
         
-        data = request.get_json()
-        comments = data.get('comments', [])
+        data = request.get_json() or {}
+        if 'comments' in data and 'comment_ids' not in data:
+            return jsonify({
+                'success': False,
+                'message': 'Send comment_ids (the comment_id of each comment) instead of comments'
+            }), 400
+        comment_ids = data.get('comment_ids') or []
         
-        if not comments or len(comments) == 0:
+        if not comment_ids or len(comment_ids) == 0:
             return jsonify({'success': True, 'results': []})
         
         # Configure Gemini API
         api_key = os.environ.get('GEMINI_API_KEY') or 'YOUR_GEMINI_API_KEY_HERE'
         
-        if api_key == 'YOUR_GEMINI_API_KEY_HERE':
+        if api_key == 'YOUR_GEMINI_API_KEY_HERE' and not current_app.config.get('AI_USE_STUB_MODEL'):
             return jsonify({
                 'success': False, 
                 'message': 'Gemini API key not configured. Please contact administrator.'
             }), 500
         
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        # Prepare comments for batch analysis
-        comments_text = "\n\n".join([
-            f"Comment ID {comment['id']}: {comment['text']}"
-            for comment in comments
-        ])
-        
-        # Create AI prompt for offensive language detection
-        prompt = f"""
-You are a content moderation AI assistant. Analyze the following student feedback comments and identify which ones contain offensive, inappropriate, or harmful language in ANY LANGUAGE.
-
-Consider the following as offensive:
-- Profanity, vulgar language, or explicit content
-- Hate speech, discriminatory remarks, or slurs
-- Personal attacks, threats, or harassment
-- Bullying, mockery, or humiliation
-- Sexual content or inappropriate references
-- Extremely disrespectful or degrading language
-
-Do NOT flag comments that are:
-- Constructive criticism (even if negative)
-- Honest feedback about teaching quality
-- Expressions of frustration without offensive language
-- Simple complaints or suggestions for improvement
-
-Comments to analyze:
-{comments_text}
-
-Return ONLY a JSON array with this exact format (no other text):
-[
-  {{"id": 0, "is_offensive": true}},
-  {{"id": 1, "is_offensive": false}},
-  ...
-]
-
-Include all comment IDs from the input. Return valid JSON only.
-"""
-        
-        # Generate AI response
-        response = model.generate_content(prompt)
-        
-        if not response or not response.text:
-            raise Exception('AI generated empty response')
-        
-        ai_response = response.text.strip()
-        
-        # Extract JSON from response (remove markdown code blocks if present)
-        if '```json' in ai_response:
-            ai_response = ai_response.split('```json')[1].split('```')[0].strip()
-        elif '```' in ai_response:
-            ai_response = ai_response.split('```')[1].split('```')[0].strip()
+        moderation = moderate_comments(
+            comment_ids,
+            batch_size=current_app.config.get('COMMENT_MODERATION_BATCH_SIZE', 25),
+            concurrency=current_app.config.get('COMMENT_MODERATION_CONCURRENCY', 4)
+        )
+        if moderation is None:
+            return jsonify({'success': False, 'message': 'Database connection failed'}), 500
         
-        # Parse JSON response
-        import json
-        results = json.loads(ai_response)
+        flags, newly_classified, unclassified = moderation
+        if unclassified and not flags:
+            return jsonify({
+                'success': False,
+                'message': 'The AI service is temporarily unavailable. Please try again in a few moments.'
+            }), 503
         
-        # Validate results
-        if not isinstance(results, list):
-            raise Exception('Invalid AI response format')
+        results = [{'id': comment_id, 'is_offensive': flag} for comment_id, flag in sorted(flags.items())]
         
         return jsonify({
             'success': True,
             'results': results,
-            'total_analyzed': len(comments),
-            'offensive_count': sum(1 for r in results if r.get('is_offensive', False))
+            'total_analyzed': len(results),
+            'offensive_count': sum(1 for r in results if r['is_offensive']),
+            'newly_classified': newly_classified,
+            'unclassified': unclassified
         })
         
     except ImportError:
@@ -10588,13 +9814,8 @@ Include all comment IDs from the input. Return valid JSON only.
             'success': False,
             'message': 'Gemini AI library not installed. Please install google-generativeai package.'
         }), 500
-    except json.JSONDecodeError as e:
-        print(f"JSON decode error: {str(e)}")
-        print(f"AI Response: {ai_response}")
-        return jsonify({
-            'success': False,
-            'message': 'Failed to parse AI response. Please try again.'
-        }), 500
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Invalid comment IDs'}), 400
     except Exception as e:
         print(f"Error filtering offensive comments: {str(e)}")
         import traceback
@@ -10883,7 +10104,7 @@ def generate_comparison_summary(comparisons, current_period, previous_period):
     Generate AI summary of faculty performance comparison
     """
     try:
-        from utils.ai_support import initialize_gemini
+        from utils.ai_support import GEMINI_MODEL
         
         # Prepare comparison data for AI
         improved = [c for c in comparisons if c['score_change'] > 0.2]
@@ -10917,11 +10138,10 @@ Provide a comprehensive but concise summary (150-200 words) that:
 Use **bold** for emphasis on key points. Be professional and constructive.
 """
         
-        model = initialize_gemini()
-        response = model.generate_content(prompt)
+        summary = get_ai_client().generate(prompt, model_name=GEMINI_MODEL)
         
-        if response and response.text:
-            return response.text.strip()
+        if summary:
+            return summary
         else:
             return "AI summary generation is temporarily unavailable. The comparison data shows performance changes across the selected faculty members."
             
@@ -11011,6 +10231,7 @@ def export_faculty_report():
             if include_comments:
                 cursor.execute("""
                     SELECT 
+                        c.comment_id,
                         c.comment_text,
                         c.sentiment,
                         c.created_at,
@@ -12012,6 +11233,7 @@ def create_category():
         """, (name, description, weight))
         
         category_id = cursor.lastrowid
+        Questionnaire.invalidate(cursor)
         conn.commit()
         
         # Get the newly created category
@@ -12155,6 +11377,7 @@ def create_criterion():
         """, (category_id, description, order))
         
         criteria_id = cursor.lastrowid
+        Questionnaire.invalidate(cursor)
         conn.commit()
         
         # Get the created criterion
@@ -12230,6 +11453,7 @@ def update_criterion(criteria_id):
                 WHERE criteria_id = %s
             """, (description, criteria_id))
         
+        Questionnaire.invalidate(cursor)
         conn.commit()
         
         # Get the updated criterion
@@ -12304,6 +11528,7 @@ def delete_criterion(criteria_id):
         
         # Delete the criterion
         cursor.execute("DELETE FROM evaluation_criteria WHERE criteria_id = %s", (criteria_id,))
+        Questionnaire.invalidate(cursor)
         conn.commit()
         
         cursor.close()
@@ -12350,6 +11575,7 @@ def reorder_criteria():
                     WHERE criteria_id = %s
                 """, (order, criteria_id))
         
+        Questionnaire.invalidate(cursor)
         conn.commit()
         cursor.close()
         conn.close()
@@ -12371,60 +11597,24 @@ def reorder_criteria():
 def get_evaluation_questions():
     """Get all evaluation questions grouped by category for student evaluation form"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get all non-archived categories with their criteria ordered
-        cursor.execute("""
-            SELECT 
-                c.category_id,
-                c.name as category_name,
-                c.description as category_description,
-                c.weight,
-                cr.criteria_id,
-                cr.description as criteria_description,
-                cr.`order`
-            FROM evaluation_categories c
-            LEFT JOIN evaluation_criteria cr ON c.category_id = cr.category_id
-            WHERE c.is_archived = FALSE
-            ORDER BY c.category_id, cr.`order`, cr.criteria_id
-        """)
-        
-        rows = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
-        
-        # Group criteria by category
-        categories = {}
-        for row in rows:
-            category_id = row['category_id']
-            
-            if category_id not in categories:
-                categories[category_id] = {
-                    'category_id': category_id,
-                    'category_name': row['category_name'],
-                    'category_description': row['category_description'],
-                    'weight': float(row['weight']) if row['weight'] else 1.0,
-                    'criteria': []
-                }
-            
-            # Add criteria if exists (skip if no criteria for category)
-            if row['criteria_id']:
-                categories[category_id]['criteria'].append({
-                    'criteria_id': row['criteria_id'],
-                    'description': row['criteria_description'],
-                    'order': row['order']
-                })
+        version, questionnaire = Questionnaire.get()
         
-        # Convert to list
-        categories_list = list(categories.values())
+        # Browsers revalidate with If-None-Match and get an empty 304 while
+        # the questionnaire is unchanged
+        etag = f"questionnaire-{version}" if version is not None else None
+        if etag and request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = jsonify({
+                'success': True,
+                'categories': questionnaire['categories'],
+                'total_questions': questionnaire['total_questions']
+            })
         
-        return jsonify({
-            'success': True,
-            'categories': categories_list,
-            'total_questions': sum(len(cat['criteria']) for cat in categories_list)
-        })
+        if etag:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+        return response
         
     except Exception as e:
         print(f"Error getting evaluation questions: {str(e)}")
@@ -12493,6 +11683,7 @@ def update_category(category_id):
             update_values.append(category_id)
             query = f"UPDATE evaluation_categories SET {', '.join(update_fields)} WHERE category_id = %s"
             cursor.execute(query, tuple(update_values))
+            Questionnaire.invalidate(cursor)
             conn.commit()
         
         # Get updated category
@@ -12580,6 +11771,9 @@ def delete_category(category_id):
         
         # If force delete is requested, delete responses first
         if response_count > 0 and force_delete:
+            # The category's faculty score totals go with its responses
+            FacultyScores.drop_category(cursor, category_id)
+            
             # Delete all responses linked to criteria in this category
             cursor.execute("""
                 DELETE er FROM evaluation_responses er
@@ -12594,6 +11788,7 @@ def delete_category(category_id):
         # Delete the category
         cursor.execute("DELETE FROM evaluation_categories WHERE category_id = %s", (category_id,))
         
+        Questionnaire.invalidate(cursor)
         conn.commit()
         cursor.close()
         conn.close()
@@ -12641,6 +11836,7 @@ def archive_category(category_id):
             WHERE category_id = %s
         """, (is_archived, category_id))
         
+        Questionnaire.invalidate(cursor)
         conn.commit()
         
         # Get updated category
@@ -12715,6 +11911,7 @@ def reorder_categories():
                 WHERE category_id = %s
             """, (display_order, category_id))
         
+        Questionnaire.invalidate(cursor)
         conn.commit()
         cursor.close()
         conn.close()
@@ -12839,6 +12036,7 @@ def import_questionnaires():
                     """, (category_id, question_text))
                     imported_questions += 1
         
+        Questionnaire.invalidate(cursor)
         conn.commit()
         cursor.close()
         conn.close()
@@ -13079,24 +12277,8 @@ def get_guidance_rating_distribution():
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
-        # Get current active period
-        cursor.execute("""
-            SELECT period_id, title
-            FROM evaluation_periods 
-            WHERE status = 'Active' 
-            ORDER BY start_date DESC 
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
-        
-        if not current_period:
-            cursor.execute("""
-                SELECT period_id, title
-                FROM evaluation_periods 
-                ORDER BY start_date DESC 
-                LIMIT 1
-            """)
-            current_period = cursor.fetchone()
+        # Get current active period (most recent as fallback)
+        current_period = AcademicCalendar.active_period(fallback=True)
         
         if not current_period:
             return jsonify({
@@ -13290,7 +12472,8 @@ def get_reports():
                 r.program_id,
                 r.faculty_id,
                 r.file_format,
-                r.file_path,
+                r.status,
+                r.render_error,
                 r.file_size,
                 r.download_count,
                 r.created_at,
@@ -13387,7 +12570,7 @@ def get_report_statistics():
         this_month = cursor.fetchone()
         
         # Get total storage used
-        cursor.execute("SELECT SUM(file_size) as total_storage FROM generated_reports")
+        cursor.execute("SELECT SUM(file_size) as total_storage FROM generated_reports WHERE status = 'ready'")
         storage = cursor.fetchone()
         
         # Get reports by type
@@ -13581,6 +12764,7 @@ def create_evaluation_period():
             VALUES (%s, %s, %s, %s, %s)
         """, (acad_term_id, title, start_date, end_date, status))
         
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         period_id = cursor.lastrowid
         
@@ -13675,6 +12859,7 @@ def update_evaluation_period(period_id):
             WHERE period_id = %s
         """, (acad_term_id, title, start_date, end_date, status, period_id))
         
+        AcademicCalendar.invalidate(cursor)
         conn.commit()
         
         cursor.close()
@@ -13757,18 +12942,14 @@ def delete_report(report_id):
             conn.close()
             return jsonify({'success': False, 'message': 'Report not found'}), 404
         
-        # Delete the report
+        # Delete the report, and its artifact unless another report has the same content
         cursor.execute("DELETE FROM generated_reports WHERE report_id = %s", (report_id,))
+        remove_unreferenced_artifact(cursor, report.get('content_hash'), report.get('file_path'))
         
         conn.commit()
         cursor.close()
         conn.close()
         
-        # TODO: Delete physical file if it exists
-        # import os
-        # if report['file_path'] and os.path.exists(report['file_path']):
-        #     os.remove(report['file_path'])
-        
         return jsonify({
             'success': True,
             'message': 'Report deleted successfully'
@@ -13860,25 +13041,23 @@ def generate_report():
         elif program_name:
             report_name += f" - {program_name}"
         
-        # Calculate estimated file size (simulated - would be actual size in real implementation)
-        import random
-        file_size = random.randint(500000, 5000000)  # 500KB to 5MB
-        
         # Get current user ID
         user_id = session.get('user_id', 1)
         
-        # Insert report record
+        # Insert report record; the file is rendered once by the report worker,
+        # which records its real size (see utils/report_artifacts.py)
         cursor.execute("""
             INSERT INTO generated_reports 
             (report_name, report_type, period_id, program_id, faculty_id, file_format, 
-             file_size, generated_by)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+             status, generated_by)
+            VALUES (%s, %s, %s, %s, %s, %s, 'queued', %s)
         """, (report_name, report_type, period_id, program_id, faculty_id, file_format, 
-              file_size, user_id))
+              user_id))
         
         report_id = cursor.lastrowid
         
         conn.commit()
+        ensure_report_renderer(current_app._get_current_object())
         
         # Get the newly created report
         cursor.execute("""
@@ -13911,9 +13090,9 @@ def generate_report():
         
         return jsonify({
             'success': True,
-            'message': 'Report generated successfully',
+            'message': 'Report queued for generation',
             'report': new_report
-        })
+        }), 202
         
     except Exception as e:
         print(f"Error generating report: {str(e)}")
@@ -13961,6 +13140,22 @@ def download_report_file(report_id):
             conn.close()
             return jsonify({'success': False, 'message': 'Report not found'}), 404
         
+        # Artifacts are rendered once by the report worker and sent from disk
+        file_path = report.get('file_path')
+        if report.get('status') != 'ready' or not file_path or not os.path.exists(file_path):
+            # Failed, expired or missing artifacts go back in the render queue
+            if report.get('status') not in ('queued', 'rendering'):
+                queue_report_render(cursor, report_id)
+                conn.commit()
+            cursor.close()
+            conn.close()
+            ensure_report_renderer(current_app._get_current_object())
+            return jsonify({
+                'success': False,
+                'status': 'queued' if report.get('status') != 'rendering' else 'rendering',
+                'message': 'Report is being generated, please try again shortly'
+            }), 202
+        
         # Increment download count
         cursor.execute("""
             UPDATE generated_reports 
@@ -13972,29 +13167,15 @@ def download_report_file(report_id):
         cursor.close()
         conn.close()
         
-        # Generate file path
-        file_path = report.get('file_path')
-        
-        # If file_path is null or file doesn't exist, generate the report on-the-fly
-        if not file_path or not os.path.exists(file_path):
-            # Generate report dynamically
-            file_path = generate_report_file(report)
-        
-        # Map file format to actual file extension for download
-        extension_map = {
-            'pdf': 'pdf',
-            'excel': 'xlsx',
-            'csv': 'csv',
-            'powerpoint': 'pptx'
-        }
-        file_extension = extension_map.get(report['file_format'], report['file_format'])
+        file_extension = REPORT_EXTENSIONS.get(report['file_format'], report['file_format'])
         
-        # Send file
+        # Send file (the content hash doubles as a strong ETag)
         return send_file(
             file_path,
             as_attachment=True,
             download_name=f"{report['report_name']}.{file_extension}",
-            mimetype=get_mimetype(report['file_format'])
+            mimetype=get_mimetype(report['file_format']),
+            etag=report['content_hash']
         )
         
     except Exception as e:
@@ -14034,263 +13215,6 @@ def get_mimetype(file_format):
     return mimetypes.get(file_format, 'application/octet-stream')
 
 
-def generate_report_file(report):
-    """Generate report file dynamically (PDF or Excel)"""
-    import os
-    from datetime import datetime
-    
-    # Create reports directory if it doesn't exist
-    reports_dir = os.path.join('static', 'reports')
-    os.makedirs(reports_dir, exist_ok=True)
-    
-    # Generate filename with proper extension
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    safe_name = "".join(c for c in report['report_name'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-    safe_name = safe_name.replace(' ', '_')
-    
-    # Map file format to actual file extension
-    extension_map = {
-        'pdf': 'pdf',
-        'excel': 'xlsx',
-        'csv': 'csv',
-        'powerpoint': 'pptx'
-    }
-    file_extension = extension_map.get(report['file_format'], report['file_format'])
-    filename = f"{safe_name}_{timestamp}.{file_extension}"
-    file_path = os.path.join(reports_dir, filename)
-    
-    # Generate based on format
-    if report['file_format'] == 'pdf':
-        generate_analytics_pdf_report(report, file_path)
-    elif report['file_format'] == 'excel':
-        generate_analytics_excel_report(report, file_path)
-    elif report['file_format'] == 'csv':
-        generate_csv_report(report, file_path)
-    else:
-        # Fallback: create a simple text file
-        with open(file_path, 'w') as f:
-            f.write(f"Report: {report['report_name']}\n")
-            f.write(f"Type: {report['report_type']}\n")
-            f.write(f"Generated: {datetime.now()}\n")
-    
-    return file_path
-
-
-def generate_analytics_pdf_report(report, file_path):
-    """Generate analytics PDF report using ReportLab"""
-    try:
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-        from reportlab.lib import colors
-        from datetime import datetime
-        
-        # Create PDF
-        doc = SimpleDocTemplate(file_path, pagesize=letter)
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#0059cc'),
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        story.append(Paragraph(report['report_name'], title_style))
-        story.append(Spacer(1, 0.2 * inch))
-        
-        # Report Info
-        info_data = [
-            ['Report Type:', report['report_type'].capitalize()],
-            ['Generated:', datetime.now().strftime('%B %d, %Y at %I:%M %p')],
-            ['Format:', report['file_format'].upper()],
-        ]
-        
-        info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-        info_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#495057')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ]))
-        story.append(info_table)
-        story.append(Spacer(1, 0.5 * inch))
-        
-        # Content
-        story.append(Paragraph("Report Summary", styles['Heading2']))
-        story.append(Spacer(1, 0.2 * inch))
-        
-        summary_text = f"""
-        This is a {report['report_type']} report generated for the evaluation period. 
-        The report contains comprehensive analysis and statistics for faculty evaluation data.
-        """
-        story.append(Paragraph(summary_text, styles['BodyText']))
-        story.append(Spacer(1, 0.3 * inch))
-        
-        # Sample data table
-        story.append(Paragraph("Evaluation Statistics", styles['Heading2']))
-        story.append(Spacer(1, 0.2 * inch))
-        
-        data = [
-            ['Metric', 'Value'],
-            ['Total Evaluations', 'N/A'],
-            ['Average Rating', 'N/A'],
-            ['Response Rate', 'N/A'],
-            ['Completion Rate', 'N/A'],
-        ]
-        
-        table = Table(data, colWidths=[3*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0059cc')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-        ]))
-        story.append(table)
-        
-        # Footer
-        story.append(Spacer(1, 0.5 * inch))
-        footer_text = "Generated by IntellEvalPro - Faculty Evaluation System"
-        story.append(Paragraph(footer_text, styles['Italic']))
-        
-        # Build PDF
-        doc.build(story)
-        
-    except ImportError:
-        # Fallback if reportlab is not installed
-        generate_simple_text_report(report, file_path)
-
-
-def generate_analytics_excel_report(report, file_path):
-    """Generate analytics Excel report using openpyxl"""
-    try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill
-        from datetime import datetime
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Report"
-        
-        # Title
-        ws['A1'] = report['report_name']
-        ws['A1'].font = Font(size=16, bold=True, color="0059cc")
-        ws['A1'].alignment = Alignment(horizontal='center')
-        ws.merge_cells('A1:D1')
-        
-        # Report Info
-        ws['A3'] = 'Report Type:'
-        ws['B3'] = report['report_type'].capitalize()
-        ws['A4'] = 'Generated:'
-        ws['B4'] = datetime.now().strftime('%B %d, %Y at %I:%M %p')
-        ws['A5'] = 'Format:'
-        ws['B5'] = report['file_format'].upper()
-        
-        # Make headers bold
-        for row in [3, 4, 5]:
-            ws[f'A{row}'].font = Font(bold=True)
-        
-        # Statistics Header
-        ws['A7'] = 'Evaluation Statistics'
-        ws['A7'].font = Font(size=14, bold=True)
-        
-        # Table headers
-        ws['A9'] = 'Metric'
-        ws['B9'] = 'Value'
-        ws['A9'].font = Font(bold=True)
-        ws['B9'].font = Font(bold=True)
-        ws['A9'].fill = PatternFill(start_color='0059cc', end_color='0059cc', fill_type='solid')
-        ws['B9'].fill = PatternFill(start_color='0059cc', end_color='0059cc', fill_type='solid')
-        ws['A9'].font = Font(bold=True, color='FFFFFF')
-        ws['B9'].font = Font(bold=True, color='FFFFFF')
-        
-        # Sample data
-        data = [
-            ['Total Evaluations', 'N/A'],
-            ['Average Rating', 'N/A'],
-            ['Response Rate', 'N/A'],
-            ['Completion Rate', 'N/A'],
-        ]
-        
-        for idx, row in enumerate(data, start=10):
-            ws[f'A{idx}'] = row[0]
-            ws[f'B{idx}'] = row[1]
-        
-        # Adjust column widths
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 20
-        
-        # Footer
-        footer_row = len(data) + 12
-        ws[f'A{footer_row}'] = 'Generated by IntellEvalPro - Faculty Evaluation System'
-        ws[f'A{footer_row}'].font = Font(italic=True, size=9)
-        
-        wb.save(file_path)
-        
-    except ImportError:
-        # Fallback if openpyxl is not installed
-        generate_simple_text_report(report, file_path)
-
-
-def generate_csv_report(report, file_path):
-    """Generate CSV report"""
-    import csv
-    from datetime import datetime
-    
-    with open(file_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        
-        # Header
-        writer.writerow(['Report Name', report['report_name']])
-        writer.writerow(['Report Type', report['report_type']])
-        writer.writerow(['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow([])
-        
-        # Statistics
-        writer.writerow(['Metric', 'Value'])
-        writer.writerow(['Total Evaluations', 'N/A'])
-        writer.writerow(['Average Rating', 'N/A'])
-        writer.writerow(['Response Rate', 'N/A'])
-        writer.writerow(['Completion Rate', 'N/A'])
-
-
-def generate_simple_text_report(report, file_path):
-    """Fallback: Generate simple text report"""
-    from datetime import datetime
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(f"{'='*60}\n")
-        f.write(f"{report['report_name']}\n")
-        f.write(f"{'='*60}\n\n")
-        f.write(f"Report Type: {report['report_type']}\n")
-        f.write(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n")
-        f.write(f"Format: {report['file_format']}\n\n")
-        f.write(f"{'='*60}\n")
-        f.write(f"Evaluation Statistics\n")
-        f.write(f"{'='*60}\n\n")
-        f.write(f"Total Evaluations: N/A\n")
-        f.write(f"Average Rating: N/A\n")
-        f.write(f"Response Rate: N/A\n")
-        f.write(f"Completion Rate: N/A\n\n")
-        f.write(f"{'='*60}\n")
-        f.write(f"Generated by IntellEvalPro - Faculty Evaluation System\n")
-        f.write(f"{'='*60}\n")
-
-
 @api_bp.route('/evaluation-periods-detailed')
 @login_required
 def get_evaluation_periods_detailed():
@@ -14584,43 +13508,53 @@ def get_response_analytics():
         period_filter = "AND ep.period_id = %s" if period_id else ""
         period_params = (period_id,) if period_id else ()
         
-        # 1. Get total responses count
-        query_total_responses = f"""
-            SELECT COUNT(DISTINCT e.evaluation_id) as total_responses
-            FROM evaluations e
-            JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            WHERE e.status = 'Completed'
-            {period_filter}
-        """
-        cursor.execute(query_total_responses, period_params)
-        total_responses = cursor.fetchone()['total_responses'] or 0
+        # A single period's counts and ratings come from the cached response matrix
+        matrix = ResponseMatrix.for_period(int(period_id)) if period_id and period_id.isdigit() else None
         
-        # 2. Calculate response rate
-        query_response_rate = f"""
-            SELECT 
-                COUNT(CASE WHEN e.status = 'Completed' THEN 1 END) as completed,
-                COUNT(e.evaluation_id) as total
-            FROM evaluations e
-            JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            WHERE 1=1
-            {period_filter}
-        """
-        cursor.execute(query_response_rate, period_params)
-        rate_data = cursor.fetchone()
-        response_rate = round((rate_data['completed'] / rate_data['total'] * 100), 1) if rate_data['total'] > 0 else 0
+        if matrix is not None:
+            counts = matrix.evaluation_counts()
+            overall = matrix.summary()
+            total_responses = counts['completed']
+            response_rate = round(counts['response_rate'], 1)
+            quality_score = round(overall['mean'], 1) if overall['count'] else 0
+        else:
+            # 1. Get total responses count
+            query_total_responses = f"""
+                SELECT COUNT(DISTINCT e.evaluation_id) as total_responses
+                FROM evaluations e
+                JOIN evaluation_periods ep ON e.period_id = ep.period_id
+                WHERE e.status = 'Completed'
+                {period_filter}
+            """
+            cursor.execute(query_total_responses, period_params)
+            total_responses = cursor.fetchone()['total_responses'] or 0
         
-        # 3. Calculate quality score (average rating)
-        query_quality = f"""
-            SELECT ROUND(AVG(er.rating), 1) as quality_score
-            FROM evaluation_responses er
-            JOIN evaluations e ON er.evaluation_id = e.evaluation_id
-            JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            WHERE e.status = 'Completed'
-            {period_filter}
-        """
-        cursor.execute(query_quality, period_params)
-        quality_result = cursor.fetchone()
-        quality_score = quality_result['quality_score'] if quality_result and quality_result['quality_score'] else 0
+            # 2. Calculate response rate
+            query_response_rate = f"""
+                SELECT 
+                    COUNT(CASE WHEN e.status = 'Completed' THEN 1 END) as completed,
+                    COUNT(e.evaluation_id) as total
+                FROM evaluations e
+                JOIN evaluation_periods ep ON e.period_id = ep.period_id
+                WHERE 1=1
+                {period_filter}
+            """
+            cursor.execute(query_response_rate, period_params)
+            rate_data = cursor.fetchone()
+            response_rate = round((rate_data['completed'] / rate_data['total'] * 100), 1) if rate_data['total'] > 0 else 0
+        
+            # 3. Calculate quality score (average rating)
+            query_quality = f"""
+                SELECT ROUND(AVG(er.rating), 1) as quality_score
+                FROM evaluation_responses er
+                JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                JOIN evaluation_periods ep ON e.period_id = ep.period_id
+                WHERE e.status = 'Completed'
+                {period_filter}
+            """
+            cursor.execute(query_quality, period_params)
+            quality_result = cursor.fetchone()
+            quality_score = quality_result['quality_score'] if quality_result and quality_result['quality_score'] else 0
         
         # 4. Response rate over time (last 6 weeks)
         query_weekly_trend = f"""
@@ -14695,19 +13629,34 @@ def get_response_analytics():
         departments = cursor.fetchall()
         
         # 7. Response quality metrics
-        query_quality_metrics = f"""
-            SELECT 
-                COUNT(DISTINCT e.evaluation_id) as total_evaluations,
-                COUNT(DISTINCT CASE WHEN er.rating IS NOT NULL THEN e.evaluation_id END) as complete_responses,
-                COUNT(DISTINCT CASE WHEN e.comments IS NOT NULL AND LENGTH(e.comments) > 50 THEN e.evaluation_id END) as detailed_comments
-            FROM evaluations e
-            JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-            WHERE e.status = 'Completed'
-            {period_filter}
-        """
-        cursor.execute(query_quality_metrics, period_params)
-        quality_metrics = cursor.fetchone()
+        if matrix is not None:
+            # Every evaluation in the matrix has at least one rating
+            cursor.execute("""
+                SELECT COUNT(*) as detailed_comments
+                FROM evaluations e
+                WHERE e.period_id = %s
+                AND e.status = 'Completed'
+                AND e.comments IS NOT NULL AND LENGTH(e.comments) > 50
+            """, (period_id,))
+            quality_metrics = {
+                'total_evaluations': total_responses,
+                'complete_responses': len(matrix.ids['evaluation']),
+                'detailed_comments': cursor.fetchone()['detailed_comments']
+            }
+        else:
+            query_quality_metrics = f"""
+                SELECT 
+                    COUNT(DISTINCT e.evaluation_id) as total_evaluations,
+                    COUNT(DISTINCT CASE WHEN er.rating IS NOT NULL THEN e.evaluation_id END) as complete_responses,
+                    COUNT(DISTINCT CASE WHEN e.comments IS NOT NULL AND LENGTH(e.comments) > 50 THEN e.evaluation_id END) as detailed_comments
+                FROM evaluations e
+                JOIN evaluation_periods ep ON e.period_id = ep.period_id
+                LEFT JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
+                WHERE e.status = 'Completed'
+                {period_filter}
+            """
+            cursor.execute(query_quality_metrics, period_params)
+            quality_metrics = cursor.fetchone()
         
         complete_pct = round((quality_metrics['complete_responses'] / quality_metrics['total_evaluations'] * 100), 1) if quality_metrics['total_evaluations'] > 0 else 0
         detailed_pct = round((quality_metrics['detailed_comments'] / quality_metrics['total_evaluations'] * 100), 1) if quality_metrics['total_evaluations'] > 0 else 0
@@ -14782,21 +13731,29 @@ def get_response_analytics():
                     level = 5
             daily_levels.append({'count': count, 'level': level})
         
-        # Calculate sentiment score (positive vs negative ratings)
-        query_sentiment = f"""
-            SELECT 
-                COUNT(CASE WHEN er.rating >= 4 THEN 1 END) as positive,
-                COUNT(CASE WHEN er.rating < 3 THEN 1 END) as negative,
-                COUNT(er.rating) as total
-            FROM evaluation_responses er
-            JOIN evaluations e ON er.evaluation_id = e.evaluation_id
-            JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            WHERE e.status = 'Completed'
-            {period_filter}
-        """
-        cursor.execute(query_sentiment, period_params)
-        sentiment_data = cursor.fetchone()
-        
+        # Calculate sentiment score (positive vs negative ratings)
+        if matrix is not None:
+            votes = overall['votes']
+            sentiment_data = {
+                'positive': votes['4'] + votes['5'],
+                'negative': votes['1'] + votes['2'],
+                'total': overall['count']
+            }
+        else:
+            query_sentiment = f"""
+                SELECT 
+                    COUNT(CASE WHEN er.rating >= 4 THEN 1 END) as positive,
+                    COUNT(CASE WHEN er.rating < 3 THEN 1 END) as negative,
+                    COUNT(er.rating) as total
+                FROM evaluation_responses er
+                JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                JOIN evaluation_periods ep ON e.period_id = ep.period_id
+                WHERE e.status = 'Completed'
+                {period_filter}
+            """
+            cursor.execute(query_sentiment, period_params)
+            sentiment_data = cursor.fetchone()
+        
         if sentiment_data['total'] > 0:
             sentiment_score = round(((sentiment_data['positive'] - sentiment_data['negative']) / sentiment_data['total']), 2)
         else:
@@ -15271,10 +14228,28 @@ def get_my_courses():
 @api_bp.route('/admin/activity-logs')
 @login_required
 def get_activity_logs():
-    """Get all activity logs for admin"""
+    """
+    Get a page of activity logs for admin, newest first
+    
+    Query params:
+        limit: Page size (default 50, max 200)
+        cursor: next_cursor of the previous page
+        role, activity_type, user_id, search: Filters
+        date_from, date_to: Inclusive date range (YYYY-MM-DD)
+    
+    The first page (no cursor) also carries the matching total and the
+    header stats.
+    """
     if session.get('role') != 'admin':
         return jsonify({'success': False, 'error': 'Unauthorized'}), 403
     
+    try:
+        filters = ActivityLog.parse_filters(request.args)
+        after = ActivityLog.decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid filter or cursor'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'success': False, 'error': 'Database connection failed'}), 500
@@ -15282,35 +14257,56 @@ def get_activity_logs():
     try:
         cursor = conn.cursor(dictionary=True)
         
-        # Get all activity logs
-        cursor.execute("""
-            SELECT 
-                log_id,
-                user_id,
-                user_name,
-                user_role,
-                activity_type,
-                description,
-                reason,
-                target_user,
-                ip_address,
-                user_agent,
-                additional_data,
-                timestamp
-            FROM activity_logs
-            ORDER BY timestamp DESC
-        """)
-        logs = cursor.fetchall()
+        logs, next_cursor = ActivityLog.page(cursor, filters, after, limit)
+        result = {
+            'success': True,
+            'logs': logs,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        }
+        
+        if after is None:
+            result['total'] = ActivityLog.count(cursor, filters)
+            result['stats'] = ActivityLog.stats(cursor)
+        
+        cursor.close()
+        
+        return jsonify(result)
         
+    except Exception as e:
+        print(f"Error getting activity logs: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    finally:
+        if conn and conn.is_connected():
+            conn.close()
+
+
+@api_bp.route('/admin/activity-logs/<int:log_id>')
+@login_required
+def get_activity_log(log_id):
+    """Get a single activity log including user agent and additional data"""
+    if session.get('role') != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'success': False, 'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        log = ActivityLog.get(cursor, log_id)
         cursor.close()
         
+        if not log:
+            return jsonify({'success': False, 'error': 'Log not found'}), 404
+        
         return jsonify({
             'success': True,
-            'logs': logs
+            'log': log
         })
         
     except Exception as e:
-        print(f"Error getting activity logs: {str(e)}")
+        print(f"Error getting activity log: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
     finally:
         if conn and conn.is_connected():
@@ -15320,8 +14316,14 @@ def get_activity_logs():
 @api_bp.route('/admin/export-logs')
 @login_required
 def export_activity_logs():
-    """Export activity logs to Excel or CSV"""
-    from flask import Response
+    """
+    Export activity logs to Excel or CSV
+    
+    Accepts the same filters as /admin/activity-logs. Rows are read in
+    keyset batches and written out one by one, so memory use does not
+    grow with the size of the log.
+    """
+    from flask import Response, stream_with_context
     import csv
     from io import StringIO
     
@@ -15330,122 +14332,120 @@ def export_activity_logs():
     
     export_format = request.args.get('format', 'csv')
     
+    try:
+        filters = ActivityLog.parse_filters(request.args)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid filter'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'success': False, 'error': 'Database connection failed'}), 500
     
-    try:
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get all activity logs
-        cursor.execute("""
-            SELECT 
-                log_id,
-                user_name,
-                user_role,
-                activity_type,
-                description,
-                reason,
-                target_user,
-                ip_address,
-                timestamp
-            FROM activity_logs
-            ORDER BY timestamp DESC
-        """)
-        logs = cursor.fetchall()
-        
-        cursor.close()
-        
-        if export_format == 'excel':
-            try:
-                from openpyxl import Workbook
-                from openpyxl.styles import Font, PatternFill
-                from datetime import datetime
-                
-                # Create workbook
-                wb = Workbook()
-                ws = wb.active
-                ws.title = "Activity Logs"
-                
-                # Add headers
-                headers = ['Log ID', 'User Name', 'Role', 'Activity Type', 'Description', 
-                          'Reason', 'Target User', 'IP Address', 'Timestamp']
-                ws.append(headers)
-                
-                # Style headers
-                header_fill = PatternFill(start_color='0059cc', end_color='0059cc', fill_type='solid')
-                header_font = Font(bold=True, color='FFFFFF')
-                for cell in ws[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                
-                # Add data
-                for log in logs:
-                    ws.append([
-                        log.get('log_id'),
-                        log.get('user_name'),
-                        log.get('user_role'),
-                        log.get('activity_type'),
-                        log.get('description'),
-                        log.get('reason'),
-                        log.get('target_user'),
-                        log.get('ip_address'),
-                        log.get('timestamp')
-                    ])
-                
-                # Save to BytesIO
-                from io import BytesIO
-                output = BytesIO()
-                wb.save(output)
-                output.seek(0)
-                
-                return Response(
-                    output.getvalue(),
-                    mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                    headers={'Content-Disposition': f'attachment; filename=activity_logs_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'}
-                )
-            except ImportError:
-                # Fallback to CSV if openpyxl not available
-                export_format = 'csv'
-        
-        if export_format == 'csv':
-            # Create CSV
-            si = StringIO()
-            writer = csv.writer(si)
+    headers = ['Log ID', 'User Name', 'Role', 'Activity Type', 'Description', 
+               'Reason', 'Target User', 'IP Address', 'Timestamp']
+    
+    def export_row(log):
+        return [
+            log.get('log_id'),
+            log.get('user_name'),
+            log.get('user_role'),
+            log.get('activity_type'),
+            log.get('description'),
+            log.get('reason'),
+            log.get('target_user'),
+            log.get('ip_address'),
+            log.get('timestamp')
+        ]
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    if export_format == 'excel':
+        try:
+            from openpyxl import Workbook
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.styles import Font, PatternFill
+            import tempfile
             
-            # Write headers
-            writer.writerow(['Log ID', 'User Name', 'Role', 'Activity Type', 'Description', 
-                           'Reason', 'Target User', 'IP Address', 'Timestamp'])
+            # Write-only workbooks spool rows to disk instead of keeping
+            # a cell object per value
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("Activity Logs")
             
-            # Write data
-            for log in logs:
-                writer.writerow([
-                    log.get('log_id'),
-                    log.get('user_name'),
-                    log.get('user_role'),
-                    log.get('activity_type'),
-                    log.get('description'),
-                    log.get('reason'),
-                    log.get('target_user'),
-                    log.get('ip_address'),
-                    log.get('timestamp')
-                ])
+            # Style headers
+            header_fill = PatternFill(start_color='0059cc', end_color='0059cc', fill_type='solid')
+            header_font = Font(bold=True, color='FFFFFF')
+            header_cells = []
+            for header in headers:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.fill = header_fill
+                cell.font = header_font
+                header_cells.append(cell)
+            ws.append(header_cells)
             
-            output = si.getvalue()
-            from datetime import datetime
+            cursor = conn.cursor(dictionary=True)
+            for log in ActivityLog.iter_all(cursor, filters):
+                ws.append(export_row(log))
+            cursor.close()
+            
+            output = tempfile.TemporaryFile()
+            wb.save(output)
+            output.seek(0)
+            
+            def generate_xlsx():
+                try:
+                    while True:
+                        chunk = output.read(64 * 1024)
+                        if not chunk:
+                            break
+                        yield chunk
+                finally:
+                    output.close()
             
             return Response(
-                output,
-                mimetype='text/csv',
-                headers={'Content-Disposition': f'attachment; filename=activity_logs_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'}
+                generate_xlsx(),
+                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                headers={'Content-Disposition': f'attachment; filename=activity_logs_{timestamp}.xlsx'}
             )
+        except ImportError:
+            # Fallback to CSV if openpyxl not available
+            export_format = 'csv'
+        except Exception as e:
+            print(f"Error exporting activity logs: {str(e)}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+    
+    def generate_csv():
+        si = StringIO()
+        writer = csv.writer(si)
         
-    except Exception as e:
-        print(f"Error exporting activity logs: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
+        def flush():
+            data = si.getvalue()
+            si.seek(0)
+            si.truncate(0)
+            return data
+        
+        # Write headers
+        writer.writerow(headers)
+        yield flush()
+        
+        # Write data
+        cursor = conn.cursor(dictionary=True)
+        try:
+            for log in ActivityLog.iter_all(cursor, filters):
+                writer.writerow(export_row(log))
+                if si.tell() >= 64 * 1024:
+                    yield flush()
+        except Exception as e:
+            # Headers are already sent; end the file where it broke
+            print(f"Error exporting activity logs: {str(e)}")
+        finally:
+            cursor.close()
+        yield flush()
+    
+    return Response(
+        stream_with_context(generate_csv()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename=activity_logs_{timestamp}.csv'}
+    )
 
 
 def log_activity(user_id=None, user_name=None, user_role=None, activity_type='', 
@@ -16073,91 +15073,12 @@ def export_rankings_pdf():
         if not period_info:
             return jsonify({'success': False, 'message': 'Period information not found'}), 404
         
-        # Get faculty rankings data using the same query as the rankings API
-        query = """
-            SELECT 
-                f.faculty_id,
-                f.first_name,
-                f.last_name,
-                f.program_id,
-                p.name AS department_name,
-                COUNT(DISTINCT e.evaluation_id) AS total_evaluations,
-                -- Overall average rating
-                ROUND(AVG(overall_avg.avg_rating), 2) AS average_rating,
-                -- Learning Delivery (Category ID 2) 
-                ROUND(AVG(cat2.avg_rating), 2) AS learning_delivery,
-                -- Assessment of Student Learning (Category ID 4)
-                ROUND(AVG(cat4.avg_rating), 2) AS assessment_learning,
-                -- Student-Teacher Engagement (Category ID 5)
-                ROUND(AVG(cat5.avg_rating), 2) AS student_engagement
-            FROM faculty f
-            LEFT JOIN programs p ON f.program_id = p.program_id
-            LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-            LEFT JOIN evaluations e ON cs.section_id = e.section_id
-                AND e.period_id = %s
-                AND e.status = 'completed'
-            LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
-            -- Overall average subquery
-            LEFT JOIN (
-                SELECT 
-                    e.evaluation_id,
-                    AVG(er.rating) as avg_rating
-                FROM evaluations e
-                JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                WHERE e.period_id = %s AND e.status = 'completed'
-                GROUP BY e.evaluation_id
-            ) overall_avg ON e.evaluation_id = overall_avg.evaluation_id
-            -- Learning Delivery (Category 2) average
-            LEFT JOIN (
-                SELECT 
-                    e.evaluation_id,
-                    AVG(er.rating) as avg_rating
-                FROM evaluations e
-                JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-                WHERE e.period_id = %s AND e.status = 'completed' AND ec.category_id = 2
-                GROUP BY e.evaluation_id
-            ) cat2 ON e.evaluation_id = cat2.evaluation_id
-            -- Assessment of Student Learning (Category 4) average  
-            LEFT JOIN (
-                SELECT 
-                    e.evaluation_id,
-                    AVG(er.rating) as avg_rating
-                FROM evaluations e
-                JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-                WHERE e.period_id = %s AND e.status = 'completed' AND ec.category_id = 4
-                GROUP BY e.evaluation_id
-            ) cat4 ON e.evaluation_id = cat4.evaluation_id
-            -- Student-Teacher Engagement (Category 5) average
-            LEFT JOIN (
-                SELECT 
-                    e.evaluation_id,
-                    AVG(er.rating) as avg_rating
-                FROM evaluations e
-                JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-                WHERE e.period_id = %s AND e.status = 'completed' AND ec.category_id = 5
-                GROUP BY e.evaluation_id
-            ) cat5 ON e.evaluation_id = cat5.evaluation_id
-            WHERE at.acad_year_id = %s
-        """
-        
-        params = [period_id, period_id, period_id, period_id, period_id, academic_year_id]
-        
-        if department_id:
-            query += " AND f.program_id = %s"
-            params.append(department_id)
-        
-        query += """
-            GROUP BY f.faculty_id, f.first_name, f.last_name, f.program_id, p.name
-            HAVING COUNT(DISTINCT e.evaluation_id) > 0
-            ORDER BY average_rating DESC, total_evaluations DESC
-        """
-        
-        cursor.execute(query, tuple(params))
-        rankings = cursor.fetchall()
+        # Same ranking engine as the rankings API (one column per active category)
+        ranking = FacultyRankings.compute(period_id, academic_year_id, department_id)
+        if ranking is None:
+            return jsonify({'success': False, 'message': 'Failed to compute faculty rankings'}), 500
+        categories = ranking['categories']
+        rankings = ranking['rankings']
         
         # Helper function for remarks
         def get_remarks(mean):
@@ -16233,13 +15154,15 @@ def export_rankings_pdf():
         remarks_style = ParagraphStyle('RemarksStyle', fontSize=7, leading=9, alignment=TA_CENTER)
         
         # Build table data (same format as faculty results)
-        table_data = [['Rank', 'Faculty Name', 'Department', 'Overall Rating', 'Learning Delivery', 'Assessment Learning', 'Student Engagement', 'Evaluations', 'Remarks']]
+        category_header_style = ParagraphStyle('CategoryHeaderCell', fontSize=7, leading=8, fontName='Times-Bold', alignment=TA_CENTER)
+        table_data = [
+            ['Rank', 'Faculty Name', 'Department', 'Overall Rating']
+            + [Paragraph(category['name'], category_header_style) for category in categories]
+            + ['Evaluations', 'Remarks']
+        ]
         
         for idx, faculty in enumerate(rankings, 1):
             overall_rating = faculty['average_rating'] or 0.0
-            learning_delivery = faculty['learning_delivery'] or 0.0
-            assessment_learning = faculty['assessment_learning'] or 0.0
-            student_engagement = faculty['student_engagement'] or 0.0
             
             # Wrap text in Paragraph for proper formatting (same as faculty results)
             remarks_text = get_remarks(overall_rating)
@@ -16248,17 +15171,21 @@ def export_rankings_pdf():
                 str(idx),
                 Paragraph(f"{faculty['first_name']} {faculty['last_name']}", cell_style),
                 Paragraph(faculty['department_name'] or 'N/A', cell_style),
-                f"{overall_rating:.2f}",
-                f"{learning_delivery:.2f}",
-                f"{assessment_learning:.2f}",
-                f"{student_engagement:.2f}",
+                f"{overall_rating:.2f}"
+            ] + [
+                f"{faculty['category_scores'][category['category_id']]:.2f}" for category in categories
+            ] + [
                 str(faculty['total_evaluations']),
                 Paragraph(remarks_text, remarks_style)
             ]
             table_data.append(row)
         
+        # Category columns share the width the three fixed category columns used to take
+        category_width = (2.1 / len(categories)) * inch if categories else 0
+        col_widths = [0.4*inch, 1.8*inch, 1.3*inch, 0.7*inch] + [category_width] * len(categories) + [0.7*inch, 1.0*inch]
+        
         # Create table (same column structure and styling as faculty results)
-        table = Table(table_data, colWidths=[0.4*inch, 1.8*inch, 1.3*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.7*inch, 1.0*inch])
+        table = Table(table_data, colWidths=col_widths)
         table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
@@ -16411,91 +15338,12 @@ def export_rankings_excel():
         if not period_info:
             return jsonify({'success': False, 'message': 'Period information not found'}), 404
         
-        # Get faculty rankings data using the same query as the PDF export
-        query = """
-            SELECT 
-                f.faculty_id,
-                f.first_name,
-                f.last_name,
-                f.program_id,
-                p.name AS department_name,
-                COUNT(DISTINCT e.evaluation_id) AS total_evaluations,
-                -- Overall average rating
-                ROUND(AVG(overall_avg.avg_rating), 2) AS average_rating,
-                -- Learning Delivery (Category ID 2) 
-                ROUND(AVG(cat2.avg_rating), 2) AS learning_delivery,
-                -- Assessment of Student Learning (Category ID 4)
-                ROUND(AVG(cat4.avg_rating), 2) AS assessment_learning,
-                -- Student-Teacher Engagement (Category ID 5)
-                ROUND(AVG(cat5.avg_rating), 2) AS student_engagement
-            FROM faculty f
-            LEFT JOIN programs p ON f.program_id = p.program_id
-            LEFT JOIN class_sections cs ON f.faculty_id = cs.faculty_id
-            LEFT JOIN evaluations e ON cs.section_id = e.section_id
-                AND e.period_id = %s
-                AND e.status = 'completed'
-            LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            LEFT JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
-            -- Overall average subquery
-            LEFT JOIN (
-                SELECT 
-                    e.evaluation_id,
-                    AVG(er.rating) as avg_rating
-                FROM evaluations e
-                JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                WHERE e.period_id = %s AND e.status = 'completed'
-                GROUP BY e.evaluation_id
-            ) overall_avg ON e.evaluation_id = overall_avg.evaluation_id
-            -- Learning Delivery (Category 2) average
-            LEFT JOIN (
-                SELECT 
-                    e.evaluation_id,
-                    AVG(er.rating) as avg_rating
-                FROM evaluations e
-                JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-                WHERE e.period_id = %s AND e.status = 'completed' AND ec.category_id = 2
-                GROUP BY e.evaluation_id
-            ) cat2 ON e.evaluation_id = cat2.evaluation_id
-            -- Assessment of Student Learning (Category 4) average  
-            LEFT JOIN (
-                SELECT 
-                    e.evaluation_id,
-                    AVG(er.rating) as avg_rating
-                FROM evaluations e
-                JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-                WHERE e.period_id = %s AND e.status = 'completed' AND ec.category_id = 4
-                GROUP BY e.evaluation_id
-            ) cat4 ON e.evaluation_id = cat4.evaluation_id
-            -- Student-Teacher Engagement (Category 5) average
-            LEFT JOIN (
-                SELECT 
-                    e.evaluation_id,
-                    AVG(er.rating) as avg_rating
-                FROM evaluations e
-                JOIN evaluation_responses er ON e.evaluation_id = er.evaluation_id
-                JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-                WHERE e.period_id = %s AND e.status = 'completed' AND ec.category_id = 5
-                GROUP BY e.evaluation_id
-            ) cat5 ON e.evaluation_id = cat5.evaluation_id
-            WHERE at.acad_year_id = %s
-        """
-        
-        params = [period_id, period_id, period_id, period_id, period_id, academic_year_id]
-        
-        if department_id:
-            query += " AND f.program_id = %s"
-            params.append(department_id)
-        
-        query += """
-            GROUP BY f.faculty_id, f.first_name, f.last_name, f.program_id, p.name
-            HAVING COUNT(DISTINCT e.evaluation_id) > 0
-            ORDER BY average_rating DESC, total_evaluations DESC
-        """
-        
-        cursor.execute(query, tuple(params))
-        rankings = cursor.fetchall()
+        # Same ranking engine as the rankings API (one column per active category)
+        ranking = FacultyRankings.compute(period_id, academic_year_id, department_id)
+        if ranking is None:
+            return jsonify({'success': False, 'message': 'Failed to compute faculty rankings'}), 500
+        categories = ranking['categories']
+        rankings = ranking['rankings']
         
         # Helper function for remarks
         def get_remarks(mean):
@@ -16513,6 +15361,10 @@ def export_rankings_excel():
         cursor.close()
         conn.close()
         
+        # Rank, name, department, overall, one column per category, evaluations, remarks
+        total_columns = 6 + len(categories)
+        last_col = get_column_letter(total_columns)
+        
         # Create Excel workbook (same format as faculty results)
         wb = Workbook()
         ws = wb.active
@@ -16558,28 +15410,28 @@ def export_rankings_excel():
             pass
         
         # Header section (same format as faculty results)
-        ws.merge_cells(f'A{row}:I{row}')
+        ws.merge_cells(f'A{row}:{last_col}{row}')
         cell = ws[f'A{row}']
         cell.value = 'NORZAGARAY COLLEGE'
         cell.font = Font(name='Times New Roman', size=12, bold=True)
         cell.alignment = center_alignment
         row += 1
         
-        ws.merge_cells(f'A{row}:I{row}')
+        ws.merge_cells(f'A{row}:{last_col}{row}')
         cell = ws[f'A{row}']
         cell.value = 'Municipal Compound, Norzagaray, Bulacan'
         cell.font = normal_font
         cell.alignment = center_alignment
         row += 1
         
-        ws.merge_cells(f'A{row}:I{row}')
+        ws.merge_cells(f'A{row}:{last_col}{row}')
         cell = ws[f'A{row}']
         cell.value = 'GUIDANCE AND COUNSELING CENTER'
         cell.font = Font(name='Times New Roman', size=10, bold=True)
         cell.alignment = center_alignment
         row += 1
         
-        ws.merge_cells(f'A{row}:I{row}')
+        ws.merge_cells(f'A{row}:{last_col}{row}')
         cell = ws[f'A{row}']
         cell.value = 'FACULTY TEACHING PERFORMANCE EVALUATION RANKINGS REPORT'
         cell.font = Font(name='Times New Roman', size=9)
@@ -16589,7 +15441,7 @@ def export_rankings_excel():
         # Remove any status text from period name using regex (same as faculty results)
         import re
         period_name = re.sub(r'\s*\([^)]*\)\s*$', '', period_info['period_name']).strip()
-        ws.merge_cells(f'A{row}:I{row}')
+        ws.merge_cells(f'A{row}:{last_col}{row}')
         cell = ws[f'A{row}']
         cell.value = f"{period_name}, A.Y. {period_info['year_name']}"
         cell.font = Font(name='Times New Roman', size=9)
@@ -16609,7 +15461,7 @@ def export_rankings_excel():
         row += 1  # Empty row
         
         # Rankings table (same format as faculty results categories)
-        ws.merge_cells(f'A{row}:I{row}')
+        ws.merge_cells(f'A{row}:{last_col}{row}')
         cell = ws[f'A{row}']
         cell.value = 'FACULTY EVALUATION RANKINGS'
         cell.font = subheader_font
@@ -16619,7 +15471,9 @@ def export_rankings_excel():
         row += 1
         
         # Table headers (same format as faculty results)
-        headers = ['Rank', 'Faculty Name', 'Department', 'Overall Rating', 'Learning Delivery', 'Assessment Learning', 'Student Engagement', 'Evaluations', 'Remarks']
+        headers = (['Rank', 'Faculty Name', 'Department', 'Overall Rating']
+                   + [category['name'] for category in categories]
+                   + ['Evaluations', 'Remarks'])
         for col, header in enumerate(headers, 1):
             cell = ws.cell(row=row, column=col)
             cell.value = header
@@ -16632,21 +15486,17 @@ def export_rankings_excel():
         # Rankings data (same format as faculty results)
         for idx, faculty in enumerate(rankings, 1):
             overall_rating = faculty['average_rating'] or 0.0
-            learning_delivery = faculty['learning_delivery'] or 0.0
-            assessment_learning = faculty['assessment_learning'] or 0.0
-            student_engagement = faculty['student_engagement'] or 0.0
             
             ws.cell(row=row, column=1).value = idx
             ws.cell(row=row, column=2).value = f"{faculty['first_name']} {faculty['last_name']}"
             ws.cell(row=row, column=3).value = faculty['department_name'] or 'N/A'
             ws.cell(row=row, column=4).value = f"{overall_rating:.2f}"
-            ws.cell(row=row, column=5).value = f"{learning_delivery:.2f}"
-            ws.cell(row=row, column=6).value = f"{assessment_learning:.2f}"
-            ws.cell(row=row, column=7).value = f"{student_engagement:.2f}"
-            ws.cell(row=row, column=8).value = faculty['total_evaluations']
-            ws.cell(row=row, column=9).value = get_remarks(overall_rating)
+            for offset, category in enumerate(categories):
+                ws.cell(row=row, column=5 + offset).value = f"{faculty['category_scores'][category['category_id']]:.2f}"
+            ws.cell(row=row, column=total_columns - 1).value = faculty['total_evaluations']
+            ws.cell(row=row, column=total_columns).value = get_remarks(overall_rating)
             
-            for col in range(1, 10):
+            for col in range(1, total_columns + 1):
                 cell = ws.cell(row=row, column=col)
                 cell.font = normal_font
                 cell.border = thin_border
@@ -16660,7 +15510,7 @@ def export_rankings_excel():
         row += 1  # Empty row
         
         # Rating scale (same format as faculty results)
-        ws.merge_cells(f'A{row}:I{row}')
+        ws.merge_cells(f'A{row}:{last_col}{row}')
         cell = ws[f'A{row}']
         cell.value = 'RATING SCALE:'
         cell.font = subheader_font
@@ -16749,12 +15599,9 @@ def export_rankings_excel():
         ws.column_dimensions['A'].width = 8
         ws.column_dimensions['B'].width = 25
         ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 12
-        ws.column_dimensions['E'].width = 12
-        ws.column_dimensions['F'].width = 12
-        ws.column_dimensions['G'].width = 12
-        ws.column_dimensions['H'].width = 12
-        ws.column_dimensions['I'].width = 20
+        for col in range(4, total_columns):
+            ws.column_dimensions[get_column_letter(col)].width = 12
+        ws.column_dimensions[last_col].width = 20
         
         # Save file
         if department:
@@ -16781,6 +15628,55 @@ def export_rankings_excel():
 # AI ANALYTICS ENDPOINTS
 # ================================
 
+def _ai_insight(function_name, func, *args, advanced_mode=False):
+    """
+    Generate an AI analytics insight
+
+    Advanced analyses run as insight jobs (unless AI_ASYNC_ADVANCED is off),
+    so the chart data is returned at once and the page polls
+    /ai-analytics/insight-jobs/<job_id> for the text.
+
+    Args:
+        function_name (str): Insight name
+        func (callable): Insight function from utils.ai_support
+        *args: Its positional arguments
+        advanced_mode (bool): Advanced or standard analysis
+
+    Returns:
+        tuple: (insight text or None, insight job ID or None)
+    """
+    if advanced_mode and current_app.config.get('AI_ASYNC_ADVANCED', True):
+        job_id = start_insight_job(
+            current_app._get_current_object(), function_name, func, *args,
+            user_id=session.get('user_id'), advanced_mode=True
+        )
+        if job_id:
+            return None, job_id
+    return func(*args, advanced_mode=advanced_mode), None
+
+
+@api_bp.route('/ai-analytics/insight-jobs/<job_id>')
+@login_required
+def ai_analytics_insight_job(job_id):
+    """Get the status (and, once completed, the text) of an advanced AI insight job"""
+    job = get_insight_job(job_id, current_app.config.get('AI_ADVANCED_TIMEOUT_SECONDS', 60))
+    if not job or job['created_by'] != session.get('user_id'):
+        return jsonify({'success': False, 'message': 'Insight job not found'}), 404
+
+    if job['status'] == 'failed':
+        return jsonify({
+            'success': True,
+            'status': 'failed',
+            'ai_insight': 'AI analysis is temporarily unavailable. Please try again later.'
+        })
+
+    return jsonify({
+        'success': True,
+        'status': job['status'],
+        'ai_insight': job['insight'] if job['status'] == 'completed' else None
+    })
+
+
 @api_bp.route('/ai-analytics/performance-trends')
 @login_required
 def ai_analytics_performance_trends():
@@ -16927,13 +15823,17 @@ def ai_analytics_performance_trends():
         
         # Generate AI insight
         from utils.ai_support import generate_performance_trend_insight
-        ai_insight = generate_performance_trend_insight(trends_data, metrics, advanced_mode)
+        ai_insight, ai_insight_job = _ai_insight(
+            'performance_trend', generate_performance_trend_insight, trends_data, metrics,
+            advanced_mode=advanced_mode
+        )
         
         return jsonify({
             'success': True,
             'chart_data': chart_data,
             'metrics': metrics,
-            'ai_insight': ai_insight
+            'ai_insight': ai_insight,
+            'ai_insight_job': ai_insight_job
         })
         
     except Exception as e:
@@ -17226,13 +16126,17 @@ def ai_analytics_comparison():
         
         # Generate AI insight
         from utils.ai_support import generate_comparison_insight
-        ai_insight = generate_comparison_insight(comparison_data, top_faculty, bottom_faculty, advanced_mode)
+        ai_insight, ai_insight_job = _ai_insight(
+            'comparison', generate_comparison_insight, comparison_data, top_faculty, bottom_faculty,
+            advanced_mode=advanced_mode
+        )
         
         return jsonify({
             'success': True,
             'chart_data': chart_data,
             'rankings': rankings,
-            'ai_insight': ai_insight
+            'ai_insight': ai_insight,
+            'ai_insight_job': ai_insight_job
         })
         
     except Exception as e:
@@ -17267,23 +16171,39 @@ def ai_analytics_question_analysis():
             period_filter = "AND e.period_id = %s"
             period_params.append(period_id)
         
-        # Get question performance data from evaluation criteria
-        query = f"""
-            SELECT 
-                ec.description as question_text,
-                AVG(er.rating) as avg_score,
-                COUNT(er.response_id) as response_count,
-                ec.criteria_id as question_id
-            FROM evaluation_responses er
-            JOIN evaluations e ON er.evaluation_id = e.evaluation_id
-            JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
-            WHERE er.rating IS NOT NULL {period_filter}
-            GROUP BY ec.criteria_id, ec.description
-            ORDER BY avg_score DESC
-        """
-        cursor.execute(query, period_params)
-        
-        question_data = cursor.fetchall()
+        # Single periods are aggregated from the cached response matrix
+        matrix = ResponseMatrix.for_period(int(period_id)) if period_id.isdigit() else None
+        if matrix is not None:
+            question_stats = matrix.group_stats('criteria')
+            question_data = [
+                {
+                    'question_text': matrix.criteria[criteria_id]['description'],
+                    'avg_score': stats['mean'],
+                    'response_count': stats['count'],
+                    'question_id': criteria_id
+                }
+                for criteria_id, stats in question_stats.items()
+            ]
+            question_data.sort(key=lambda q: q['avg_score'], reverse=True)
+        else:
+            question_stats = {}
+            # Get question performance data from evaluation criteria
+            query = f"""
+                SELECT 
+                    ec.description as question_text,
+                    AVG(er.rating) as avg_score,
+                    COUNT(er.response_id) as response_count,
+                    ec.criteria_id as question_id
+                FROM evaluation_responses er
+                JOIN evaluations e ON er.evaluation_id = e.evaluation_id
+                JOIN evaluation_criteria ec ON er.criteria_id = ec.criteria_id
+                WHERE er.rating IS NOT NULL {period_filter}
+                GROUP BY ec.criteria_id, ec.description
+                ORDER BY avg_score DESC
+            """
+            cursor.execute(query, period_params)
+            
+            question_data = cursor.fetchall()
         
         # Prepare chart data
         questions = [q['question_text'][:50] + '...' if len(q['question_text']) > 50 else q['question_text'] for q in question_data]
@@ -17313,21 +16233,36 @@ def ai_analytics_question_analysis():
         # Prepare detailed question data
         detailed_questions = []
         for q in question_data:
-            detailed_questions.append({
+            question = {
                 'question_text': q['question_text'],
                 'mean': float(q['avg_score']),
                 'response_count': q['response_count']
-            })
+            }
+            # Spread and distribution are only available from the response matrix
+            stats = question_stats.get(q['question_id'])
+            if stats:
+                question.update({
+                    'std_dev': round(stats['std_dev'], 2),
+                    'p25': stats['p25'],
+                    'median': stats['median'],
+                    'p75': stats['p75'],
+                    'votes': stats['votes']
+                })
+            detailed_questions.append(question)
         
         # Generate AI insight
         from utils.ai_support import generate_question_analysis_insight
-        ai_insight = generate_question_analysis_insight(question_data, advanced_mode)
+        ai_insight, ai_insight_job = _ai_insight(
+            'question_analysis', generate_question_analysis_insight, question_data,
+            advanced_mode=advanced_mode
+        )
         
         return jsonify({
             'success': True,
             'chart_data': chart_data,
             'question_data': detailed_questions,
-            'ai_insight': ai_insight
+            'ai_insight': ai_insight,
+            'ai_insight_job': ai_insight_job
         })
         
     except Exception as e:
@@ -17491,7 +16426,10 @@ def ai_analytics_engagement():
         
         # Generate AI insight
         from utils.ai_support import generate_engagement_insight
-        ai_insight = generate_engagement_insight(engagement_data, stats, advanced_mode)
+        ai_insight, ai_insight_job = _ai_insight(
+            'engagement', generate_engagement_insight, engagement_data, stats,
+            advanced_mode=advanced_mode
+        )
         
         return jsonify({
             'success': True,
@@ -17502,7 +16440,8 @@ def ai_analytics_engagement():
                 'stats': dept_stats,
                 'rankings': dept_rankings
             },
-            'ai_insight': ai_insight
+            'ai_insight': ai_insight,
+            'ai_insight_job': ai_insight_job
         })
         
     except Exception as e:
@@ -17620,12 +16559,16 @@ def ai_analytics_improvement_opportunities():
         
         # Generate AI insight and recommendations
         from utils.ai_support import generate_improvement_opportunities_insight
-        ai_insight = generate_improvement_opportunities_insight(improvement_data, advanced_mode)
+        ai_insight, ai_insight_job = _ai_insight(
+            'improvement_opportunities', generate_improvement_opportunities_insight, improvement_data,
+            advanced_mode=advanced_mode
+        )
         
         return jsonify({
             'success': True,
             'improvement_data': formatted_data,
-            'ai_insight': ai_insight
+            'ai_insight': ai_insight,
+            'ai_insight_job': ai_insight_job
         })
         
     except Exception as e:
@@ -3,7 +3,7 @@ Authentication routes blueprint for IntellEvalPro
 Handles login, logout, signup, and password recovery
 """
 from flask import Blueprint, render_template, request, redirect, url_for, session, flash
-from models import User
+from models import User, request_transaction
 from utils import check_password_hash
 
 # Create blueprint
@@ -98,18 +98,19 @@ def login():
             session['login_time'] = datetime.now().isoformat()
             session['last_activity'] = datetime.now().isoformat()
             
-            # Update last login
-            User.update_last_login(user['user_id'])
-            
-            # Log successful login activity
-            log_activity(
-                user_id=user['user_id'],
-                user_name=f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() or username,
-                user_role=user['role'],
-                activity_type='login',
-                description=f"User logged in successfully",
-                ip_address=request.remote_addr
-            )
+            # Update last login and log the activity in one transaction
+            with request_transaction():
+                User.update_last_login(user['user_id'])
+                
+                # Log successful login activity
+                log_activity(
+                    user_id=user['user_id'],
+                    user_name=f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() or username,
+                    user_role=user['role'],
+                    activity_type='login',
+                    description=f"User logged in successfully",
+                    ip_address=request.remote_addr
+                )
             
             # Redirect based on role using url_for
             if user['role'] == 'admin':
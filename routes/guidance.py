@@ -5,6 +5,7 @@ Handles all guidance counselor-related routes and functionality
 from flask import Blueprint, render_template, session, redirect, url_for, request, jsonify
 from utils import guidance_required
 from models.database import get_db_connection
+from models.academic_calendar import AcademicCalendar
 
 # Create blueprint
 guidance_bp = Blueprint('guidance', __name__, url_prefix='/guidance')
@@ -19,58 +20,9 @@ def guidance_dashboard():
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
         
-        # Get current academic term with year info
-        cursor.execute("""
-            SELECT 
-                at.acad_term_id,
-                at.term_name,
-                at.term_code,
-                ay.year_code,
-                ay.year_name,
-                CONCAT(ay.year_code, ' - ', at.term_name) as display_term
-            FROM academic_terms at
-            INNER JOIN academic_years ay ON at.acad_year_id = ay.acad_year_id
-            WHERE at.is_current = 1
-            LIMIT 1
-        """)
-        current_term = cursor.fetchone()
-        
-        if not current_term:
-            # Fallback to most recent term
-            cursor.execute("""
-                SELECT 
-                    at.acad_term_id,
-                    at.term_name,
-                    at.term_code,
-                    ay.year_code,
-                    ay.year_name,
-                    CONCAT(ay.year_code, ' - ', at.term_name) as display_term
-                FROM academic_terms at
-                INNER JOIN academic_years ay ON at.acad_year_id = ay.acad_year_id
-                ORDER BY at.acad_term_id DESC
-                LIMIT 1
-            """)
-            current_term = cursor.fetchone()
-        
-        # Get current active period
-        cursor.execute("""
-            SELECT period_id, title, start_date, end_date
-            FROM evaluation_periods 
-            WHERE status = 'Active' 
-            ORDER BY start_date DESC 
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
-        
-        if not current_period:
-            # Fallback to most recent period if no active period
-            cursor.execute("""
-                SELECT period_id, title, start_date, end_date
-                FROM evaluation_periods 
-                ORDER BY start_date DESC 
-                LIMIT 1
-            """)
-            current_period = cursor.fetchone()
+        # Current academic term and active period (most recent as fallback)
+        current_term = AcademicCalendar.current_term(fallback=True)
+        current_period = AcademicCalendar.active_period(fallback=True)
         
         # Get total faculty count
         cursor.execute("SELECT COUNT(*) as total_faculty FROM faculty WHERE status = 'Active'")
@@ -297,14 +249,7 @@ def faculty_performance():
         cursor = conn.cursor(dictionary=True)
         
         # Get current active period
-        cursor.execute("""
-            SELECT period_id, title, start_date, end_date
-            FROM evaluation_periods 
-            WHERE status = 'Active' 
-            ORDER BY start_date DESC 
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
+        current_period = AcademicCalendar.active_period()
         
         if not current_period:
             # No active period, return empty data
@@ -479,14 +424,7 @@ def rankings():
         all_periods = cursor.fetchall() or []
         
         # Get current active period or most recent period
-        cursor.execute("""
-            SELECT period_id, title, start_date, end_date, status
-            FROM evaluation_periods 
-            WHERE status = 'Active' 
-            ORDER BY start_date DESC 
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
+        current_period = AcademicCalendar.active_period()
         
         if not current_period and all_periods:
             # If no active period, use the most recent one
@@ -565,14 +503,7 @@ def response_analytics():
             """, (selected_period_id,))
             current_period = cursor.fetchone()
         else:
-            cursor.execute("""
-                SELECT period_id, title, start_date, end_date
-                FROM evaluation_periods 
-                WHERE status = 'Active' 
-                ORDER BY start_date DESC 
-                LIMIT 1
-            """)
-            current_period = cursor.fetchone()
+            current_period = AcademicCalendar.active_period()
             if current_period:
                 selected_period_id = current_period['period_id']
         
@@ -884,14 +815,7 @@ def evaluation_monitoring():
         all_periods = cursor.fetchall()
         
         # Get current active period
-        cursor.execute("""
-            SELECT period_id 
-            FROM evaluation_periods 
-            WHERE status = 'Active' 
-            ORDER BY start_date DESC 
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
+        current_period = AcademicCalendar.active_period()
         selected_period_id = current_period['period_id'] if current_period else None
         
         cursor.close()
@@ -1230,14 +1154,7 @@ def get_dashboard_stats():
         total_departments = cursor.fetchone()['total_departments'] or 0
         
         # Get current active period
-        cursor.execute("""
-            SELECT period_id 
-            FROM evaluation_periods 
-            WHERE status = 'Active' 
-            ORDER BY start_date DESC 
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
+        current_period = AcademicCalendar.active_period()
         period_id = current_period['period_id'] if current_period else None
         
         # Get student evaluation statistics for the current active period
@@ -1313,14 +1230,12 @@ def get_dashboard_stats():
         # Calculate overall evaluation completion rate
         evaluation_completion_rate = round((completed_evaluations / total_evaluations * 100) if total_evaluations > 0 else 0, 1)
         
-        # Get average rating from completed evaluations
+        # Get average rating from completed evaluations (faculty score aggregates)
         cursor.execute("""
-            SELECT AVG(er.rating) as average_rating
-            FROM evaluation_responses er
-            JOIN evaluations e ON er.evaluation_id = e.evaluation_id
-            WHERE e.status = 'Completed'
+            SELECT SUM(rating_sum) / SUM(response_count) as average_rating
+            FROM faculty_score_aggregates
             {}
-        """.format("AND e.period_id = %s" if period_id else ""), (period_id,) if period_id else ())
+        """.format("WHERE period_id = %s" if period_id else ""), (period_id,) if period_id else ())
         avg_result = cursor.fetchone()
         average_rating = float(avg_result['average_rating'] or 0)
         
@@ -4,7 +4,7 @@ Handles all student-related routes and functionality
 """
 from flask import Blueprint, render_template, session, redirect, url_for, request
 from utils import student_required
-from models import Student, Evaluation, get_db_connection
+from models import Student, Evaluation, AcademicCalendar, get_db_connection
 from utils.json_encoder import jsonify
 from datetime import datetime
 
@@ -62,15 +62,9 @@ def student_dashboard():
         print(f"DEBUG: student_id={student_id}")
         
         # Get current evaluation period
-        cursor.execute("""
-            SELECT period_id as id, title, start_date, end_date, status,
-                   DATEDIFF(end_date, CURDATE()) as days_remaining
-            FROM evaluation_periods
-            WHERE status = 'Active'
-            ORDER BY start_date DESC
-            LIMIT 1
-        """)
-        period = cursor.fetchone()
+        period = AcademicCalendar.active_period()
+        if period:
+            period['id'] = period['period_id']
         
         print(f"DEBUG: Active period found: {period}")
         
@@ -243,31 +237,9 @@ def pending_evaluations():
         student_id = student_record['id']
         
         # Get current evaluation period (check for Active status OR date-based active period)
-        cursor.execute("""
-            SELECT period_id as id, title, start_date, end_date, status,
-                   DATEDIFF(end_date, CURDATE()) as days_remaining,
-                   CASE 
-                       WHEN CURDATE() < start_date THEN 'Upcoming'
-                       WHEN CURDATE() > end_date THEN 'Completed'
-                       WHEN CURDATE() BETWEEN start_date AND end_date THEN 'Active'
-                       ELSE status
-                   END as computed_status
-            FROM evaluation_periods
-            WHERE COALESCE(is_archived, 0) = 0
-            AND (
-                status = 'Active' 
-                OR CURDATE() BETWEEN start_date AND end_date
-            )
-            ORDER BY 
-                CASE WHEN CURDATE() BETWEEN start_date AND end_date THEN 1 ELSE 2 END,
-                start_date DESC
-            LIMIT 1
-        """)
-        current_period = cursor.fetchone()
-        
-        # Update the status to computed_status if available
-        if current_period and current_period.get('computed_status'):
-            current_period['status'] = current_period['computed_status']
+        current_period = AcademicCalendar.open_period()
+        if current_period:
+            current_period['id'] = current_period['period_id']
         
         # If no active evaluation period, show empty state but don't redirect
         # (Allow students to see their completed evaluations even without active period)
@@ -284,8 +256,7 @@ def pending_evaluations():
                    ep.end_date,
                    ets.session_id, ets.start_time, ets.time_limit_minutes,
                    CASE 
-                       WHEN ets.session_id IS NOT NULL AND 
-                            TIMESTAMPDIFF(SECOND, ets.start_time, NOW()) > (ets.time_limit_minutes * 60)
+                       WHEN e.status IN ('Pending', 'In Progress') AND e.expires_at <= NOW()
                        THEN 'Expired'
                        ELSE e.status
                    END as display_status
@@ -306,21 +277,11 @@ def pending_evaluations():
         """, (student_id,))
         evaluations_raw = cursor.fetchall()
         
-        # Process evaluations and update expired ones
+        # Show timed-out evaluations as Expired; the expiry sweeper
+        # (utils/expired_evaluations.py) updates the rows themselves
         evaluations = []
         for eval_data in evaluations_raw:
-            # Update status in database if expired
-            if eval_data['display_status'] == 'Expired' and eval_data['status'] != 'Expired':
-                cursor.execute("""
-                    UPDATE evaluations 
-                    SET status = 'Expired' 
-                    WHERE evaluation_id = %s
-                """, (eval_data['evaluation_id'],))
-                conn.commit()
-                eval_data['status'] = 'Expired'
-            else:
-                eval_data['status'] = eval_data['display_status']
-            
+            eval_data['status'] = eval_data['display_status']
             evaluations.append(eval_data)
         
         # Get completed evaluations
@@ -857,35 +818,20 @@ def submit_evaluation():
         # Collect comments - now using single comment field
         comments = request.form.get('comments', '').strip()
         
-        # Update evaluation status
-        cursor.execute("""
-            UPDATE evaluations 
-            SET status = 'Completed',
-                completion_time = NOW(),
-                updated_at = NOW()
-            WHERE evaluation_id = %s
-        """, (evaluation_id,))
-        
-        # Insert all responses
-        for response in responses_data:
-            cursor.execute("""
-                INSERT INTO evaluation_responses (evaluation_id, criteria_id, rating)
-                VALUES (%s, %s, %s)
-            """, (evaluation_id, response['criteria_id'], response['rating']))
-        
-        # Delete any existing draft since evaluation is now completed
-        cursor.execute("DELETE FROM evaluation_drafts WHERE evaluation_id = %s", (evaluation_id,))
-        
-        # Store comment in the comments table if provided
-        if comments:
-            cursor.execute("""
-                INSERT INTO comments (evaluation_id, comment_text, sentiment, created_at)
-                VALUES (%s, %s, %s, NOW())
-            """, (evaluation_id, comments, 'Neutral'))
+        # Status update, all ratings, draft cleanup and comment in one transaction
+        try:
+            written = Evaluation.record_submission(cursor, evaluation_id, responses_data, comments)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
         
-        conn.commit()
-        cursor.close()
-        conn.close()
+        if not written:
+            # A concurrent retry (e.g. double-click) already completed it
+            print(f"Evaluation {evaluation_id} was already submitted; ignoring duplicate submit")
         
         return jsonify({
             'success': True, 
@@ -0,0 +1,252 @@
+"""
+Parity tests: batch analytics (build_faculty_analytics) vs the legacy
+per-faculty FacultyAnalytics.calculate_faculty_performance path
+
+No MySQL server is needed. A fake connection answers both paths' queries
+from the same in-memory period, evaluating them the way MySQL would
+(AVG over completed responses, the 10 longest comments per sentiment, ...).
+"""
+import json
+from collections import Counter
+
+import pytest
+
+from models import analytics
+from models.analytics import AnalyticsScheduler, FacultyAnalytics, build_faculty_analytics
+from utils.theme_matcher import ThemeMatcher
+
+PERIOD_ID = 1
+
+# section_id -> (faculty_id, subject_id)
+SECTIONS = {1: (10, 100), 2: (10, 200), 3: (10, None), 4: (20, 100)}
+# criteria_id -> category_id
+CRITERIA = {1: 1, 2: 1, 3: 2}
+
+POSITIVE = [
+    'Very clear explanations and always prepared for every single class session',
+    'Engaging and interactive lessons that keep everyone interested throughout',
+    'Helpful and supportive when we ask questions after class',
+    'Clear',
+    'Knowledgeable and skilled in the subject, explains clearly with good slides',
+    'Patient and kind',
+    'Organized lessons with a clear plan each week',
+    'Good use of online tools and slides during discussion',
+    'Punctual and manages time well',
+    'Great feedback on quizzes and exams',
+    'Speaks clearly with a good voice',
+    'Always available and supportive',
+    'Engaging',
+]
+NEGATIVE = [
+    'Often late and does not manage time well in class',
+    'Exams are too hard and feedback on grades is slow',
+    'Sometimes unclear',
+    'Slides are hard to read in the back of the room',
+    'Speaks too fast',
+]
+
+
+def _period():
+    """Evaluations, responses and comments of one period"""
+    evaluations, responses, comments = [], [], []
+    evaluation_id = 0
+    for section_id in SECTIONS:
+        for student in range(10):
+            evaluation_id += 1
+            status = 'Completed' if student < 7 else ('Pending' if student == 7 else 'In Progress')
+            evaluations.append({'evaluation_id': evaluation_id, 'section_id': section_id, 'status': status})
+            if status != 'Pending':
+                for criteria_id in CRITERIA:
+                    # Uneven ratings so category averages land near grade boundaries
+                    rating = 5 - (evaluation_id + criteria_id * student) % 3 + (student == 0 and criteria_id == 3)
+                    responses.append({'evaluation_id': evaluation_id, 'criteria_id': criteria_id,
+                                      'rating': min(rating, 5)})
+            texts = POSITIVE if evaluation_id % 2 else NEGATIVE
+            sentiment = 'Positive' if evaluation_id % 2 else 'Negative'
+            comments.append({'evaluation_id': evaluation_id,
+                             'comment_text': texts[evaluation_id % len(texts)],
+                             'sentiment': sentiment})
+            if evaluation_id % 5 == 0:
+                comments.append({'evaluation_id': evaluation_id, 'comment_text': 'Okay', 'sentiment': 'Neutral'})
+    return evaluations, responses, comments
+
+
+class FakeCursor:
+    """Answers the legacy and batch analytics queries from _period()"""
+
+    def __init__(self, dictionary):
+        self.dictionary = dictionary
+        self.evaluations, self.responses, self.comments = _period()
+        self._rows = []
+
+    # Helpers -----------------------------------------------------------
+    def _scope(self, params):
+        faculty_id, period_id = params[0], params[1]
+        subject_id = params[2] if len(params) > 2 else None
+        assert period_id == PERIOD_ID
+        ids = set()
+        for e in self.evaluations:
+            faculty, subject = SECTIONS[e['section_id']]
+            if faculty == faculty_id and (subject_id is None or subject == subject_id):
+                ids.add(e['evaluation_id'])
+        return ids
+
+    def _status(self, evaluation_id):
+        return next(e['status'] for e in self.evaluations if e['evaluation_id'] == evaluation_id)
+
+    def _owner(self, evaluation_id):
+        section_id = next(e['section_id'] for e in self.evaluations if e['evaluation_id'] == evaluation_id)
+        return SECTIONS[section_id]
+
+    # Cursor API --------------------------------------------------------
+    def execute(self, query, params=()):
+        params = list(params)
+        if 'CROSS JOIN' in query:
+            self._rows = [self._evaluation_stats(params[:len(params) // 3])]
+        elif 'JSON_OBJECT' in query:
+            self._rows = self._category_performance(params)
+        elif 'ORDER BY CHAR_LENGTH' in query:
+            sentiment = 'Positive' if "'Positive'" in query else 'Negative'
+            self._rows = self._longest_comments(params, sentiment)
+        elif 'COUNT(*) as total_evaluations' in query:
+            self._rows = self._grouped_evaluations()
+        elif 'COUNT(*) as responses' in query:
+            self._rows = self._grouped_ratings()
+        elif 'COUNT(*) as comments' in query:
+            self._rows = self._grouped_sentiments()
+        elif "c.sentiment IN ('Positive', 'Negative')" in query:
+            self._rows = [(*self._owner(c['evaluation_id']), c['sentiment'], c['comment_text'])
+                          for c in self.comments if c['sentiment'] in ('Positive', 'Negative')]
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        pass
+
+    # Legacy queries ----------------------------------------------------
+    def _evaluation_stats(self, params):
+        scope = self._scope(params)
+        ratings = [r['rating'] for r in self.responses if r['evaluation_id'] in scope]
+        sentiments = Counter(c['sentiment'] for c in self.comments if c['evaluation_id'] in scope)
+        return {
+            'total_evaluations': len(scope),
+            'completed_evaluations': sum(self._status(e) == 'Completed' for e in scope),
+            'total_responses': len(ratings),
+            'average_rating': sum(ratings) / len(ratings) if ratings else None,
+            'total_comments': sum(sentiments.values()),
+            'positive_comments': sentiments['Positive'],
+            'negative_comments': sentiments['Negative'],
+            'neutral_comments': sentiments['Neutral'],
+        }
+
+    def _category_performance(self, params):
+        scope = self._scope(params)
+        by_category = {}
+        for r in self.responses:
+            if r['evaluation_id'] in scope and self._status(r['evaluation_id']) == 'Completed':
+                by_category.setdefault(CRITERIA[r['criteria_id']], []).append(r['rating'])
+        return [{
+            'category_id': category_id,
+            'category_name': f"Category {category_id}",
+            'average_score': sum(ratings) / len(ratings),
+            'total_responses': len(ratings),
+            'score_distribution': json.dumps({str(v): ratings.count(v) for v in range(1, 6)}),
+        } for category_id, ratings in by_category.items()]
+
+    def _longest_comments(self, params, sentiment):
+        scope = self._scope(params)
+        texts = [c['comment_text'] for c in self.comments
+                 if c['evaluation_id'] in scope and c['sentiment'] == sentiment]
+        return [{'comment_text': text} for text in sorted(texts, key=len, reverse=True)[:10]]
+
+    # Batch queries -----------------------------------------------------
+    def _grouped_evaluations(self):
+        groups = Counter()
+        completed = Counter()
+        for e in self.evaluations:
+            key = SECTIONS[e['section_id']]
+            groups[key] += 1
+            completed[key] += e['status'] == 'Completed'
+        return [(f, s, groups[(f, s)], completed[(f, s)]) for f, s in groups]
+
+    def _grouped_ratings(self):
+        groups = Counter()
+        for r in self.responses:
+            faculty, subject = self._owner(r['evaluation_id'])
+            completed = int(self._status(r['evaluation_id']) == 'Completed')
+            groups[(faculty, subject, CRITERIA[r['criteria_id']], completed, r['rating'])] += 1
+        return [key + (count,) for key, count in groups.items()]
+
+    def _grouped_sentiments(self):
+        groups = Counter((*self._owner(c['evaluation_id']), c['sentiment']) for c in self.comments)
+        return [key + (count,) for key, count in groups.items()]
+
+
+class FakeConnection:
+    def cursor(self, dictionary=False):
+        return FakeCursor(dictionary)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_database(monkeypatch):
+    monkeypatch.setattr(analytics, 'get_db_connection', FakeConnection)
+    monkeypatch.setattr(analytics, 'get_theme_matcher', lambda path=None: ThemeMatcher())
+
+
+SAVED_FIELDS = (
+    'total_evaluations', 'completed_evaluations', 'response_rate', 'average_rating',
+    'overall_score', 'performance_grade', 'strengths_summary', 'improvement_areas',
+    'total_comments', 'positive_comments', 'negative_comments', 'neutral_comments'
+)
+
+
+def _category_rows(result):
+    return {
+        c['category_id']: (
+            round(float(c['average_score']), 2),
+            c['total_responses'],
+            json.loads(c['score_distribution']),
+            FacultyAnalytics._calculate_performance_grade(c['average_score'])
+        )
+        for c in result['category_performance']
+    }
+
+
+@pytest.mark.parametrize('faculty_id', [10, 20])
+def test_batch_analytics_match_legacy(faculty_id):
+    rows = AnalyticsScheduler.load_period_rows(PERIOD_ID)
+    batch = {r['subject_id']: r for r in build_faculty_analytics(PERIOD_ID, rows[faculty_id], ThemeMatcher())}
+
+    subjects = {subject for faculty, subject in SECTIONS.values() if faculty == faculty_id}
+    assert set(batch) == {None} | {s for s in subjects if s is not None}
+
+    for subject_id, result in batch.items():
+        legacy = FacultyAnalytics.calculate_faculty_performance(faculty_id, PERIOD_ID, subject_id)
+        for field in SAVED_FIELDS:
+            assert result[field] == legacy[field], (subject_id, field)
+        assert _category_rows(result) == _category_rows(legacy), subject_id
+
+
+def test_themes_use_only_the_longest_comments():
+    rows = AnalyticsScheduler.load_period_rows(PERIOD_ID)
+    overall = build_faculty_analytics(PERIOD_ID, rows[10], ThemeMatcher())[0]
+    positives = [text for subject, sentiment, text in rows[10]['comments'] if sentiment == 'Positive']
+
+    # More comments than the legacy LIMIT, so the cut-off is exercised
+    assert len(positives) > analytics.THEME_COMMENT_LIMIT
+    matcher = ThemeMatcher()
+    longest = sorted(positives, key=len, reverse=True)[:analytics.THEME_COMMENT_LIMIT]
+    expected = '; '.join(matcher.rank(matcher.count_all(longest))[:3])
+    assert overall['strengths_summary'] == expected
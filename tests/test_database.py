@@ -0,0 +1,89 @@
+"""
+Tests for the request-scoped connection in models.database
+
+A fake raw connection stands in for the pool, so no MySQL server is needed.
+"""
+import flask
+import pytest
+
+from models import database
+from models.database import RequestTransactionAborted
+
+
+class FakeRawConnection:
+    def __init__(self):
+        self.log = []
+
+    def cursor(self, *args, **kwargs):
+        self.log.append('cursor')
+        return FakeCursor()
+
+    def commit(self):
+        self.log.append('commit')
+
+    def rollback(self):
+        self.log.append('rollback')
+
+    def close(self):
+        self.log.append('close')
+
+
+class FakeCursor:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def raw(monkeypatch):
+    raw = FakeRawConnection()
+    monkeypatch.setattr(database, '_checkout', lambda: raw)
+    return raw
+
+
+@pytest.fixture
+def app_context():
+    with flask.Flask(__name__).app_context():
+        yield
+
+
+def test_sole_borrower_rolls_back_and_can_commit_again(raw, app_context):
+    conn = database.get_db_connection()
+    conn.rollback()
+    conn.commit()
+    conn.close()
+
+    assert raw.log == ['rollback', 'commit']
+
+
+def test_shared_rollback_aborts_later_commits(raw, app_context):
+    handler = database.get_db_connection()
+    helper = database.get_db_connection()
+
+    # The handler never releases its borrow (early return / exception path)
+    helper.rollback()
+    helper.close()
+
+    assert raw.log == ['rollback']
+    with pytest.raises(RequestTransactionAborted):
+        handler.commit()
+    assert 'commit' not in raw.log
+
+
+def test_aborted_request_is_not_committed_at_teardown(raw, app_context):
+    with pytest.raises(ValueError):
+        with database.request_transaction():
+            database.get_db_connection().commit()
+            database.get_db_connection().rollback()
+            raise ValueError
+
+    database.close_request_connection()
+    assert 'commit' not in raw.log
+    assert raw.log[-1] == 'close'
+
+
+def test_request_transaction_releases_its_borrow(raw, app_context):
+    with database.request_transaction() as conn:
+        conn.commit()
+
+    assert conn._borrowers == 0
+    assert raw.log == ['commit']
@@ -0,0 +1,117 @@
+"""
+Tests for utils.expired_evaluations.sweep_expired_evaluations
+
+No MySQL server is needed: the sweeper runs against a recording connection
+that only accepts statements on tables defined by the schema dump
+(database/*.sql) or created by an init_* function, so a misspelled table
+fails the test instead of being swallowed by the sweeper's error handler.
+"""
+import glob
+import os
+import re
+
+import pytest
+
+from utils import expired_evaluations
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CREATE_TABLE = re.compile(r"CREATE TABLE\s+(?:IF NOT EXISTS\s+)?`?(\w+)`?", re.IGNORECASE)
+TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+`?(\w+)`?", re.IGNORECASE)
+
+
+def _known_tables():
+    """Tables in the schema dump plus those created by the init_* functions"""
+    tables = set()
+    sources = glob.glob(os.path.join(ROOT, 'database', '*.sql'))
+    sources += glob.glob(os.path.join(ROOT, 'models', '*.py'))
+    sources += glob.glob(os.path.join(ROOT, 'utils', '*.py'))
+    for path in sources:
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            tables.update(name.lower() for name in CREATE_TABLE.findall(f.read()))
+    return tables
+
+
+KNOWN_TABLES = _known_tables()
+
+
+class RecordingCursor:
+    """Cursor that checks table names and answers the sweeper's SELECTs"""
+
+    def __init__(self, timer_enabled):
+        self.timer_enabled = timer_enabled
+        self.statements = []
+        self.rowcount = 0
+        self._rows = []
+
+    def execute(self, query, params=()):
+        for table in TABLE_REFERENCE.findall(query):
+            assert table.lower() in KNOWN_TABLES, f"Unknown table {table!r} in: {query.strip()}"
+        self.statements.append(' '.join(query.split()))
+        self.rowcount = 0
+        if 'FROM timer_settings' in query:
+            self._rows = [{'enabled': int(self.timer_enabled)}]
+        elif 'FROM evaluation_periods' in query:
+            self._rows = [{'period_id': 7}]
+        else:
+            self._rows = []
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self, dictionary=False):
+        return self._cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _sweep(monkeypatch, timer_enabled):
+    cursor = RecordingCursor(timer_enabled)
+    monkeypatch.setattr(expired_evaluations, 'get_db_connection', lambda: RecordingConnection(cursor))
+    return expired_evaluations.sweep_expired_evaluations(batch_size=100), cursor.statements
+
+
+def test_schema_defines_timer_settings():
+    assert 'timer_settings' in KNOWN_TABLES
+    assert 'evaluation_timer_settings' not in KNOWN_TABLES
+
+
+@pytest.mark.parametrize('timer_enabled', [True, False])
+def test_sweep_runs_against_real_tables(monkeypatch, timer_enabled):
+    result, statements = _sweep(monkeypatch, timer_enabled)
+
+    assert result == {'timer_expired': 0, 'period_expired': 0, 'sessions_expired': 0}
+    assert any(s.startswith('SELECT enabled FROM timer_settings') for s in statements)
+
+
+def test_deadline_and_period_sweeps_ignore_timer_setting(monkeypatch):
+    _, statements = _sweep(monkeypatch, timer_enabled=False)
+
+    expired = [s for s in statements if s.startswith('UPDATE evaluations SET status = \'Expired\'')]
+    assert any('expires_at <= NOW()' in s for s in expired)
+    assert any('WHERE period_id = %s' in s for s in expired)
+    assert not any("SET status = 'expired'" in s for s in statements)
+
+
+def test_timer_sessions_expire_when_enabled(monkeypatch):
+    _, statements = _sweep(monkeypatch, timer_enabled=True)
+
+    assert any("UPDATE evaluation_timer_sessions SET status = 'expired'" in s for s in statements)
@@ -0,0 +1,88 @@
+"""
+Tests for utils.period_scheduler.run_period_lifecycle
+
+No MySQL server is needed: a fake connection holds a period that became
+Active earlier and a student enrolled afterwards, and the run must create
+that student's evaluation even though no transition is due.
+"""
+from utils import period_scheduler
+
+
+class FakeCursor:
+    """Answers the lifecycle's queries from an in-memory period"""
+
+    def __init__(self, db):
+        self.db = db
+        self.rowcount = 0
+        self._rows = []
+
+    def execute(self, query, params=()):
+        self.rowcount = 0
+        self._rows = []
+        if 'HAVING target_status != status' in query:
+            # The Active period is within its dates: no transition due
+            self._rows = []
+        elif "WHERE status = 'Active'" in query:
+            self._rows = [{'period_id': p} for p, status in self.db['periods'].items() if status == 'Active']
+        elif 'INSERT INTO evaluations' in query:
+            period_id = params[0]
+            student_id = params[2] if len(params) > 2 else None
+            for section_id, student in self.db['enrollments']:
+                key = (period_id, section_id, student)
+                if (student_id is None or student == student_id) and key not in self.db['evaluations']:
+                    self.db['evaluations'].add(key)
+                    self.rowcount += 1
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.committed = False
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _setup(monkeypatch):
+    db = {
+        'periods': {1: 'Active', 2: 'Closed'},
+        # Student 501 was enrolled after period 1 became Active
+        'enrollments': [(10, 500), (10, 501)],
+        'evaluations': {(1, 10, 500)},
+    }
+    conn = FakeConnection(db)
+    monkeypatch.setattr(period_scheduler, 'get_db_connection', lambda: conn)
+    return db, conn
+
+
+def test_run_creates_evaluations_for_late_enrollments(monkeypatch):
+    db, conn = _setup(monkeypatch)
+
+    assert period_scheduler.run_period_lifecycle('test') == []
+    assert db['evaluations'] == {(1, 10, 500), (1, 10, 501)}
+    assert conn.committed
+
+
+def test_run_is_idempotent(monkeypatch):
+    db, conn = _setup(monkeypatch)
+
+    period_scheduler.run_period_lifecycle('test')
+    period_scheduler.run_period_lifecycle('test')
+    assert db['evaluations'] == {(1, 10, 500), (1, 10, 501)}
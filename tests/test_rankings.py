@@ -0,0 +1,122 @@
+"""
+Tests for models.rankings.FacultyRankings.compute
+
+No MySQL server is needed: the ranking query runs on an in-memory SQLite
+database holding the tables it reads. faculty_score_aggregates is filled
+by the same aggregation the rebuild command uses, so the totals can be
+compared with the legacy COUNT(DISTINCT evaluation_id) over evaluations.
+"""
+import sqlite3
+
+import pytest
+
+from models import rankings
+from models.faculty_scores import _AGGREGATE_SELECT_SQL
+
+PERIOD_ID = 1
+
+SCHEMA = """
+    CREATE TABLE evaluation_categories (category_id INT, name TEXT, is_archived INT, display_order INT);
+    CREATE TABLE evaluation_criteria (criteria_id INT, category_id INT);
+    CREATE TABLE programs (program_id INT, name TEXT);
+    CREATE TABLE faculty (faculty_id INT, first_name TEXT, last_name TEXT, program_id INT, is_archived INT);
+    CREATE TABLE academic_terms (acad_term_id INT, acad_year_id INT);
+    CREATE TABLE evaluation_periods (period_id INT, acad_term_id INT);
+    CREATE TABLE class_sections (section_id INT, faculty_id INT);
+    CREATE TABLE evaluations (evaluation_id INT, period_id INT, section_id INT, status TEXT);
+    CREATE TABLE evaluation_responses (evaluation_id INT, criteria_id INT, rating INT);
+    CREATE TABLE faculty_score_aggregates (
+        faculty_id INT, period_id INT, category_id INT, evaluation_count INT,
+        response_count INT, rating_sum REAL,
+        rating_1 INT, rating_2 INT, rating_3 INT, rating_4 INT, rating_5 INT
+    );
+"""
+
+
+class SQLiteCursor:
+    """Dictionary cursor over sqlite3 accepting MySQL-style %s placeholders"""
+
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+
+    def execute(self, query, params=()):
+        self._cursor.execute(query.replace('%s', '?'), params)
+
+    def fetchall(self):
+        columns = [column[0] for column in self._cursor.description]
+        return [dict(zip(columns, row)) for row in self._cursor.fetchall()]
+
+    def close(self):
+        pass
+
+
+class SQLiteConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, dictionary=False):
+        return SQLiteCursor(self._conn)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO evaluation_categories VALUES (?, ?, 0, ?)",
+                     [(1, 'Teaching', 1), (2, 'Communication', 2)])
+    conn.executemany("INSERT INTO evaluation_criteria VALUES (?, ?)", [(1, 1), (2, 2)])
+    conn.execute("INSERT INTO programs VALUES (1, 'BSIT')")
+    conn.executemany("INSERT INTO faculty VALUES (?, ?, ?, 1, 0)",
+                     [(10, 'Ada', 'Reyes'), (20, 'Ben', 'Cruz')])
+    conn.execute("INSERT INTO academic_terms VALUES (1, 1)")
+    conn.execute("INSERT INTO evaluation_periods VALUES (1, 1)")
+    conn.executemany("INSERT INTO class_sections VALUES (?, ?)", [(100, 10), (200, 20)])
+
+    # Faculty 10: each evaluation answers only one of the two categories, so
+    # every per-category count is 2 while the faculty has 4 evaluations
+    responses = {1: [(1, 5)], 2: [(1, 4)], 3: [(2, 3)], 4: [(2, 4)],
+                 5: [(1, 5), (2, 5)], 6: [(1, 4), (2, 4)], 7: [(1, 3), (2, 3)]}
+    sections = {1: 100, 2: 100, 3: 100, 4: 100, 5: 200, 6: 200, 7: 200}
+    for evaluation_id, section_id in sections.items():
+        conn.execute("INSERT INTO evaluations VALUES (?, ?, ?, 'Completed')",
+                     (evaluation_id, PERIOD_ID, section_id))
+        conn.executemany("INSERT INTO evaluation_responses VALUES (?, ?, ?)",
+                         [(evaluation_id, criteria_id, rating) for criteria_id, rating in responses[evaluation_id]])
+    conn.execute("INSERT INTO evaluations VALUES (8, ?, 100, 'Pending')", (PERIOD_ID,))
+
+    conn.execute("INSERT INTO faculty_score_aggregates "
+                 + _AGGREGATE_SELECT_SQL.format(period_filter=""))
+
+    monkeypatch.setattr(rankings, 'get_db_connection', lambda: SQLiteConnection(conn))
+    return conn
+
+
+def _legacy_totals(conn):
+    """COUNT(DISTINCT evaluation_id) per faculty, as the legacy ranking query did"""
+    rows = conn.execute("""
+        SELECT cs.faculty_id, COUNT(DISTINCT e.evaluation_id)
+        FROM class_sections cs
+        JOIN evaluations e ON cs.section_id = e.section_id
+            AND e.period_id = ? AND e.status = 'Completed'
+        GROUP BY cs.faculty_id
+    """, (PERIOD_ID,)).fetchall()
+    return dict(rows)
+
+
+def test_total_evaluations_match_legacy_count(db):
+    result = rankings.FacultyRankings.compute(PERIOD_ID)
+    totals = {row['faculty_id']: row['total_evaluations'] for row in result['rankings']}
+
+    assert totals == _legacy_totals(db) == {10: 4, 20: 3}
+
+
+def test_scores_still_come_from_aggregates(db):
+    result = rankings.FacultyRankings.compute(PERIOD_ID)
+    by_faculty = {row['faculty_id']: row for row in result['rankings']}
+
+    assert by_faculty[10]['average_rating'] == 4.0
+    assert by_faculty[10]['category_scores'] == {1: 4.5, 2: 3.5}
+    assert by_faculty[20]['category_scores'] == {1: 4.0, 2: 4.0}
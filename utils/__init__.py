@@ -2,30 +2,48 @@
 Utilities package for IntellEvalPro
 Provides helper functions and decorators
 """
-from .security import generate_password_hash, check_password_hash
-from .decorators import (
-    login_required, 
-    role_required, 
-    admin_required, 
-    student_required, 
-    guidance_required
-)
-from .json_encoder import DecimalEncoder, DecimalJSONProvider, jsonify
-from .validators import (
-    validate_email,
-    validate_username,
-    validate_password,
-    validate_student_number,
-    validate_date,
-    sanitize_input,
-    validate_file_extension
-)
-from .email_utils import (
-    send_email,
-    send_bulk_emails,
-    send_evaluation_start_notification,
-    send_evaluation_reminder
-)
+import importlib
+
+# Helpers are imported on first use, so worker processes that only need a
+# Flask-free submodule (e.g. utils.evaluation_reports in bulk export
+# children) don't load Flask, the email stack or the database layer
+_EXPORTS = {
+    'generate_password_hash': 'security',
+    'check_password_hash': 'security',
+    'login_required': 'decorators',
+    'role_required': 'decorators',
+    'admin_required': 'decorators',
+    'student_required': 'decorators',
+    'guidance_required': 'decorators',
+    'DecimalEncoder': 'json_encoder',
+    'DecimalJSONProvider': 'json_encoder',
+    'jsonify': 'json_encoder',
+    'validate_email': 'validators',
+    'validate_username': 'validators',
+    'validate_password': 'validators',
+    'validate_student_number': 'validators',
+    'validate_date': 'validators',
+    'sanitize_input': 'validators',
+    'validate_file_extension': 'validators',
+    'send_email': 'email_utils',
+    'send_bulk_emails': 'email_utils',
+    'create_smtp_pool': 'email_utils',
+    'send_evaluation_start_notification': 'email_utils',
+    'send_evaluation_reminder': 'email_utils',
+    'prepare_evaluation_start_notification': 'email_utils',
+    'prepare_evaluation_reminder': 'email_utils',
+}
+
+
+def __getattr__(name):
+    """Import an exported helper from its submodule on first access"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'generate_password_hash',
@@ -47,7 +65,10 @@ __all__ = [
     'validate_file_extension',
     'send_email',
     'send_bulk_emails',
+    'create_smtp_pool',
     'send_evaluation_start_notification',
-    'send_evaluation_reminder'
+    'send_evaluation_reminder',
+    'prepare_evaluation_start_notification',
+    'prepare_evaluation_reminder'
 ]
 
@@ -0,0 +1,487 @@
+"""
+Shared AI client for IntellEvalPro
+Runs every Gemini call on a bounded worker pool with deadlines and a circuit breaker
+
+Request threads never call the model directly. AIClient.generate() hands
+the call to a pool of AI_MAX_CONCURRENCY threads and waits at most
+AI_TIMEOUT_SECONDS for it; at most AI_MAX_PENDING further calls may queue,
+anything beyond that is rejected at once. A call that overruns its
+deadline keeps its pool slot until the model answers, so a slow upstream
+fills the pool and later callers fail fast instead of tying up every
+Flask worker.
+
+After AI_CIRCUIT_FAILURE_THRESHOLD consecutive failures (errors or
+timeouts) the circuit opens and calls are rejected for
+AI_CIRCUIT_RESET_SECONDS, after which a single trial call decides whether
+it closes again. Callers use complete() to get their existing static
+fallback text whenever the model is unavailable.
+
+Advanced analytics insights can run as insight jobs: the request returns
+a job id at once, the insight is generated on a separate job pool (with
+AI_ADVANCED_TIMEOUT_SECONDS as deadline) and the result is stored in
+ai_insight_jobs for polling.
+
+Models are built once per name and reused. Set AI_USE_STUB_MODEL=True, or
+pass model_factory / use set_ai_client(), to run against StubModel
+instead of Gemini.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from models.database import get_db_connection
+
+DEFAULT_MODEL = 'gemini-2.5-flash'
+
+# Insight jobs still queued/running this long after their deadline were lost with their process
+JOB_GRACE_SECONDS = 120
+
+
+class AIUnavailableError(Exception):
+    """Raised when the model is busy, the circuit is open, or the call timed out or failed"""
+
+
+class StubModel:
+    """Local stand-in for a Gemini model (for tests and offline development)"""
+
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+    def __init__(self, text='Stub AI response.', delay=0, error=None):
+        """
+        Args:
+            text (str or callable): Response text, or a function of the prompt
+            delay (float): Seconds to wait before answering
+            error (Exception): Raised instead of answering
+        """
+        self.text = text
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.Response(self.text(prompt) if callable(self.text) else self.text)
+
+
+def _gemini_model(model_name):
+    """Configure the Gemini SDK and build a model"""
+    import google.generativeai as genai
+
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in environment variables")
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+
+class AIClient:
+    """Bounded, deadline-enforcing, circuit-breaking access to the AI model"""
+
+    def __init__(self, model_factory=None, max_workers=4, max_pending=8, timeout_seconds=20,
+                 failure_threshold=5, reset_seconds=60):
+        """
+        Args:
+            model_factory (callable): Builds a model from its name (default: Gemini)
+            max_workers (int): Concurrent model calls
+            max_pending (int): Calls allowed to wait for a free worker
+            timeout_seconds (float): Default per-call deadline
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_seconds (float): Seconds the circuit stays open before a trial call
+        """
+        self.model_factory = model_factory
+        # The Gemini SDK also enforces the deadline on its HTTP request
+        self.native_timeouts = model_factory is None
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ai-client')
+        self.slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self.models = {}
+        self.lock = threading.Lock()
+
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.counters = {'calls': 0, 'succeeded': 0, 'timeouts': 0, 'errors': 0, 'rejected': 0}
+
+    def model(self, model_name=DEFAULT_MODEL):
+        """
+        Get the (shared) model for a name, building it on first use
+
+        Raises:
+            ValueError: If GEMINI_API_KEY is not configured
+        """
+        with self.lock:
+            model = self.models.get(model_name)
+            if model is None:
+                model = self.model_factory(model_name) if self.model_factory else _gemini_model(model_name)
+                self.models[model_name] = model
+            return model
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def _allow_call(self):
+        """Check the circuit; when its reset time has passed, let one trial call through"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_running or time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.trial_running = True
+            return True
+
+    def _record(self, succeeded):
+        """Update the circuit with the outcome of a call"""
+        with self.lock:
+            self.trial_running = False
+            if succeeded:
+                if self.opened_at is not None:
+                    print("✅ AI circuit closed")
+                self.failures = 0
+                self.opened_at = None
+                return
+
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    print(f"⚠️ AI circuit opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+
+    def _call(self, model, prompt, timeout):
+        """Run one model call (on a pool thread)"""
+        if self.native_timeouts:
+            response = model.generate_content(prompt, request_options={'timeout': timeout})
+        else:
+            response = model.generate_content(prompt)
+
+        try:
+            text = response.text if response else None
+        except ValueError:
+            # Gemini raises instead of returning text for blocked responses
+            return None
+        return text.strip() if text else None
+
+    def generate(self, prompt, model_name=DEFAULT_MODEL, timeout=None, model=None):
+        """
+        Call the model within a deadline
+
+        Args:
+            prompt (str): Prompt
+            model_name (str): Model to use
+            timeout (float): Deadline in seconds (default AI_TIMEOUT_SECONDS)
+            model: Model object to use instead of the shared one
+
+        Returns:
+            str: Response text, or None if the model returned nothing
+
+        Raises:
+            ValueError: If GEMINI_API_KEY is not configured
+            AIUnavailableError: If the call was rejected, timed out or failed
+        """
+        timeout = timeout or self.timeout_seconds
+        if model is None:
+            model = self.model(model_name)
+
+        if not self.slots.acquire(blocking=False):
+            self._count('rejected')
+            raise AIUnavailableError('AI service is busy')
+        if not self._allow_call():
+            self.slots.release()
+            self._count('rejected')
+            raise AIUnavailableError('AI service is temporarily unavailable')
+
+        self._count('calls')
+        try:
+            future = self.executor.submit(self._call, model, prompt, timeout)
+        except Exception:
+            self.slots.release()
+            self._record(False)
+            raise
+        # The slot is held until the model answers, even after the deadline
+        future.add_done_callback(lambda _: self.slots.release())
+
+        try:
+            text = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._count('timeouts')
+            self._record(False)
+            raise AIUnavailableError(f'AI call exceeded its {timeout}s deadline')
+        except Exception as e:
+            self._count('errors')
+            self._record(False)
+            raise AIUnavailableError(f'AI call failed: {e}') from e
+
+        self._count('succeeded')
+        self._record(True)
+        return text
+
+    def complete(self, prompt, fallback, **kwargs):
+        """
+        Call the model, returning fallback text if it is unavailable
+
+        Args:
+            prompt (str): Prompt
+            fallback (str): Static text used when the model can't answer
+            **kwargs: Passed to generate()
+
+        Returns:
+            str: Response text or fallback
+        """
+        try:
+            return self.generate(prompt, **kwargs) or fallback
+        except (AIUnavailableError, ValueError) as e:
+            print(f"AI unavailable, using fallback text: {e}")
+            return fallback
+
+    def stats(self):
+        """
+        Get the pool, circuit and call counters
+
+        Returns:
+            dict: circuit state, consecutive failures, limits and counters
+        """
+        with self.lock:
+            if self.opened_at is None:
+                circuit = 'closed'
+            elif self.trial_running or time.monotonic() - self.opened_at >= self.reset_seconds:
+                circuit = 'half_open'
+            else:
+                circuit = 'open'
+            return {
+                'circuit': circuit,
+                'consecutive_failures': self.failures,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'timeout_seconds': self.timeout_seconds,
+                **self.counters
+            }
+
+
+def _settings():
+    """Read AI client settings from the Flask config when running inside the app"""
+    from flask import current_app, has_app_context
+
+    config = current_app.config if has_app_context() else {}
+    return {
+        'max_workers': config.get('AI_MAX_CONCURRENCY', 4),
+        'max_pending': config.get('AI_MAX_PENDING', 8),
+        'timeout_seconds': config.get('AI_TIMEOUT_SECONDS', 20),
+        'failure_threshold': config.get('AI_CIRCUIT_FAILURE_THRESHOLD', 5),
+        'reset_seconds': config.get('AI_CIRCUIT_RESET_SECONDS', 60),
+        'model_factory': (lambda _: StubModel()) if config.get('AI_USE_STUB_MODEL', False) else None
+    }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_ai_client():
+    """Get the process-wide AI client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = AIClient(**_settings())
+        return _client
+
+
+def set_ai_client(client):
+    """Replace the process-wide AI client (e.g. with one using StubModel)"""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+# ================================
+# INSIGHT JOBS
+# ================================
+
+_job_executor = None
+_job_executor_lock = threading.Lock()
+
+
+def init_ai_insight_jobs_table():
+    """Initialize ai_insight_jobs table if it doesn't exist"""
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ai_insight_jobs (
+                    job_id CHAR(32) PRIMARY KEY,
+                    function_name VARCHAR(64) NOT NULL,
+                    status ENUM('queued', 'running', 'completed', 'failed') NOT NULL DEFAULT 'queued',
+                    insight MEDIUMTEXT NULL,
+                    error TEXT NULL,
+                    created_by INT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    completed_at DATETIME NULL,
+                    INDEX idx_ai_insight_jobs_created (created_at)
+                )
+            """)
+            conn.commit()
+            cursor.close()
+            print("✅ AI insight jobs table initialized successfully")
+        except Exception as e:
+            print(f"Error initializing AI insight jobs table: {e}")
+        finally:
+            conn.close()
+
+
+def _get_job_executor(app):
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is None:
+            _job_executor = ThreadPoolExecutor(
+                max_workers=app.config.get('AI_JOB_WORKERS', 2),
+                thread_name_prefix='ai-insight-job'
+            )
+        return _job_executor
+
+
+def _finish_job(job_id, status, insight=None, error=None):
+    conn = get_db_connection()
+    if not conn:
+        return
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE ai_insight_jobs
+            SET status = %s, insight = %s, error = %s,
+                completed_at = IF(%s IN ('completed', 'failed'), NOW(), NULL)
+            WHERE job_id = %s
+        """, (status, insight, error, status, job_id))
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"Error updating AI insight job {job_id}: {e}")
+    finally:
+        conn.close()
+
+
+def _run_insight_job(app, job_id, func, args, kwargs):
+    with app.app_context():
+        _finish_job(job_id, 'running')
+        try:
+            insight = func(*args, **kwargs)
+            _finish_job(job_id, 'completed', insight=insight)
+        except Exception as e:
+            print(f"Error running AI insight job {job_id}: {e}")
+            _finish_job(job_id, 'failed', error=str(e))
+
+
+def start_insight_job(app, function_name, func, *args, user_id=None, **kwargs):
+    """
+    Generate an insight in the background
+
+    Args:
+        app: Flask application
+        function_name (str): Insight name (for the job record)
+        func (callable): Insight function; called as func(*args, **kwargs)
+        user_id (int): Requesting user
+        *args, **kwargs: Passed to func
+
+    Returns:
+        str: Job ID, or None if the job could not be recorded
+    """
+    job_id = uuid.uuid4().hex
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO ai_insight_jobs (job_id, function_name, created_by)
+            VALUES (%s, %s, %s)
+        """, (job_id, function_name, user_id))
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"Error creating AI insight job: {e}")
+        return None
+    finally:
+        conn.close()
+
+    _get_job_executor(app).submit(_run_insight_job, app, job_id, func, args, kwargs)
+    return job_id
+
+
+def get_insight_job(job_id, deadline_seconds):
+    """
+    Get an insight job
+
+    Jobs still unfinished well past deadline_seconds were lost with the
+    process running them and are reported as failed.
+
+    Args:
+        job_id (str): From start_insight_job()
+        deadline_seconds (float): AI_ADVANCED_TIMEOUT_SECONDS
+
+    Returns:
+        dict: job_id, function_name, status, insight, error, created_by; or None
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT job_id, function_name, status, insight, error, created_by,
+                   TIMESTAMPDIFF(SECOND, created_at, NOW()) AS age_seconds
+            FROM ai_insight_jobs
+            WHERE job_id = %s
+        """, (job_id,))
+        job = cursor.fetchone()
+        cursor.close()
+    except Exception as e:
+        print(f"Error getting AI insight job {job_id}: {e}")
+        return None
+    finally:
+        conn.close()
+
+    if job and job['status'] in ('queued', 'running') and job['age_seconds'] > deadline_seconds + JOB_GRACE_SECONDS:
+        job['status'] = 'failed'
+        job['error'] = 'Insight job was interrupted'
+    return job
+
+
+def collect_insight_jobs(max_age_hours=24):
+    """
+    Delete insight jobs older than max_age_hours
+
+    Returns:
+        int: Number of jobs deleted, or None on failure
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            DELETE FROM ai_insight_jobs
+            WHERE created_at < NOW() - INTERVAL %s HOUR
+        """, (max_age_hours,))
+        deleted = cursor.rowcount
+        conn.commit()
+        cursor.close()
+        return deleted
+    except Exception as e:
+        print(f"Error deleting old AI insight jobs: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
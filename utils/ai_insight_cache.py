@@ -0,0 +1,341 @@
+"""
+AI insight cache for IntellEvalPro
+Reuses generated /ai-analytics insights while the metrics they were built from are unchanged
+
+Every analytics insight is produced from a prompt that embeds the metrics
+it describes. An insight is identified by the function that produced it,
+its mode (standard/advanced), the model name and the SHA-256 of that
+prompt, so changed metrics (or a reworded prompt) simply produce a new
+key and are sent to the model again.
+
+Insights are kept in the ai_insight_cache table so every worker process
+shares them and they survive restarts. Entries expire after
+AI_INSIGHT_CACHE_TTL_SECONDS; once more than AI_INSIGHT_CACHE_MAX_ENTRIES
+are stored, the least recently used ones are evicted. Only text returned
+by the model is cached - fallback messages are never stored.
+
+The model call is passed in by the caller (see _generate_insight in
+utils/ai_support.py, which goes through the shared AI client), so a stub
+model can stand in for Gemini, and MemoryInsightStore can replace the
+database.
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+
+DEFAULT_TTL_SECONDS = 86400
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def _table_conn():
+    """Get a database connection (imported lazily so the cache works without one)"""
+    from models.database import get_db_connection
+    return get_db_connection()
+
+
+def init_ai_insight_cache_table():
+    """Initialize ai_insight_cache table if it doesn't exist"""
+    conn = _table_conn()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ai_insight_cache (
+                    cache_key CHAR(64) PRIMARY KEY,
+                    function_name VARCHAR(64) NOT NULL,
+                    mode ENUM('standard', 'advanced') NOT NULL,
+                    insight MEDIUMTEXT NOT NULL,
+                    hit_count INT UNSIGNED NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_used_at DATETIME NOT NULL,
+                    expires_at DATETIME NOT NULL,
+                    INDEX idx_ai_insight_expires (expires_at),
+                    INDEX idx_ai_insight_last_used (last_used_at)
+                )
+            """)
+            conn.commit()
+            cursor.close()
+            print("✅ AI insight cache table initialized successfully")
+        except Exception as e:
+            print(f"Error initializing AI insight cache table: {e}")
+        finally:
+            conn.close()
+
+
+def insight_cache_key(function_name, mode, model_name, prompt):
+    """
+    Build the cache key of an insight
+
+    Args:
+        function_name (str): Insight function, e.g. 'performance_trend'
+        mode (str): 'standard' or 'advanced'
+        model_name (str): Model the insight is generated with
+        prompt (str): Prompt sent to the model (contains the input metrics)
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for part in (function_name, mode, model_name, prompt):
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class DatabaseInsightStore:
+    """Insight store backed by the ai_insight_cache table"""
+
+    def get(self, key):
+        """
+        Get an unexpired insight and record the hit
+
+        Args:
+            key (str): From insight_cache_key()
+
+        Returns:
+            str: Cached insight, or None
+        """
+        conn = _table_conn()
+        if not conn:
+            return None
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT insight FROM ai_insight_cache
+                WHERE cache_key = %s AND expires_at > NOW()
+            """, (key,))
+            row = cursor.fetchone()
+            if not row:
+                cursor.close()
+                return None
+            cursor.execute("""
+                UPDATE ai_insight_cache
+                SET hit_count = hit_count + 1, last_used_at = NOW()
+                WHERE cache_key = %s
+            """, (key,))
+            conn.commit()
+            cursor.close()
+            return row[0]
+        except Exception as e:
+            print(f"Error reading AI insight cache: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def put(self, key, function_name, mode, insight, ttl_seconds):
+        """
+        Store an insight
+
+        Args:
+            key (str): From insight_cache_key()
+            function_name (str): Insight function
+            mode (str): 'standard' or 'advanced'
+            insight (str): Model output
+            ttl_seconds (int): Seconds the insight stays valid
+        """
+        conn = _table_conn()
+        if not conn:
+            return
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO ai_insight_cache
+                    (cache_key, function_name, mode, insight, last_used_at, expires_at)
+                VALUES (%s, %s, %s, %s, NOW(), NOW() + INTERVAL %s SECOND)
+                ON DUPLICATE KEY UPDATE
+                    insight = VALUES(insight),
+                    hit_count = 0,
+                    last_used_at = NOW(),
+                    expires_at = VALUES(expires_at)
+            """, (key, function_name, mode, insight, int(ttl_seconds)))
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            print(f"Error writing AI insight cache: {e}")
+        finally:
+            conn.close()
+
+    def evict(self, max_entries):
+        """
+        Remove expired insights, then the least recently used beyond max_entries
+
+        Args:
+            max_entries (int): Entries to keep (0 for no limit)
+
+        Returns:
+            int: Number of entries removed
+        """
+        conn = _table_conn()
+        if not conn:
+            return 0
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM ai_insight_cache WHERE expires_at <= NOW()")
+            removed = cursor.rowcount
+            if max_entries:
+                cursor.execute("SELECT COUNT(*) FROM ai_insight_cache")
+                excess = cursor.fetchone()[0] - max_entries
+                if excess > 0:
+                    cursor.execute("""
+                        DELETE FROM ai_insight_cache
+                        ORDER BY last_used_at ASC
+                        LIMIT %s
+                    """, (excess,))
+                    removed += cursor.rowcount
+            conn.commit()
+            cursor.close()
+            return removed
+        except Exception as e:
+            print(f"Error evicting AI insight cache: {e}")
+            return 0
+        finally:
+            conn.close()
+
+
+class MemoryInsightStore:
+    """In-process insight store (for tests, or running without a database)"""
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry or entry['expires_at'] <= datetime.now():
+                return None
+            entry['hit_count'] += 1
+            entry['last_used_at'] = time.monotonic()
+            return entry['insight']
+
+    def put(self, key, function_name, mode, insight, ttl_seconds):
+        with self.lock:
+            self.entries[key] = {
+                'function_name': function_name,
+                'mode': mode,
+                'insight': insight,
+                'hit_count': 0,
+                'last_used_at': time.monotonic(),
+                'expires_at': datetime.now() + timedelta(seconds=ttl_seconds)
+            }
+
+    def evict(self, max_entries):
+        with self.lock:
+            now = datetime.now()
+            expired = [key for key, entry in self.entries.items() if entry['expires_at'] <= now]
+            for key in expired:
+                del self.entries[key]
+            removed = len(expired)
+            if max_entries and len(self.entries) > max_entries:
+                by_use = sorted(self.entries, key=lambda key: self.entries[key]['last_used_at'])
+                for key in by_use[:len(self.entries) - max_entries]:
+                    del self.entries[key]
+                    removed += 1
+            return removed
+
+
+def _setting(name, default):
+    """Read a setting from the Flask config when running inside the app"""
+    try:
+        from flask import current_app, has_app_context
+        if has_app_context():
+            return current_app.config.get(name, default)
+    except ImportError:
+        pass
+    return default
+
+
+class InsightCache:
+    """Generate insights through a model, reusing stored results"""
+
+    def __init__(self, store=None, ttl_seconds=None, max_entries=None):
+        """
+        Args:
+            store: DatabaseInsightStore (default) or MemoryInsightStore
+            ttl_seconds (int): Overrides AI_INSIGHT_CACHE_TTL_SECONDS
+            max_entries (int): Overrides AI_INSIGHT_CACHE_MAX_ENTRIES
+        """
+        self.store = store or DatabaseInsightStore()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def _ttl(self):
+        if self.ttl_seconds is not None:
+            return self.ttl_seconds
+        return _setting('AI_INSIGHT_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS)
+
+    def _max_entries(self):
+        if self.max_entries is not None:
+            return self.max_entries
+        return _setting('AI_INSIGHT_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+
+    def generate(self, function_name, advanced_mode, prompt, complete, model_name):
+        """
+        Get an insight from the cache, or generate and store it
+
+        Args:
+            function_name (str): Insight function, e.g. 'performance_trend'
+            advanced_mode (bool): Advanced (True) or standard analysis
+            prompt (str): Prompt for the model
+            complete (callable): Calls the model with the prompt and returns
+                its text (or None); only called on a miss
+            model_name (str): Model name (part of the key)
+
+        Returns:
+            str: Insight text, or None if the model returned nothing
+                 (exceptions from the model propagate to the caller)
+        """
+        mode = 'advanced' if advanced_mode else 'standard'
+        ttl_seconds = self._ttl()
+        key = insight_cache_key(function_name, mode, model_name, prompt)
+
+        if ttl_seconds:
+            cached = self.store.get(key)
+            if cached is not None:
+                with self.lock:
+                    self.hits += 1
+                return cached
+
+        with self.lock:
+            self.misses += 1
+
+        insight = complete(prompt)
+        if not insight:
+            return None
+
+        if ttl_seconds:
+            self.store.put(key, function_name, mode, insight, ttl_seconds)
+            self.store.evict(self._max_entries())
+        return insight
+
+    def stats(self):
+        """
+        Get hit/miss counters of this process
+
+        Returns:
+            dict: hits, misses, hit_rate (0-1), ttl_seconds, max_entries
+        """
+        with self.lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'ttl_seconds': self._ttl(),
+            'max_entries': self._max_entries()
+        }
+
+    def reset_stats(self):
+        """Reset the hit/miss counters"""
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by the analytics insight functions in utils/ai_support.py
+insight_cache = InsightCache()
@@ -4,7 +4,8 @@ Uses Google Gemini AI to provide intelligent help and support
 """
 import os
 import logging
-import google.generativeai as genai
+from utils.ai_client import get_ai_client
+from utils.ai_insight_cache import insight_cache
 
 # Suppress ALTS credentials warnings from gRPC
 logging.getLogger('grpc').setLevel(logging.ERROR)
@@ -302,15 +303,13 @@ You are the IntellEvalPro AI Support Assistant for Guidance Counselors. You help
 Be professional, provide detailed step-by-step guidance, and focus on actionable solutions for managing the evaluation system effectively.
 """
 
+# Gemini 2.0 Flash (fastest model for analytics)
+GEMINI_MODEL = 'gemini-2.0-flash'
+
+
 def initialize_gemini():
-    """Initialize Gemini AI with API key"""
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found in environment variables")
-    
-    genai.configure(api_key=api_key)
-    # Use Gemini 2.0 Flash (fastest model for analytics)
-    return genai.GenerativeModel('gemini-2.0-flash')
+    """Get the shared Gemini model (configured once per process, see utils/ai_client.py)"""
+    return get_ai_client().model(GEMINI_MODEL)
 
 def get_ai_response(user_message, role='student'):
     """
@@ -324,22 +323,23 @@ def get_ai_response(user_message, role='student'):
         tuple: (success: bool, response: str)
     """
     try:
-        model = initialize_gemini()
-        
         # Select appropriate context based on role
         context = GUIDANCE_CONTEXT if role == 'guidance' else SYSTEM_CONTEXT
         
         # Create the full prompt with system context
         full_prompt = f"{context}\n\nUser Question: {user_message}\n\nAssistant:"
         
-        # Generate response
-        response = model.generate_content(full_prompt)
+        # Generate response (bounded by the shared client's deadline and circuit breaker)
+        text = get_ai_client().generate(full_prompt, model_name=GEMINI_MODEL)
         
-        if response and response.text:
-            return True, response.text.strip()
+        if text:
+            return True, text
         else:
             return False, "I couldn't generate a response. Please try again."
             
+    except ImportError:
+        # Gemini SDK not installed (ai_support_chat reports the assistant as unavailable)
+        raise
     except ValueError as ve:
         # API key not configured
         return False, "AI Assistant is not configured. Please contact your administrator."
@@ -385,7 +385,40 @@ def is_system_related_question(user_message):
 # AI ANALYTICS FUNCTIONS
 # ================================
 
-def generate_performance_trend_insight(trends_data, metrics, advanced_mode=False):
+def _generate_insight(function_name, advanced_mode, prompt, model=None):
+    """
+    Generate an analytics insight, reusing a cached one for the same prompt
+
+    Advanced analyses get the longer AI_ADVANCED_TIMEOUT_SECONDS deadline.
+
+    Args:
+        function_name (str): Insight function (part of the cache key)
+        advanced_mode (bool): Advanced or standard analysis
+        prompt (str): Prompt containing the input metrics
+        model: Object with generate_content(); defaults to the shared Gemini model
+
+    Returns:
+        str: Insight text, or None if the model returned nothing
+
+    Raises:
+        AIUnavailableError: If the model is unavailable (callers use fallback text)
+    """
+    timeout = None
+    if advanced_mode:
+        from flask import current_app, has_app_context
+        if has_app_context():
+            timeout = current_app.config.get('AI_ADVANCED_TIMEOUT_SECONDS')
+
+    return insight_cache.generate(
+        function_name,
+        advanced_mode,
+        prompt,
+        complete=lambda text: get_ai_client().generate(text, model_name=GEMINI_MODEL, timeout=timeout, model=model),
+        model_name=GEMINI_MODEL if model is None else getattr(model, 'model_name', type(model).__name__)
+    )
+
+
+def generate_performance_trend_insight(trends_data, metrics, advanced_mode=False, model=None):
     """Generate AI insight for performance trends - Standard or Advanced mode"""
     try:
         if not trends_data or len(trends_data) < 2:
@@ -442,17 +475,16 @@ def generate_performance_trend_insight(trends_data, metrics, advanced_mode=False
             Provide 2-3 concise sentences: trend assessment + actionable insight + recommendation.
             """
         
-        model = initialize_gemini()
-        response = model.generate_content(prompt)
+        insight = _generate_insight('performance_trend', advanced_mode, prompt, model)
         
-        return response.text.strip() if response and response.text else f"Faculty performance {'improved' if change > 0 else 'declined'} by {abs(change):.2f} points. {'Continue current initiatives' if change > 0 else 'Implement targeted support programs'}."
+        return insight or f"Faculty performance {'improved' if change > 0 else 'declined'} by {abs(change):.2f} points. {'Continue current initiatives' if change > 0 else 'Implement targeted support programs'}."
         
     except Exception as e:
         print(f"Error generating performance trend insight: {e}")
         return "Overall faculty performance shows consistent patterns across evaluation periods with opportunities for targeted improvement."
 
 
-def generate_comparison_insight(comparison_data, top_faculty, bottom_faculty, advanced_mode=False):
+def generate_comparison_insight(comparison_data, top_faculty, bottom_faculty, advanced_mode=False, model=None):
     """Generate AI insight for faculty comparison - Standard or Advanced mode"""
     try:
         if not comparison_data:
@@ -506,17 +538,16 @@ def generate_comparison_insight(comparison_data, top_faculty, bottom_faculty, ad
             Provide 2-3 sentences: performance distribution assessment + key recommendation.
             """
         
-        model = initialize_gemini()
-        response = model.generate_content(prompt)
+        insight = _generate_insight('comparison', advanced_mode, prompt, model)
         
-        return response.text.strip() if response and response.text else f"Top {top_count} faculty maintain excellent performance above 4.5, while {bottom_count} faculty show potential for targeted development support."
+        return insight or f"Top {top_count} faculty maintain excellent performance above 4.5, while {bottom_count} faculty show potential for targeted development support."
         
     except Exception as e:
         print(f"Error generating comparison insight: {e}")
         return f"Faculty performance analysis shows {top_count} excellent performers eligible for recognition and {bottom_count} faculty who would benefit from additional support."
 
 
-def generate_question_analysis_insight(question_data, advanced_mode=False):
+def generate_question_analysis_insight(question_data, advanced_mode=False, model=None):
     """Generate AI insight for question analysis - Standard or Advanced mode"""
     try:
         if not question_data:
@@ -575,17 +606,16 @@ def generate_question_analysis_insight(question_data, advanced_mode=False):
             Provide 2-3 sentences: key finding + development focus.
             """
         
-        model = initialize_gemini()
-        response = model.generate_content(prompt)
+        insight = _generate_insight('question_analysis', advanced_mode, prompt, model)
         
-        return response.text.strip() if response and response.text else f"Question analysis reveals {len(outstanding_questions)} outstanding areas and {len(needs_improvement + poor_questions)} areas requiring focused faculty development efforts."
+        return insight or f"Question analysis reveals {len(outstanding_questions)} outstanding areas and {len(needs_improvement + poor_questions)} areas requiring focused faculty development efforts."
         
     except Exception as e:
         print(f"Error generating question analysis insight: {e}")
         return f"Questionnaire analysis shows {len(outstanding_questions)} high-performing criteria and {len(needs_improvement + poor_questions)} areas where faculty development programs could provide significant improvement."
 
 
-def generate_engagement_insight(engagement_data, stats, advanced_mode=False):
+def generate_engagement_insight(engagement_data, stats, advanced_mode=False, model=None):
     """Generate AI insight for student engagement - Standard or Advanced mode"""
     try:
         if not engagement_data:
@@ -653,17 +683,16 @@ def generate_engagement_insight(engagement_data, stats, advanced_mode=False):
             Provide 2-3 sentences: assessment + improvement strategy.
             """
         
-        model = initialize_gemini()
-        response = model.generate_content(prompt)
+        insight = _generate_insight('engagement', advanced_mode, prompt, model)
         
-        return response.text.strip() if response and response.text else f"Student engagement shows {high_count} classes with excellent participation while {low_count} classes may benefit from improved communication strategies."
+        return insight or f"Student engagement shows {high_count} classes with excellent participation while {low_count} classes may benefit from improved communication strategies."
         
     except Exception as e:
         print(f"Error generating engagement insight: {e}")
         return f"Engagement analysis indicates {stats.get('overall_engagement', 'N/A')} average participation with {low_count} classes requiring attention to improve response rates."
 
 
-def generate_improvement_opportunities_insight(improvement_data, advanced_mode=False):
+def generate_improvement_opportunities_insight(improvement_data, advanced_mode=False, model=None):
     """Generate AI insight for improvement opportunities - Standard or Advanced mode"""
     try:
         if not improvement_data:
@@ -751,10 +780,9 @@ def generate_improvement_opportunities_insight(improvement_data, advanced_mode=F
             Provide 2-3 sentences: priority focus + recommended action.
             """
         
-        model = initialize_gemini()
-        response = model.generate_content(prompt)
+        insight = _generate_insight('improvement_opportunities', advanced_mode, prompt, model)
         
-        return response.text.strip() if response and response.text else f"Analysis identifies {faculty_count} faculty members who would benefit from targeted professional development, with immediate focus on {critical_count} critical performance gaps below satisfactory level."
+        return insight or f"Analysis identifies {faculty_count} faculty members who would benefit from targeted professional development, with immediate focus on {critical_count} critical performance gaps below satisfactory level."
         
     except Exception as e:
         print(f"Error generating improvement insight: {e}")
@@ -787,10 +815,9 @@ def generate_comprehensive_training_plan():
         Use bullet points and clear structure.
         """
         
-        model = initialize_gemini()
-        response = model.generate_content(prompt)
+        plan = get_ai_client().generate(prompt, model_name=GEMINI_MODEL)
         
-        return response.text.strip() if response and response.text else """
+        return plan or """
         <h4>Faculty Development Training Plan</h4>
         <p><strong>Module 1:</strong> Student Engagement Enhancement</p>
         <p><strong>Module 2:</strong> Effective Feedback Strategies</p>
@@ -0,0 +1,563 @@
+"""
+Bulk evaluation exports for IntellEvalPro
+Renders every faculty's evaluation summary report for a period into one ZIP
+
+Requesting a bulk export only inserts a 'queued' bulk_export_jobs row. A
+worker claims the job and loads everything it needs in a handful of
+set-based queries (period, faculty, rating counts per faculty/criterion
+and comments), instead of one results query per faculty. The per-faculty
+PDF/XLSX files are rendered in a ProcessPoolExecutor and each finished
+file is appended to a ZIP on disk, so neither rendering nor the archive
+ever runs in (or is held in memory by) a web request. Progress is stored
+on the job row and read by the job-status endpoint.
+
+Job status:
+    queued     - waiting for a worker
+    running    - claimed; total/completed/failed track progress
+    completed  - ZIP ready at file_path
+    failed     - the job itself failed (error_message)
+    expired    - ZIP removed by the report artifact collector
+
+Standalone worker:
+    python -m utils.bulk_exports            # run until interrupted
+    python -m utils.bulk_exports --once     # process queued jobs, then exit
+"""
+import concurrent.futures
+import multiprocessing
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+
+from models.database import get_db_connection
+from utils.evaluation_reports import EXTENSIONS, group_faculty_results, render_evaluation_file
+
+# Jobs whose worker has not reported progress for this long are reclaimed
+LEASE_TIMEOUT_SECONDS = 900
+
+# Seconds between progress writes while files are being rendered
+PROGRESS_INTERVAL_SECONDS = 1
+
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+
+def init_bulk_export_tables():
+    """Initialize bulk_export_jobs table if it doesn't exist"""
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bulk_export_jobs (
+                    job_id VARCHAR(36) PRIMARY KEY,
+                    period_id INT NOT NULL,
+                    program_id INT NULL,
+                    file_format ENUM('pdf', 'excel') NOT NULL DEFAULT 'pdf',
+                    status ENUM('queued', 'running', 'completed', 'failed', 'expired')
+                        NOT NULL DEFAULT 'queued',
+                    total INT NOT NULL DEFAULT 0,
+                    completed INT NOT NULL DEFAULT 0,
+                    failed INT NOT NULL DEFAULT 0,
+                    file_path VARCHAR(500) NULL,
+                    file_size BIGINT NULL,
+                    error_message VARCHAR(500) NULL,
+                    created_by INT NULL,
+                    locked_by VARCHAR(128) NULL,
+                    locked_at DATETIME NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at DATETIME NULL,
+                    completed_at DATETIME NULL,
+                    INDEX idx_bulk_export_jobs_status (status, created_at)
+                )
+            """)
+            conn.commit()
+            cursor.close()
+            print("✅ Bulk export table initialized successfully")
+        except Exception as e:
+            print(f"Error initializing bulk export table: {e}")
+        finally:
+            conn.close()
+
+
+def enqueue_bulk_export(period_id, program_id=None, file_format='pdf', created_by=None):
+    """
+    Queue a bulk export of every faculty's report for a period
+
+    Args:
+        period_id (int): Evaluation period
+        program_id (int, optional): Only faculty of this department/program
+        file_format (str): 'pdf' or 'excel'
+        created_by (int, optional): User who requested it
+
+    Returns:
+        str: Job ID, or None on failure
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+
+    try:
+        job_id = str(uuid.uuid4())
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO bulk_export_jobs (job_id, period_id, program_id, file_format, created_by)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (job_id, period_id, program_id, file_format, created_by))
+        conn.commit()
+        cursor.close()
+        return job_id
+    except Exception as e:
+        print(f"Error queueing bulk export: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+
+def get_bulk_export(job_id):
+    """
+    Get a bulk export job with its progress
+
+    Args:
+        job_id (str): Job ID
+
+    Returns:
+        dict: Job row plus 'progress' (0-100), or None if not found
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT job_id, period_id, program_id, file_format, status, total, completed,
+                   failed, file_path, file_size, error_message, created_by, created_at,
+                   started_at, completed_at
+            FROM bulk_export_jobs
+            WHERE job_id = %s
+        """, (job_id,))
+        job = cursor.fetchone()
+        cursor.close()
+        if job:
+            done = job['completed'] + job['failed']
+            if job['status'] == 'completed':
+                job['progress'] = 100
+            else:
+                job['progress'] = round(done * 100 / job['total']) if job['total'] else 0
+        return job
+    except Exception as e:
+        print(f"Error getting bulk export {job_id}: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def load_faculty_reports(cursor, period_id, program_id=None):
+    """
+    Load the report data of every evaluated faculty of a period
+
+    Four queries in total, however many faculty there are.
+
+    Args:
+        cursor: Dictionary cursor
+        period_id (int): Evaluation period
+        program_id (int, optional): Only faculty of this program
+
+    Returns:
+        list: Report dicts for render_evaluation_file(), ordered by faculty name
+    """
+    cursor.execute("""
+        SELECT ep.title as period_name, ay.year_name
+        FROM evaluation_periods ep
+        JOIN academic_terms at ON ep.acad_term_id = at.acad_term_id
+        JOIN academic_years ay ON at.acad_year_id = ay.acad_year_id
+        WHERE ep.period_id = %s
+    """, (period_id,))
+    period_info = cursor.fetchone()
+
+    program_filter = ""
+    params = [period_id]
+    if program_id:
+        program_filter = "AND f.program_id = %s"
+        params.append(program_id)
+
+    cursor.execute(f"""
+        SELECT
+            cs.faculty_id,
+            c.category_id,
+            c.name as category_name,
+            c.display_order as category_order,
+            cr.criteria_id as criterion_id,
+            cr.description,
+            cr.order as criterion_order,
+            er.rating,
+            COUNT(*) as count
+        FROM evaluations e
+        JOIN class_sections cs ON e.section_id = cs.section_id
+        JOIN faculty f ON cs.faculty_id = f.faculty_id
+        JOIN evaluation_responses er ON er.evaluation_id = e.evaluation_id
+        JOIN evaluation_criteria cr ON er.criteria_id = cr.criteria_id
+        JOIN evaluation_categories c ON cr.category_id = c.category_id
+        WHERE e.period_id = %s
+          AND e.status = 'Completed'
+          {program_filter}
+        GROUP BY cs.faculty_id, c.category_id, cr.criteria_id, er.rating
+        ORDER BY cs.faculty_id, c.display_order, cr.order
+    """, tuple(params))
+    rows_by_faculty = {}
+    for row in cursor.fetchall():
+        rows_by_faculty.setdefault(row['faculty_id'], []).append(row)
+
+    cursor.execute(f"""
+        SELECT DISTINCT cs.faculty_id, cm.comment_text
+        FROM comments cm
+        JOIN evaluations e ON cm.evaluation_id = e.evaluation_id
+        JOIN class_sections cs ON e.section_id = cs.section_id
+        JOIN faculty f ON cs.faculty_id = f.faculty_id
+        WHERE e.period_id = %s
+          AND e.status = 'Completed'
+          AND cm.comment_text IS NOT NULL
+          AND TRIM(cm.comment_text) != ''
+          {program_filter}
+        ORDER BY cs.faculty_id, cm.comment_text
+    """, tuple(params))
+    comments_by_faculty = {}
+    for row in cursor.fetchall():
+        comments_by_faculty.setdefault(row['faculty_id'], []).append(row['comment_text'])
+
+    if not rows_by_faculty:
+        return []
+
+    faculty_ids = list(rows_by_faculty)
+    placeholders = ', '.join(['%s'] * len(faculty_ids))
+    cursor.execute(f"""
+        SELECT faculty_id, first_name, last_name, faculty_number
+        FROM faculty
+        WHERE faculty_id IN ({placeholders})
+        ORDER BY last_name, first_name
+    """, tuple(faculty_ids))
+
+    reports = []
+    for faculty in cursor.fetchall():
+        reports.append({
+            'faculty': faculty,
+            'subject': None,
+            'section': None,
+            'period_info': period_info,
+            'comments': comments_by_faculty.get(faculty['faculty_id'], []),
+            **group_faculty_results(rows_by_faculty[faculty['faculty_id']])
+        })
+    return reports
+
+
+def _archive_name(report, file_format):
+    """File name of a faculty's report inside the ZIP"""
+    faculty = report['faculty']
+    name = f"{faculty['last_name']}_{faculty['first_name']}_{faculty['faculty_number'] or faculty['faculty_id']}"
+    safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
+    return f"Evaluation_Report_{safe_name}.{EXTENSIONS[file_format]}"
+
+
+class BulkExportWorker:
+    """
+    Runs queued bulk export jobs one at a time
+
+    Args:
+        app: Flask application (for config and app contexts)
+        processes (int): Render processes per job
+    """
+
+    def __init__(self, app, processes=None):
+        self.app = app
+        self.processes = processes or app.config.get('BULK_EXPORT_PROCESSES', 2)
+        self.export_dir = os.path.abspath(
+            app.config.get('BULK_EXPORT_DIR', os.path.join('storage', 'bulk_exports'))
+        )
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def claim_job(self):
+        """
+        Atomically claim the oldest queued job for this worker
+
+        Returns:
+            dict: Claimed job row, or None if nothing is queued
+        """
+        conn = get_db_connection()
+        if not conn:
+            return None
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+
+            # Requeue jobs whose worker died (running jobs report progress every second)
+            cursor.execute("""
+                UPDATE bulk_export_jobs
+                SET status = 'queued', locked_by = NULL, locked_at = NULL,
+                    total = 0, completed = 0, failed = 0
+                WHERE status = 'running'
+                AND locked_at < NOW() - INTERVAL %s SECOND
+            """, (LEASE_TIMEOUT_SECONDS,))
+
+            cursor.execute("""
+                UPDATE bulk_export_jobs
+                SET status = 'running', locked_by = %s, locked_at = NOW(), started_at = NOW()
+                WHERE status = 'queued'
+                ORDER BY created_at
+                LIMIT 1
+            """, (self.worker_id,))
+            conn.commit()
+
+            cursor.execute("""
+                SELECT job_id, period_id, program_id, file_format
+                FROM bulk_export_jobs
+                WHERE status = 'running' AND locked_by = %s
+                LIMIT 1
+            """, (self.worker_id,))
+            job = cursor.fetchone()
+            cursor.close()
+            return job
+        except Exception as e:
+            print(f"Error claiming bulk export job: {e}")
+            conn.rollback()
+            return None
+        finally:
+            conn.close()
+
+    def update_job(self, job_id, finished=False, **fields):
+        """
+        Write progress or the final state of a claimed job (renews its lease)
+
+        Args:
+            job_id (str): Job ID
+            finished (bool): Also stamp completed_at
+            **fields: Columns to set
+        """
+        conn = get_db_connection()
+        if not conn:
+            return
+
+        try:
+            assignments = ', '.join(f"{column} = %s" for column in fields)
+            if finished:
+                assignments += ", completed_at = NOW()"
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                UPDATE bulk_export_jobs
+                SET {assignments}, locked_at = NOW()
+                WHERE job_id = %s AND locked_by = %s
+            """, tuple(fields.values()) + (job_id, self.worker_id))
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            print(f"Error updating bulk export {job_id}: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def load_reports(self, job):
+        """Load the report data of a job (see load_faculty_reports)"""
+        conn = get_db_connection()
+        if not conn:
+            raise RuntimeError("Database connection failed")
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            reports = load_faculty_reports(cursor, job['period_id'], job['program_id'])
+            cursor.close()
+            return reports
+        finally:
+            conn.close()
+
+    def build_archive(self, job, reports, work_dir):
+        """
+        Render reports in the process pool and add each to the job's ZIP
+
+        Args:
+            job (dict): Claimed job
+            reports (list): From load_faculty_reports()
+            work_dir (str): Scratch directory for rendered files
+
+        Returns:
+            tuple: (zip_path, completed, failed)
+        """
+        zip_path = os.path.join(work_dir, f"{job['job_id']}.zip")
+        completed = failed = 0
+        last_progress = time.monotonic()
+
+        # Spawned (not forked) children: the parent is a threaded web process.
+        # They only import utils.evaluation_reports, which needs neither Flask
+        # nor the database; re-importing the parent's main script does not
+        # build the app either (see app.__getattr__)
+        context = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.processes, mp_context=context) as executor, \
+                zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            futures = {}
+            for index, report in enumerate(reports):
+                file_path = os.path.join(work_dir, f"{index}.{EXTENSIONS[job['file_format']]}")
+                future = executor.submit(render_evaluation_file, report, job['file_format'], file_path)
+                futures[future] = report
+
+            for future in concurrent.futures.as_completed(futures):
+                report = futures[future]
+                try:
+                    file_path = future.result()
+                    archive.write(file_path, _archive_name(report, job['file_format']))
+                    os.remove(file_path)
+                    completed += 1
+                except Exception as e:
+                    print(f"Error rendering bulk export report for faculty "
+                          f"{report['faculty']['faculty_id']}: {e}")
+                    failed += 1
+
+                if time.monotonic() - last_progress >= PROGRESS_INTERVAL_SECONDS:
+                    self.update_job(job['job_id'], completed=completed, failed=failed)
+                    last_progress = time.monotonic()
+
+        return zip_path, completed, failed
+
+    def run_job(self, job):
+        """
+        Run a claimed job to completion or failure
+
+        Args:
+            job (dict): Claimed job
+        """
+        os.makedirs(self.export_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix='.bulk-', dir=self.export_dir)
+        try:
+            reports = self.load_reports(job)
+            self.update_job(job['job_id'], total=len(reports))
+
+            zip_path, completed, failed = self.build_archive(job, reports, work_dir)
+            file_path = os.path.join(self.export_dir, f"{job['job_id']}.zip")
+            os.replace(zip_path, file_path)
+
+            self.update_job(
+                job['job_id'], finished=True, status='completed', completed=completed, failed=failed,
+                file_path=file_path, file_size=os.path.getsize(file_path)
+            )
+            print(f"📦 Bulk export {job['job_id']}: {completed} report(s), {failed} failed")
+        except Exception as e:
+            print(f"Error running bulk export {job['job_id']}: {e}")
+            self.update_job(job['job_id'], finished=True, status='failed', error_message=str(e)[:500])
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def run(self, once=False, idle_sleep=5):
+        """
+        Run jobs until the queue is empty (once=True) or forever
+
+        Args:
+            once (bool): Exit when nothing is queued instead of polling
+            idle_sleep (float): Seconds to wait between polls when idle
+        """
+        while True:
+            with self.app.app_context():
+                job = self.claim_job()
+                if job:
+                    self.run_job(job)
+            if not job:
+                if once:
+                    return
+                time.sleep(idle_sleep)
+
+
+def collect_bulk_exports(retention_days):
+    """
+    Remove ZIPs of bulk exports completed more than retention_days ago
+
+    Args:
+        retention_days (int): Days a ZIP is kept (0 = forever)
+
+    Returns:
+        int: Number of jobs expired, or None on failure
+    """
+    if not retention_days:
+        return 0
+
+    conn = get_db_connection()
+    if not conn:
+        return None
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT job_id, file_path
+            FROM bulk_export_jobs
+            WHERE status = 'completed'
+            AND completed_at < NOW() - INTERVAL %s DAY
+        """, (retention_days,))
+        jobs = cursor.fetchall()
+
+        for job in jobs:
+            if job['file_path'] and os.path.exists(job['file_path']):
+                os.remove(job['file_path'])
+            cursor.execute("""
+                UPDATE bulk_export_jobs
+                SET status = 'expired', file_path = NULL
+                WHERE job_id = %s
+            """, (job['job_id'],))
+        conn.commit()
+        cursor.close()
+        return len(jobs)
+    except Exception as e:
+        print(f"Error expiring bulk exports: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+
+def ensure_bulk_export_worker(app):
+    """
+    Start an in-process thread that runs queued bulk exports, if not running
+
+    The thread only coordinates; reports are rendered in child processes.
+    Disabled when BULK_EXPORT_INPROCESS is False (i.e. a standalone worker
+    is deployed instead).
+
+    Args:
+        app: Flask application
+    """
+    global _worker_thread
+    if not app.config.get('BULK_EXPORT_INPROCESS', True):
+        return
+
+    with _worker_lock:
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return
+        worker = BulkExportWorker(app)
+        _worker_thread = threading.Thread(target=worker.run, kwargs={'once': True}, daemon=True)
+        _worker_thread.start()
+
+
+def main():
+    """Standalone worker entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='IntellEvalPro bulk export worker')
+    parser.add_argument('--once', action='store_true', help='Run queued jobs and exit')
+    parser.add_argument('--processes', type=int, default=None, help='Render processes per job')
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        init_bulk_export_tables()
+
+    worker = BulkExportWorker(app, processes=args.processes)
+    print(f"🚀 Bulk export worker {worker.worker_id} started")
+    try:
+        worker.run(once=args.once)
+    except KeyboardInterrupt:
+        print("Bulk export worker stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+"""
+Comment moderation for IntellEvalPro
+Classifies student comments as offensive once and keeps the result per comment
+
+Results live in comment_moderation, one row per comments.comment_id,
+together with the model and prompt version that produced them, and are
+mirrored to comments.is_flagged. A comment is only sent to the model when
+it has no result for the current MODERATION_MODEL/PROMPT_VERSION, so
+viewing a faculty member's comments again costs nothing, and changing
+the prompt (bump PROMPT_VERSION) re-moderates everything lazily.
+
+Comments are classified in batches of COMMENT_MODERATION_BATCH_SIZE (one
+prompt each, so hundreds of comments never overflow a single prompt),
+with up to COMMENT_MODERATION_CONCURRENCY batches in flight through the
+shared AI client. Historical comments can be backfilled with:
+    python -m utils.comment_moderation [--limit N] [--batch-size N]
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from models.database import get_db_connection
+from utils.ai_client import get_ai_client, DEFAULT_MODEL, AIUnavailableError
+
+MODERATION_MODEL = DEFAULT_MODEL
+
+# Bump whenever MODERATION_PROMPT changes so existing results are redone
+PROMPT_VERSION = 1
+
+DEFAULT_BATCH_SIZE = 25
+DEFAULT_CONCURRENCY = 4
+
+MODERATION_PROMPT = """
+You are a content moderation AI assistant. Analyze the following student feedback comments and identify which ones contain offensive, inappropriate, or harmful language in ANY LANGUAGE.
+
+Consider the following as offensive:
+- Profanity, vulgar language, or explicit content
+- Hate speech, discriminatory remarks, or slurs
+- Personal attacks, threats, or harassment
+- Bullying, mockery, or humiliation
+- Sexual content or inappropriate references
+- Extremely disrespectful or degrading language
+
+Do NOT flag comments that are:
+- Constructive criticism (even if negative)
+- Honest feedback about teaching quality
+- Expressions of frustration without offensive language
+- Simple complaints or suggestions for improvement
+
+Comments to analyze:
+{comments_text}
+
+Return ONLY a JSON array with this exact format (no other text):
+[
+  {{"id": 0, "is_offensive": true}},
+  {{"id": 1, "is_offensive": false}},
+  ...
+]
+
+Include all comment IDs from the input. Return valid JSON only.
+"""
+
+
+def init_comment_moderation_table():
+    """Initialize comment_moderation table if it doesn't exist"""
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS comment_moderation (
+                    comment_id INT PRIMARY KEY,
+                    is_offensive TINYINT(1) NOT NULL,
+                    model VARCHAR(64) NOT NULL,
+                    prompt_version INT NOT NULL,
+                    moderated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    INDEX idx_comment_moderation_version (model, prompt_version),
+                    FOREIGN KEY (comment_id) REFERENCES comments(comment_id) ON DELETE CASCADE
+                )
+            """)
+            conn.commit()
+            cursor.close()
+            print("✅ Comment moderation table initialized successfully")
+        except Exception as e:
+            print(f"Error initializing comment moderation table: {e}")
+        finally:
+            conn.close()
+
+
+def build_moderation_prompt(comments):
+    """
+    Build the prompt for one batch
+
+    Args:
+        comments (list): Dicts with comment_id and comment_text
+
+    Returns:
+        str: Prompt
+    """
+    comments_text = "\n\n".join(
+        f"Comment ID {comment['comment_id']}: {comment['comment_text']}"
+        for comment in comments
+    )
+    return MODERATION_PROMPT.format(comments_text=comments_text)
+
+
+def parse_moderation_response(ai_response):
+    """
+    Parse the model's JSON answer
+
+    Args:
+        ai_response (str): Model output, possibly wrapped in a markdown code block
+
+    Returns:
+        dict: comment_id -> is_offensive
+
+    Raises:
+        ValueError: If the answer is not a JSON array of results
+    """
+    if '```json' in ai_response:
+        ai_response = ai_response.split('```json')[1].split('```')[0].strip()
+    elif '```' in ai_response:
+        ai_response = ai_response.split('```')[1].split('```')[0].strip()
+
+    results = json.loads(ai_response)
+    if not isinstance(results, list):
+        raise ValueError('Invalid AI response format')
+
+    flags = {}
+    for result in results:
+        try:
+            flags[int(result['id'])] = bool(result.get('is_offensive', False))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return flags
+
+
+def classify_batch(comments, client=None):
+    """
+    Classify one batch of comments with the model
+
+    Args:
+        comments (list): Dicts with comment_id and comment_text
+        client (AIClient): Defaults to the shared client
+
+    Returns:
+        dict: comment_id -> is_offensive for the comments the model answered for
+
+    Raises:
+        AIUnavailableError, ValueError: If the batch could not be classified
+    """
+    client = client or get_ai_client()
+    ai_response = client.generate(build_moderation_prompt(comments), model_name=MODERATION_MODEL)
+    if not ai_response:
+        raise ValueError('AI generated empty response')
+
+    requested = {comment['comment_id'] for comment in comments}
+    return {
+        comment_id: flag
+        for comment_id, flag in parse_moderation_response(ai_response).items()
+        if comment_id in requested
+    }
+
+
+def _store_results(flags):
+    """Save moderation results and mirror them to comments.is_flagged"""
+    if not flags:
+        return
+    conn = get_db_connection()
+    if not conn:
+        return
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO comment_moderation (comment_id, is_offensive, model, prompt_version)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                is_offensive = VALUES(is_offensive),
+                model = VALUES(model),
+                prompt_version = VALUES(prompt_version)
+        """, [(comment_id, int(flag), MODERATION_MODEL, PROMPT_VERSION) for comment_id, flag in flags.items()])
+        cursor.executemany(
+            "UPDATE comments SET is_flagged = %s WHERE comment_id = %s",
+            [(int(flag), comment_id) for comment_id, flag in flags.items()]
+        )
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"Error storing comment moderation results: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def _moderate_batch(client, batch):
+    try:
+        flags = classify_batch(batch, client)
+    except (AIUnavailableError, ValueError) as e:
+        print(f"Error moderating {len(batch)} comment(s): {e}")
+        return {}
+    _store_results(flags)
+    return flags
+
+
+def classify_comments(comments, batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Classify comments in fixed-size batches, several batches at a time
+
+    Each batch's results are stored as soon as it finishes; batches the
+    model couldn't answer are left unmoderated (and retried next time).
+
+    Args:
+        comments (list): Dicts with comment_id and comment_text
+        batch_size (int): Comments per prompt
+        concurrency (int): Batches in flight at once
+
+    Returns:
+        dict: comment_id -> is_offensive for the comments classified
+    """
+    batches = [comments[i:i + batch_size] for i in range(0, len(comments), batch_size)]
+    if not batches:
+        return {}
+
+    # Resolved here, where the app config is available, not on the batch threads
+    client = get_ai_client()
+    flags = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(batches)))) as executor:
+        for batch_flags in executor.map(lambda batch: _moderate_batch(client, batch), batches):
+            flags.update(batch_flags)
+    return flags
+
+
+def _unmoderated_comments(cursor, comment_ids=None, after_id=0, limit=None):
+    """Comments without a result for the current model/prompt version"""
+    query = """
+        SELECT c.comment_id, c.comment_text
+        FROM comments c
+        LEFT JOIN comment_moderation m
+            ON m.comment_id = c.comment_id
+            AND m.model = %s AND m.prompt_version = %s
+        WHERE m.comment_id IS NULL
+        AND c.comment_text IS NOT NULL
+        AND c.comment_text != ''
+        AND c.comment_id > %s
+    """
+    params = [MODERATION_MODEL, PROMPT_VERSION, after_id]
+    if comment_ids is not None:
+        query += f" AND c.comment_id IN ({', '.join(['%s'] * len(comment_ids))})"
+        params.extend(comment_ids)
+    query += " ORDER BY c.comment_id"
+    if limit:
+        query += " LIMIT %s"
+        params.append(limit)
+    cursor.execute(query, tuple(params))
+    return cursor.fetchall()
+
+
+def moderate_comments(comment_ids, batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Get moderation results for comments, classifying only those not yet moderated
+
+    Args:
+        comment_ids (list): comments.comment_id values
+        batch_size (int): Comments per prompt
+        concurrency (int): Batches in flight at once
+
+    Returns:
+        tuple: (dict comment_id -> is_offensive, number newly classified,
+                number that could not be classified), or None on database failure
+    """
+    comment_ids = sorted({int(comment_id) for comment_id in comment_ids})
+    if not comment_ids:
+        return {}, 0, 0
+
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor(dictionary=True)
+        pending = _unmoderated_comments(cursor, comment_ids)
+        cursor.close()
+    except Exception as e:
+        print(f"Error loading unmoderated comments: {e}")
+        return None
+    finally:
+        conn.close()
+
+    new_flags = classify_comments(pending, batch_size, concurrency)
+
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor(dictionary=True)
+        placeholders = ', '.join(['%s'] * len(comment_ids))
+        cursor.execute(f"""
+            SELECT comment_id, is_offensive
+            FROM comment_moderation
+            WHERE comment_id IN ({placeholders})
+            AND model = %s AND prompt_version = %s
+        """, (*comment_ids, MODERATION_MODEL, PROMPT_VERSION))
+        flags = {row['comment_id']: bool(row['is_offensive']) for row in cursor.fetchall()}
+        cursor.close()
+    except Exception as e:
+        print(f"Error loading comment moderation results: {e}")
+        return None
+    finally:
+        conn.close()
+
+    # Results of this run stand even if storing them failed
+    flags.update(new_flags)
+    return flags, len(new_flags), len(pending) - len(new_flags)
+
+
+def backfill(limit=None, batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Moderate historical comments that have no current result
+
+    Args:
+        limit (int): Stop after this many comments (None for all)
+        batch_size (int): Comments per prompt
+        concurrency (int): Batches in flight at once
+
+    Returns:
+        tuple: (comments classified, comments flagged offensive, comments skipped)
+    """
+    classified = flagged = skipped = 0
+    after_id = 0
+    chunk = batch_size * concurrency
+
+    while limit is None or classified + skipped < limit:
+        size = chunk if limit is None else min(chunk, limit - classified - skipped)
+        conn = get_db_connection()
+        if not conn:
+            break
+        try:
+            cursor = conn.cursor(dictionary=True)
+            pending = _unmoderated_comments(cursor, after_id=after_id, limit=size)
+            cursor.close()
+        finally:
+            conn.close()
+        if not pending:
+            break
+
+        flags = classify_comments(pending, batch_size, concurrency)
+        classified += len(flags)
+        flagged += sum(1 for flag in flags.values() if flag)
+        skipped += len(pending) - len(flags)
+        # Comments the model couldn't answer are left for the next run
+        after_id = pending[-1]['comment_id']
+        print(f"🛡️ Moderated {classified} comment(s), {flagged} offensive, {skipped} skipped")
+
+    return classified, flagged, skipped
+
+
+def main():
+    """Backfill entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='IntellEvalPro comment moderation backfill')
+    parser.add_argument('--limit', type=int, default=None, help='Maximum comments to moderate')
+    parser.add_argument('--batch-size', type=int, default=None, help='Comments per prompt')
+    parser.add_argument('--concurrency', type=int, default=None, help='Batches in flight at once')
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        init_comment_moderation_table()
+        classified, flagged, skipped = backfill(
+            limit=args.limit,
+            batch_size=args.batch_size or app.config.get('COMMENT_MODERATION_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+            concurrency=args.concurrency or app.config.get('COMMENT_MODERATION_CONCURRENCY', DEFAULT_CONCURRENCY)
+        )
+    print(f"✅ Backfill finished: {classified} classified, {flagged} offensive, {skipped} skipped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,545 @@
+"""
+Durable outbound email queue for IntellEvalPro
+Stores bulk notification jobs and per-recipient delivery state in MySQL
+
+Jobs survive worker restarts and are visible to every gunicorn worker:
+    email_jobs    - one row per bulk send (template, payload, throughput)
+    email_outbox  - one row per recipient (pending/sending/sent/failed)
+
+Recipients are claimed atomically in batches, so any number of workers
+(in-process threads or the standalone worker) can drain the queue
+concurrently. Failed sends are retried with exponential backoff, and rows
+left in 'sending' by a crashed worker are reclaimed after a lease timeout.
+
+Standalone worker:
+    python -m utils.email_queue            # run until interrupted
+    python -m utils.email_queue --once     # drain what is due, then exit
+"""
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+import logging
+import concurrent.futures
+
+from flask import current_app
+from models.database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# Rows stuck in 'sending' longer than this are assumed orphaned by a dead worker
+LEASE_TIMEOUT_SECONDS = 600
+
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+
+def init_email_queue_tables():
+    """Initialize email_jobs and email_outbox tables if they don't exist"""
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS email_jobs (
+                    job_id VARCHAR(36) PRIMARY KEY,
+                    template VARCHAR(50) NOT NULL,
+                    payload TEXT,
+                    period_id INT NULL,
+                    status ENUM('processing', 'completed') NOT NULL DEFAULT 'processing',
+                    total INT NOT NULL DEFAULT 0,
+                    throughput TEXT,
+                    created_by INT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    completed_at DATETIME NULL,
+                    INDEX idx_email_jobs_status (status)
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS email_outbox (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    job_id VARCHAR(36) NOT NULL,
+                    user_id INT NULL,
+                    to_email VARCHAR(255) NOT NULL,
+                    to_name VARCHAR(255) NULL,
+                    status ENUM('pending', 'sending', 'sent', 'failed') NOT NULL DEFAULT 'pending',
+                    attempts INT NOT NULL DEFAULT 0,
+                    next_attempt_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    locked_by VARCHAR(100) NULL,
+                    locked_at DATETIME NULL,
+                    last_error VARCHAR(500) NULL,
+                    sent_at DATETIME NULL,
+                    INDEX idx_email_outbox_due (status, next_attempt_at),
+                    INDEX idx_email_outbox_job (job_id, status),
+                    FOREIGN KEY (job_id) REFERENCES email_jobs(job_id) ON DELETE CASCADE
+                )
+            """)
+            conn.commit()
+            print("✅ Email queue tables initialized successfully")
+        except Exception as e:
+            print(f"Error initializing email queue tables: {e}")
+        finally:
+            cursor.close()
+            conn.close()
+
+
+def enqueue_email_job(template, recipients, payload=None, period_id=None, created_by=None):
+    """
+    Create a bulk email job and queue one outbox row per recipient
+
+    Args:
+        template (str): Key in EMAIL_TEMPLATES used to render each message
+        recipients (list): Dicts with 'email', 'name' and optional 'user_id'
+        payload (dict, optional): Template arguments shared by all recipients
+        period_id (int, optional): Evaluation period the job belongs to
+        created_by (int, optional): User ID that started the job
+
+    Returns:
+        str: Job ID, or None if the job could not be stored
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+
+    job_id = str(uuid.uuid4())
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO email_jobs (job_id, template, payload, period_id, total, created_by)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, (job_id, template, json.dumps(payload or {}, default=str), period_id,
+              len(recipients), created_by))
+        cursor.executemany("""
+            INSERT INTO email_outbox (job_id, user_id, to_email, to_name)
+            VALUES (%s, %s, %s, %s)
+        """, [(job_id, r.get('user_id'), r['email'], r.get('name')) for r in recipients])
+        conn.commit()
+        cursor.close()
+        return job_id
+    except Exception as e:
+        print(f"Error enqueuing email job: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+
+def get_email_job_progress(job_id):
+    """
+    Aggregate delivery progress for a job from the outbox
+
+    Args:
+        job_id (str): Job ID
+
+    Returns:
+        dict: Job status and per-state counts, or None if the job does not exist
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            SELECT job_id, template, period_id, status, total, throughput,
+                   created_at, completed_at
+            FROM email_jobs
+            WHERE job_id = %s
+        """, (job_id,))
+        job = cursor.fetchone()
+        if not job:
+            cursor.close()
+            return None
+
+        cursor.execute("""
+            SELECT status, COUNT(*) AS count
+            FROM email_outbox
+            WHERE job_id = %s
+            GROUP BY status
+        """, (job_id,))
+        counts = {row['status']: row['count'] for row in cursor.fetchall()}
+        cursor.close()
+
+        job['sent'] = counts.get('sent', 0)
+        job['failed'] = counts.get('failed', 0)
+        job['pending'] = counts.get('pending', 0) + counts.get('sending', 0)
+        job['throughput'] = json.loads(job['throughput']) if job['throughput'] else None
+        return job
+    except Exception as e:
+        print(f"Error getting email job progress: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+class RateLimiter:
+    """Token bucket shared by the sending threads of one worker"""
+
+    def __init__(self, rate_per_second):
+        self.rate = float(rate_per_second or 0)
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        """Block until the next send is allowed (no-op when rate <= 0)"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class EmailQueueWorker:
+    """
+    Drains email_outbox in claimed batches
+
+    Args:
+        app: Flask application (for config and app contexts)
+        batch_size (int): Recipients claimed per batch
+        rate_per_second (float): Max messages per second for this worker (0 = unlimited)
+        connections (int): Pooled SMTP connections / sending threads
+    """
+
+    def __init__(self, app, batch_size=None, rate_per_second=None, connections=None):
+        self.app = app
+        config = app.config
+        self.batch_size = batch_size or config.get('EMAIL_QUEUE_BATCH_SIZE', 100)
+        self.max_attempts = config.get('EMAIL_QUEUE_MAX_ATTEMPTS', 5)
+        self.retry_base_seconds = config.get('EMAIL_QUEUE_RETRY_BASE_SECONDS', 60)
+        self.connections = connections or config.get('EMAIL_QUEUE_CONNECTIONS', 5)
+        self.rate_limiter = RateLimiter(
+            config.get('EMAIL_RATE_LIMIT_PER_SECOND', 10) if rate_per_second is None else rate_per_second
+        )
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def claim_batch(self):
+        """
+        Atomically claim due recipients for this worker
+
+        Returns:
+            list: Claimed outbox rows joined with their job template/payload
+        """
+        conn = get_db_connection()
+        if not conn:
+            return []
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+
+            # Release rows orphaned by a worker that died mid-send
+            cursor.execute("""
+                UPDATE email_outbox
+                SET status = 'pending', locked_by = NULL, locked_at = NULL
+                WHERE status = 'sending'
+                AND locked_at < NOW() - INTERVAL %s SECOND
+            """, (LEASE_TIMEOUT_SECONDS,))
+
+            cursor.execute("""
+                UPDATE email_outbox
+                SET status = 'sending', locked_by = %s, locked_at = NOW()
+                WHERE status = 'pending'
+                AND next_attempt_at <= NOW()
+                ORDER BY next_attempt_at, id
+                LIMIT %s
+            """, (self.worker_id, self.batch_size))
+            conn.commit()
+
+            cursor.execute("""
+                SELECT o.id, o.job_id, o.to_email, o.to_name, o.attempts,
+                       j.template, j.payload
+                FROM email_outbox o
+                JOIN email_jobs j ON o.job_id = j.job_id
+                WHERE o.status = 'sending' AND o.locked_by = %s
+                ORDER BY o.id
+            """, (self.worker_id,))
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        except Exception as e:
+            print(f"Error claiming email batch: {e}")
+            conn.rollback()
+            return []
+        finally:
+            conn.close()
+
+    def _prepare_jobs(self, rows):
+        """
+        Render each job's template once for the whole batch
+
+        Args:
+            rows (list): Claimed outbox rows
+
+        Returns:
+            dict: job_id -> PreparedEmail (None if the template failed to render)
+        """
+        from utils.email_utils import EMAIL_TEMPLATES
+
+        prepared = {}
+        for row in rows:
+            if row['job_id'] in prepared:
+                continue
+            try:
+                prepare = EMAIL_TEMPLATES[row['template']]
+                prepared[row['job_id']] = prepare(**json.loads(row['payload'] or '{}'))
+            except Exception as e:
+                logger.error(f"Error rendering template for email job {row['job_id']}: {e}")
+                prepared[row['job_id']] = None
+        return prepared
+
+    def _send_one(self, row, prepared, smtp_pool):
+        """Send one queued message; returns (row id, success)"""
+        if prepared is None:
+            return row['id'], False
+
+        self.rate_limiter.acquire()
+        with self.app.app_context():
+            ok = prepared.send(row['to_email'], row['to_name'], smtp_pool=smtp_pool)
+        return row['id'], ok
+
+    def record_results(self, job_ids, results, throughput):
+        """
+        Persist per-recipient outcomes and close finished jobs
+
+        Args:
+            job_ids (list): Jobs touched by this batch
+            results (list): (outbox id, success) tuples
+            throughput (dict): SMTP pool stats for this batch
+        """
+        sent_ids = [row_id for row_id, ok in results if ok]
+        failed_ids = [row_id for row_id, ok in results if not ok]
+
+        conn = get_db_connection()
+        if not conn:
+            return
+
+        try:
+            cursor = conn.cursor()
+            if sent_ids:
+                placeholders = ', '.join(['%s'] * len(sent_ids))
+                cursor.execute(f"""
+                    UPDATE email_outbox
+                    SET status = 'sent', sent_at = NOW(), attempts = attempts + 1,
+                        locked_by = NULL, locked_at = NULL, last_error = NULL
+                    WHERE id IN ({placeholders})
+                """, sent_ids)
+            if failed_ids:
+                # MySQL evaluates SET left to right: status/backoff use the old attempts
+                placeholders = ', '.join(['%s'] * len(failed_ids))
+                cursor.execute(f"""
+                    UPDATE email_outbox
+                    SET status = IF(attempts + 1 >= %s, 'failed', 'pending'),
+                        next_attempt_at = NOW() + INTERVAL (%s * POW(2, attempts)) SECOND,
+                        attempts = attempts + 1,
+                        locked_by = NULL, locked_at = NULL,
+                        last_error = 'SMTP send failed'
+                    WHERE id IN ({placeholders})
+                """, [self.max_attempts, self.retry_base_seconds] + failed_ids)
+
+            if job_ids:
+                placeholders = ', '.join(['%s'] * len(job_ids))
+                cursor.execute(f"""
+                    UPDATE email_jobs
+                    SET throughput = %s
+                    WHERE job_id IN ({placeholders})
+                """, [json.dumps(throughput)] + job_ids)
+            cursor.execute("""
+                UPDATE email_jobs j
+                SET j.status = 'completed', j.completed_at = NOW()
+                WHERE j.status = 'processing'
+                AND NOT EXISTS (SELECT 1 FROM email_outbox o
+                                WHERE o.job_id = j.job_id
+                                AND o.status IN ('pending', 'sending'))
+            """)
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            print(f"Error recording email results: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def process_batch(self):
+        """
+        Claim, send and record one batch
+
+        Returns:
+            int: Number of recipients processed (0 when nothing is due)
+        """
+        from utils.email_utils import create_smtp_pool
+
+        with self.app.app_context():
+            rows = self.claim_batch()
+            if not rows:
+                return 0
+            prepared = self._prepare_jobs(rows)
+            smtp_pool = create_smtp_pool(size=self.connections)
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=smtp_pool.size) as executor:
+                results = list(executor.map(
+                    lambda row: self._send_one(row, prepared[row['job_id']], smtp_pool), rows
+                ))
+        finally:
+            smtp_pool.close()
+
+        with self.app.app_context():
+            self.record_results(sorted({row['job_id'] for row in rows}), results, smtp_pool.stats())
+
+        sent = sum(1 for _, ok in results if ok)
+        print(f"📧 Email queue batch: {sent} sent, {len(results) - sent} failed")
+        return len(rows)
+
+    def seconds_until_due(self, idle_sleep=5):
+        """
+        How long until the next unfinished recipient can be sent
+
+        Args:
+            idle_sleep (float): Wait reported when only rows in 'sending' remain
+
+        Returns:
+            float: Seconds until the earliest pending next_attempt_at (0 if
+            already due), or None when every job has finished
+        """
+        conn = get_db_connection()
+        if not conn:
+            return idle_sleep
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT
+                    MIN(CASE WHEN status = 'pending'
+                        THEN TIMESTAMPDIFF(SECOND, NOW(), next_attempt_at) END) AS pending_wait,
+                    COUNT(*) AS unfinished
+                FROM email_outbox
+                WHERE status IN ('pending', 'sending')
+            """)
+            row = cursor.fetchone()
+            cursor.close()
+            if not row['unfinished']:
+                return None
+            if row['pending_wait'] is None:
+                # Only rows claimed by another worker (or orphaned) remain
+                return idle_sleep
+            return max(float(row['pending_wait']), 0.0)
+        except Exception as e:
+            print(f"Error checking email queue: {e}")
+            return idle_sleep
+        finally:
+            conn.close()
+
+    def run_until_finished(self, idle_sleep=5):
+        """
+        Process batches until no job has unfinished recipients
+
+        Unlike run(once=True), messages waiting out a retry backoff keep the
+        worker alive: it sleeps until the earliest next_attempt_at instead of
+        exiting.
+
+        Args:
+            idle_sleep (float): Minimum wait between polls when nothing is due
+        """
+        while True:
+            if self.process_batch():
+                continue
+            with self.app.app_context():
+                wait = self.seconds_until_due(idle_sleep)
+            if wait is None:
+                return
+            time.sleep(max(wait, idle_sleep))
+
+    def run(self, once=False, idle_sleep=5):
+        """
+        Process batches until the queue is empty (once=True) or forever
+
+        Args:
+            once (bool): Exit when nothing is due instead of polling
+            idle_sleep (float): Seconds to wait between polls when idle
+        """
+        while True:
+            processed = self.process_batch()
+            if processed == 0:
+                if once:
+                    return
+                time.sleep(idle_sleep)
+
+
+def ensure_background_worker(app):
+    """
+    Start an in-process worker thread that drains the queue, if not running
+
+    The thread stays alive until every job has finished, including
+    recipients waiting out a retry backoff.
+
+    Disabled when EMAIL_QUEUE_INPROCESS_WORKER is False (i.e. a standalone
+    worker is deployed instead).
+
+    Args:
+        app: Flask application
+    """
+    global _worker_thread
+    if not app.config.get('EMAIL_QUEUE_INPROCESS_WORKER', True):
+        return
+
+    with _worker_lock:
+        if _worker_thread is not None and _worker_thread.is_alive():
+            return
+        worker = EmailQueueWorker(app)
+        _worker_thread = threading.Thread(target=_run_background_worker, args=(worker,), daemon=True)
+        _worker_thread.start()
+
+
+def _run_background_worker(worker):
+    """
+    Thread body for the in-process worker
+
+    The final "queue is empty" check is repeated under _worker_lock, so a job
+    enqueued while the thread is exiting either is seen here or finds no
+    live thread in ensure_background_worker() and starts a new one.
+
+    Args:
+        worker (EmailQueueWorker): Worker to run
+    """
+    global _worker_thread
+    while True:
+        worker.run_until_finished()
+        with _worker_lock:
+            with worker.app.app_context():
+                if worker.seconds_until_due() is None:
+                    _worker_thread = None
+                    return
+
+
+def main():
+    """Standalone worker entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='IntellEvalPro email queue worker')
+    parser.add_argument('--once', action='store_true', help='Drain due messages and exit')
+    parser.add_argument('--batch-size', type=int, default=None)
+    parser.add_argument('--rate', type=float, default=None, help='Max messages per second')
+    parser.add_argument('--connections', type=int, default=None, help='Pooled SMTP connections')
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        init_email_queue_tables()
+
+    worker = EmailQueueWorker(app, batch_size=args.batch_size, rate_per_second=args.rate,
+                              connections=args.connections)
+    print(f"🚀 Email queue worker {worker.worker_id} started")
+    try:
+        worker.run(once=args.once)
+    except KeyboardInterrupt:
+        print("Email queue worker stopped")
+
+
+if __name__ == '__main__':
+    main()
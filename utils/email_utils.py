@@ -3,101 +3,308 @@ Email utility functions for IntellEvalPro
 Handles sending emails for notifications, reminders, and alerts
 """
 import smtplib
+import functools
+import html
+import io
+import uuid
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
+from email.generator import BytesGenerator
 from datetime import datetime
 from flask import current_app
 import logging
 
+from .smtp_pool import SMTPConnectionPool
+
 logger = logging.getLogger(__name__)
 
 
-def send_email(to_email, subject, body_html, body_text=None, from_name='IntellEvalPro'):
+# Stands in for the recipient's name in prepared templates (see PreparedEmail)
+RECIPIENT_NAME = '{{recipient_name}}'
+
+
+@functools.lru_cache(maxsize=4)
+def _load_logo_part(logo_path):
     """
-    Send an email using SMTP
+    Read and encode the inline logo once per process
+    
+    The returned MIMEImage is never modified after creation, so the same
+    part can be attached to any number of messages.
+    
+    Args:
+        logo_path (str): Path to the logo image
+        
+    Returns:
+        MIMEImage: Inline logo part (Content-ID <logo>), or None if unreadable
+    """
+    try:
+        with open(logo_path, 'rb') as f:
+            img = MIMEImage(f.read())
+        img.add_header('Content-ID', '<logo>')
+        img.add_header('Content-Disposition', 'inline', filename='nclogo.png')
+        return img
+    except Exception:
+        # It's non-fatal if logo embedding fails; external URL will be used instead
+        logger.debug('Failed to embed logo inline; falling back to URL')
+        return None
+
+
+def _static_headers(from_name='IntellEvalPro'):
+    """
+    Headers that are identical for every recipient
+    
+    Args:
+        from_name (str): Display name for the From header
+        
+    Returns:
+        list: (header, value) tuples
+    """
+    mail_username = current_app.config.get('MAIL_USERNAME')
+    # Use a friendly From header for better trust (Name <email>)
+    headers = [('From', f"{from_name} <{mail_username}>")]
+    # Optional headers for deliverability and user trust
+    reply_to = current_app.config.get('MAIL_REPLY_TO')
+    if reply_to:
+        headers.append(('Reply-To', reply_to))
+    list_unsub = current_app.config.get('MAIL_LIST_UNSUBSCRIBE')
+    if list_unsub:
+        headers.append(('List-Unsubscribe', list_unsub))
+    return headers
+
+
+def _assemble_message(headers, to_email, subject, body_html, body_text, logo_part):
+    """Put together one MIME message from already rendered parts"""
+    msg = MIMEMultipart('alternative')
+    for name, value in headers:
+        msg[name] = value
+    msg['To'] = to_email
+    msg['Subject'] = subject
+
+    # Add plain text part if provided
+    if body_text:
+        msg.attach(MIMEText(body_text, 'plain'))
+
+    # Add HTML part
+    msg.attach(MIMEText(body_html, 'html'))
+
+    # Embed logo inline if the static logo exists - reduces image blocking
+    if logo_part is not None:
+        msg.attach(logo_part)
+    return msg
+
+
+def build_email_message(to_email, subject, body_html, body_text=None, from_name='IntellEvalPro'):
+    """
+    Build the MIME message for an outgoing email
     
     Args:
         to_email (str): Recipient email address
         subject (str): Email subject
         body_html (str): HTML body content
         body_text (str, optional): Plain text body content
+        from_name (str): Display name for the From header
         
     Returns:
-        bool: True if email sent successfully, False otherwise
+        MIMEMultipart: Message ready to send
     """
-    try:
-        # Get email configuration from Flask config
-        mail_server = current_app.config.get('MAIL_SERVER')
-        mail_port = current_app.config.get('MAIL_PORT')
-        mail_use_tls = current_app.config.get('MAIL_USE_TLS')
-        mail_username = current_app.config.get('MAIL_USERNAME')
-        mail_password = current_app.config.get('MAIL_PASSWORD')
-
-        # Validate email configuration
-        if not mail_username or not mail_password:
-            logger.error('Email credentials not configured (MAIL_USERNAME or MAIL_PASSWORD missing)')
+    logo_part = _load_logo_part(current_app.config.get('LOGO_PATH', 'static/images/nclogo.png'))
+    return _assemble_message(_static_headers(from_name), to_email, subject, body_html, body_text, logo_part)
+
+
+class PreparedEmail:
+    """
+    Email rendered once and sent to many recipients
+    
+    The subject, bodies, static headers and logo part are built when the
+    object is created (inside an app context). Per recipient only the name
+    and address are substituted. The logo (several hundred KB of base64) is
+    also serialized once and spliced into each message's bytes, which is
+    where most of the per-message cost used to go.
+    
+    Args:
+        subject (str): Email subject
+        body_html (str): HTML body; RECIPIENT_NAME marks where the name goes
+        body_text (str, optional): Plain text body with the same marker
+        from_name (str): Display name for the From header
+    """
+
+    def __init__(self, subject, body_html, body_text=None, from_name='IntellEvalPro'):
+        self.subject = subject
+        self.body_html = body_html
+        self.body_text = body_text
+        self.headers = _static_headers(from_name)
+        self.envelope_from = current_app.config.get('MAIL_USERNAME')
+        self.logo_part = _load_logo_part(current_app.config.get('LOGO_PATH', 'static/images/nclogo.png'))
+        # Fixed per-job boundary: a random token cannot occur in the bodies,
+        # and it spares the generator from scanning every message for one
+        self.boundary = f"==============={uuid.uuid4().hex}=="
+        self._logo_bytes = self._flatten(self.logo_part) if self.logo_part is not None else None
+
+    @staticmethod
+    def _flatten(msg):
+        fp = io.BytesIO()
+        BytesGenerator(fp, policy=msg.policy.clone(linesep='\r\n')).flatten(msg)
+        return fp.getvalue()
+
+    def build(self, to_email, to_name, include_logo=True):
+        """
+        Build the message for one recipient
+        
+        Args:
+            to_email (str): Recipient email address
+            to_name (str): Recipient display name
+            include_logo (bool): Attach the inline logo part
+            
+        Returns:
+            MIMEMultipart: Message ready to send
+        """
+        to_name = to_name or ''
+        body_html = self.body_html.replace(RECIPIENT_NAME, html.escape(to_name))
+        body_text = self.body_text.replace(RECIPIENT_NAME, to_name) if self.body_text else None
+        logo_part = self.logo_part if include_logo else None
+        msg = _assemble_message(self.headers, to_email, self.subject, body_html, body_text, logo_part)
+        msg.set_boundary(self.boundary)
+        return msg
+
+    def as_bytes(self, to_email, to_name):
+        """
+        Serialize the message for one recipient, reusing the encoded logo
+        
+        Produces the same bytes as flattening build(to_email, to_name).
+        
+        Args:
+            to_email (str): Recipient email address
+            to_name (str): Recipient display name
+            
+        Returns:
+            bytes: Message with CRLF line endings, ready for SMTP DATA
+        """
+        data = self._flatten(self.build(to_email, to_name, include_logo=False))
+        if self._logo_bytes is None:
+            return data
+        close = f"\r\n--{self.boundary}--\r\n".encode('ascii')
+        return b''.join([
+            data[:-len(close)],
+            f"\r\n--{self.boundary}\r\n".encode('ascii'),
+            self._logo_bytes,
+            close,
+        ])
+
+    def send(self, to_email, to_name, smtp_pool=None):
+        """
+        Build and send the message for one recipient
+        
+        Args:
+            to_email (str): Recipient email address
+            to_name (str): Recipient display name
+            smtp_pool (SMTPConnectionPool, optional): Reuse pooled connections
+            
+        Returns:
+            bool: True if email sent successfully, False otherwise
+        """
+        try:
+            if smtp_pool is None:
+                return _deliver_message(self.build(to_email, to_name), to_email)
+            if not _mail_credentials_configured():
+                return False
+            return smtp_pool.send_raw(self.envelope_from, [to_email], self.as_bytes(to_email, to_name))
+        except Exception as e:
+            logger.exception(f'Failed to send email to {to_email}: {e}')
             return False
 
-        # Create message
-        msg = MIMEMultipart('alternative')
-        # Use a friendly From header for better trust (Name <email>)
-        msg['From'] = f"{from_name} <{mail_username}>"
-        # Optional headers for deliverability and user trust
-        reply_to = current_app.config.get('MAIL_REPLY_TO')
-        if reply_to:
-            msg['Reply-To'] = reply_to
-        list_unsub = current_app.config.get('MAIL_LIST_UNSUBSCRIBE')
-        if list_unsub:
-            msg['List-Unsubscribe'] = list_unsub
-        msg['To'] = to_email
-        msg['Subject'] = subject
-
-        # Add plain text part if provided
-        if body_text:
-            part1 = MIMEText(body_text, 'plain')
-            msg.attach(part1)
-
-        # Add HTML part
-        part2 = MIMEText(body_html, 'html')
-        msg.attach(part2)
-
-        # Embed logo inline if the static logo exists - reduces image blocking
+
+def create_smtp_pool(size=5):
+    """
+    Create a pooled SMTP sender from the Flask mail configuration
+    
+    Args:
+        size (int): Number of SMTP connections to keep open
+        
+    Returns:
+        SMTPConnectionPool: Pool to pass to send_email(smtp_pool=...); call close() when done
+    """
+    return SMTPConnectionPool.from_config(current_app.config, size=size)
+
+
+def _mail_credentials_configured():
+    """Check MAIL_USERNAME/MAIL_PASSWORD, logging when they are missing"""
+    if not current_app.config.get('MAIL_USERNAME') or not current_app.config.get('MAIL_PASSWORD'):
+        logger.error('Email credentials not configured (MAIL_USERNAME or MAIL_PASSWORD missing)')
+        return False
+    return True
+
+
+def _deliver_message(msg, to_email, smtp_pool=None):
+    """
+    Send a built message over the pool or a one-off SMTP connection
+    
+    Args:
+        msg: Message to send
+        to_email (str): Recipient email address (for logging)
+        smtp_pool (SMTPConnectionPool, optional): Reuse pooled connections
+        
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
+    # Validate email configuration
+    if not _mail_credentials_configured():
+        return False
+
+    if smtp_pool is not None:
+        return smtp_pool.send(msg)
+
+    # Get email configuration from Flask config
+    mail_server = current_app.config.get('MAIL_SERVER')
+    mail_port = current_app.config.get('MAIL_PORT')
+    mail_use_tls = current_app.config.get('MAIL_USE_TLS')
+    mail_username = current_app.config.get('MAIL_USERNAME')
+    mail_password = current_app.config.get('MAIL_PASSWORD')
+
+    # Send email
+    with smtplib.SMTP(mail_server, mail_port, timeout=30) as server:
+        # Advertise ourselves and start TLS if configured
+        try:
+            server.ehlo()
+            if mail_use_tls:
+                server.starttls()
+                server.ehlo()
+        except Exception as tls_err:
+            # Non-fatal: log and continue (login may still fail later)
+            logger.debug(f'TLS handshake issue: {tls_err}')
+
+        # Enable SMTP debug level when running in debug mode
         try:
-            logo_path = current_app.config.get('LOGO_PATH', 'static/images/nclogo.png')
-            with open(logo_path, 'rb') as f:
-                img = MIMEImage(f.read())
-                img.add_header('Content-ID', '<logo>')
-                img.add_header('Content-Disposition', 'inline', filename='nclogo.png')
-                msg.attach(img)
+            if getattr(current_app, 'debug', False):
+                server.set_debuglevel(1)
         except Exception:
-            # It's non-fatal if logo embedding fails; external URL will be used instead
-            logger.debug('Failed to embed logo inline; falling back to URL')
+            pass
+
+        server.login(mail_username, mail_password)
+        server.send_message(msg)
+
+    logger.info(f'Email sent successfully to {to_email} via {mail_server}:{mail_port}')
+    return True
 
-        # Send email
-        with smtplib.SMTP(mail_server, mail_port, timeout=30) as server:
-            # Advertise ourselves and start TLS if configured
-            try:
-                server.ehlo()
-                if mail_use_tls:
-                    server.starttls()
-                    server.ehlo()
-            except Exception as tls_err:
-                # Non-fatal: log and continue (login may still fail later)
-                logger.debug(f'TLS handshake issue: {tls_err}')
-
-            # Enable SMTP debug level when running in debug mode
-            try:
-                if getattr(current_app, 'debug', False):
-                    server.set_debuglevel(1)
-            except Exception:
-                pass
-
-            server.login(mail_username, mail_password)
-            server.send_message(msg)
-
-        logger.info(f'Email sent successfully to {to_email} via {mail_server}:{mail_port}')
-        return True
+
+def send_email(to_email, subject, body_html, body_text=None, from_name='IntellEvalPro', smtp_pool=None):
+    """
+    Send an email using SMTP
+    
+    Args:
+        to_email (str): Recipient email address
+        subject (str): Email subject
+        body_html (str): HTML body content
+        body_text (str, optional): Plain text body content
+        smtp_pool (SMTPConnectionPool, optional): Reuse pooled connections
+            instead of opening a new one for this message
+        
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
+    try:
+        msg = build_email_message(to_email, subject, body_html, body_text, from_name)
+        return _deliver_message(msg, to_email, smtp_pool)
 
     except Exception as e:
         # Log full exception with stack trace for easier debugging (do not expose sensitive info)
@@ -109,6 +316,9 @@ def send_bulk_emails(recipients, subject, body_html, body_text=None):
     """
     Send emails to multiple recipients using optimized batch processing
     
+    Messages are spread over a small pool of persistent SMTP connections
+    instead of opening one connection per recipient.
+    
     Args:
         recipients (list): List of recipient email addresses
         subject (str): Email subject
@@ -116,7 +326,7 @@ def send_bulk_emails(recipients, subject, body_html, body_text=None):
         body_text (str, optional): Plain text body content
         
     Returns:
-        dict: Statistics about email sending (sent, failed)
+        dict: Statistics about email sending (sent, failed) plus pool throughput
     """
     import concurrent.futures
     from threading import Lock
@@ -128,10 +338,13 @@ def send_bulk_emails(recipients, subject, body_html, body_text=None):
     }
     
     stats_lock = Lock()
+    app = current_app._get_current_object()
+    smtp_pool = create_smtp_pool(size=5)
     
     def send_single_email(email):
         """Send email and update stats thread-safely"""
-        success = send_email(email, subject, body_html, body_text)
+        with app.app_context():
+            success = send_email(email, subject, body_html, body_text, smtp_pool=smtp_pool)
         with stats_lock:
             if success:
                 stats['sent'] += 1
@@ -139,10 +352,14 @@ def send_bulk_emails(recipients, subject, body_html, body_text=None):
                 stats['failed'] += 1
         return success
     
-    # Use ThreadPoolExecutor for parallel email sending (max 5 concurrent connections)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        executor.map(send_single_email, recipients)
+    # One worker per pooled SMTP connection (5 concurrent connections)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=smtp_pool.size) as executor:
+            list(executor.map(send_single_email, recipients))
+    finally:
+        smtp_pool.close()
     
+    stats['throughput'] = smtp_pool.stats()
     return stats
 
 
@@ -208,7 +425,8 @@ def _render_reset_template(user_name, reset_url, expiry_hours=1):
     return body_html, body_text
 
 
-def send_evaluation_start_notification(student_email, student_name, period_title, start_date, end_date):
+def send_evaluation_start_notification(student_email, student_name, period_title, start_date, end_date,
+                                       smtp_pool=None):
     """
     Send notification to user when evaluation period starts
     
@@ -218,10 +436,28 @@ def send_evaluation_start_notification(student_email, student_name, period_title
         period_title (str): Evaluation period title
         start_date (str): Start date of evaluation period
         end_date (str): End date of evaluation period
+        smtp_pool (SMTPConnectionPool, optional): Pooled sender for bulk jobs
         
     Returns:
         bool: True if email sent successfully
     """
+    prepared = prepare_evaluation_start_notification(period_title, start_date, end_date)
+    return prepared.send(student_email, student_name, smtp_pool=smtp_pool)
+
+
+def prepare_evaluation_start_notification(period_title, start_date, end_date):
+    """
+    Render the evaluation start notification once for a whole period blast
+    
+    Args:
+        period_title (str): Evaluation period title
+        start_date (str): Start date of evaluation period
+        end_date (str): End date of evaluation period
+        
+    Returns:
+        PreparedEmail: Call send(email, name, smtp_pool) per recipient
+    """
+    student_name = RECIPIENT_NAME
     subject = f"📝 Evaluation Period Started: {period_title}"
     
     # Format dates for display
@@ -419,10 +655,11 @@ def send_evaluation_start_notification(student_email, student_name, period_title
     Norzagaray College
     """
     
-    return send_email(student_email, subject, body_html, body_text)
+    return PreparedEmail(subject, body_html, body_text)
 
 
-def send_evaluation_reminder(student_email, student_name, period_title, end_date, pending_count):
+def send_evaluation_reminder(student_email, student_name, period_title, end_date, pending_count,
+                             smtp_pool=None):
     """
     Send reminder to student about pending evaluations
     
@@ -432,10 +669,28 @@ def send_evaluation_reminder(student_email, student_name, period_title, end_date
         period_title (str): Evaluation period title
         end_date (str): End date of evaluation period
         pending_count (int): Number of pending evaluations
+        smtp_pool (SMTPConnectionPool, optional): Pooled sender for bulk jobs
         
     Returns:
         bool: True if email sent successfully
     """
+    prepared = prepare_evaluation_reminder(period_title, end_date, pending_count)
+    return prepared.send(student_email, student_name, smtp_pool=smtp_pool)
+
+
+def prepare_evaluation_reminder(period_title, end_date, pending_count):
+    """
+    Render the pending evaluation reminder once for many recipients
+    
+    Args:
+        period_title (str): Evaluation period title
+        end_date (str): End date of evaluation period
+        pending_count (int): Number of pending evaluations
+        
+    Returns:
+        PreparedEmail: Call send(email, name, smtp_pool) per recipient
+    """
+    student_name = RECIPIENT_NAME
     subject = f"⏰ Reminder: {pending_count} Pending Evaluation(s) - {period_title}"
     
     end_formatted = datetime.strptime(end_date, '%Y-%m-%d').strftime('%B %d, %Y')
@@ -560,4 +815,12 @@ def send_evaluation_reminder(student_email, student_name, period_title, end_date
     IntellEvalPro - Norzagaray College
     """
     
-    return send_email(student_email, subject, body_html, body_text)
+    return PreparedEmail(subject, body_html, body_text)
+
+
+# Templates the durable email queue (utils/email_queue.py) can render by name.
+# Each is called once per job as fn(**job_payload) and returns a PreparedEmail.
+EMAIL_TEMPLATES = {
+    'evaluation_start': prepare_evaluation_start_notification,
+    'evaluation_reminder': prepare_evaluation_reminder,
+}
@@ -0,0 +1,640 @@
+"""
+Per-faculty evaluation reports for IntellEvalPro
+Groups a faculty's rating counts into the summary report and renders it as PDF or Excel
+
+Shared by the single-faculty export endpoints and bulk export jobs
+(utils/bulk_exports.py). Renderers take plain data and a file path only,
+so they can run in worker processes.
+"""
+import os
+import re
+
+# File extension of each export format
+EXTENSIONS = {'pdf': 'pdf', 'excel': 'xlsx'}
+
+# Default signature positions (percent of the signature area)
+DEFAULT_SIGNATURES = {
+    'faculty_x': 10.0, 'faculty_y': 8.33,
+    'dean_x': 10.0, 'dean_y': 33.33,
+    'president_x': 10.0, 'president_y': 58.33
+}
+
+
+def rating_remarks(mean):
+    """Descriptive equivalent of a 1-5 mean rating"""
+    if mean >= 4.50:
+        return 'OUTSTANDING'
+    elif mean >= 3.50:
+        return 'HIGHLY SATISFACTORY'
+    elif mean >= 2.50:
+        return 'SATISFACTORY'
+    elif mean >= 1.50:
+        return 'NEEDS IMPROVEMENT'
+    else:
+        return 'POOR'
+
+
+def group_faculty_results(rows):
+    """
+    Group rating counts into categories and criteria with means and remarks
+
+    Args:
+        rows (list): Dicts with category_id, category_name, category_order,
+                     criterion_id, description, criterion_order, rating and
+                     count (number of responses with that rating), ordered by
+                     category and criterion
+
+    Returns:
+        dict: categories (each with criteria), total_mean, overall_mean, overall_remarks
+    """
+    categories = {}
+    criteria = {}
+    for row in rows:
+        category_id = row['category_id']
+        if category_id not in categories:
+            categories[category_id] = {
+                'category_id': category_id,
+                'category_name': row['category_name'],
+                'category_order': row['category_order'],
+                'criteria': []
+            }
+
+        if row['criterion_id']:
+            criterion = criteria.get(row['criterion_id'])
+            if not criterion:
+                criterion = {
+                    'criterion_id': row['criterion_id'],
+                    'description': row['description'],
+                    'criterion_order': row['criterion_order'],
+                    'votes': {'5': 0, '4': 0, '3': 0, '2': 0, '1': 0},
+                    'total_responses': 0,
+                    'mean': 0,
+                    'remarks': 'No Data'
+                }
+                categories[category_id]['criteria'].append(criterion)
+                criteria[row['criterion_id']] = criterion
+
+            if row['rating']:
+                rating_str = str(int(row['rating']))
+                count = int(row['count'])
+                criterion['votes'][rating_str] = criterion['votes'].get(rating_str, 0) + count
+                criterion['total_responses'] += count
+
+    # Calculate means
+    total_mean = 0
+    total_criteria = 0
+    for criterion in criteria.values():
+        if criterion['total_responses'] > 0:
+            total_score = sum(int(rating) * count for rating, count in criterion['votes'].items())
+            criterion['mean'] = total_score / criterion['total_responses']
+            criterion['remarks'] = rating_remarks(criterion['mean'])
+            total_mean += criterion['mean']
+            total_criteria += 1
+
+    overall_mean = total_mean / total_criteria if total_criteria > 0 else 0
+
+    return {
+        'categories': list(categories.values()),
+        'total_mean': total_mean,
+        'overall_mean': overall_mean,
+        'overall_remarks': rating_remarks(overall_mean)
+    }
+
+
+def _unpack(report):
+    """Fields of a report dict used by both renderers"""
+    return (
+        report['faculty'], report.get('subject'), report.get('section'), report.get('period_info'),
+        report['categories'], report.get('comments') or [],
+        report['total_mean'], report['overall_mean'], report['overall_remarks']
+    )
+
+
+def render_evaluation_pdf(report, file_path, signatures=None):
+    """
+    Render a faculty evaluation summary report as PDF
+
+    Args:
+        report (dict): faculty, subject, section, period_info, comments and the
+                       fields of group_faculty_results()
+        file_path (str): Destination file
+        signatures (dict, optional): Signature positions (see DEFAULT_SIGNATURES)
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    
+    (faculty, subject, section, period_info, categories_list, unique_comments,
+     total_mean, overall_mean, overall_remarks) = _unpack(report)
+    
+    signatures = {**DEFAULT_SIGNATURES, **(signatures or {})}
+    sig_faculty_x, sig_faculty_y = signatures['faculty_x'], signatures['faculty_y']
+    sig_dean_x, sig_dean_y = signatures['dean_x'], signatures['dean_y']
+    sig_president_x, sig_president_y = signatures['president_x'], signatures['president_y']
+    
+    doc = SimpleDocTemplate(file_path, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    elements = []
+    styles = getSampleStyleSheet()
+    
+    # Add logo and header
+    logo_path = os.path.join('static', 'images', 'nclogo.png')
+    if os.path.exists(logo_path):
+        logo = Image(logo_path, width=0.8*inch, height=0.8*inch)
+        elements.append(logo)
+    
+    # Title
+    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=12, textColor=colors.black, spaceAfter=6, alignment=TA_CENTER, fontName='Times-Bold')
+    elements.append(Paragraph('NORZAGARAY COLLEGE', title_style))
+    elements.append(Paragraph('Municipal Compound, Norzagaray, Bulacan', ParagraphStyle('Subtitle', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER)))
+    elements.append(Paragraph('GUIDANCE AND COUNSELING CENTER', ParagraphStyle('Subtitle2', parent=styles['Normal'], fontSize=10, fontName='Times-Bold', alignment=TA_CENTER, spaceAfter=6)))
+    elements.append(Paragraph('FACULTY TEACHING PERFORMANCE EVALUATION SUMMARY REPORT', ParagraphStyle('Subtitle3', parent=styles['Normal'], fontSize=9, alignment=TA_CENTER, spaceAfter=3)))
+    
+    if period_info:
+        # Remove any status text (Active), (Closed), etc. from period name using regex
+        period_name = re.sub(r'\s*\([^)]*\)\s*$', '', period_info['period_name']).strip()
+        elements.append(Paragraph(f"{period_name}, A.Y. {period_info['year_name']}", ParagraphStyle('Period', parent=styles['Normal'], fontSize=9, alignment=TA_CENTER, spaceAfter=6)))
+    
+    # Add section info to print header if section is selected
+    if section:
+        elements.append(Paragraph(f"Section: {section['section_name']}", ParagraphStyle('Section', parent=styles['Normal'], fontSize=9, alignment=TA_CENTER, spaceAfter=12)))
+    else:
+        elements.append(Spacer(1, 0.1*inch))
+    
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Faculty info
+    elements.append(Paragraph(f"<b>Faculty Name:</b> {faculty['first_name']} {faculty['last_name']}", styles['Normal']))
+    if subject:
+        elements.append(Paragraph(f"<b>Subject:</b> {subject['subject_code']} - {subject['title']}", styles['Normal']))
+    if section:
+        elements.append(Paragraph(f"<b>Section:</b> {section['section_name']}", styles['Normal']))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Build results tables
+    for category in categories_list:
+        # Category header
+        elements.append(Paragraph(f"<b>{category['category_name']}</b>", ParagraphStyle('CategoryHeader', parent=styles['Heading2'], fontSize=11, fontName='Times-Bold', spaceAfter=6)))
+    
+        # Criteria table
+        table_data = [['No.', 'Performance Indicators', '5', '4', '3', '2', '1', 'Mean', 'Remarks']]
+    
+        # Create paragraph styles for table cells
+        cell_style = ParagraphStyle('CellStyle', parent=styles['Normal'], fontSize=8, leading=10)
+        remarks_style = ParagraphStyle('RemarksStyle', parent=styles['Normal'], fontSize=7, leading=9, alignment=TA_CENTER)
+    
+        for idx, criterion in enumerate(category['criteria'], 1):
+            # Wrap remarks text in Paragraph for text wrapping
+            remarks_text = criterion['remarks'] if criterion['total_responses'] > 0 else 'NO DATA'
+    
+            table_data.append([
+                str(idx),
+                Paragraph(criterion['description'], cell_style),
+                str(criterion['votes']['5']),
+                str(criterion['votes']['4']),
+                str(criterion['votes']['3']),
+                str(criterion['votes']['2']),
+                str(criterion['votes']['1']),
+                f"{criterion['mean']:.2f}" if criterion['total_responses'] > 0 else 'N/A',
+                Paragraph(remarks_text, remarks_style)
+            ])
+    
+        # Adjusted column widths to give more space to remarks while keeping everything on one page
+        table = Table(table_data, colWidths=[0.3*inch, 2.8*inch, 0.35*inch, 0.35*inch, 0.35*inch, 0.35*inch, 0.35*inch, 0.5*inch, 1.0*inch])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('ALIGN', (1, 1), (1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Times-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 8),
+            ('FONTSIZE', (0, 1), (-1, -1), 7),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+            ('TOPPADDING', (0, 1), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+            ('LEFTPADDING', (0, 0), (-1, -1), 3),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]))
+    
+        elements.append(table)
+        elements.append(Spacer(1, 0.15*inch))
+    
+    # Comments section
+    if unique_comments:
+        elements.append(Paragraph('<b>COMMENTS:</b>', ParagraphStyle('CommentsHeader', parent=styles['Heading3'], fontSize=10, fontName='Times-Bold', spaceAfter=6)))
+        for idx, comment in enumerate(unique_comments, 1):
+            elements.append(Paragraph(f"{idx}. {comment}", ParagraphStyle('Comment', parent=styles['Normal'], fontSize=9, leftIndent=20, spaceAfter=4)))
+        elements.append(Spacer(1, 0.2*inch))
+    
+    # Rating scale
+    elements.append(Paragraph('<b>RATING SCALE:</b>', ParagraphStyle('RatingHeader', parent=styles['Heading3'], fontSize=10, fontName='Times-Bold', spaceAfter=6)))
+    rating_data = [
+        ['Rating', 'Equivalent', 'Total:', f"{total_mean:.2f}"],
+        ['4.50 - 5.00', 'OUTSTANDING', 'Rating:', f"{overall_mean:.2f}"],
+        ['3.50 - 4.49', 'HIGHLY SATISFACTORY', 'Remarks:', overall_remarks],
+        ['2.50 - 3.49', 'SATISFACTORY', '', ''],
+        ['1.50 - 2.49', 'NEEDS IMPROVEMENT', '', ''],
+        ['1.00 - 1.49', 'POOR', '', '']
+    ]
+    
+    rating_table = Table(rating_data, colWidths=[1.5*inch, 2*inch, 1.2*inch, 1.5*inch])
+    rating_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Times-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('SPAN', (2, 3), (3, 5)),
+    ]))
+    
+    elements.append(rating_table)
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Signatures with custom positioning
+    # Convert percentage to actual spacing (max available space ~4 inches after rating table)
+    max_signature_space = 4.0  # inches available for signature positioning
+    
+    # Calculate vertical spacing based on Y percentages
+    faculty_spacing = (sig_faculty_y / 100.0) * max_signature_space
+    dean_spacing = ((sig_dean_y - sig_faculty_y) / 100.0) * max_signature_space
+    president_spacing = ((sig_president_y - sig_dean_y) / 100.0) * max_signature_space
+    
+    # Determine horizontal alignment based on X percentage
+    # 0-33% = LEFT, 33-66% = CENTER, 66-100% = RIGHT
+    def get_alignment(x_percent):
+        if x_percent < 33:
+            return TA_LEFT
+        elif x_percent < 66:
+            return TA_CENTER
+        else:
+            return 2  # TA_RIGHT value
+    
+    faculty_align = get_alignment(sig_faculty_x)
+    dean_align = get_alignment(sig_dean_x)
+    president_align = get_alignment(sig_president_x)
+    
+    # Faculty Signature
+    elements.append(Spacer(1, faculty_spacing * inch))
+    elements.append(Paragraph('_' * 50, ParagraphStyle('SigLine1', parent=styles['Normal'], alignment=faculty_align)))
+    elements.append(Paragraph('<b>SIGNATURE OF FACULTY</b>', ParagraphStyle('Sig', parent=styles['Normal'], fontSize=9, spaceAfter=12, alignment=faculty_align)))
+    
+    # Dean Signature
+    elements.append(Spacer(1, dean_spacing * inch))
+    elements.append(Paragraph('_' * 50, ParagraphStyle('SigLine2', parent=styles['Normal'], alignment=dean_align)))
+    elements.append(Paragraph('<b>SIGNATURE OF COLLEGE DEAN</b>', ParagraphStyle('Sig2', parent=styles['Normal'], fontSize=9, spaceAfter=12, alignment=dean_align)))
+    
+    # President Signature
+    elements.append(Spacer(1, president_spacing * inch))
+    elements.append(Paragraph('<b>NOTED BY:</b>', ParagraphStyle('Noted', parent=styles['Normal'], fontSize=9, fontName='Times-Bold', spaceAfter=6, alignment=president_align)))
+    elements.append(Paragraph('<b>MA. LIBERTY DG. PASCUAL, Ph.D.</b>', ParagraphStyle('Name', parent=styles['Normal'], fontSize=10, fontName='Times-Bold', alignment=president_align)))
+    elements.append(Paragraph('College President', ParagraphStyle('Title', parent=styles['Normal'], alignment=president_align)))
+    
+    # Build PDF
+    doc.build(elements)
+
+
+def render_evaluation_excel(report, file_path):
+    """
+    Render a faculty evaluation summary report as an Excel workbook
+
+    Args:
+        report (dict): As for render_evaluation_pdf()
+        file_path (str): Destination file
+    """
+    import openpyxl
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    
+    (faculty, subject, section, period_info, categories_list, unique_comments,
+     total_mean, overall_mean, overall_remarks) = _unpack(report)
+    
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Evaluation Report"
+    
+    # Styles
+    header_font = Font(name='Times New Roman', size=14, bold=True)
+    subheader_font = Font(name='Times New Roman', size=11, bold=True)
+    normal_font = Font(name='Times New Roman', size=10)
+    bold_font = Font(name='Times New Roman', size=10, bold=True)
+    
+    center_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    left_alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
+    
+    gray_fill = PatternFill(start_color='E5E7EB', end_color='E5E7EB', fill_type='solid')
+    
+    thin_border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    
+    # Add logo at the top
+    row = 1
+    try:
+        from openpyxl.drawing.image import Image as XLImage
+        logo_path = os.path.join('static', 'images', 'nclogo.png')
+        if os.path.exists(logo_path):
+            img = XLImage(logo_path)
+            # Make logo bigger (100x100 pixels)
+            img.width = 100
+            img.height = 100
+            # Position the logo in column C-D area (left side, as shown in the format)
+            ws.add_image(img, f'C{row}')
+            # Set row heights to accommodate larger logo - reduced spacing to lower the logo
+            ws.row_dimensions[row].height = 75
+            ws.row_dimensions[row + 1].height = 3
+            ws.row_dimensions[row + 2].height = 3
+            # Add less space for the image to position it lower
+            row += 3
+    except Exception as e:
+        print(f"Could not add logo: {e}")
+        pass
+    
+    # Header section
+    ws.merge_cells(f'A{row}:I{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'NORZAGARAY COLLEGE'
+    cell.font = Font(name='Times New Roman', size=12, bold=True)
+    cell.alignment = center_alignment
+    row += 1
+    
+    ws.merge_cells(f'A{row}:I{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'Municipal Compound, Norzagaray, Bulacan'
+    cell.font = normal_font
+    cell.alignment = center_alignment
+    row += 1
+    
+    ws.merge_cells(f'A{row}:I{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'GUIDANCE AND COUNSELING CENTER'
+    cell.font = Font(name='Times New Roman', size=10, bold=True)
+    cell.alignment = center_alignment
+    row += 1
+    
+    ws.merge_cells(f'A{row}:I{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'FACULTY TEACHING PERFORMANCE EVALUATION SUMMARY REPORT'
+    cell.font = Font(name='Times New Roman', size=9)
+    cell.alignment = center_alignment
+    row += 1
+    
+    if period_info:
+        # Remove any status text (Active), (Closed), etc. from period name using regex
+        period_name = re.sub(r'\s*\([^)]*\)\s*$', '', period_info['period_name']).strip()
+        ws.merge_cells(f'A{row}:I{row}')
+        cell = ws[f'A{row}']
+        cell.value = f"{period_name}, A.Y. {period_info['year_name']}"
+        cell.font = Font(name='Times New Roman', size=9)
+        cell.alignment = center_alignment
+        row += 1
+    
+    # Add section info to print header if section is selected
+    if section:
+        ws.merge_cells(f'A{row}:I{row}')
+        cell = ws[f'A{row}']
+        cell.value = f"Section: {section['section_name']}"
+        cell.font = Font(name='Times New Roman', size=9)
+        cell.alignment = center_alignment
+        row += 1
+    
+    row += 1  # Empty row
+    
+    # Faculty info
+    ws[f'A{row}'] = f"Faculty Name: {faculty['first_name']} {faculty['last_name']}"
+    ws[f'A{row}'].font = bold_font
+    row += 1
+    
+    if subject:
+        ws[f'A{row}'] = f"Subject: {subject['subject_code']} - {subject['title']}"
+        ws[f'A{row}'].font = bold_font
+        row += 1
+    
+    if section:
+        ws[f'A{row}'] = f"Section: {section['section_name']}"
+        ws[f'A{row}'].font = bold_font
+        row += 1
+    
+    row += 1  # Empty row
+    
+    # Categories and criteria
+    for category in categories_list:
+        # Category header
+        ws.merge_cells(f'A{row}:I{row}')
+        cell = ws[f'A{row}']
+        cell.value = category['category_name']
+        cell.font = subheader_font
+        cell.fill = gray_fill
+        cell.alignment = left_alignment
+        cell.border = thin_border
+        row += 1
+    
+        # Table headers
+        headers = ['No.', 'Performance Indicators', '5', '4', '3', '2', '1', 'Mean', 'Remarks']
+        for col, header in enumerate(headers, 1):
+            cell = ws.cell(row=row, column=col)
+            cell.value = header
+            cell.font = bold_font
+            cell.fill = gray_fill
+            cell.alignment = center_alignment
+            cell.border = thin_border
+        row += 1
+    
+        # Criteria data
+        for idx, criterion in enumerate(category['criteria'], 1):
+            ws.cell(row=row, column=1).value = idx
+            ws.cell(row=row, column=2).value = criterion['description']
+            ws.cell(row=row, column=3).value = criterion['votes']['5']
+            ws.cell(row=row, column=4).value = criterion['votes']['4']
+            ws.cell(row=row, column=5).value = criterion['votes']['3']
+            ws.cell(row=row, column=6).value = criterion['votes']['2']
+            ws.cell(row=row, column=7).value = criterion['votes']['1']
+            ws.cell(row=row, column=8).value = f"{criterion['mean']:.2f}" if criterion['total_responses'] > 0 else 'N/A'
+            ws.cell(row=row, column=9).value = criterion['remarks']
+    
+            for col in range(1, 10):
+                cell = ws.cell(row=row, column=col)
+                cell.font = normal_font
+                cell.border = thin_border
+                if col == 2:
+                    cell.alignment = left_alignment
+                else:
+                    cell.alignment = center_alignment
+    
+            row += 1
+    
+        row += 1  # Empty row between categories
+    
+    # Comments
+    if unique_comments:
+        ws.merge_cells(f'A{row}:I{row}')
+        cell = ws[f'A{row}']
+        cell.value = 'COMMENTS:'
+        cell.font = subheader_font
+        cell.alignment = left_alignment
+        row += 1
+    
+        for idx, comment in enumerate(unique_comments, 1):
+            ws.merge_cells(f'A{row}:I{row}')
+            cell = ws[f'A{row}']
+            cell.value = f"{idx}. {comment}"
+            cell.font = normal_font
+            cell.alignment = left_alignment
+            row += 1
+    
+        row += 1
+    
+    # Rating scale
+    ws.merge_cells(f'A{row}:I{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'RATING SCALE:'
+    cell.font = subheader_font
+    cell.alignment = left_alignment
+    row += 1
+    
+    # Rating table
+    rating_headers = [['Rating', 'Equivalent', 'Total:', f"{total_mean:.2f}"]]
+    rating_data = [
+        ['4.50 - 5.00', 'OUTSTANDING', 'Rating:', f"{overall_mean:.2f}"],
+        ['3.50 - 4.49', 'HIGHLY SATISFACTORY', 'Remarks:', overall_remarks],
+        ['2.50 - 3.49', 'SATISFACTORY', '', ''],
+        ['1.50 - 2.49', 'NEEDS IMPROVEMENT', '', ''],
+        ['1.00 - 1.49', 'POOR', '', '']
+    ]
+    
+    for data_row in rating_headers + rating_data:
+        for col, value in enumerate(data_row, 1):
+            cell = ws.cell(row=row, column=col)
+            cell.value = value
+            cell.font = bold_font if row == (row - len(rating_data) - len(rating_headers) + 1) else normal_font
+            cell.fill = gray_fill if row == (row - len(rating_data) - len(rating_headers) + 1) else PatternFill()
+            cell.alignment = center_alignment
+            cell.border = thin_border
+        row += 1
+    
+    row += 2  # Empty rows before signatures
+    
+    # Signature section
+    # Signature of Faculty
+    ws.merge_cells(f'A{row}:C{row}')
+    cell = ws[f'A{row}']
+    cell.value = '________________________________'
+    cell.alignment = left_alignment
+    row += 1
+    
+    ws.merge_cells(f'A{row}:C{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'SIGNATURE OF FACULTY'
+    cell.font = bold_font
+    cell.alignment = left_alignment
+    row += 2
+    
+    # Signature of College Dean
+    ws.merge_cells(f'A{row}:C{row}')
+    cell = ws[f'A{row}']
+    cell.value = '________________________________'
+    cell.alignment = left_alignment
+    row += 1
+    
+    ws.merge_cells(f'A{row}:C{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'SIGNATURE OF COLLEGE DEAN'
+    cell.font = bold_font
+    cell.alignment = left_alignment
+    row += 2
+    
+    # Noted by section
+    ws.merge_cells(f'A{row}:C{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'NOTED BY:'
+    cell.font = bold_font
+    cell.alignment = left_alignment
+    row += 2
+    
+    ws.merge_cells(f'A{row}:C{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'MA. LIBERTY DG. PASCUAL, Ph.D.'
+    cell.font = bold_font
+    cell.alignment = left_alignment
+    row += 1
+    
+    ws.merge_cells(f'A{row}:C{row}')
+    cell = ws[f'A{row}']
+    cell.value = 'College President'
+    cell.font = normal_font
+    cell.alignment = left_alignment
+    row += 1
+    
+    # Column widths
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 50
+    ws.column_dimensions['C'].width = 8
+    ws.column_dimensions['D'].width = 8
+    ws.column_dimensions['E'].width = 8
+    ws.column_dimensions['F'].width = 8
+    ws.column_dimensions['G'].width = 8
+    ws.column_dimensions['H'].width = 12
+    ws.column_dimensions['I'].width = 20
+    
+    # Configure page setup for printing
+    ws.page_setup.orientation = ws.ORIENTATION_PORTRAIT
+    ws.page_setup.paperSize = ws.PAPERSIZE_LETTER
+    ws.page_setup.fitToPage = True
+    ws.page_setup.fitToHeight = 0  # Fit all rows on pages
+    ws.page_setup.fitToWidth = 1   # Fit to one page wide
+    
+    # Set print margins (in inches)
+    ws.page_margins.left = 0.5
+    ws.page_margins.right = 0.5
+    ws.page_margins.top = 0.75
+    ws.page_margins.bottom = 0.75
+    ws.page_margins.header = 0.3
+    ws.page_margins.footer = 0.3
+    
+    # Set print area (from A1 to last used cell)
+    ws.print_area = f'A1:I{row}'
+    
+    # Center on page when printing
+    ws.page_setup.horizontalCentered = True
+    
+    # Print gridlines for better readability
+    ws.print_options.gridLines = False
+    ws.print_options.headings = False
+    
+    # Scale to fit (80% scale for better readability)
+    ws.page_setup.scale = 85
+    ws.sheet_properties.pageSetUpPr.fitToPage = True
+    
+    # Print title rows (repeat header on each page if document spans multiple pages)
+    # This will repeat the first 6 rows (logo and headers) on each printed page
+    ws.print_title_rows = '1:6'
+    
+    # Set print quality
+    ws.page_setup.printQuality = 600
+    
+    wb.save(file_path)
+
+def render_evaluation_file(report, file_format, file_path):
+    """
+    Render a report in the given format (process pool entry point)
+
+    Args:
+        report (dict): As for render_evaluation_pdf()
+        file_format (str): 'pdf' or 'excel'
+        file_path (str): Destination file
+
+    Returns:
+        str: file_path
+    """
+    if file_format == 'excel':
+        render_evaluation_excel(report, file_path)
+    else:
+        render_evaluation_pdf(report, file_path)
+    return file_path
@@ -1,10 +1,267 @@
 """
 Expired Evaluations Management
 Handles automatic marking of evaluations as expired when time limits are exceeded
+
+Deadlines are stored rather than computed: starting a timer writes
+expires_at on the evaluation_timer_sessions row and on its evaluation, and
+both tables are indexed on (status, expires_at). A single sweeper expires
+due rows in bounded batches, so no page view ever has to write:
+    - evaluations whose timer deadline has passed
+    - timer sessions past their deadline whose evaluation was not submitted
+      (while the timer is enabled in timer_settings)
+    - incomplete evaluations of periods that have ended
+
+Submitting an evaluation closes its timer session as 'completed'
+(Evaluation.record_submission), so on-time submits are never counted as
+expired.
+
+Each web process runs a sweeper thread, but only the holder of the
+'evaluation_expiry' lease in scheduler_leases sweeps. To run it from cron
+or a separate process instead, set EXPIRY_SWEEPER_INPROCESS=False and use:
+    python -m utils.expired_evaluations --once
 """
 
+import os
+import socket
+import threading
+import time
+import uuid
 from datetime import datetime, timedelta
 from models.database import get_db_connection
+from models.faculty_scores import FacultyScores
+from utils.period_scheduler import acquire_lease, release_lease
+
+LEASE_NAME = 'evaluation_expiry'
+
+_sweeper_lock = threading.Lock()
+_sweeper_thread = None
+
+
+def _index_exists(cursor, table_name, index_name):
+    """Check information_schema for an index (compatible with older MySQL/MariaDB)"""
+    cursor.execute("""
+        SELECT COUNT(1)
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+        AND table_name = %s
+        AND index_name = %s
+    """, (table_name, index_name))
+    return cursor.fetchone()[0] > 0
+
+
+def _column_exists(cursor, table_name, column_name):
+    """Check information_schema for a column"""
+    cursor.execute("""
+        SELECT COUNT(1)
+        FROM information_schema.columns
+        WHERE table_schema = DATABASE()
+        AND table_name = %s
+        AND column_name = %s
+    """, (table_name, column_name))
+    return cursor.fetchone()[0] > 0
+
+
+def init_expiry_columns():
+    """
+    Add the expires_at deadline columns and indexes if they don't exist
+    
+    Existing timer sessions and open evaluations are backfilled from their
+    start time and time limit.
+    """
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            
+            if not _column_exists(cursor, 'evaluation_timer_sessions', 'expires_at'):
+                cursor.execute("ALTER TABLE evaluation_timer_sessions ADD COLUMN expires_at DATETIME NULL")
+            if not _index_exists(cursor, 'evaluation_timer_sessions', 'idx_timer_sessions_status_expires'):
+                cursor.execute(
+                    "CREATE INDEX idx_timer_sessions_status_expires "
+                    "ON evaluation_timer_sessions(status, expires_at)"
+                )
+            
+            if not _column_exists(cursor, 'evaluations', 'expires_at'):
+                cursor.execute("ALTER TABLE evaluations ADD COLUMN expires_at DATETIME NULL")
+            if not _index_exists(cursor, 'evaluations', 'idx_evaluations_status_expires'):
+                cursor.execute(
+                    "CREATE INDEX idx_evaluations_status_expires "
+                    "ON evaluations(status, expires_at)"
+                )
+            
+            cursor.execute("""
+                UPDATE evaluation_timer_sessions
+                SET expires_at = start_time + INTERVAL time_limit_minutes MINUTE
+                WHERE expires_at IS NULL
+            """)
+            cursor.execute("""
+                UPDATE evaluations e
+                JOIN (
+                    SELECT evaluation_id, MAX(expires_at) as expires_at
+                    FROM evaluation_timer_sessions
+                    GROUP BY evaluation_id
+                ) ets ON e.evaluation_id = ets.evaluation_id
+                SET e.expires_at = ets.expires_at
+                WHERE e.expires_at IS NULL
+                AND e.status IN ('Pending', 'In Progress')
+            """)
+            
+            conn.commit()
+            cursor.close()
+            print("✅ Evaluation expiry columns initialized successfully")
+        except Exception as e:
+            print(f"Error initializing evaluation expiry columns: {e}")
+        finally:
+            conn.close()
+
+
+def set_timer_deadline(cursor, session_id):
+    """
+    Copy a new timer session's deadline onto its evaluation (caller commits)
+    
+    Args:
+        cursor: Cursor on the connection that created the session
+        session_id (int): Timer session just inserted with its expires_at
+    """
+    cursor.execute("""
+        UPDATE evaluations e
+        JOIN evaluation_timer_sessions ets ON e.evaluation_id = ets.evaluation_id
+        SET e.expires_at = ets.expires_at
+        WHERE ets.session_id = %s
+    """, (session_id,))
+
+
+def _expire_in_batches(conn, cursor, query, params, batch_size):
+    """
+    Run a LIMITed UPDATE until it affects fewer rows than the batch size
+    
+    Each batch is committed on its own so row locks are held briefly.
+    
+    Args:
+        conn: Connection to commit on
+        cursor: Cursor on conn
+        query (str): UPDATE ending in "LIMIT %s"
+        params (tuple): Parameters before the LIMIT
+        batch_size (int): Rows per batch
+    
+    Returns:
+        int: Total rows updated
+    """
+    total = 0
+    while True:
+        cursor.execute(query, tuple(params) + (batch_size,))
+        updated = cursor.rowcount
+        conn.commit()
+        total += updated
+        if updated < batch_size:
+            return total
+
+
+def sweep_expired_evaluations(batch_size=500):
+    """
+    Expire evaluations whose timer deadline or period end has passed
+    
+    Args:
+        batch_size (int): Rows updated per statement/commit
+    
+    Returns:
+        dict: timer_expired, period_expired and sessions_expired counts,
+              or None on failure
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+    
+    try:
+        cursor = conn.cursor(dictionary=True)
+        
+        # Range scan on idx_evaluations_status_expires
+        timer_expired = _expire_in_batches(conn, cursor, """
+            UPDATE evaluations
+            SET status = 'Expired', updated_at = NOW()
+            WHERE status IN ('Pending', 'In Progress')
+            AND expires_at <= NOW()
+            AND completion_time IS NULL
+            ORDER BY expires_at
+            LIMIT %s
+        """, (), batch_size)
+        
+        # Sessions left active by submits made before Evaluation.record_submission
+        # closed them are completed, not expired
+        _expire_in_batches(conn, cursor, """
+            UPDATE evaluation_timer_sessions
+            SET status = 'completed',
+                end_time = (
+                    SELECT e.completion_time FROM evaluations e
+                    WHERE e.evaluation_id = evaluation_timer_sessions.evaluation_id
+                )
+            WHERE status = 'active'
+            AND expires_at <= NOW()
+            AND EXISTS (
+                SELECT 1 FROM evaluations e
+                WHERE e.evaluation_id = evaluation_timer_sessions.evaluation_id
+                AND e.status = 'Completed'
+            )
+            ORDER BY expires_at
+            LIMIT %s
+        """, (), batch_size)
+        
+        # Timer sessions only time out while the timer is enabled
+        cursor.execute("SELECT enabled FROM timer_settings WHERE setting_id = 1")
+        timer_settings = cursor.fetchone()
+        
+        sessions_expired = 0
+        if timer_settings and timer_settings['enabled']:
+            sessions_expired = _expire_in_batches(conn, cursor, """
+                UPDATE evaluation_timer_sessions
+                SET status = 'expired', end_time = COALESCE(end_time, expires_at)
+                WHERE status = 'active'
+                AND expires_at <= NOW()
+                AND NOT EXISTS (
+                    SELECT 1 FROM evaluations e
+                    WHERE e.evaluation_id = evaluation_timer_sessions.evaluation_id
+                    AND e.status = 'Completed'
+                )
+                ORDER BY expires_at
+                LIMIT %s
+            """, (), batch_size)
+        
+        # Ended periods are few; each is swept through the period_id prefix
+        # of period_section_student_UNIQUE
+        cursor.execute("""
+            SELECT period_id
+            FROM evaluation_periods
+            WHERE end_date < CURDATE()
+        """)
+        ended_periods = [row['period_id'] for row in cursor.fetchall()]
+        
+        period_expired = 0
+        for period_id in ended_periods:
+            period_expired += _expire_in_batches(conn, cursor, """
+                UPDATE evaluations
+                SET status = 'Expired', updated_at = NOW()
+                WHERE period_id = %s
+                AND status IN ('Pending', 'In Progress')
+                AND completion_time IS NULL
+                LIMIT %s
+            """, (period_id,), batch_size)
+        
+        cursor.close()
+        
+        if timer_expired or period_expired:
+            print(f"⏰ Expired {timer_expired} timed-out and {period_expired} "
+                  f"ended-period evaluation(s)")
+        return {
+            'timer_expired': timer_expired,
+            'period_expired': period_expired,
+            'sessions_expired': sessions_expired
+        }
+    except Exception as e:
+        print(f"Error sweeping expired evaluations: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
 
 
 def mark_expired_evaluations():
@@ -16,50 +273,16 @@ def mark_expired_evaluations():
     Returns:
         dict: Summary of expired evaluations marked
     """
+    result = sweep_expired_evaluations()
+    if result is None:
+        return {'success': False, 'error': 'Failed to sweep expired evaluations'}
+    
     conn = get_db_connection()
     if not conn:
         return {'success': False, 'error': 'Database connection failed'}
     
     try:
         cursor = conn.cursor(dictionary=True)
-        expired_count = 0
-        
-        # Get timer settings
-        cursor.execute("SELECT enabled, time_limit FROM evaluation_timer_settings LIMIT 1")
-        timer_settings = cursor.fetchone()
-        
-        if timer_settings and timer_settings['enabled']:
-            time_limit = timer_settings['time_limit']
-            
-            # Mark evaluations as Expired if timer exceeded
-            query_timer_expired = """
-                UPDATE evaluations e
-                LEFT JOIN evaluation_timer_sessions ets ON e.evaluation_id = ets.evaluation_id
-                SET e.status = 'Expired'
-                WHERE e.status IN ('Pending', 'In Progress')
-                  AND e.start_time IS NOT NULL
-                  AND e.completion_time IS NULL
-                  AND TIMESTAMPDIFF(MINUTE, e.start_time, NOW()) > %s
-            """
-            cursor.execute(query_timer_expired, (time_limit,))
-            timer_expired = cursor.rowcount
-            expired_count += timer_expired
-            
-        # Mark evaluations as Expired if evaluation period has ended
-        query_period_expired = """
-            UPDATE evaluations e
-            JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            SET e.status = 'Expired'
-            WHERE e.status IN ('Pending', 'In Progress')
-              AND ep.end_date < CURDATE()
-              AND e.completion_time IS NULL
-              AND e.status != 'Expired'
-        """
-        cursor.execute(query_period_expired)
-        period_expired = cursor.rowcount
-        expired_count += period_expired
-        
-        conn.commit()
         
         # Get detailed breakdown
         cursor.execute("""
@@ -76,18 +299,18 @@ def mark_expired_evaluations():
         
         cursor.close()
         
+        expired_count = result['timer_expired'] + result['period_expired']
         return {
             'success': True,
             'expired_count': expired_count,
-            'timer_expired': timer_expired if timer_settings and timer_settings['enabled'] else 0,
-            'period_expired': period_expired,
+            'timer_expired': result['timer_expired'],
+            'period_expired': result['period_expired'],
             'breakdown': breakdown,
             'message': f'Marked {expired_count} evaluation(s) as expired'
         }
         
     except Exception as e:
         print(f"Error marking expired evaluations: {e}")
-        conn.rollback()
         return {'success': False, 'error': str(e)}
     finally:
         conn.close()
@@ -152,7 +375,7 @@ def get_expired_evaluations(period_id=None, student_id=None):
             LEFT JOIN faculty f ON cs.faculty_id = f.faculty_id
             LEFT JOIN subjects sub ON cs.subject_id = sub.subject_id
             LEFT JOIN evaluation_periods ep ON e.period_id = ep.period_id
-            LEFT JOIN evaluation_timer_settings ts ON 1=1
+            LEFT JOIN timer_settings ts ON ts.setting_id = 1
             WHERE {where_clause}
             ORDER BY e.start_time DESC
         """
@@ -208,11 +431,15 @@ def reset_expired_evaluation(evaluation_id):
                 'error': 'Evaluation not found or not in Expired status'
             }
         
+        # Every reset path retracts before deleting responses (no-op for Expired)
+        FacultyScores.retract_evaluation(cursor, evaluation_id)
+        
         # Reset evaluation to Pending and clear start_time
         cursor.execute("""
             UPDATE evaluations
             SET status = 'Pending',
                 start_time = NULL,
+                expires_at = NULL,
                 updated_at = NOW()
             WHERE evaluation_id = %s
         """, (evaluation_id,))
@@ -275,11 +502,14 @@ def reset_multiple_expired_evaluations(evaluation_ids):
                 """, (eval_id,))
                 
                 if cursor.fetchone():
+                    FacultyScores.retract_evaluation(cursor, eval_id)
+                    
                     # Reset evaluation
                     cursor.execute("""
                         UPDATE evaluations
                         SET status = 'Pending',
                             start_time = NULL,
+                            expires_at = NULL,
                             updated_at = NOW()
                         WHERE evaluation_id = %s
                     """, (eval_id,))
@@ -396,3 +626,98 @@ def get_expired_evaluations_summary(period_id=None):
         return {'success': False, 'error': str(e)}
     finally:
         conn.close()
+
+
+class ExpirySweeper:
+    """
+    Periodically expires due evaluations while holding the sweeper lease
+    
+    Args:
+        app: Flask application (for config and app contexts)
+        interval (int): Seconds between sweeps
+        batch_size (int): Rows updated per statement/commit
+    """
+    
+    def __init__(self, app, interval=None, batch_size=None):
+        self.app = app
+        self.interval = interval or app.config.get('EXPIRY_SWEEP_INTERVAL_SECONDS', 60)
+        self.batch_size = batch_size or app.config.get('EXPIRY_SWEEP_BATCH_SIZE', 500)
+        self.sweeper_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    
+    def run_once(self):
+        """
+        Sweep if this sweeper holds the lease
+        
+        Returns:
+            dict: Sweep counts, or None if not the leader or on failure
+        """
+        with self.app.app_context():
+            if not acquire_lease(LEASE_NAME, self.sweeper_id, self.interval * 3):
+                return None
+            return sweep_expired_evaluations(self.batch_size)
+    
+    def run(self, once=False):
+        """
+        Sweep every interval until stopped
+        
+        Args:
+            once (bool): Sweep a single time, release the lease and return
+        """
+        while True:
+            self.run_once()
+            if once:
+                with self.app.app_context():
+                    release_lease(LEASE_NAME, self.sweeper_id)
+                return
+            time.sleep(self.interval)
+
+
+def ensure_expiry_sweeper(app):
+    """
+    Start the in-process sweeper thread, if not running
+    
+    Disabled when EXPIRY_SWEEPER_INPROCESS is False (i.e. cron or a
+    standalone sweeper is used instead).
+    
+    Args:
+        app: Flask application
+    """
+    global _sweeper_thread
+    if _sweeper_thread is not None and _sweeper_thread.is_alive():
+        return
+    if not app.config.get('EXPIRY_SWEEPER_INPROCESS', True):
+        return
+    
+    with _sweeper_lock:
+        if _sweeper_thread is not None and _sweeper_thread.is_alive():
+            return
+        sweeper = ExpirySweeper(app)
+        _sweeper_thread = threading.Thread(target=sweeper.run, daemon=True)
+        _sweeper_thread.start()
+
+
+def main():
+    """Standalone sweeper / cron entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='IntellEvalPro evaluation expiry sweeper')
+    parser.add_argument('--once', action='store_true', help='Sweep once and exit')
+    parser.add_argument('--interval', type=int, default=None, help='Seconds between sweeps')
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args()
+    
+    from app import app
+    
+    with app.app_context():
+        init_expiry_columns()
+    
+    sweeper = ExpirySweeper(app, interval=args.interval, batch_size=args.batch_size)
+    print(f"🚀 Expiry sweeper {sweeper.sweeper_id} started")
+    try:
+        sweeper.run(once=args.once)
+    except KeyboardInterrupt:
+        print("Expiry sweeper stopped")
+
+
+if __name__ == '__main__':
+    main()
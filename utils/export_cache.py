@@ -0,0 +1,132 @@
+"""
+Evaluation export cache for IntellEvalPro
+Keeps rendered per-faculty PDF/Excel exports on disk and reuses them while their data is unchanged
+
+An export is identified by everything it is built from: the export kind,
+faculty, period, subject, section, academic year, signature positions,
+the faculty's results version (bumped whenever one of their evaluations is
+completed or retracted, see FacultyScores.results_version) and the
+questionnaire version. The SHA-256 of those parts names the cached file:
+    <EXPORT_CACHE_DIR>/<key[:2]>/<key>.<ext>
+so a changed input simply produces a new key, and stale files are never
+served. Files not used for EXPORT_CACHE_MAX_AGE_DAYS are removed by the
+report artifact collector (see utils/report_artifacts.py).
+
+Results of a closed period no longer change, so their exports are also
+sent with a private max-age and the key as ETag.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+TEMP_PREFIX = '.export-'
+
+
+def export_cache_key(kind, **parts):
+    """
+    Build the cache key of an export
+
+    Args:
+        kind (str): Export kind, e.g. 'evaluation_pdf'
+        **parts: Every input the export is built from (JSON-serializable)
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    payload = json.dumps({'kind': kind, **parts}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _export_path(cache_dir, key, extension):
+    """Path of a cached export"""
+    return os.path.join(cache_dir, key[:2], f"{key}.{extension}")
+
+
+def cached_export(cache_dir, key, extension):
+    """
+    Get a previously rendered export
+
+    Args:
+        cache_dir (str): EXPORT_CACHE_DIR
+        key (str): From export_cache_key()
+        extension (str): File extension
+
+    Returns:
+        str: Path of the cached file, or None if it was never rendered
+    """
+    file_path = _export_path(cache_dir, key, extension)
+    if not os.path.exists(file_path):
+        return None
+
+    # Record the use so collect_export_cache() keeps files in demand
+    try:
+        os.utime(file_path, None)
+    except OSError:
+        pass
+    return file_path
+
+
+def export_temp_path(cache_dir, extension):
+    """
+    Create a temporary file to render an export into
+
+    Args:
+        cache_dir (str): EXPORT_CACHE_DIR (same filesystem, so storing is a rename)
+        extension (str): File extension
+
+    Returns:
+        str: Path of the empty temporary file
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, suffix=f".{extension}", dir=cache_dir)
+    os.close(fd)
+    return temp_path
+
+
+def store_export(cache_dir, key, extension, temp_path):
+    """
+    Move a rendered export into the cache
+
+    Args:
+        cache_dir (str): EXPORT_CACHE_DIR
+        key (str): From export_cache_key()
+        extension (str): File extension
+        temp_path (str): File from export_temp_path(), fully written
+
+    Returns:
+        str: Path of the cached file
+    """
+    file_path = _export_path(cache_dir, key, extension)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    os.replace(temp_path, file_path)
+    return file_path
+
+
+def collect_export_cache(cache_dir, max_age_days):
+    """
+    Remove cached exports (and abandoned temporary files) not used recently
+
+    Args:
+        cache_dir (str): EXPORT_CACHE_DIR
+        max_age_days (int): Days since last use after which a file goes
+
+    Returns:
+        int: Number of files removed
+    """
+    if not max_age_days or not os.path.isdir(cache_dir):
+        return 0
+
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError as e:
+                print(f"Error removing cached export {path}: {e}")
+    return removed
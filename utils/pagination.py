@@ -0,0 +1,85 @@
+"""
+Pagination helpers for IntellEvalPro
+Reads page, limit and sort arguments of server-side paginated list endpoints
+"""
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def is_paginated(args):
+    """
+    Check whether a list request asked for a single page
+
+    List endpoints without page/limit keep returning the whole list for
+    older callers (dropdowns, archives).
+
+    Args:
+        args: Mapping such as request.args
+
+    Returns:
+        bool: True if page or limit was given
+    """
+    return 'page' in args or 'limit' in args
+
+
+def parse_page_args(args, sort_columns, default_sort):
+    """
+    Read page, limit, sort and order arguments
+
+    Args:
+        args: Mapping such as request.args
+        sort_columns (dict): Allowed sort keys mapped to ORDER BY expressions
+        default_sort (str): Sort key used when none (or an unknown one) is given
+
+    Returns:
+        dict: page, limit, offset, sort, order and order_by (SQL for ORDER BY)
+
+    Raises:
+        ValueError: If page or limit is not a number
+    """
+    page = max(1, int(args.get('page') or 1))
+    limit = max(1, min(int(args.get('limit') or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+
+    sort = args.get('sort')
+    if sort not in sort_columns:
+        sort = default_sort
+    order = 'desc' if (args.get('order') or '').lower() == 'desc' else 'asc'
+
+    # Every expression gets the direction, e.g. "last_name, first_name" -> both DESC
+    order_by = ', '.join(
+        f"{expression.strip()} {order.upper()}"
+        for expression in sort_columns[sort].split(',')
+    )
+
+    return {
+        'page': page,
+        'limit': limit,
+        'offset': (page - 1) * limit,
+        'sort': sort,
+        'order': order,
+        'order_by': order_by
+    }
+
+
+def page_info(paging, total):
+    """
+    Build the pagination block of a list response
+
+    Args:
+        paging (dict): From parse_page_args()
+        total (int): Number of rows matching the filters, or None if not counted
+
+    Returns:
+        dict: page, limit, sort, order and, when counted, total and total_pages
+    """
+    info = {
+        'page': paging['page'],
+        'limit': paging['limit'],
+        'sort': paging['sort'],
+        'order': paging['order']
+    }
+    if total is not None:
+        info['total'] = total
+        info['total_pages'] = (total + paging['limit'] - 1) // paging['limit']
+    return info
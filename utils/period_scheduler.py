@@ -0,0 +1,365 @@
+"""
+Evaluation period lifecycle scheduler for IntellEvalPro
+Moves evaluation periods between Pending, Active and Closed as their dates pass
+
+Period status used to be recomputed by table-wide UPDATEs (plus an
+enrollment sync) on every admin/guidance page load. Status only depends on
+the current date and the period's own dates, so it now changes in two places:
+    - this scheduler, shortly after midnight (and on a safety interval)
+    - the period create/update endpoints, for the period they just wrote
+
+A period becoming Active gets its missing evaluations created in the same
+transaction. Every transition is recorded in period_transitions. Each run
+also creates the evaluations of students enrolled after their period became
+Active (enrollment endpoints do this too; the run catches any other writer).
+
+Each web process runs a scheduler thread, but only the holder of the
+'period_lifecycle' lease in scheduler_leases acts, so one deployment
+performs each transition once. To run it from cron or a separate process
+instead, set PERIOD_SCHEDULER_INPROCESS=False and use:
+    python -m utils.period_scheduler --once    # apply due transitions, then exit
+    python -m utils.period_scheduler           # keep running
+"""
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from models.database import get_db_connection
+from models.evaluation import Evaluation
+from models.academic_calendar import AcademicCalendar
+
+LEASE_NAME = 'period_lifecycle'
+
+# Seconds after midnight to wait so the database date has rolled over too
+MIDNIGHT_GRACE_SECONDS = 5
+
+_scheduler_lock = threading.Lock()
+_scheduler_thread = None
+
+
+def init_period_scheduler_tables():
+    """Initialize scheduler_leases and period_transitions tables if they don't exist"""
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scheduler_leases (
+                    name VARCHAR(64) PRIMARY KEY,
+                    holder VARCHAR(128) NOT NULL,
+                    expires_at DATETIME NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS period_transitions (
+                    transition_id INT AUTO_INCREMENT PRIMARY KEY,
+                    period_id INT NOT NULL,
+                    from_status VARCHAR(20) NOT NULL,
+                    to_status VARCHAR(20) NOT NULL,
+                    evaluations_created INT NOT NULL DEFAULT 0,
+                    triggered_by VARCHAR(128) NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    INDEX idx_period_transitions_period (period_id, created_at)
+                )
+            """)
+            conn.commit()
+            cursor.close()
+            print("✅ Period scheduler tables initialized successfully")
+        except Exception as e:
+            print(f"Error initializing period scheduler tables: {e}")
+        finally:
+            conn.close()
+
+
+def acquire_lease(name, holder, seconds):
+    """
+    Take or renew a named lease in scheduler_leases
+
+    The lease is granted if it is free, expired or already held by holder,
+    so exactly one holder at a time gets True.
+
+    Args:
+        name (str): Lease name (one per kind of background job)
+        holder (str): Unique id of the caller
+        seconds (int): How long the lease lasts unless renewed
+
+    Returns:
+        bool: True if holder now holds the lease
+    """
+    conn = get_db_connection()
+    if not conn:
+        return False
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT IGNORE INTO scheduler_leases (name, holder, expires_at)
+            VALUES (%s, %s, NOW() - INTERVAL 1 SECOND)
+        """, (name, holder))
+        cursor.execute("""
+            UPDATE scheduler_leases
+            SET holder = %s, expires_at = NOW() + INTERVAL %s SECOND
+            WHERE name = %s AND (holder = %s OR expires_at < NOW())
+        """, (holder, seconds, name, holder))
+        cursor.execute("SELECT holder FROM scheduler_leases WHERE name = %s", (name,))
+        row = cursor.fetchone()
+        conn.commit()
+        cursor.close()
+        return bool(row) and row[0] == holder
+    except Exception as e:
+        print(f"Error acquiring {name} lease: {e}")
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+
+def release_lease(name, holder):
+    """
+    Give up a named lease if holder still has it
+
+    Args:
+        name (str): Lease name
+        holder (str): Id the lease was acquired with
+    """
+    conn = get_db_connection()
+    if not conn:
+        return
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE scheduler_leases
+            SET expires_at = NOW() - INTERVAL 1 SECOND
+            WHERE name = %s AND holder = %s
+        """, (name, holder))
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"Error releasing {name} lease: {e}")
+    finally:
+        conn.close()
+
+
+def apply_period_transitions(cursor, triggered_by, period_id=None):
+    """
+    Move periods whose dates call for another status (caller commits)
+
+    Canceled periods are never touched.
+
+    Args:
+        cursor: Dictionary cursor on the connection that owns the transaction
+        triggered_by (str): Scheduler id or user that caused the run (recorded)
+        period_id (int, optional): Only consider this period
+
+    Returns:
+        list: Dicts with period_id, title, from_status, to_status and
+              evaluations_created for each transition made
+    """
+    query = """
+        SELECT period_id, title, status,
+               CASE
+                   WHEN CURDATE() < start_date THEN 'Pending'
+                   WHEN CURDATE() > end_date THEN 'Closed'
+                   ELSE 'Active'
+               END as target_status
+        FROM evaluation_periods
+        WHERE status != 'Canceled'
+    """
+    params = []
+    if period_id:
+        query += " AND period_id = %s"
+        params.append(period_id)
+    query += " HAVING target_status != status"
+    cursor.execute(query, tuple(params))
+    due = cursor.fetchall()
+
+    transitions = []
+    for period in due:
+        # Guarded on the old status so concurrent runs cannot apply it twice
+        cursor.execute("""
+            UPDATE evaluation_periods
+            SET status = %s, updated_at = NOW()
+            WHERE period_id = %s AND status = %s
+        """, (period['target_status'], period['period_id'], period['status']))
+        if cursor.rowcount == 0:
+            continue
+
+        evaluations_created = 0
+        if period['target_status'] == 'Active':
+            evaluations_created = Evaluation.create_for_period(cursor, period['period_id'])
+
+        cursor.execute("""
+            INSERT INTO period_transitions
+                (period_id, from_status, to_status, evaluations_created, triggered_by)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (period['period_id'], period['status'], period['target_status'],
+              evaluations_created, triggered_by))
+
+        transitions.append({
+            'period_id': period['period_id'],
+            'title': period['title'],
+            'from_status': period['status'],
+            'to_status': period['target_status'],
+            'evaluations_created': evaluations_created
+        })
+
+    if transitions:
+        AcademicCalendar.invalidate(cursor)
+    return transitions
+
+
+def run_period_lifecycle(triggered_by, period_id=None):
+    """
+    Apply due period transitions in their own transaction
+
+    Afterwards missing evaluations are created for every Active period, so
+    students enrolled mid-period are picked up on the next run.
+
+    Args:
+        triggered_by (str): Scheduler id or user that caused the run (recorded)
+        period_id (int, optional): Only consider this period
+
+    Returns:
+        list: Transitions made (see apply_period_transitions), or None on failure
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+
+    try:
+        cursor = conn.cursor(dictionary=True)
+        transitions = apply_period_transitions(cursor, triggered_by, period_id)
+        evaluations_synced = Evaluation.create_for_active_periods(cursor)
+        conn.commit()
+        cursor.close()
+
+        for transition in transitions:
+            print(f"✅ Period {transition['period_id']} ({transition['title']}): "
+                  f"{transition['from_status']} → {transition['to_status']}"
+                  + (f", {transition['evaluations_created']} evaluation(s) created"
+                     if transition['to_status'] == 'Active' else ""))
+        if evaluations_synced:
+            print(f"✅ {evaluations_synced} evaluation(s) created for new enrollments in Active periods")
+        return transitions
+    except Exception as e:
+        print(f"Error applying period transitions: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+
+class PeriodScheduler:
+    """
+    Runs period transitions after each midnight while holding the lease
+
+    Args:
+        app: Flask application (for config and app contexts)
+        interval (int): Max seconds between runs (also bounds lease failover)
+    """
+
+    def __init__(self, app, interval=None):
+        self.app = app
+        self.interval = interval or app.config.get('PERIOD_SCHEDULER_INTERVAL_SECONDS', 3600)
+        self.scheduler_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def acquire_lease(self):
+        """
+        Take or renew the scheduler lease
+
+        Returns:
+            bool: True if this scheduler holds the lease
+        """
+        return acquire_lease(LEASE_NAME, self.scheduler_id, self.interval * 2)
+
+    def release_lease(self):
+        """Give up the lease so the next run (e.g. from cron) can take it at once"""
+        release_lease(LEASE_NAME, self.scheduler_id)
+
+    def seconds_until_next_run(self):
+        """Seconds until just after the next midnight, capped at the interval"""
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        wait = (next_midnight - now).total_seconds() + MIDNIGHT_GRACE_SECONDS
+        return min(wait, self.interval)
+
+    def run_once(self):
+        """
+        Apply due transitions if this scheduler holds the lease
+
+        Returns:
+            list: Transitions made, or None if not the leader or on failure
+        """
+        with self.app.app_context():
+            if not self.acquire_lease():
+                return None
+            return run_period_lifecycle(self.scheduler_id)
+
+    def run(self, once=False):
+        """
+        Run now, then after every midnight (or interval) until stopped
+
+        Args:
+            once (bool): Run a single time, release the lease and return
+        """
+        while True:
+            self.run_once()
+            if once:
+                with self.app.app_context():
+                    self.release_lease()
+                return
+            time.sleep(self.seconds_until_next_run())
+
+
+def ensure_period_scheduler(app):
+    """
+    Start the in-process scheduler thread, if not running
+
+    Disabled when PERIOD_SCHEDULER_INPROCESS is False (i.e. cron or a
+    standalone scheduler is used instead).
+
+    Args:
+        app: Flask application
+    """
+    global _scheduler_thread
+    if _scheduler_thread is not None and _scheduler_thread.is_alive():
+        return
+    if not app.config.get('PERIOD_SCHEDULER_INPROCESS', True):
+        return
+
+    with _scheduler_lock:
+        if _scheduler_thread is not None and _scheduler_thread.is_alive():
+            return
+        scheduler = PeriodScheduler(app)
+        _scheduler_thread = threading.Thread(target=scheduler.run, daemon=True)
+        _scheduler_thread.start()
+
+
+def main():
+    """Standalone scheduler / cron entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='IntellEvalPro evaluation period scheduler')
+    parser.add_argument('--once', action='store_true', help='Apply due transitions and exit')
+    parser.add_argument('--interval', type=int, default=None, help='Max seconds between runs')
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        init_period_scheduler_tables()
+
+    scheduler = PeriodScheduler(app, interval=args.interval)
+    print(f"🚀 Period scheduler {scheduler.scheduler_id} started")
+    try:
+        scheduler.run(once=args.once)
+    except KeyboardInterrupt:
+        print("Period scheduler stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,590 @@
+"""
+Generated report artifacts for IntellEvalPro
+Renders guidance reports once in the background and serves them from disk
+
+Requesting a report only inserts a 'queued' generated_reports row. A
+render worker claims queued rows, renders each one to a temporary file and
+stores it content-addressed under REPORT_ARTIFACT_DIR:
+    <REPORT_ARTIFACT_DIR>/<sha256[:2]>/<sha256>.<ext>
+The row then records status 'ready', the real file_size, file_path and
+content_hash, and every download is sent straight from that file.
+
+Report status:
+    queued     - waiting for a render worker
+    rendering  - claimed by a worker (reclaimed if the worker dies)
+    ready      - artifact on disk
+    failed     - rendering raised (render_error); a download queues it again
+    expired    - artifact removed by the retention policy; a download queues it again
+
+Retention (leased, so one process collects at a time): artifacts rendered
+more than REPORT_RETENTION_DAYS ago are expired, and files no row refers
+to any more (deleted or expired reports, abandoned temporary files,
+pre-artifact copies in static/reports) are deleted. Rows sharing an
+identical artifact share its file, so a file is only removed once no row
+has its hash. The same collector prunes the export cache
+(utils/export_cache.py) and old bulk export ZIPs (utils/bulk_exports.py).
+
+Standalone worker:
+    python -m utils.report_artifacts            # render and collect until interrupted
+    python -m utils.report_artifacts --once     # render what is queued, collect, then exit
+"""
+import hashlib
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+
+from models.database import get_db_connection
+from utils.period_scheduler import acquire_lease, release_lease
+from utils.export_cache import collect_export_cache
+from utils.bulk_exports import collect_bulk_exports
+from utils.ai_client import collect_insight_jobs
+from utils.report_renderers import EXTENSIONS, render_report_file
+
+LEASE_NAME = 'report_artifact_gc'
+
+# Rows stuck in 'rendering' longer than this are assumed orphaned by a dead worker
+RENDER_TIMEOUT_SECONDS = 900
+
+# Unreferenced files younger than this may belong to a render in progress
+ORPHAN_GRACE_SECONDS = 3600
+
+# Where downloads used to be re-rendered into (public, never recorded)
+LEGACY_REPORTS_DIR = os.path.join('static', 'reports')
+
+TEMP_PREFIX = '.render-'
+
+_renderer_lock = threading.Lock()
+_renderer_thread = None
+_collector_lock = threading.Lock()
+_collector_thread = None
+
+
+def _index_exists(cursor, table_name, index_name):
+    """Check information_schema for an index (compatible with older MySQL/MariaDB)"""
+    cursor.execute("""
+        SELECT COUNT(1)
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+        AND table_name = %s
+        AND index_name = %s
+    """, (table_name, index_name))
+    return cursor.fetchone()[0] > 0
+
+
+def _column_exists(cursor, table_name, column_name):
+    """Check information_schema for a column"""
+    cursor.execute("""
+        SELECT COUNT(1)
+        FROM information_schema.columns
+        WHERE table_schema = DATABASE()
+        AND table_name = %s
+        AND column_name = %s
+    """, (table_name, column_name))
+    return cursor.fetchone()[0] > 0
+
+
+def init_report_artifact_columns():
+    """
+    Add the artifact status columns to generated_reports if they don't exist
+
+    Reports created before artifacts were stored have no file, so they
+    start out 'expired' and are rendered on their next download.
+    """
+    conn = get_db_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+
+            if not _column_exists(cursor, 'generated_reports', 'status'):
+                cursor.execute("""
+                    ALTER TABLE generated_reports
+                    ADD COLUMN status ENUM('queued', 'rendering', 'ready', 'failed', 'expired')
+                        NOT NULL DEFAULT 'queued' AFTER file_format
+                """)
+                cursor.execute("UPDATE generated_reports SET status = 'expired', file_path = NULL")
+            if not _column_exists(cursor, 'generated_reports', 'content_hash'):
+                cursor.execute("ALTER TABLE generated_reports ADD COLUMN content_hash CHAR(64) NULL AFTER file_size")
+            if not _column_exists(cursor, 'generated_reports', 'render_error'):
+                cursor.execute("ALTER TABLE generated_reports ADD COLUMN render_error VARCHAR(500) NULL AFTER content_hash")
+            if not _column_exists(cursor, 'generated_reports', 'rendered_at'):
+                cursor.execute("ALTER TABLE generated_reports ADD COLUMN rendered_at DATETIME NULL AFTER render_error")
+            if not _column_exists(cursor, 'generated_reports', 'locked_by'):
+                cursor.execute("ALTER TABLE generated_reports ADD COLUMN locked_by VARCHAR(128) NULL AFTER rendered_at")
+            if not _column_exists(cursor, 'generated_reports', 'locked_at'):
+                cursor.execute("ALTER TABLE generated_reports ADD COLUMN locked_at DATETIME NULL AFTER locked_by")
+
+            if not _index_exists(cursor, 'generated_reports', 'idx_reports_status_rendered'):
+                cursor.execute(
+                    "CREATE INDEX idx_reports_status_rendered ON generated_reports(status, rendered_at)"
+                )
+            if not _index_exists(cursor, 'generated_reports', 'idx_reports_content_hash'):
+                cursor.execute("CREATE INDEX idx_reports_content_hash ON generated_reports(content_hash)")
+
+            conn.commit()
+            cursor.close()
+            print("✅ Report artifact columns initialized successfully")
+        except Exception as e:
+            print(f"Error initializing report artifact columns: {e}")
+        finally:
+            conn.close()
+
+
+def artifact_path(artifact_dir, content_hash, file_format):
+    """
+    Path of the artifact with a given content hash
+
+    Args:
+        artifact_dir (str): REPORT_ARTIFACT_DIR
+        content_hash (str): SHA-256 hex digest of the file
+        file_format (str): generated_reports.file_format
+
+    Returns:
+        str: <artifact_dir>/<hash[:2]>/<hash>.<ext>
+    """
+    extension = EXTENSIONS.get(file_format, file_format)
+    return os.path.join(artifact_dir, content_hash[:2], f"{content_hash}.{extension}")
+
+
+def store_report_artifact(report, artifact_dir):
+    """
+    Render a report and store it under its content hash
+
+    The file is rendered next to its final location and moved into place
+    atomically, so readers never see a partial artifact. If an identical
+    artifact already exists it is reused.
+
+    Args:
+        report (dict): generated_reports row
+        artifact_dir (str): REPORT_ARTIFACT_DIR
+
+    Returns:
+        tuple: (content_hash, file_path, file_size)
+    """
+    os.makedirs(artifact_dir, exist_ok=True)
+    extension = EXTENSIONS.get(report['file_format'], report['file_format'])
+    fd, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, suffix=f".{extension}", dir=artifact_dir)
+    os.close(fd)
+
+    try:
+        render_report_file(report, temp_path)
+
+        digest = hashlib.sha256()
+        with open(temp_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+        file_path = artifact_path(artifact_dir, content_hash, report['file_format'])
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        if os.path.exists(file_path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, file_path)
+        return content_hash, file_path, os.path.getsize(file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def queue_report_render(cursor, report_id):
+    """
+    Put a report back in the render queue (caller commits)
+
+    Used when a download finds a failed, expired or missing artifact.
+
+    Args:
+        cursor: Cursor on the connection that owns the transaction
+        report_id (int): Report ID
+
+    Returns:
+        bool: True if the report was queued (False if already queued/rendering)
+    """
+    cursor.execute("""
+        UPDATE generated_reports
+        SET status = 'queued', file_path = NULL, content_hash = NULL,
+            render_error = NULL, locked_by = NULL, locked_at = NULL
+        WHERE report_id = %s AND status NOT IN ('queued', 'rendering')
+    """, (report_id,))
+    return cursor.rowcount > 0
+
+
+def remove_unreferenced_artifact(cursor, content_hash, file_path):
+    """
+    Delete an artifact file once no report refers to its hash
+
+    Call after deleting or expiring the row that used it.
+
+    Args:
+        cursor: Cursor (sees the caller's uncommitted changes)
+        content_hash (str): Hash of the artifact, may be None
+        file_path (str): Artifact path, may be None
+
+    Returns:
+        bool: True if a file was removed
+    """
+    if not content_hash or not file_path:
+        return False
+
+    cursor.execute(
+        "SELECT COUNT(*) as total FROM generated_reports WHERE content_hash = %s",
+        (content_hash,)
+    )
+    row = cursor.fetchone()
+    references = row['total'] if isinstance(row, dict) else row[0]
+    if references or not os.path.exists(file_path):
+        return False
+
+    try:
+        os.remove(file_path)
+        return True
+    except OSError as e:
+        print(f"Error removing report artifact {file_path}: {e}")
+        return False
+
+
+class ReportRenderWorker:
+    """
+    Renders queued reports one at a time
+
+    Args:
+        app: Flask application (for config and app contexts)
+        artifact_dir (str): Where artifacts are stored
+    """
+
+    def __init__(self, app, artifact_dir=None):
+        self.app = app
+        self.artifact_dir = os.path.abspath(artifact_dir or app.config.get(
+            'REPORT_ARTIFACT_DIR', os.path.join('storage', 'reports')
+        ))
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def claim_report(self):
+        """
+        Atomically claim the oldest queued report for this worker
+
+        Returns:
+            dict: Claimed generated_reports row, or None if nothing is queued
+        """
+        conn = get_db_connection()
+        if not conn:
+            return None
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+
+            # Release rows orphaned by a worker that died mid-render
+            cursor.execute("""
+                UPDATE generated_reports
+                SET status = 'queued', locked_by = NULL, locked_at = NULL
+                WHERE status = 'rendering'
+                AND locked_at < NOW() - INTERVAL %s SECOND
+            """, (RENDER_TIMEOUT_SECONDS,))
+
+            cursor.execute("""
+                UPDATE generated_reports
+                SET status = 'rendering', locked_by = %s, locked_at = NOW()
+                WHERE status = 'queued'
+                ORDER BY report_id
+                LIMIT 1
+            """, (self.worker_id,))
+            conn.commit()
+
+            cursor.execute("""
+                SELECT report_id, report_name, report_type, period_id, program_id,
+                       faculty_id, file_format, created_at
+                FROM generated_reports
+                WHERE status = 'rendering' AND locked_by = %s
+                ORDER BY report_id
+                LIMIT 1
+            """, (self.worker_id,))
+            report = cursor.fetchone()
+            cursor.close()
+            return report
+        except Exception as e:
+            print(f"Error claiming report to render: {e}")
+            conn.rollback()
+            return None
+        finally:
+            conn.close()
+
+    def record_result(self, report, artifact=None, error=None):
+        """
+        Mark a claimed report ready (with its artifact) or failed
+
+        Args:
+            report (dict): Claimed row
+            artifact (tuple, optional): (content_hash, file_path, file_size)
+            error (str, optional): Why rendering failed
+        """
+        conn = get_db_connection()
+        if not conn:
+            return
+
+        try:
+            cursor = conn.cursor()
+            if artifact:
+                content_hash, file_path, file_size = artifact
+                cursor.execute("""
+                    UPDATE generated_reports
+                    SET status = 'ready', content_hash = %s, file_path = %s, file_size = %s,
+                        render_error = NULL, rendered_at = NOW(), locked_by = NULL, locked_at = NULL
+                    WHERE report_id = %s AND locked_by = %s
+                """, (content_hash, file_path, file_size, report['report_id'], self.worker_id))
+            else:
+                cursor.execute("""
+                    UPDATE generated_reports
+                    SET status = 'failed', render_error = %s, locked_by = NULL, locked_at = NULL
+                    WHERE report_id = %s AND locked_by = %s
+                """, ((error or '')[:500], report['report_id'], self.worker_id))
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            print(f"Error recording render of report {report['report_id']}: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def render_next(self):
+        """
+        Claim and render one queued report
+
+        Returns:
+            bool: True if a report was claimed
+        """
+        with self.app.app_context():
+            report = self.claim_report()
+            if not report:
+                return False
+
+            try:
+                artifact = store_report_artifact(report, self.artifact_dir)
+            except Exception as e:
+                print(f"Error rendering report {report['report_id']}: {e}")
+                self.record_result(report, error=str(e))
+                return True
+
+            self.record_result(report, artifact=artifact)
+            print(f"📄 Report {report['report_id']} rendered ({artifact[2]} bytes, {artifact[0][:12]})")
+            return True
+
+    def run(self, once=False, idle_sleep=5):
+        """
+        Render reports until the queue is empty (once=True) or forever
+
+        Args:
+            once (bool): Exit when nothing is queued instead of polling
+            idle_sleep (float): Seconds to wait between polls when idle
+        """
+        while True:
+            if not self.render_next():
+                if once:
+                    return
+                time.sleep(idle_sleep)
+
+
+def collect_report_artifacts(artifact_dir, retention_days):
+    """
+    Apply the retention policy and delete unreferenced artifact files
+
+    Args:
+        artifact_dir (str): REPORT_ARTIFACT_DIR
+        retention_days (int): Days an artifact is kept after rendering (0 = forever)
+
+    Returns:
+        dict: expired (rows) and removed (files) counts, or None on failure
+    """
+    conn = get_db_connection()
+    if not conn:
+        return None
+
+    try:
+        cursor = conn.cursor()
+
+        expired = 0
+        if retention_days:
+            cursor.execute("""
+                UPDATE generated_reports
+                SET status = 'expired', file_path = NULL, content_hash = NULL
+                WHERE status = 'ready'
+                AND rendered_at < NOW() - INTERVAL %s DAY
+            """, (retention_days,))
+            expired = cursor.rowcount
+            conn.commit()
+
+        cursor.execute("SELECT DISTINCT content_hash FROM generated_reports WHERE content_hash IS NOT NULL")
+        referenced = {row[0] for row in cursor.fetchall()}
+        cursor.execute("SELECT file_path FROM generated_reports WHERE file_path IS NOT NULL")
+        referenced_paths = {os.path.abspath(row[0]) for row in cursor.fetchall()}
+        cursor.close()
+    except Exception as e:
+        print(f"Error applying report retention: {e}")
+        conn.rollback()
+        return None
+    finally:
+        conn.close()
+
+    cutoff = time.time() - ORPHAN_GRACE_SECONDS
+    removed = 0
+
+    for directory in (artifact_dir, LEGACY_REPORTS_DIR):
+        if not os.path.isdir(directory):
+            continue
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if name == '.gitkeep' or os.path.abspath(path) in referenced_paths:
+                    continue
+                if directory == artifact_dir and name.split('.', 1)[0] in referenced:
+                    continue
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError as e:
+                    print(f"Error removing report artifact {path}: {e}")
+
+    if expired or removed:
+        print(f"🧹 Report artifacts: {expired} expired, {removed} file(s) removed")
+    return {'expired': expired, 'removed': removed}
+
+
+class ReportArtifactCollector:
+    """
+    Periodically applies the retention policy while holding the collector lease
+
+    Args:
+        app: Flask application (for config and app contexts)
+        interval (int): Seconds between collections
+    """
+
+    def __init__(self, app, interval=None):
+        self.app = app
+        self.interval = interval or app.config.get('REPORT_GC_INTERVAL_SECONDS', 3600)
+        self.artifact_dir = os.path.abspath(
+            app.config.get('REPORT_ARTIFACT_DIR', os.path.join('storage', 'reports'))
+        )
+        self.retention_days = app.config.get('REPORT_RETENTION_DAYS', 30)
+        self.export_cache_dir = os.path.abspath(
+            app.config.get('EXPORT_CACHE_DIR', os.path.join('storage', 'exports'))
+        )
+        self.export_cache_max_age_days = app.config.get('EXPORT_CACHE_MAX_AGE_DAYS', 14)
+        self.collector_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def run_once(self):
+        """
+        Collect if this collector holds the lease
+
+        Returns:
+            dict: Collection counts, or None if not the leader or on failure
+        """
+        with self.app.app_context():
+            if not acquire_lease(LEASE_NAME, self.collector_id, self.interval * 2):
+                return None
+            result = collect_report_artifacts(self.artifact_dir, self.retention_days)
+            exports_removed = collect_export_cache(self.export_cache_dir, self.export_cache_max_age_days)
+            if exports_removed:
+                print(f"🧹 Export cache: {exports_removed} unused file(s) removed")
+            bulk_expired = collect_bulk_exports(self.retention_days)
+            if bulk_expired:
+                print(f"🧹 Bulk exports: {bulk_expired} ZIP(s) expired")
+            jobs_deleted = collect_insight_jobs()
+            if jobs_deleted:
+                print(f"🧹 AI insight jobs: {jobs_deleted} old job(s) deleted")
+            return result
+
+    def run(self, once=False):
+        """
+        Collect every interval until stopped
+
+        Args:
+            once (bool): Collect a single time, release the lease and return
+        """
+        while True:
+            self.run_once()
+            if once:
+                with self.app.app_context():
+                    release_lease(LEASE_NAME, self.collector_id)
+                return
+            time.sleep(self.interval)
+
+
+def ensure_report_renderer(app):
+    """
+    Start an in-process thread that renders queued reports, if not running
+
+    Disabled when REPORT_WORKER_INPROCESS is False (i.e. a standalone
+    worker is deployed instead).
+
+    Args:
+        app: Flask application
+    """
+    global _renderer_thread
+    if not app.config.get('REPORT_WORKER_INPROCESS', True):
+        return
+
+    with _renderer_lock:
+        if _renderer_thread is not None and _renderer_thread.is_alive():
+            return
+        worker = ReportRenderWorker(app)
+        _renderer_thread = threading.Thread(target=worker.run, kwargs={'once': True}, daemon=True)
+        _renderer_thread.start()
+
+
+def ensure_report_collector(app):
+    """
+    Start the in-process retention thread, if not running
+
+    Disabled when REPORT_WORKER_INPROCESS is False.
+
+    Args:
+        app: Flask application
+    """
+    global _collector_thread
+    if _collector_thread is not None and _collector_thread.is_alive():
+        return
+    if not app.config.get('REPORT_WORKER_INPROCESS', True):
+        return
+
+    with _collector_lock:
+        if _collector_thread is not None and _collector_thread.is_alive():
+            return
+        collector = ReportArtifactCollector(app)
+        _collector_thread = threading.Thread(target=collector.run, daemon=True)
+        _collector_thread.start()
+
+
+def main():
+    """Standalone worker / cron entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='IntellEvalPro report render worker')
+    parser.add_argument('--once', action='store_true', help='Render queued reports, collect once and exit')
+    parser.add_argument('--gc-interval', type=int, default=None, help='Seconds between retention runs')
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        init_report_artifact_columns()
+
+    worker = ReportRenderWorker(app)
+    collector = ReportArtifactCollector(app, interval=args.gc_interval)
+    print(f"🚀 Report worker {worker.worker_id} started")
+    try:
+        if args.once:
+            worker.run(once=True)
+            collector.run(once=True)
+            return
+
+        threading.Thread(target=collector.run, daemon=True).start()
+        worker.run()
+    except KeyboardInterrupt:
+        print("Report worker stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+"""
+Report renderers for IntellEvalPro
+Write generated_reports rows out as PDF, Excel, CSV or plain text files
+
+Renderers only depend on the report row: the "Generated" stamp is the
+report's created_at rather than the time of rendering, so re-rendering a
+report produces the same content (see utils/report_artifacts.py).
+"""
+from datetime import datetime
+
+# File extension of each generated_reports.file_format
+EXTENSIONS = {
+    'pdf': 'pdf',
+    'excel': 'xlsx',
+    'csv': 'csv',
+    'powerpoint': 'pptx'
+}
+
+
+def _generated_at(report):
+    """When the report was requested (falls back to now for unsaved rows)"""
+    return report.get('created_at') or datetime.now()
+
+
+def render_report_file(report, file_path):
+    """
+    Render a report into file_path in its file_format
+
+    Args:
+        report (dict): generated_reports row
+        file_path (str): Destination file (overwritten)
+    """
+    if report['file_format'] == 'pdf':
+        generate_analytics_pdf_report(report, file_path)
+    elif report['file_format'] == 'excel':
+        generate_analytics_excel_report(report, file_path)
+    elif report['file_format'] == 'csv':
+        generate_csv_report(report, file_path)
+    else:
+        # Fallback: create a simple text file
+        generate_simple_text_report(report, file_path)
+
+
+def generate_analytics_pdf_report(report, file_path):
+    """Generate analytics PDF report using ReportLab"""
+    try:
+        from reportlab.lib.pagesizes import letter, A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib import colors
+        
+        # Create PDF (invariant: no creation date or random document ID)
+        doc = SimpleDocTemplate(file_path, pagesize=letter, invariant=True)
+        story = []
+        styles = getSampleStyleSheet()
+        
+        # Title
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#0059cc'),
+            spaceAfter=30,
+            alignment=1  # Center
+        )
+        story.append(Paragraph(report['report_name'], title_style))
+        story.append(Spacer(1, 0.2 * inch))
+        
+        # Report Info
+        info_data = [
+            ['Report Type:', report['report_type'].capitalize()],
+            ['Generated:', _generated_at(report).strftime('%B %d, %Y at %I:%M %p')],
+            ['Format:', report['file_format'].upper()],
+        ]
+        
+        info_table = Table(info_data, colWidths=[2*inch, 4*inch])
+        info_table.setStyle(TableStyle([
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#495057')),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ]))
+        story.append(info_table)
+        story.append(Spacer(1, 0.5 * inch))
+        
+        # Content
+        story.append(Paragraph("Report Summary", styles['Heading2']))
+        story.append(Spacer(1, 0.2 * inch))
+        
+        summary_text = f"""
+        This is a {report['report_type']} report generated for the evaluation period. 
+        The report contains comprehensive analysis and statistics for faculty evaluation data.
+        """
+        story.append(Paragraph(summary_text, styles['BodyText']))
+        story.append(Spacer(1, 0.3 * inch))
+        
+        # Sample data table
+        story.append(Paragraph("Evaluation Statistics", styles['Heading2']))
+        story.append(Spacer(1, 0.2 * inch))
+        
+        data = [
+            ['Metric', 'Value'],
+            ['Total Evaluations', 'N/A'],
+            ['Average Rating', 'N/A'],
+            ['Response Rate', 'N/A'],
+            ['Completion Rate', 'N/A'],
+        ]
+        
+        table = Table(data, colWidths=[3*inch, 2*inch])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0059cc')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+        ]))
+        story.append(table)
+        
+        # Footer
+        story.append(Spacer(1, 0.5 * inch))
+        footer_text = "Generated by IntellEvalPro - Faculty Evaluation System"
+        story.append(Paragraph(footer_text, styles['Italic']))
+        
+        # Build PDF
+        doc.build(story)
+        
+    except ImportError:
+        # Fallback if reportlab is not installed
+        generate_simple_text_report(report, file_path)
+
+
+def generate_analytics_excel_report(report, file_path):
+    """Generate analytics Excel report using openpyxl"""
+    try:
+        from openpyxl import Workbook
+        from openpyxl.styles import Font, Alignment, PatternFill
+        
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Report"
+        
+        # Title
+        ws['A1'] = report['report_name']
+        ws['A1'].font = Font(size=16, bold=True, color="0059cc")
+        ws['A1'].alignment = Alignment(horizontal='center')
+        ws.merge_cells('A1:D1')
+        
+        # Report Info
+        ws['A3'] = 'Report Type:'
+        ws['B3'] = report['report_type'].capitalize()
+        ws['A4'] = 'Generated:'
+        ws['B4'] = _generated_at(report).strftime('%B %d, %Y at %I:%M %p')
+        ws['A5'] = 'Format:'
+        ws['B5'] = report['file_format'].upper()
+        
+        # Make headers bold
+        for row in [3, 4, 5]:
+            ws[f'A{row}'].font = Font(bold=True)
+        
+        # Statistics Header
+        ws['A7'] = 'Evaluation Statistics'
+        ws['A7'].font = Font(size=14, bold=True)
+        
+        # Table headers
+        ws['A9'] = 'Metric'
+        ws['B9'] = 'Value'
+        ws['A9'].font = Font(bold=True)
+        ws['B9'].font = Font(bold=True)
+        ws['A9'].fill = PatternFill(start_color='0059cc', end_color='0059cc', fill_type='solid')
+        ws['B9'].fill = PatternFill(start_color='0059cc', end_color='0059cc', fill_type='solid')
+        ws['A9'].font = Font(bold=True, color='FFFFFF')
+        ws['B9'].font = Font(bold=True, color='FFFFFF')
+        
+        # Sample data
+        data = [
+            ['Total Evaluations', 'N/A'],
+            ['Average Rating', 'N/A'],
+            ['Response Rate', 'N/A'],
+            ['Completion Rate', 'N/A'],
+        ]
+        
+        for idx, row in enumerate(data, start=10):
+            ws[f'A{idx}'] = row[0]
+            ws[f'B{idx}'] = row[1]
+        
+        # Adjust column widths
+        ws.column_dimensions['A'].width = 30
+        ws.column_dimensions['B'].width = 20
+        
+        # Footer
+        footer_row = len(data) + 12
+        ws[f'A{footer_row}'] = 'Generated by IntellEvalPro - Faculty Evaluation System'
+        ws[f'A{footer_row}'].font = Font(italic=True, size=9)
+        
+        wb.save(file_path)
+        
+    except ImportError:
+        # Fallback if openpyxl is not installed
+        generate_simple_text_report(report, file_path)
+
+
+def generate_csv_report(report, file_path):
+    """Generate CSV report"""
+    import csv
+    
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        
+        # Header
+        writer.writerow(['Report Name', report['report_name']])
+        writer.writerow(['Report Type', report['report_type']])
+        writer.writerow(['Generated', _generated_at(report).strftime('%Y-%m-%d %H:%M:%S')])
+        writer.writerow([])
+        
+        # Statistics
+        writer.writerow(['Metric', 'Value'])
+        writer.writerow(['Total Evaluations', 'N/A'])
+        writer.writerow(['Average Rating', 'N/A'])
+        writer.writerow(['Response Rate', 'N/A'])
+        writer.writerow(['Completion Rate', 'N/A'])
+
+
+def generate_simple_text_report(report, file_path):
+    """Fallback: Generate simple text report"""
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(f"{'='*60}\n")
+        f.write(f"{report['report_name']}\n")
+        f.write(f"{'='*60}\n\n")
+        f.write(f"Report Type: {report['report_type']}\n")
+        f.write(f"Generated: {_generated_at(report).strftime('%B %d, %Y at %I:%M %p')}\n")
+        f.write(f"Format: {report['file_format']}\n\n")
+        f.write(f"{'='*60}\n")
+        f.write(f"Evaluation Statistics\n")
+        f.write(f"{'='*60}\n\n")
+        f.write(f"Total Evaluations: N/A\n")
+        f.write(f"Average Rating: N/A\n")
+        f.write(f"Response Rate: N/A\n")
+        f.write(f"Completion Rate: N/A\n\n")
+        f.write(f"{'='*60}\n")
+        f.write(f"Generated by IntellEvalPro - Faculty Evaluation System\n")
+        f.write(f"{'='*60}\n")
@@ -0,0 +1,236 @@
+"""
+Comment sentiment for IntellEvalPro
+Offline English/Tagalog lexicon scorer used to label comments when they are submitted
+
+Each word found in the lexicon adds its weight to the comment's score.
+Negators (not, hindi, wala...) flip the next few words, intensifiers
+(very, sobrang, napaka-...) strengthen the next one, and after a contrast
+word (but, pero, kaso...) the rest of the comment counts more than what
+came before. Scores of SENTIMENT_THRESHOLD or more are Positive, of
+-SENTIMENT_THRESHOLD or less Negative, anything else Neutral.
+
+Only a regex split and dict lookups are involved, so a comment is
+classified in microseconds without any network call. Comments stored
+before this scorer existed were all saved as 'Neutral'; relabel them with:
+    python -m utils.sentiment [--all] [--batch-size N]
+"""
+import re
+
+SENTIMENT_THRESHOLD = 0.5
+
+NEGATION_SCOPE = 3
+NEGATION_FACTOR = -0.75
+CONTRAST_FACTOR = 1.5
+
+LEXICON = {
+    # English - positive
+    'good': 1.0, 'great': 2.0, 'excellent': 3.0, 'amazing': 2.5, 'awesome': 2.5,
+    'best': 2.5, 'outstanding': 3.0, 'superb': 3.0, 'wonderful': 2.5, 'perfect': 2.5,
+    'helpful': 2.0, 'kind': 1.5, 'patient': 1.5, 'clear': 1.5, 'understandable': 1.5,
+    'knowledgeable': 2.0, 'engaging': 2.0, 'interesting': 1.5, 'fun': 1.5, 'nice': 1.0,
+    'approachable': 1.5, 'organized': 1.5, 'prepared': 1.5, 'effective': 2.0,
+    'inspiring': 2.5, 'motivating': 2.0, 'love': 2.5, 'loved': 2.5, 'like': 1.0,
+    'enjoy': 1.5, 'enjoyed': 1.5, 'thank': 1.5, 'thanks': 1.5, 'fair': 1.0,
+    'friendly': 1.5, 'respectful': 1.5, 'passionate': 2.0, 'supportive': 2.0,
+    'recommend': 2.0, 'punctual': 1.0, 'dedicated': 2.0, 'caring': 2.0,
+    'professional': 1.5, 'understanding': 1.5, 'happy': 1.5, 'learned': 1.0,
+    # English - negative
+    'bad': -1.5, 'poor': -2.0, 'terrible': -3.0, 'awful': -3.0, 'worst': -3.0,
+    'boring': -2.0, 'rude': -2.5, 'late': -1.0, 'absent': -1.5, 'unclear': -1.5,
+    'confusing': -2.0, 'confused': -1.5, 'unfair': -2.0, 'strict': -0.5, 'lazy': -2.0,
+    'unprepared': -2.0, 'disorganized': -2.0, 'hate': -2.5, 'hated': -2.5,
+    'difficult': -1.0, 'hard': -0.5, 'slow': -1.0, 'monotonous': -1.5,
+    'unprofessional': -2.5, 'disrespectful': -2.5, 'annoying': -2.0, 'useless': -2.5,
+    'waste': -2.0, 'sleepy': -1.0, 'favoritism': -2.5, 'biased': -2.0, 'careless': -2.0,
+    'impatient': -2.0, 'improve': -0.5, 'improvement': -0.5, 'lack': -1.0, 'lacks': -1.0,
+    'sad': -1.5, 'disappointed': -2.0, 'disappointing': -2.0, 'scary': -1.5,
+    # Tagalog - positive
+    'magaling': 2.0, 'galing': 2.0, 'mahusay': 2.5, 'husay': 2.0, 'mabait': 2.0,
+    'bait': 1.5, 'maganda': 1.5, 'ganda': 1.5, 'malinaw': 1.5, 'linaw': 1.0,
+    'maayos': 1.5, 'ayos': 1.0, 'masaya': 1.5, 'saya': 1.5, 'matiyaga': 1.5,
+    'mapagpasensya': 1.5, 'maalaga': 2.0, 'matalino': 2.0, 'salamat': 1.5,
+    'gusto': 1.0, 'paborito': 2.0, 'naiintindihan': 1.5, 'naintindihan': 1.5,
+    'nakakatuwa': 1.5, 'masipag': 2.0, 'sipag': 1.5, 'magaan': 1.0, 'idol': 2.0,
+    'lodi': 2.0, 'astig': 2.0, 'kwenta': 1.0, 'kuwenta': 1.0,
+    # Tagalog - negative
+    'pangit': -2.0, 'panget': -2.0, 'masungit': -2.0, 'sungit': -1.5,
+    'nakakainip': -2.0, 'nakakaantok': -1.5, 'antok': -1.0, 'tamad': -2.0,
+    'mabagal': -1.0, 'bagal': -1.0, 'magulo': -1.5, 'gulo': -1.0, 'malabo': -1.5,
+    'labo': -1.0, 'mahirap': -1.0, 'hirap': -0.5, 'galit': -1.5, 'nagagalit': -1.5,
+    'bastos': -2.5, 'nakakatakot': -1.5, 'takot': -1.0, 'sayang': -1.5,
+    'nakakainis': -2.0, 'inis': -1.5, 'kulang': -1.0, 'pabaya': -2.0,
+    'nakakalito': -1.5, 'lito': -1.0,
+}
+
+NEGATORS = frozenset((
+    'not', 'no', 'never', 'dont', "don't", 'doesnt', "doesn't", 'didnt', "didn't",
+    'isnt', "isn't", 'wasnt', "wasn't", 'arent', "aren't", 'cannot', 'cant', "can't",
+    'wont', "won't", 'hardly', 'without',
+    'hindi', 'di', 'wala', 'walang', 'huwag', 'wag',
+))
+
+INTENSIFIERS = {
+    'very': 1.5, 'really': 1.5, 'so': 1.3, 'super': 1.5, 'extremely': 2.0, 'too': 1.3,
+    'truly': 1.5, 'absolutely': 1.8, 'sobra': 1.5, 'sobrang': 1.5, 'grabe': 1.5,
+}
+
+# Tagalog degree prefixes: napaka-galing (very good), pinaka-magaling (the best)
+PREFIX_INTENSIFIERS = (('napaka', 1.8), ('pinaka', 1.8))
+
+CONTRASTS = frozenset(('but', 'however', 'pero', 'kaso', 'ngunit', 'subalit'))
+
+_TOKEN_RE = re.compile(r"[a-zñ']+")
+
+
+def _word_weight(token):
+    """Lexicon weight of a word, resolving Tagalog degree prefixes"""
+    weight = LEXICON.get(token)
+    if weight is not None:
+        return weight
+    for prefix, factor in PREFIX_INTENSIFIERS:
+        if token.startswith(prefix):
+            root = token[len(prefix):].lstrip('-')
+            weight = LEXICON.get(root) or LEXICON.get('ma' + root)
+            if weight is not None:
+                return weight * factor
+    return None
+
+
+def sentiment_score(text):
+    """
+    Score the sentiment of a comment
+
+    Args:
+        text (str): Comment in English, Tagalog or a mix of both
+
+    Returns:
+        float: Positive for favourable comments, negative for unfavourable, 0 if neutral
+    """
+    if not text:
+        return 0.0
+
+    score = 0.0
+    negated = 0
+    boost = 1.0
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in NEGATORS:
+            negated = NEGATION_SCOPE
+            continue
+        if token in INTENSIFIERS:
+            boost = INTENSIFIERS[token]
+            continue
+        if token in CONTRASTS:
+            # What follows "but" is what the student means
+            score /= CONTRAST_FACTOR
+            boost = CONTRAST_FACTOR
+            negated = 0
+            continue
+
+        weight = _word_weight(token)
+        if weight is not None:
+            if negated:
+                weight *= NEGATION_FACTOR
+            score += weight * boost
+            boost = 1.0
+        if negated:
+            negated -= 1
+
+    return score
+
+
+def classify_sentiment(text):
+    """
+    Label a comment for comments.sentiment
+
+    Args:
+        text (str): Comment text
+
+    Returns:
+        str: 'Positive', 'Negative' or 'Neutral'
+    """
+    score = sentiment_score(text)
+    if score >= SENTIMENT_THRESHOLD:
+        return 'Positive'
+    if score <= -SENTIMENT_THRESHOLD:
+        return 'Negative'
+    return 'Neutral'
+
+
+def backfill_sentiment(batch_size=1000, rescore_all=False):
+    """
+    Label stored comments with classify_sentiment()
+
+    Args:
+        batch_size (int): Comments read and updated per transaction
+        rescore_all (bool): Relabel every comment, not only those still
+            'Neutral' (or NULL) from before sentiment was scored
+
+    Returns:
+        tuple: (comments scanned, comments relabelled)
+    """
+    from models.database import get_db_connection
+
+    scanned = relabelled = 0
+    after_id = 0
+    condition = "" if rescore_all else "AND (sentiment IS NULL OR sentiment = 'Neutral')"
+
+    while True:
+        conn = get_db_connection()
+        if not conn:
+            break
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"""
+                SELECT comment_id, comment_text, sentiment
+                FROM comments
+                WHERE comment_id > %s {condition}
+                ORDER BY comment_id
+                LIMIT %s
+            """, (after_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                cursor.close()
+                break
+
+            updates = []
+            for row in rows:
+                sentiment = classify_sentiment(row['comment_text'])
+                if sentiment != row['sentiment']:
+                    updates.append((sentiment, row['comment_id']))
+            if updates:
+                cursor.executemany("UPDATE comments SET sentiment = %s WHERE comment_id = %s", updates)
+            conn.commit()
+            cursor.close()
+        except Exception as e:
+            print(f"Error backfilling comment sentiment: {e}")
+            conn.rollback()
+            break
+        finally:
+            conn.close()
+
+        scanned += len(rows)
+        relabelled += len(updates)
+        after_id = rows[-1]['comment_id']
+        print(f"💬 Scanned {scanned} comment(s), relabelled {relabelled}")
+
+    return scanned, relabelled
+
+
+def main():
+    """Backfill entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='IntellEvalPro comment sentiment backfill')
+    parser.add_argument('--all', action='store_true', help='Relabel every comment, not only Neutral ones')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Comments per transaction')
+    args = parser.parse_args()
+
+    from app import app
+
+    with app.app_context():
+        scanned, relabelled = backfill_sentiment(batch_size=args.batch_size, rescore_all=args.all)
+    print(f"✅ Sentiment backfill finished: {scanned} scanned, {relabelled} relabelled")
+
+
+if __name__ == '__main__':
+    main()
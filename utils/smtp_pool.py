@@ -0,0 +1,270 @@
+"""
+Pooled SMTP sender for IntellEvalPro
+Keeps a small number of authenticated SMTP connections open for bulk sends
+
+A bulk notification used to open a fresh SMTP connection (EHLO, STARTTLS,
+LOGIN) for every single recipient. SMTPConnectionPool keeps N connections
+open, sends many messages over each, and transparently reconnects when the
+server drops the session (421, disconnect, timeout).
+
+It only needs a host and port, so it can be exercised locally against a
+stand-in server, e.g.:
+
+    python -m aiosmtpd -n -l localhost:8025
+
+    pool = SMTPConnectionPool('localhost', 8025, use_tls=False)
+    pool.send(msg)
+    pool.close()
+"""
+import queue
+import smtplib
+import socket
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the connection is considered dead and is reopened
+RECONNECT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    socket.timeout,
+    ConnectionError,
+    OSError,
+)
+
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of authenticated SMTP connections
+
+    Args:
+        host (str): SMTP server host
+        port (int): SMTP server port
+        username (str, optional): Login user (login skipped if empty)
+        password (str, optional): Login password
+        use_tls (bool): Issue STARTTLS after EHLO
+        size (int): Maximum number of open connections
+        timeout (float): Socket timeout in seconds
+        max_messages_per_connection (int): Reopen after this many messages
+        max_retries (int): Reconnect attempts per message on transient errors
+    """
+
+    def __init__(self, host, port, username=None, password=None, use_tls=True,
+                 size=5, timeout=30, max_messages_per_connection=100, max_retries=2):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        self.max_retries = max_retries
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._stats = {
+            'sent': 0,
+            'failed': 0,
+            'connections_opened': 0,
+            'reconnects': 0,
+        }
+        self._started_at = time.monotonic()
+
+    @classmethod
+    def from_config(cls, config, size=5, **kwargs):
+        """
+        Build a pool from Flask config (MAIL_SERVER, MAIL_PORT, ...)
+
+        Args:
+            config: Flask config mapping
+            size (int): Number of connections to keep open
+
+        Returns:
+            SMTPConnectionPool: Configured pool
+        """
+        return cls(
+            config.get('MAIL_SERVER'),
+            config.get('MAIL_PORT'),
+            username=config.get('MAIL_USERNAME'),
+            password=config.get('MAIL_PASSWORD'),
+            use_tls=config.get('MAIL_USE_TLS'),
+            size=size,
+            **kwargs
+        )
+
+    # ------------------------------------------------------------------
+    # Connection management
+    # ------------------------------------------------------------------
+    def _open(self):
+        """Open, secure and authenticate one SMTP connection"""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.use_tls:
+                if server.has_extn('starttls'):
+                    server.starttls()
+                    server.ehlo()
+                else:
+                    logger.warning(f'{self.host}:{self.port} does not offer STARTTLS')
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            self._quit(server)
+            raise
+
+        with self._lock:
+            self._stats['connections_opened'] += 1
+        return [server, 0]  # [connection, messages sent on it]
+
+    @staticmethod
+    def _quit(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _acquire(self):
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._open()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, entry):
+        if entry is not None:
+            if self._closed or entry[1] >= self.max_messages_per_connection:
+                self._quit(entry[0])
+            else:
+                self._idle.put(entry)
+        self._slots.release()
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+    def send(self, msg):
+        """
+        Send one email.message.Message over a pooled connection
+
+        Transient failures (421 responses, disconnects, timeouts) reopen the
+        connection and retry up to max_retries times.
+
+        Args:
+            msg: Message to send (From/To taken from headers)
+
+        Returns:
+            bool: True if the message was accepted by the server
+        """
+        return self._send(lambda server: server.send_message(msg), msg.get('To'))
+
+    def send_raw(self, from_addr, to_addrs, data):
+        """
+        Send an already serialized message (CRLF line endings)
+
+        Args:
+            from_addr (str): Envelope sender
+            to_addrs (list): Envelope recipients
+            data (bytes): Complete message including headers
+
+        Returns:
+            bool: True if the message was accepted by the server
+        """
+        return self._send(lambda server: server.sendmail(from_addr, to_addrs, data), ', '.join(to_addrs))
+
+    def _send(self, deliver, recipient):
+        if self._closed:
+            raise RuntimeError('SMTP pool is closed')
+
+        attempt = 0
+        while True:
+            try:
+                entry = self._acquire()
+            except Exception as e:
+                if attempt < self.max_retries:
+                    attempt += 1
+                    continue
+                logger.error(f'Could not open SMTP connection to {self.host}:{self.port}: {e}')
+                self._record(failed=True)
+                return False
+
+            try:
+                deliver(entry[0])
+            except Exception as e:
+                code = getattr(e, 'smtp_code', None)
+                transient = isinstance(e, RECONNECT_ERRORS) or code == 421
+                if transient:
+                    # Session is gone; drop it and retry on a fresh one
+                    self._quit(entry[0])
+                    self._release(None)
+                    if attempt < self.max_retries:
+                        attempt += 1
+                        logger.info(f'SMTP connection lost ({e}); reconnecting (attempt {attempt})')
+                        self._record(reconnect=True)
+                        continue
+                else:
+                    # Message-level rejection (e.g. 550); the connection is still usable
+                    self._release(entry)
+                logger.error(f"Failed to send email to {recipient}: {e}")
+                self._record(failed=True)
+                return False
+
+            entry[1] += 1
+            self._release(entry)
+            self._record()
+            return True
+
+    def _record(self, failed=False, reconnect=False):
+        with self._lock:
+            if reconnect:
+                self._stats['reconnects'] += 1
+            elif failed:
+                self._stats['failed'] += 1
+            else:
+                self._stats['sent'] += 1
+
+    def close(self):
+        """Close every idle connection; in-flight ones close on release"""
+        self._closed = True
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(server)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def stats(self):
+        """
+        Throughput statistics since the pool was created
+
+        Returns:
+            dict: sent/failed counts, connections opened, reconnects and messages per second
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        elapsed = time.monotonic() - self._started_at
+        stats['elapsed_seconds'] = round(elapsed, 2)
+        stats['messages_per_second'] = round(stats['sent'] / elapsed, 2) if elapsed > 0 else 0.0
+        stats['messages_per_connection'] = (
+            round(stats['sent'] / stats['connections_opened'], 2) if stats['connections_opened'] else 0.0
+        )
+        return stats
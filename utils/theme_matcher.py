@@ -0,0 +1,230 @@
+"""
+Comment theme matcher for IntellEvalPro
+Counts teaching themes (clarity, engagement, preparation...) in comments with one precompiled regex
+
+Every keyword of every theme is folded into a single alternation with
+word boundaries, longest keywords first, so a comment is scanned once no
+matter how many themes there are, and "time" no longer matches inside
+"sometimes". A keyword ending in '*' also matches longer words starting
+with it ("explain*" matches explains, explained, explanation).
+
+The theme dictionary defaults to DEFAULT_THEMES (English and Tagalog).
+Point ANALYTICS_THEMES_FILE at a JSON object of theme -> keyword list to
+use your own.
+"""
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+
+DEFAULT_THEMES = {
+    'Clear Explanation': [
+        'clear', 'clearly', 'explain*', 'understand*', 'clarity',
+        'malinaw', 'linaw', 'paliwanag', 'ipinaliwanag', 'maintindihan', 'naiintindihan', 'naintindihan',
+    ],
+    'Engaging Teaching': [
+        'engaging', 'interesting', 'interactive', 'participation', 'participate*',
+        'nakakaengganyo', 'masaya', 'nakakatuwa', 'nakikilahok',
+    ],
+    'Well Prepared': [
+        'prepared', 'organized', 'structure*', 'plan', 'plans', 'planned',
+        'handa', 'nakahanda', 'maayos', 'organisado',
+    ],
+    'Helpful': [
+        'helpful', 'support*', 'assist*', 'available',
+        'matulungin', 'tumutulong', 'tulong', 'nakakatulong',
+    ],
+    'Knowledgeable': [
+        'knowledge*', 'expert', 'experienced', 'skilled',
+        'matalino', 'marunong', 'magaling', 'mahusay', 'dalubhasa',
+    ],
+    'Patient': [
+        'patient', 'patience', 'understanding', 'calm', 'kind',
+        'matiyaga', 'mapagpasensya', 'mahinahon', 'mabait', 'maunawain',
+    ],
+    'Communication': [
+        'communication', 'communicate*', 'speak*', 'voice', 'presentation',
+        'magsalita', 'nagsasalita', 'boses', 'pananalita',
+    ],
+    'Time Management': [
+        'time', 'punctual', 'schedule*', 'manage*', 'late',
+        'oras', 'nasa oras', 'huli', 'laging late',
+    ],
+    'Assessment': [
+        'exam', 'exams', 'test', 'tests', 'quiz*', 'grade*', 'grading', 'feedback', 'evaluation',
+        'pagsusulit', 'marka', 'grado',
+    ],
+    'Technology Use': [
+        'technology', 'online', 'digital', 'computer', 'powerpoint', 'slides',
+        'teknolohiya',
+    ],
+}
+
+
+class ThemeMatcher:
+    """Single-pass, word-bounded keyword matcher over a theme dictionary"""
+
+    def __init__(self, themes=None):
+        """
+        Args:
+            themes (dict): Theme name -> list of keywords (default DEFAULT_THEMES)
+        """
+        self.themes = list((themes or DEFAULT_THEMES).keys())
+        self._order = {theme: index for index, theme in enumerate(self.themes)}
+        self._keyword_themes = {}
+        self._prefix_themes = []
+
+        patterns = []
+        for theme, keywords in (themes or DEFAULT_THEMES).items():
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                if not keyword:
+                    continue
+                if keyword.endswith('*'):
+                    stem = keyword[:-1]
+                    self._prefix_themes.append((stem, theme))
+                    patterns.append((len(stem), re.escape(stem) + r'\w*'))
+                else:
+                    self._keyword_themes.setdefault(keyword, theme)
+                    patterns.append((len(keyword), re.escape(keyword).replace(r'\ ', r'\s+')))
+
+        # Longest first so "nasa oras" wins over "oras"
+        patterns.sort(key=lambda pattern: -pattern[0])
+        alternation = '|'.join(pattern for _, pattern in patterns) or r'(?!x)x'
+        # Texts are lowercased before matching; IGNORECASE makes the scan several times slower
+        self._regex = re.compile(rf"\b(?:{alternation})\b")
+        # Longest stem first, matching the alternation
+        self._prefix_themes.sort(key=lambda prefix: -len(prefix[0]))
+
+    def _theme_of(self, word):
+        theme = self._keyword_themes.get(' '.join(word.split()))
+        if theme:
+            return theme
+        for stem, theme in self._prefix_themes:
+            if word.startswith(stem):
+                return theme
+        return None
+
+    def count(self, text, counts=None):
+        """
+        Count theme keywords in one text
+
+        Args:
+            text (str): Comment
+            counts (Counter): Add to this counter instead of a new one
+
+        Returns:
+            Counter: Theme -> number of keyword matches
+        """
+        counts = Counter() if counts is None else counts
+        if text:
+            for match in self._regex.finditer(text.lower()):
+                theme = self._theme_of(match.group(0))
+                if theme:
+                    counts[theme] += 1
+        return counts
+
+    def count_all(self, texts):
+        """
+        Count theme keywords over many texts
+
+        Args:
+            texts (iterable): Comments
+
+        Returns:
+            Counter: Theme -> number of keyword matches
+        """
+        counts = Counter()
+        for text in texts:
+            self.count(text, counts)
+        return counts
+
+    def count_grouped(self, rows, groups, text_field='comment_text'):
+        """
+        Count theme keywords per group in a single pass over rows
+
+        Args:
+            rows (iterable): Dict rows, e.g. a period's comments with their faculty_id
+            groups (callable): Returns the groups a row counts towards
+                (e.g. its faculty and its faculty/subject pair)
+            text_field (str): Row field holding the comment
+
+        Returns:
+            dict: Group -> Counter of theme matches
+        """
+        grouped = {}
+        for row in rows:
+            counts = self.count(row[text_field])
+            if not counts:
+                continue
+            for group in groups(row):
+                grouped.setdefault(group, Counter()).update(counts)
+        return grouped
+
+    def rank(self, counts):
+        """
+        Themes found, most frequent first (ties keep dictionary order)
+
+        Args:
+            counts (Counter): From count(), count_all() or count_grouped()
+
+        Returns:
+            list: Theme names
+        """
+        found = [theme for theme, count in counts.items() if count > 0]
+        return sorted(found, key=lambda theme: (-counts[theme], self._order.get(theme, len(self._order))))
+
+
+def load_themes(path):
+    """
+    Load a theme dictionary from a JSON file
+
+    Args:
+        path (str): JSON object of theme name -> list of keywords
+
+    Returns:
+        dict: Theme dictionary
+
+    Raises:
+        ValueError: If the file is not a theme -> keyword list object
+    """
+    with open(path, encoding='utf-8') as f:
+        themes = json.load(f)
+    if not isinstance(themes, dict) or not all(isinstance(words, list) for words in themes.values()):
+        raise ValueError(f"{path} must map theme names to keyword lists")
+    return themes
+
+
+@lru_cache(maxsize=4)
+def _matcher_for(path):
+    if path:
+        try:
+            return ThemeMatcher(load_themes(path))
+        except (OSError, ValueError) as e:
+            print(f"Error loading themes from {path}, using defaults: {e}")
+    return ThemeMatcher()
+
+
+def themes_file():
+    """ANALYTICS_THEMES_FILE when running inside the app, else None"""
+    try:
+        from flask import current_app, has_app_context
+        if has_app_context():
+            return current_app.config.get('ANALYTICS_THEMES_FILE') or None
+    except ImportError:
+        pass
+    return None
+
+
+def get_theme_matcher(path=None):
+    """
+    Get the compiled matcher for the configured theme dictionary
+
+    Args:
+        path (str): Theme file to use instead of ANALYTICS_THEMES_FILE
+            (worker processes have no app context to read it from)
+
+    Returns:
+        ThemeMatcher: Built once per theme file
+    """
+    return _matcher_for(path or themes_file())